@@ -155,6 +155,7 @@ const AddEventModal = ({ isOpen, onClose, onSave, allEvents, creationContext = {
                   <div className="form-group"><label>Min Team Members</label><input className="text-black" type="number" name="minMembers" value={formData.minMembers || 1} onChange={handleInputChange} min="1" /></div>
                   <div className="form-group"><label>Max Team Members</label><input className="text-black" type="number" name="maxMembers" value={formData.maxMembers || 1} onChange={handleInputChange} min={formData.minMembers || 1} /></div>
                   <div className="form-group"><label>Min Female Members</label><input className="text-black" type="number" name="minFemaleMembers" value={formData.minFemaleMembers || 0} onChange={handleInputChange} min="0" /></div>
+                  <div className="form-group"><label>Max Teams (blank = unlimited)</label><input className="text-black" type="number" name="maxTeams" value={formData.maxTeams || ''} onChange={handleInputChange} min="1" /></div>
                   <div className="flex items-center pt-6"><label htmlFor="facultyMentor" className="flex items-center cursor-pointer"><input id="facultyMentor" type="checkbox" name="facultyMentor" checked={!!formData.facultyMentor} onChange={handleInputChange} className="hidden" />{formData.facultyMentor ? <CheckSquare className="text-[#ff6a3c]" /> : <Square className="text-gray-400" />}<span className="ml-2 font-semibold text-gray-700">Faculty Mentor Required</span></label></div>
                 </div>
               </>
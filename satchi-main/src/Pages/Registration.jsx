@@ -26,12 +26,15 @@ const EventRules = ({ event }) => (
   </motion.div>
 );
 
+const wait = (ms) => new Promise((resolve) => setTimeout(resolve, ms));
+
 const Registration = () => {
   const { eventId } = useParams();
   const { user } = useAuth();
   const [event, setEvent] = useState(null);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState(null);
+  const [queuePosition, setQueuePosition] = useState(null);
 
   useEffect(() => {
     if (!eventId) {
@@ -57,9 +60,35 @@ const Registration = () => {
   }, [eventId]);
 
   const submitProject = async (payload) => {
-    await axios.post(`${API_URL}/api/submit-project/${event.eventId}/`, payload, {
-      headers: { "Content-Type": "application/json" },
-    });
+    try {
+      return await submitThroughQueue(payload);
+    } finally {
+      setQueuePosition(null);
+    }
+  };
+
+  const submitThroughQueue = async (payload) => {
+    let ticket = null;
+    for (;;) {
+      try {
+        const headers = { "Content-Type": "application/json" };
+        if (ticket) headers["X-Registration-Ticket"] = ticket;
+        return await axios.post(`${API_URL}/api/submit-project/${event.eventId}/`, payload, { headers });
+      } catch (requestError) {
+        // 429 with a queue ticket: registration is busy, wait for our turn and resubmit
+        let queue = requestError?.response?.status === 429 ? requestError.response.data?.queue : null;
+        if (!queue || queue.ticket === ticket) throw requestError;
+        ticket = queue.ticket;
+        while (!queue.admitted) {
+          setQueuePosition(queue.position);
+          await wait(queue.retryAfter * 1000);
+          const response = await axios.get(`${API_URL}/api/registration-queue/${event.eventId}/`, {
+            params: { ticket },
+          });
+          queue = response.data;
+        }
+      }
+    }
   };
 
   return (
@@ -97,6 +126,13 @@ const Registration = () => {
 
         {event && <EventRules event={event} />}
 
+        {queuePosition !== null && (
+          <div className="mx-auto mb-8 max-w-4xl rounded-lg border border-amber-300 bg-amber-50 p-4 text-center text-amber-800">
+            <Loader className="mr-2 inline-block animate-spin" size={18} />
+            Registration is busy. You are number {queuePosition} in line; your form will be submitted automatically.
+          </div>
+        )}
+
         {event ? (
           <ProjectSubmissionForm
             event={event}
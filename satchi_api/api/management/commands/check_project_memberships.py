@@ -0,0 +1,46 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from api.models import UserProjectMembership
+from api.services import expected_project_memberships
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the user/project membership index with the captain and team member "
+        "links it is built from; --fix adds missing rows and deletes stale ones."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--fix", action="store_true", help="Repair the index instead of only reporting.")
+        parser.add_argument("--show", type=int, default=20, help="How many differences of each kind to list.")
+
+    def handle(self, *args, **options):
+        expected = expected_project_memberships()
+        stored = {
+            (user_id, project_id, event_id): pk
+            for pk, user_id, project_id, event_id in UserProjectMembership.objects.values_list(
+                "pk", "user_id", "project_id", "event_id"
+            ).iterator()
+        }
+        missing = sorted(expected - stored.keys())
+        stale = sorted(stored.keys() - expected)
+
+        for label, rows in (("missing", missing), ("stale", stale)):
+            for user_id, project_id, event_id in rows[: options["show"]]:
+                self.stdout.write(f"  {label}: user {user_id} in project {project_id} (sub-sub event {event_id})")
+            if len(rows) > options["show"]:
+                self.stdout.write(f"  ... and {len(rows) - options['show']} more {label}")
+
+        if not missing and not stale:
+            self.stdout.write(self.style.SUCCESS(f"Membership index is consistent ({len(stored)} rows)."))
+            return
+        if not options["fix"]:
+            raise CommandError(f"{len(missing)} missing and {len(stale)} stale membership rows; rerun with --fix.")
+
+        UserProjectMembership.objects.filter(pk__in=[stored[row] for row in stale]).delete()
+        UserProjectMembership.objects.bulk_create(
+            [UserProjectMembership(user_id=user_id, project_id=project_id, event_id=event_id) for user_id, project_id, event_id in missing],
+            batch_size=500,
+            ignore_conflicts=True,
+        )
+        self.stdout.write(self.style.SUCCESS(f"Added {len(missing)} and deleted {len(stale)} membership rows."))
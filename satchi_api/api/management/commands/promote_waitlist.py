@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand
+
+from api.models import WaitlistEntry
+from api.waitlist import promote_waitlist, recount_registered_teams
+from events.models import SubSubEvent
+
+
+class Command(BaseCommand):
+    help = (
+        "Recount registered teams per sub-sub event and move waitlisted teams into "
+        "events that have free places (e.g. after a promotion worker died)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("event_ids", nargs="*", type=int, help="Sub-sub event ids (default: every event with a waitlist).")
+        parser.add_argument("--no-recount", action="store_true", help="Trust the stored registeredTeams counters.")
+
+    def handle(self, *args, **options):
+        waiting = WaitlistEntry.objects.filter(status=WaitlistEntry.Status.WAITING)
+        event_ids = options["event_ids"] or sorted(set(waiting.values_list("event_id", flat=True)))
+        if not options["no_recount"]:
+            recount_registered_teams(SubSubEvent.objects.filter(pk__in=event_ids) if options["event_ids"] else None)
+
+        for event_id in event_ids:
+            before = waiting.filter(event_id=event_id).count()
+            promote_waitlist(event_id)
+            after = waiting.filter(event_id=event_id).count()
+            self.stdout.write(f"  sub-sub event {event_id}: {before - after} promoted or rejected, {after} still waiting")
+        self.stdout.write(self.style.SUCCESS(f"Processed {len(event_ids)} event(s)."))
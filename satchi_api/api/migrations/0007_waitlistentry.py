@@ -0,0 +1,35 @@
+# Generated by Django 4.2.23 on 2026-10-19 17:02
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0007_subsubevent_team_capacity'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('api', '0006_project_project_category'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='WaitlistEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('manual_entry', models.BooleanField(default=False)),
+                ('captain_email', models.EmailField(max_length=254)),
+                ('payload', models.JSONField()),
+                ('status', models.CharField(choices=[('waiting', 'Waiting'), ('promoted', 'Promoted'), ('rejected', 'Rejected')], default='waiting', max_length=10)),
+                ('error', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('created_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='waitlist_entries', to=settings.AUTH_USER_MODEL)),
+                ('event', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='waitlist', to='events.subsubevent')),
+                ('project', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='api.project')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['event', 'status', 'id'], name='api_waitlis_event_i_5669d9_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,76 @@
+# Generated by Django 4.2.23 on 2026-10-19 17:06
+
+import logging
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+logger = logging.getLogger("api.migrations")
+
+
+def backfill_event_participants(apps, schema_editor):
+    """
+    Index every existing registration. When one email is in several teams of
+    an event the oldest project keeps the row and the others are reported, so
+    the duplicates can be resolved by hand. The report is logged as a
+    warning on ``api.migrations``.
+    """
+
+    Project = apps.get_model("api", "Project")
+    TeamMember = apps.get_model("api", "TeamMember")
+    EventParticipant = apps.get_model("api", "EventParticipant")
+
+    members = {}
+    for project_id, email in TeamMember.objects.values_list("project_id", "email"):
+        members.setdefault(project_id, []).append(email)
+
+    holders = {}
+    rows = []
+    violations = []
+    for project_id, event_id, captain_email in Project.objects.order_by("id").values_list("id", "event_id", "captain_email"):
+        for email in [captain_email, *members.get(project_id, [])]:
+            email = (email or "").strip().lower()
+            if not email:
+                continue
+            holder = holders.get((event_id, email))
+            if holder is None:
+                holders[(event_id, email)] = project_id
+                rows.append(EventParticipant(event_id=event_id, project_id=project_id, email=email))
+            elif holder != project_id:
+                violations.append((event_id, email, holder, project_id))
+    EventParticipant.objects.bulk_create(rows, batch_size=500)
+
+    if violations:
+        logger.warning(
+            "%d duplicate registration(s) found; the oldest project keeps each participant:\n%s",
+            len(violations),
+            "\n".join(
+                f"  sub-sub event {event_id}: {email} in project {holder}, also in project {project_id}"
+                for event_id, email, holder, project_id in violations
+            ),
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0007_subsubevent_team_capacity'),
+        ('api', '0007_waitlistentry'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EventParticipant',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('email', models.EmailField(max_length=254)),
+                ('event', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='participants', to='events.subsubevent')),
+                ('project', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='participants', to='api.project')),
+            ],
+        ),
+        migrations.RunPython(backfill_event_participants, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='eventparticipant',
+            constraint=models.UniqueConstraint(fields=('event', 'email'), name='unique_participant_per_event'),
+        ),
+    ]
@@ -0,0 +1,58 @@
+# Generated by Django 4.2.23 on 2026-10-19 17:13
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def backfill_user_project_memberships(apps, schema_editor):
+    """Index every linked captain and member, and accounts matching their emails."""
+
+    Project = apps.get_model("api", "Project")
+    TeamMember = apps.get_model("api", "TeamMember")
+    User = apps.get_model("users", "User")
+    UserProjectMembership = apps.get_model("api", "UserProjectMembership")
+
+    users_by_email = {
+        (email or "").strip().lower(): user_id
+        for user_id, email in User.objects.exclude(email__isnull=True).exclude(email="").values_list("id", "email")
+    }
+    rows = {}
+    sources = [
+        Project.objects.values_list("id", "event_id", "captain_user_id", "captain_email"),
+        TeamMember.objects.values_list("project_id", "project__event_id", "user_id", "email"),
+    ]
+    for source in sources:
+        for project_id, event_id, user_id, email in source.iterator():
+            for linked in {user_id, users_by_email.get((email or "").strip().lower())} - {None}:
+                rows[(linked, project_id)] = UserProjectMembership(user_id=linked, project_id=project_id, event_id=event_id)
+    UserProjectMembership.objects.bulk_create(rows.values(), batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0007_subsubevent_team_capacity'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('api', '0008_eventparticipant'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserProjectMembership',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('event', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='events.subsubevent')),
+                ('project', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='user_index', to='api.project')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='project_index', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['user', 'event'], name='api_userpro_user_id_51b093_idx')],
+            },
+        ),
+        migrations.RunPython(backfill_user_project_memberships, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='userprojectmembership',
+            constraint=models.UniqueConstraint(fields=('user', 'project'), name='unique_user_project_membership'),
+        ),
+    ]
@@ -43,3 +43,77 @@ class TeamMember(models.Model):
 
     def __str__(self):
         return self.name
+
+
+class EventParticipant(models.Model):
+    """
+    Index of who is registered where: one row per normalized participant email
+    (captain and members) per SubSubEvent. The unique constraint is what keeps
+    a person in at most one team per event; rows are written by
+    ``sync_project_participants``.
+    """
+
+    event = models.ForeignKey(SubSubEvent, related_name='participants', on_delete=models.CASCADE)
+    project = models.ForeignKey(Project, related_name='participants', on_delete=models.CASCADE)
+    email = models.EmailField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["event", "email"], name="unique_participant_per_event"),
+        ]
+
+    def __str__(self):
+        return f"{self.email} in {self.event_id}"
+
+
+class UserProjectMembership(models.Model):
+    """
+    Index of which projects a user is in: one row per project the user is
+    linked to as captain (``captain_user``) or member (``TeamMember.user``).
+    ``event`` is copied from the project so "which events is this user
+    registered in" is a single indexed lookup. Rows are written by
+    ``sync_project_participants`` and ``sync_user_project_links_for_user``;
+    ``manage.py check_project_memberships`` finds and repairs drift.
+    """
+
+    user = models.ForeignKey(User, related_name='project_index', on_delete=models.CASCADE)
+    project = models.ForeignKey(Project, related_name='user_index', on_delete=models.CASCADE)
+    event = models.ForeignKey(SubSubEvent, related_name='+', on_delete=models.CASCADE)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["user", "project"], name="unique_user_project_membership"),
+        ]
+        indexes = [models.Index(fields=["user", "event"])]
+
+    def __str__(self):
+        return f"{self.user_id} in {self.project_id}"
+
+
+class WaitlistEntry(models.Model):
+    """
+    A registration received while its SubSubEvent was full. ``payload`` is the
+    parsed submission; ``api.waitlist`` turns the oldest waiting entries into
+    projects as places free up.
+    """
+
+    class Status(models.TextChoices):
+        WAITING = "waiting", "Waiting"
+        PROMOTED = "promoted", "Promoted"
+        REJECTED = "rejected", "Rejected"
+
+    event = models.ForeignKey(SubSubEvent, related_name='waitlist', on_delete=models.CASCADE)
+    created_by = models.ForeignKey(User, related_name='waitlist_entries', on_delete=models.SET_NULL, null=True, blank=True)
+    manual_entry = models.BooleanField(default=False)
+    captain_email = models.EmailField()
+    payload = models.JSONField()
+    status = models.CharField(max_length=10, choices=Status.choices, default=Status.WAITING)
+    project = models.ForeignKey(Project, related_name='+', on_delete=models.SET_NULL, null=True, blank=True)
+    error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [models.Index(fields=["event", "status", "id"])]
+
+    def __str__(self):
+        return f"{self.captain_email} waiting for {self.event}"
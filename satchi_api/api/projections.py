@@ -0,0 +1,142 @@
+"""
+Schema-declared project payloads built straight from ``.values()`` rows.
+
+Project listings return hundreds to thousands of rows. A ``Projection``
+declares the output keys and the columns they are read from, fetches exactly
+those columns with ``.values()``, loads every member of the listed projects
+in one grouped query and assembles plain dicts, so no model instance or DRF
+field is created per row.
+
+``PROJECT_LISTING`` reproduces ``ProjectSerializer``; the statistics and
+registration listings declare their shape in ``api.views``.
+"""
+
+from collections import defaultdict
+
+from rest_framework import serializers
+
+from .models import TeamMember
+
+_DATETIME = serializers.DateTimeField()
+
+
+def drf_datetime(value):
+    """Render a datetime exactly like a ``ModelSerializer`` ``DateTimeField``."""
+
+    return _DATETIME.to_representation(value) if value is not None else None
+
+
+class Column:
+    __slots__ = ("key", "column", "convert")
+
+    def __init__(self, key, column=None, convert=None):
+        self.key = key
+        self.column = column or key
+        self.convert = convert
+
+    @property
+    def columns(self):
+        return (self.column,)
+
+    def render(self, row, members):
+        value = row[self.column]
+        return self.convert(value) if self.convert else value
+
+
+class Group:
+    """A nested object whose fields come from the same row."""
+
+    __slots__ = ("key", "fields")
+
+    def __init__(self, key, *fields):
+        self.key = key
+        self.fields = fields
+
+    @property
+    def columns(self):
+        return tuple(column for field in self.fields for column in field.columns)
+
+    def render(self, row, members):
+        return {field.key: field.render(row, members) for field in self.fields}
+
+
+class Members:
+    """
+    The project's ``TeamMember`` rows, in id order, rendered with ``fields``.
+
+    ``select(row, members)`` may filter or replace the rendered list; the row
+    then also carries the ``columns`` it needs.
+    """
+
+    __slots__ = ("key", "fields", "select", "row_columns")
+
+    def __init__(self, key, fields, select=None, columns=()):
+        self.key = key
+        self.fields = fields
+        self.select = select
+        self.row_columns = tuple(columns)
+
+    @property
+    def columns(self):
+        return self.row_columns
+
+    @property
+    def member_columns(self):
+        return tuple(column for field in self.fields for column in field.columns)
+
+    def render(self, row, members):
+        rendered = [
+            {field.key: field.render(member, None) for field in self.fields}
+            for member in members.get(row["id"], ())
+        ]
+        return self.select(row, rendered) if self.select else rendered
+
+
+class Projection:
+    def __init__(self, *fields):
+        self.fields = fields
+        self.members = next((field for field in fields if isinstance(field, Members)), None)
+        columns = ["id"]
+        for field in fields:
+            columns.extend(column for column in field.columns if column not in columns)
+        self.columns = tuple(columns)
+
+    def _member_rows(self, projects):
+        grouped = defaultdict(list)
+        rows = (
+            TeamMember.objects.filter(project__in=projects.values("pk"))
+            .order_by("id")
+            .values("project_id", *self.members.member_columns)
+        )
+        for row in rows:
+            grouped[row["project_id"]].append(row)
+        return grouped
+
+    def render(self, projects):
+        """Payloads for every project in the (unevaluated) queryset ``projects``, in its order."""
+
+        rows = list(projects.values(*self.columns))
+        members = self._member_rows(projects) if self.members and rows else {}
+        fields = self.fields
+        return [{field.key: field.render(row, members) for field in fields} for row in rows]
+
+
+PROJECT_LISTING = Projection(
+    Column("project_id", "id"),
+    Column("team_name"),
+    Column("project_topic"),
+    Column("project_category"),
+    Column("trl_level"),
+    Column("sdgs"),
+    Column("captain_name"),
+    Column("captain_phone"),
+    Column("captain_email"),
+    Column("team_members"),
+    Members(
+        "members",
+        (Column("id"), Column("name"), Column("email"), Column("phone"), Column("user_id")),
+    ),
+    Column("faculty_mentor_name"),
+    Column("submitted_at", convert=drf_datetime),
+    Column("has_evaluation", convert=bool),
+)
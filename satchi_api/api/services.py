@@ -1,6 +1,20 @@
+from itertools import chain
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+
 from users.models import User
 
-from .models import Project, TeamMember
+from .models import EventParticipant, Project, TeamMember, UserProjectMembership
+
+
+class ParticipantConflict(Exception):
+    """Some participants of a project are already registered in another team of its event."""
+
+    def __init__(self, emails):
+        super().__init__(", ".join(emails))
+        self.emails = emails
 
 
 def normalize_email(value):
@@ -42,9 +56,141 @@ def _normalize_team_member_record(raw_member):
     return {"name": name, "email": email, "phone": phone}
 
 
-def sync_project_participants(project):
+def claim_event_participants(project, emails, created=False):
+    """
+    Make ``emails`` the project's ``EventParticipant`` rows. Missing rows are
+    added with one insert that the unique constraint on (event, email)
+    rejects if another team of the event holds any of them; that raises
+    ``ParticipantConflict`` with the exact emails. ``created`` skips looking
+    for rows of a project that was just inserted.
+    """
+
+    emails = list(dict.fromkeys(email for email in emails if email))
+    held = set()
+    if not created:
+        EventParticipant.objects.filter(project=project).exclude(email__in=emails).delete()
+        held = set(EventParticipant.objects.filter(project=project).values_list("email", flat=True))
+    rows = [EventParticipant(event_id=project.event_id, project=project, email=email) for email in emails if email not in held]
+    if not rows:
+        return
+    try:
+        with transaction.atomic():
+            EventParticipant.objects.bulk_create(rows)
+    except IntegrityError:
+        conflicts = (
+            EventParticipant.objects.filter(event_id=project.event_id, email__in=[row.email for row in rows])
+            .exclude(project=project)
+            .order_by("email")
+            .values_list("email", flat=True)
+        )
+        raise ParticipantConflict(list(conflicts))
+
+
+def resolve_participant_users(emails):
+    """
+    ``{normalized email: User}`` for the given emails in one query, matching
+    case-insensitively like ``email__iexact``. Emails without an account are
+    left out.
+    """
+
+    emails = sorted({normalize_email(email) for email in emails} - {""})
+    if not emails:
+        return {}
+    query = Q()
+    for email in emails:
+        query |= Q(email__iexact=email)
+    return {normalize_email(user.email): user for user in User.objects.filter(query)}
+
+
+def female_participants_error(event, emails, users):
+    """
+    Why ``emails`` do not meet ``event.minFemaleParticipants``, or None.
+    Participants without an account (or without ``sex`` on it) are handled
+    by ``FEMALE_PARTICIPANTS_UNREGISTERED_POLICY``: "ignore" does not count
+    them, "count" counts them towards the minimum, "reject" asks for them to
+    sign up first.
+    """
+
+    required = event.minFemaleParticipants or 0
+    if not required:
+        return None
+
+    female, unknown = 0, []
+    for email in emails:
+        user = users.get(normalize_email(email))
+        sex = (user.sex or "").strip().lower() if user is not None else ""
+        if sex == "female":
+            female += 1
+        elif not sex:
+            unknown.append(email)
+
+    policy = settings.FEMALE_PARTICIPANTS_UNREGISTERED_POLICY
+    if policy == "count":
+        female += len(unknown)
+    if female >= required:
+        return None
+    if policy == "reject" and unknown:
+        return (
+            f"This event requires at least {required} female participant(s). "
+            f"These participants need an account with their sex set: {', '.join(unknown)}."
+        )
+    return f"This event requires at least {required} female participant(s); the team has {female}."
+
+
+def index_project_memberships(project, user_ids, created=False):
+    """
+    Make ``user_ids`` the project's ``UserProjectMembership`` rows. ``created``
+    skips removing rows of a project that was just inserted.
+    """
+
+    user_ids = set(user_ids) - {None}
+    if not created:
+        UserProjectMembership.objects.filter(project=project).exclude(user_id__in=user_ids).delete()
+    if user_ids:
+        UserProjectMembership.objects.bulk_create(
+            [UserProjectMembership(user_id=user_id, project=project, event_id=project.event_id) for user_id in user_ids],
+            ignore_conflicts=True,
+        )
+
+
+def expected_project_memberships():
+    """
+    ``{(user_id, project_id, event_id)}`` the membership index should hold:
+    every linked captain and member, plus every account whose email matches a
+    captain or member email that was not linked yet.
+    """
+
+    users_by_email = {
+        normalize_email(email): user_id
+        for user_id, email in User.objects.exclude(email__isnull=True).exclude(email="").values_list("id", "email")
+    }
+    expected = set()
+    projects = Project.objects.values_list("id", "event_id", "captain_user_id", "captain_email")
+    members = TeamMember.objects.values_list("project_id", "project__event_id", "user_id", "email")
+    for project_id, event_id, user_id, email in chain(projects.iterator(), members.iterator()):
+        for linked in {user_id, users_by_email.get(normalize_email(email))} - {None}:
+            expected.add((linked, project_id, event_id))
+    return expected
+
+
+def sync_project_participants(project, created=False, users=None):
+    """
+    Claim the project's participants for its event, link the captain and
+    rebuild its TeamMember and UserProjectMembership rows from
+    ``team_members``. Raises ``ParticipantConflict`` when a participant is
+    already in another team of the event; callers roll their transaction
+    back. Pass ``users`` from ``resolve_participant_users`` when the caller
+    already has it.
+    """
+
+    members = [member for member in map(_normalize_team_member_record, project.team_members or []) if member]
+    emails = [normalize_email(project.captain_email)] + [member["email"] for member in members]
+    claim_event_participants(project, emails, created=created)
+    if users is None:
+        users = resolve_participant_users(emails)
+
     captain_email = normalize_email(project.captain_email)
-    captain_user = User.objects.filter(email__iexact=captain_email).first() if captain_email else None
+    captain_user = users.get(captain_email) if captain_email else None
     captain_user_id = captain_user.id if captain_user else None
 
     if project.captain_user_id != captain_user_id:
@@ -54,11 +200,8 @@ def sync_project_participants(project):
     TeamMember.objects.filter(project=project).delete()
 
     members_to_create = []
-    for raw_member in project.team_members or []:
-        member = _normalize_team_member_record(raw_member)
-        if not member:
-            continue
-        linked_user = User.objects.filter(email__iexact=member["email"]).first()
+    for member in members:
+        linked_user = users.get(member["email"])
         members_to_create.append(
             TeamMember(
                 name=display_member_name(member["name"], member["email"]),
@@ -71,6 +214,9 @@ def sync_project_participants(project):
 
     if members_to_create:
         TeamMember.objects.bulk_create(members_to_create)
+    index_project_memberships(
+        project, [captain_user_id] + [member.user_id for member in members_to_create], created=created
+    )
 
 
 def sync_user_project_links_for_user(user):
@@ -87,8 +233,19 @@ def sync_user_project_links_for_user(user):
     if linked_user is None:
         return
 
-    for project in Project.objects.filter(captain_email__iexact=email).exclude(captain_user=linked_user):
-        project.captain_user = linked_user
-        project.save(update_fields=["captain_user"])
+    linked = Project.objects.filter(captain_email__iexact=email).exclude(captain_user=linked_user).update(
+        captain_user=linked_user
+    )
+
+    linked += TeamMember.objects.filter(email__iexact=email).exclude(user=linked_user).update(user=linked_user)
 
-    TeamMember.objects.filter(email__iexact=email).exclude(user=linked_user).update(user=linked_user)
+    if linked:
+        projects = (
+            Project.objects.filter(Q(captain_user=linked_user) | Q(members__user=linked_user))
+            .values_list("id", "event_id")
+            .distinct()
+        )
+        UserProjectMembership.objects.bulk_create(
+            [UserProjectMembership(user=linked_user, project_id=project_id, event_id=event_id) for project_id, event_id in projects],
+            ignore_conflicts=True,
+        )
@@ -1,3 +1,532 @@
-from django.test import TestCase
+import importlib
+import io
+import json
+import tempfile
+from unittest import mock
 
-# Create your tests here.
+from asgiref.sync import async_to_sync
+from django.apps import apps as django_apps
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.db.models import Exists, OuterRef
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from backend import live
+from events.models import MainEvent, SubEvent, SubSubEvent
+from users.models import EventUserMapping, User
+
+from eval.models import Evaluation
+
+from .models import EventParticipant, Project, TeamMember, UserProjectMembership, WaitlistEntry
+from .projections import PROJECT_LISTING
+from .serializers import ProjectSerializer
+from .services import sync_user_project_links_for_user
+from .views import STATISTICS_PROJECT, _statistics_projects
+from .waitlist import take_team_slot
+
+
+class RegistrationMixin:
+    """A "Hackathon" sub-sub-event (``event_fields`` overrides its limits) and helpers to register teams for it."""
+
+    event_fields = {}
+
+    def setUp(self):
+        main_event = MainEvent.objects.create(name="Main Event")
+        sub_event = SubEvent.objects.create(parent_event=main_event, name="Sub Event")
+        self.event = SubSubEvent.objects.create(
+            parent_event=main_event, parent_subevent=sub_event, name="Hackathon",
+            **{"minTeamSize": 1, "maxTeamSize": 4, **self.event_fields},
+        )
+
+    def _user(self, name, **fields):
+        fields.setdefault("email", f"{name}@example.com")
+        return User.objects.create_user(username=name, password="pw", **fields)
+
+    def _client(self, user):
+        client = APIClient()
+        client.force_authenticate(user=user)
+        return client
+
+    def _payload(self, captain, members=(), **fields):
+        return {
+            "team_name": f"Team {captain}",
+            "project_topic": "Solar drones",
+            "project_category": "Software",
+            "trl_level": 3,
+            "sdgs": [7],
+            "captain_name": captain,
+            "captain_email": f"{captain}@example.com",
+            "captain_phone": "9000000000",
+            "team_members": [{"name": name, "email": f"{name}@example.com", "phone": "1"} for name in members],
+            **fields,
+        }
+
+    def _submit(self, captain, members=(), client=None, **extra):
+        return (client or self.client).post(
+            f"/api/submit-project/{self.event.event_id}/",
+            self._payload(captain, members),
+            format="json",
+            secure=True,
+            **extra,
+        )
+
+
+@override_settings(
+    LIVE_FEED_ENABLED=True,
+    LIVE_FEED_BROKER="spool",
+    LIVE_FEED_POLL_INTERVAL=0.01,
+    LIVE_FEED_MAX_DURATION=0.2,
+)
+class LiveEventFeedTests(RegistrationMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.spool_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.spool_dir.cleanup)
+        override = override_settings(LIVE_FEED_DIR=self.spool_dir.name)
+        override.enable()
+        self.addCleanup(override.disable)
+
+        self.manager = self._user("manager", role=User.Role.SUBSUBEVENTMANAGER)
+        EventUserMapping.objects.create(
+            user=self.manager, sub_sub_event=self.event, user_role=User.Role.SUBSUBEVENTMANAGER
+        )
+        self.token = Token.objects.create(user=self.manager)
+        self.url = f"/api/events/{self.event.pk}/live/"
+
+    def _register_team(self):
+        captain = self._user("captain", full_name="Captain")
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self._submit("captain", client=self._client(captain))
+        self.assertEqual(response.status_code, 201)
+        return Project.objects.get(team_name="Team captain").id
+
+    async def _read_stream(self, url, headers=None):
+        response = await self.async_client.get(url, secure=True, headers=headers)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "text/event-stream")
+        return "".join([chunk.decode() async for chunk in response.streaming_content])
+
+    def _stream_url(self):
+        response = self._client(self.manager).post(f"{self.url}token/", secure=True)
+        self.assertEqual(response.status_code, 200)
+        return response.json()["url"]
+
+    def test_registration_is_published_and_streamed_from_last_event_id(self):
+        project_id = self._register_team()
+
+        body = self._sync_read(self._stream_url(), headers={"Last-Event-ID": "0"})
+        self.assertIn("event: registration", body)
+        self.assertIn(f'"project_id": {project_id}', body)
+        self.assertIn('"team_size": 1', body)
+
+        # without Last-Event-ID the stream starts at the end of the channel
+        self.assertNotIn("event: registration", self._sync_read(self._stream_url()))
+
+    def test_feed_requires_event_manager_token(self):
+        outsider = User.objects.create_user(username="outsider@example.com", email="outsider@example.com", password="pw")
+        outsider_token = Token.objects.create(user=outsider)
+
+        self.assertEqual(self.client.get(self.url, secure=True).status_code, 401)
+        self.assertEqual(
+            self.client.get(self.url, secure=True, HTTP_AUTHORIZATION=f"Token {outsider_token.key}").status_code, 403
+        )
+        self.assertEqual(
+            self.client.get("/api/events/999999/live/", secure=True, HTTP_AUTHORIZATION=f"Token {self.token.key}").status_code,
+            404,
+        )
+
+    def test_stream_tokens_replace_account_tokens_in_the_url(self):
+        self.assertEqual(self.client.get(f"{self.url}?token={self.token.key}", secure=True).status_code, 401)
+
+        outsider = self._client(self._user("stranger"))
+        self.assertEqual(outsider.post(f"{self.url}token/", secure=True).status_code, 403)
+
+        stream_token = live.issue_stream_token(self.manager, self.event.pk)
+        self.assertEqual(
+            self.client.get(f"/api/events/{self.event.pk + 1}/live/?stream_token={stream_token}", secure=True).status_code,
+            401,
+        )
+        with override_settings(LIVE_FEED_TOKEN_MAX_AGE=-1):
+            self.assertEqual(self.client.get(f"{self.url}?stream_token={stream_token}", secure=True).status_code, 401)
+
+    def _sync_read(self, url, headers=None):
+        return async_to_sync(self._read_stream)(url, headers)
+
+
+@override_settings(
+    REGISTRATION_QUEUE_ENABLED=True,
+    REGISTRATION_QUEUE_BACKEND="file",
+    REGISTRATION_QUEUE_RATE=0.5,
+    REGISTRATION_QUEUE_BURST=1,
+)
+class RegistrationQueueTests(RegistrationMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        queue_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(queue_dir.cleanup)
+        override = override_settings(REGISTRATION_QUEUE_DIR=queue_dir.name)
+        override.enable()
+        self.addCleanup(override.disable)
+        self.now = 1_000_000.0
+        clock = mock.patch("api.waiting_room.time.time", side_effect=lambda: self.now)
+        clock.start()
+        self.addCleanup(clock.stop)
+
+    def _queue(self, name, ticket=None):
+        user = User.objects.filter(username=name).first() or self._user(name, full_name=name)
+        headers = {"HTTP_X_REGISTRATION_TICKET": ticket} if ticket else {}
+        return self._submit(name, client=self._client(user), **headers)
+
+    def _status(self, ticket):
+        return self.client.get(f"/api/registration-queue/{self.event.event_id}/", {"ticket": ticket}, secure=True)
+
+    def test_surplus_requests_wait_in_line_until_admitted(self):
+        self.assertEqual(self._queue("first").status_code, 201)
+
+        queued = self._queue("second")
+        self.assertEqual(queued.status_code, 429)
+        self.assertEqual(queued["Retry-After"], "2")
+        ticket = queued.json()["queue"]["ticket"]
+        self.assertEqual(queued.json()["queue"]["position"], 1)
+        self.assertEqual(self._queue("third").json()["queue"]["position"], 2)
+        self.assertFalse(Project.objects.filter(team_name="Team second").exists())
+
+        with self.assertNumQueries(0):
+            self.assertEqual(self._status(ticket).json()["position"], 1)
+        self.assertEqual(self._queue("second", ticket=ticket).status_code, 429)
+
+        self.now += 2
+        self.assertTrue(self._status(ticket).json()["admitted"])
+        self.assertEqual(self._queue("second", ticket=ticket).status_code, 201)
+        # "third" holds the next place, so a newcomer without a ticket queues behind it
+        self.assertEqual(self._queue("fourth").json()["queue"]["position"], 2)
+
+    def test_tickets_are_bound_to_event_and_user(self):
+        self._queue("first")
+        ticket = self._queue("second").json()["queue"]["ticket"]
+        self.now += 10
+
+        self.assertEqual(self._status("forged").status_code, 404)
+        self.assertEqual(self._queue("intruder", ticket=ticket).status_code, 429)
+        self.assertEqual(self._queue("second", ticket=ticket).status_code, 201)
+
+    def test_admitted_ticket_is_consumed(self):
+        self._queue("first")
+        ticket = self._queue("second").json()["queue"]["ticket"]
+        self.now += 10
+        self.assertEqual(self._queue("second", ticket=ticket).status_code, 201)
+        Project.objects.filter(team_name="Team second").delete()
+
+        reused = self._queue("second", ticket=ticket)
+        self.assertEqual(reused.status_code, 429)
+        self.assertIn("already been used", reused.json()["error"])
+        self.assertFalse(Project.objects.filter(team_name="Team second").exists())
+
+
+class WaitlistTests(RegistrationMixin, TestCase):
+    event_fields = {"maxTeams": 1}
+
+    def setUp(self):
+        super().setUp()
+        self.manager = self._user("manager", role=User.Role.SUPERADMIN)
+
+    def _register(self, name):
+        return self._submit(name, client=self._client(self._user(name)))
+
+    def test_full_event_waitlists_and_promotes_after_a_delete(self):
+        self.assertEqual(self._register("first").status_code, 201)
+        queued = self._register("second")
+        self.assertEqual(queued.status_code, 202)
+        self.assertEqual(queued.json()["waitlist"]["position"], 1)
+        self.assertEqual(self._register("third").json()["waitlist"]["position"], 2)
+        self.assertEqual(Project.objects.filter(event=self.event).count(), 1)
+
+        first = Project.objects.get(team_name="Team first")
+        client = self._client(self.manager)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = client.delete(f"/api/event-registrations/{self.event.pk}/{first.pk}/", secure=True)
+        self.assertEqual(response.status_code, 200)
+
+        self.assertEqual(list(Project.objects.filter(event=self.event).values_list("team_name", flat=True)), ["Team second"])
+        self.event.refresh_from_db()
+        self.assertEqual(self.event.registeredTeams, 1)
+        self.assertEqual(
+            list(WaitlistEntry.objects.order_by("id").values_list("status", flat=True)),
+            [WaitlistEntry.Status.PROMOTED, WaitlistEntry.Status.WAITING],
+        )
+
+    def test_raising_max_teams_promotes_waiting_teams(self):
+        self._register("first")
+        self._register("second")
+        self.assertEqual(self._register("second-again").status_code, 202)
+
+        client = self._client(self.manager)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = client.patch(f"/events/update_event/subsub/{self.event.pk}/", {"maxTeams": 5}, format="json", secure=True)
+        self.assertEqual(response.json()["maxTeams"], 5)
+        self.assertEqual(Project.objects.filter(event=self.event).count(), 3)
+        self.assertFalse(WaitlistEntry.objects.filter(status=WaitlistEntry.Status.WAITING).exists())
+
+    def test_uncapped_events_skip_the_counter_until_a_cap_is_set(self):
+        SubSubEvent.objects.filter(pk=self.event.pk).update(maxTeams=None)
+        self.assertEqual(self._register("first").status_code, 201)
+        self.assertEqual(self._register("second").status_code, 201)
+        self.assertEqual(SubSubEvent.objects.get(pk=self.event.pk).registeredTeams, 0)
+
+        client = self._client(self.manager)
+        with self.captureOnCommitCallbacks(execute=True):
+            client.patch(f"/events/update_event/subsub/{self.event.pk}/", {"maxTeams": 2}, format="json", secure=True)
+        self.assertEqual(SubSubEvent.objects.get(pk=self.event.pk).registeredTeams, 2)
+        self.assertEqual(self._register("third").status_code, 202)
+
+    def test_slots_are_never_oversubscribed(self):
+        SubSubEvent.objects.filter(pk=self.event.pk).update(maxTeams=3)
+        taken = [take_team_slot(self.event) for _ in range(10)]
+        self.assertEqual(taken.count(True), 3)
+        self.assertEqual(SubSubEvent.objects.get(pk=self.event.pk).registeredTeams, 3)
+
+
+class EventParticipantTests(RegistrationMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.client = self._client(self._user("manager", role=User.Role.SUPERADMIN))
+
+    def test_conflicting_submission_reports_every_taken_email(self):
+        self.assertEqual(self._submit("alpha", ["beta", "gamma"]).status_code, 201)
+        self.assertEqual(
+            sorted(EventParticipant.objects.values_list("email", flat=True)),
+            ["alpha@example.com", "beta@example.com", "gamma@example.com"],
+        )
+
+        response = self._submit("delta", ["gamma", "beta"])
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()["conflicts"], ["beta@example.com", "gamma@example.com"])
+        self.assertFalse(Project.objects.filter(team_name="Team delta").exists())
+        self.assertEqual(EventParticipant.objects.count(), 3)
+
+    def test_team_update_moves_participant_rows_and_rolls_back_on_conflict(self):
+        self._submit("alpha", ["beta"])
+        self._submit("delta")
+        project = Project.objects.get(team_name="Team alpha")
+        url = f"/api/event-registrations/{self.event.pk}/{project.pk}/"
+
+        response = self.client.patch(url, self._payload("alpha", ["epsilon"]), format="json", secure=True)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            sorted(EventParticipant.objects.filter(project=project).values_list("email", flat=True)),
+            ["alpha@example.com", "epsilon@example.com"],
+        )
+
+        response = self.client.patch(url, self._payload("alpha", ["delta"]), format="json", secure=True)
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()["conflicts"], ["delta@example.com"])
+        project.refresh_from_db()
+        self.assertEqual(project.team_members[0]["email"], "epsilon@example.com")
+
+    def test_backfill_keeps_the_oldest_registration_and_reports_duplicates(self):
+        migration = importlib.import_module("api.migrations.0008_eventparticipant")
+        for captain in ("alpha", "beta"):
+            Project.objects.create(
+                event=self.event, team_name=captain, project_topic="Topic", captain_name=captain,
+                captain_email=f"{captain}@example.com", captain_phone="1",
+            )
+        TeamMember.objects.create(project=Project.objects.get(team_name="beta"), name="A", email="Alpha@example.com", phone="1")
+
+        with self.assertLogs("api.migrations", "WARNING") as logs:
+            migration.backfill_event_participants(django_apps, None)
+
+        self.assertEqual(
+            dict(EventParticipant.objects.values_list("email", "project__team_name")),
+            {"alpha@example.com": "alpha", "beta@example.com": "beta"},
+        )
+        self.assertIn("alpha@example.com in project", logs.output[0])
+
+
+class FemaleParticipantsTests(RegistrationMixin, TestCase):
+    event_fields = {"maxTeamSize": 6, "minFemaleParticipants": 1}
+
+    def setUp(self):
+        super().setUp()
+        for name, sex in (("ada", "female"), ("grace", "female"), ("alan", "male"), ("blank", None)):
+            # signup keeps the email as typed, so lookups must ignore case
+            self._user(name, email=f"{name.title()}@Example.com", sex=sex)
+        self.client = self._client(self._user("manager", role=User.Role.SUPERADMIN))
+
+    def test_team_without_enough_female_participants_is_rejected(self):
+        response = self._submit("alan", ["blank"])
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("at least 1 female participant", response.json()["error"])
+
+        response = self._submit("alan", ["ada"])
+        self.assertEqual(response.status_code, 201)
+        project = Project.objects.get(team_name="Team alan")
+        self.assertEqual(project.captain_user.username, "alan")
+        self.assertEqual(project.members.get().user.username, "ada")
+
+    def test_unregistered_policy(self):
+        with override_settings(FEMALE_PARTICIPANTS_UNREGISTERED_POLICY="ignore"):
+            self.assertEqual(self._submit("alan", ["stranger"]).status_code, 400)
+        with override_settings(FEMALE_PARTICIPANTS_UNREGISTERED_POLICY="reject"):
+            response = self._submit("alan", ["stranger", "blank"])
+            self.assertEqual(response.status_code, 400)
+            self.assertIn("stranger@example.com, blank@example.com", response.json()["error"])
+        with override_settings(FEMALE_PARTICIPANTS_UNREGISTERED_POLICY="count"):
+            self.assertEqual(self._submit("alan", ["stranger"]).status_code, 201)
+
+    def test_admin_edit_is_checked(self):
+        self._submit("alan", ["ada"])
+        project = Project.objects.get(team_name="Team alan")
+        url = f"/api/event-registrations/{self.event.pk}/{project.pk}/"
+
+        response = self.client.patch(url, self._payload("alan", ["blank"]), format="json", secure=True)
+        self.assertEqual(response.status_code, 400)
+        response = self.client.patch(url, self._payload("alan", ["grace"]), format="json", secure=True)
+        self.assertEqual(response.status_code, 200)
+
+    def test_query_count_does_not_grow_with_team_size(self):
+        query_counts = []
+        for captain, members in (("alan", ["ada"]), ("grace", ["ada2", "blank", "x1", "x2", "x3"])):
+            with CaptureQueriesContext(connection) as queries:
+                self.assertEqual(self._submit(captain, members).status_code, 201)
+            query_counts.append(len(queries))
+        self.assertEqual(query_counts[0], query_counts[1])
+
+
+class UserProjectMembershipTests(RegistrationMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.captain = self._user("captain", email="Captain@example.com")
+        self.client = self._client(self.captain)
+
+    def _memberships(self):
+        return set(UserProjectMembership.objects.values_list("user__username", "project__team_name", "event_id"))
+
+    def test_index_follows_registrations_and_signups(self):
+        self.assertEqual(self._submit("captain", ["member"]).status_code, 201)
+        self.assertEqual(self._memberships(), {("captain", "Team captain", self.event.pk)})
+
+        member = self._user("member", email="MEMBER@example.com")
+        sync_user_project_links_for_user(member)
+        self.assertEqual(
+            self._memberships(), {("captain", "Team captain", self.event.pk), ("member", "Team captain", self.event.pk)}
+        )
+
+        registrations = self._client(member).get("/api/my-registrations/", secure=True).json()["registrations"]
+        self.assertEqual([registration["teamName"] for registration in registrations], ["Team captain"])
+
+        project = Project.objects.get()
+        manager = self._client(self._user("manager", role=User.Role.SUPERADMIN))
+        response = manager.patch(
+            f"/api/event-registrations/{self.event.pk}/{project.pk}/",
+            self._payload("captain"),
+            format="json",
+            secure=True,
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self._memberships(), {("captain", "Team captain", self.event.pk)})
+
+    def test_checker_reports_and_fixes_drift(self):
+        self._submit("captain", ["member"])
+        member = self._user("member")
+        UserProjectMembership.objects.all().delete()
+        UserProjectMembership.objects.create(user=member, project=Project.objects.create(
+            event=self.event, team_name="Other", project_topic="Topic", captain_name="Other",
+            captain_email="other@example.com", captain_phone="1",
+        ), event=self.event)
+
+        with self.assertRaisesMessage(CommandError, "2 missing and 1 stale"):
+            call_command("check_project_memberships", stdout=io.StringIO())
+
+        call_command("check_project_memberships", "--fix", stdout=io.StringIO())
+        self.assertEqual(
+            self._memberships(), {("captain", "Team captain", self.event.pk), ("member", "Team captain", self.event.pk)}
+        )
+        output = io.StringIO()
+        call_command("check_project_memberships", stdout=output)
+        self.assertIn("consistent (2 rows)", output.getvalue())
+
+    def test_backfill_indexes_links_and_matching_emails(self):
+        migration = importlib.import_module("api.migrations.0009_userprojectmembership")
+        member = self._user("member", email="Member@example.com")
+        project = Project.objects.create(
+            event=self.event, team_name="Rockets", project_topic="Topic", captain_user=self.captain,
+            captain_name="Captain", captain_email="captain@example.com", captain_phone="1",
+        )
+        TeamMember.objects.create(project=project, name="Member", email="member@example.com", phone="1")
+
+        migration.backfill_user_project_memberships(django_apps, None)
+
+        self.assertEqual(
+            self._memberships(), {("captain", "Rockets", self.event.pk), ("member", "Rockets", self.event.pk)}
+        )
+        self.assertEqual(member.project_index.get().project, project)
+
+
+class ProjectProjectionTests(TestCase):
+    def setUp(self):
+        main_event = MainEvent.objects.create(name="Main Event")
+        sub_event = SubEvent.objects.create(parent_event=main_event, name="Sub Event")
+        self.event = SubSubEvent.objects.create(
+            parent_event=main_event, parent_subevent=sub_event, name="Hackathon", minTeamSize=1, maxTeamSize=4
+        )
+        captain = User.objects.create_user(username="cap@example.com", email="cap@example.com", password="pw")
+        self.rockets = Project.objects.create(
+            event=self.event,
+            team_name="Rockets",
+            project_topic="Solar drones",
+            project_category="SOFTWARE",
+            trl_level=3,
+            sdgs=[7, 13],
+            captain_user=captain,
+            captain_name="Captain",
+            captain_email="Cap@example.com",
+            captain_phone="9000000000",
+            team_members=[{"name": "Old", "email": "old@example.com", "phone": "1"}],
+        )
+        TeamMember.objects.create(project=self.rockets, name="Captain", email="cap@example.com", phone="9000000000")
+        TeamMember.objects.create(project=self.rockets, name="Ann", email="ann@example.com", phone="1", user=captain)
+        TeamMember.objects.create(project=self.rockets, name="Ann again", email="ANN@example.com", phone="2")
+        self.legacy = Project.objects.create(
+            event=self.event,
+            team_name="Legacy",
+            project_topic="Paper forms",
+            captain_name="Lee",
+            captain_email="lee@example.com",
+            captain_phone="9000000001",
+            team_members=["bo.smith@example.com", {"name": "Cy", "email": "CY@example.com", "phone": " 3 "}],
+        )
+        Evaluation.objects.create(project=self.rockets, subsubevent=self.event, final_score="8.50")
+
+    def test_listing_matches_project_serializer(self):
+        projects = (
+            Project.objects.filter(event=self.event)
+            .annotate(has_evaluation=Exists(Evaluation.objects.filter(project=OuterRef("pk"))))
+            .order_by("id")
+        )
+        expected = ProjectSerializer(projects.prefetch_related("members"), many=True).data
+        self.assertEqual(PROJECT_LISTING.render(projects), json.loads(json.dumps(expected)))
+
+    def test_statistics_payload(self):
+        rockets, legacy = _statistics_projects(Project.objects.filter(event=self.event).order_by("-team_name"), self.event)
+
+        self.assertEqual(list(rockets), [field.key for field in STATISTICS_PROJECT.fields])
+        self.assertEqual(rockets["captain"], {"name": "Captain", "email": "Cap@example.com", "phone": "9000000000"})
+        self.assertEqual(
+            rockets["teamMembers"],
+            [{"id": rockets["teamMembers"][0]["id"], "name": "Ann", "email": "ann@example.com", "phone": "1",
+              "userId": self.rockets.captain_user_id}],
+        )
+        self.assertEqual((rockets["isEvaluated"], rockets["finalScore"]), (True, 8.5))
+        self.assertEqual(rockets["registeredAt"], self.rockets.submitted_at.isoformat())
+
+        self.assertEqual(
+            legacy["teamMembers"],
+            [
+                {"name": "Bo Smith", "email": "bo.smith@example.com", "phone": "", "userId": None},
+                {"name": "Cy", "email": "cy@example.com", "phone": "3", "userId": None},
+            ],
+        )
+        self.assertEqual((legacy["sdgs"], legacy["isEvaluated"], legacy["finalScore"]), ([], False, None))
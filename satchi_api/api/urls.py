@@ -1,15 +1,20 @@
 from django.urls import path
 
-from backend.views import health_check
+from backend.async_views import read_view
+from backend.views import health_check, metrics
 
 from . import views
 
 urlpatterns = [
     path('health/', health_check),
+    path('metrics/', metrics),
     path('submit-project/<str:event_id>/', views.submit_project),
+    path('registration-queue/<str:event_id>/', views.registration_queue_status),
     path('event-registrations/<int:event_pk>/', views.event_registrations),
     path('event-registrations/<int:event_pk>/<int:project_id>/', views.manage_event_registration),
-    path('my-registrations/', views.user_registrations),
+    path('events/<int:event_pk>/live/', views.live_event_feed),
+    path('events/<int:event_pk>/live/token/', views.live_feed_token),
+    path('my-registrations/', read_view(views.user_registrations, views.user_registrations_async)),
     path('statistics/<str:event_id>/', views.get_event_statistics),
-    path('public-stats/', views.get_public_stats),
+    path('public-stats/', read_view(views.get_public_stats, views.get_public_stats_async)),
 ]
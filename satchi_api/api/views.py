@@ -1,20 +1,36 @@
 from collections import Counter
 
+from asgiref.sync import sync_to_async
+from django.conf import settings
 from django.db import transaction
-from django.db.models import Avg, Max, Q
+from django.db.models import Avg, Exists, Max, OuterRef, Q, Subquery
+from django.http import JsonResponse, StreamingHttpResponse
 from django.shortcuts import get_object_or_404
 from rest_framework import status
-from rest_framework.decorators import api_view, permission_classes
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.authtoken.models import Token
+from rest_framework.decorators import api_view, authentication_classes, permission_classes
+from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 
+from backend import live
+from backend.async_views import async_read_view, json_response
+from backend.db_router import reporting_read
+from backend.request_log import log_submission, submission_event
 from eval.models import Evaluation
-from events.models import SubEvent, SubSubEvent
+from events.models import ArchivedRegistration, SubEvent, SubSubEvent
 from users.models import EventUserMapping, User
 
-from .models import Project, TeamMember
+from .models import EventParticipant, Project, WaitlistEntry
+from .projections import Column, Group, Members, Projection
 from .serializers import ProjectSerializer
-from .services import sync_project_participants
+from .services import (
+    ParticipantConflict,
+    female_participants_error,
+    resolve_participant_users,
+    sync_project_participants,
+)
+from .waiting_room import admission_required, queue_status
+from .waitlist import EventFull, has_waiting_teams, release_team_slot, take_team_slot, waitlist_position
 
 MANAGE_ROLES = {
     User.Role.SUPERADMIN,
@@ -182,31 +198,41 @@ def _legacy_member_payload(raw_member):
     }
 
 
-def _project_member_payload(project):
-    members = []
-    captain_email = _normalize_email(project.captain_email)
+def _distinct_team_members(captain_email, members, legacy_members):
+    """Members other than the captain, deduplicated by email; the legacy JSON snapshot if there are none."""
+
+    distinct = []
+    captain_email = _normalize_email(captain_email)
     seen_emails = set()
 
-    for member in project.members.all():
-        member_email = _normalize_email(member.email)
+    for member in members:
+        member_email = _normalize_email(member["email"])
         if member_email == captain_email or member_email in seen_emails:
             continue
         seen_emails.add(member_email)
-        members.append(_member_payload(member))
+        distinct.append(member)
 
-    if members:
-        return members
+    if distinct:
+        return distinct
 
-    if isinstance(project.team_members, list):
-        for raw_member in project.team_members:
+    if isinstance(legacy_members, list):
+        for raw_member in legacy_members:
             payload = _legacy_member_payload(raw_member)
             member_email = _normalize_email(payload.get("email"))
             if not member_email or member_email == captain_email or member_email in seen_emails:
                 continue
             seen_emails.add(member_email)
-            members.append(payload)
+            distinct.append(payload)
+
+    return distinct
 
-    return members
+
+def _project_member_payload(project):
+    return _distinct_team_members(
+        project.captain_email,
+        (_member_payload(member) for member in project.members.all()),
+        project.team_members,
+    )
 
 
 def _serialize_registration(project, viewer):
@@ -253,26 +279,42 @@ def _serialize_registration(project, viewer):
     }
 
 
-def _statistics_project_payload(project, evaluation_map):
-    evaluation = evaluation_map.get(project.id)
-    return {
-        "projectId": project.id,
-        "teamName": project.team_name,
-        "projectTopic": project.project_topic,
-        "projectCategory": project.project_category,
-        "trlLevel": project.trl_level,
-        "sdgs": project.sdgs or [],
-        "facultyMentorName": project.faculty_mentor_name,
-        "captain": {
-            "name": project.captain_name,
-            "email": project.captain_email,
-            "phone": project.captain_phone,
-        },
-        "teamMembers": _project_member_payload(project),
-        "registeredAt": project.submitted_at.isoformat() if project.submitted_at else None,
-        "isEvaluated": bool(evaluation),
-        "finalScore": float(evaluation.final_score) if evaluation and evaluation.final_score is not None else None,
-    }
+STATISTICS_PROJECT = Projection(
+    Column("projectId", "id"),
+    Column("teamName", "team_name"),
+    Column("projectTopic", "project_topic"),
+    Column("projectCategory", "project_category"),
+    Column("trlLevel", "trl_level"),
+    Column("sdgs", "sdgs", lambda sdgs: sdgs or []),
+    Column("facultyMentorName", "faculty_mentor_name"),
+    Group(
+        "captain",
+        Column("name", "captain_name"),
+        Column("email", "captain_email"),
+        Column("phone", "captain_phone"),
+    ),
+    Members(
+        "teamMembers",
+        (Column("id"), Column("name"), Column("email"), Column("phone"), Column("userId", "user_id")),
+        select=lambda row, members: _distinct_team_members(row["captain_email"], members, row["team_members"]),
+        columns=("captain_email", "team_members"),
+    ),
+    Column("registeredAt", "submitted_at", lambda value: value.isoformat() if value else None),
+    Column("isEvaluated", "is_evaluated"),
+    Column("finalScore", "final_score", lambda score: float(score) if score is not None else None),
+)
+
+
+def _statistics_projects(projects, event):
+    """``STATISTICS_PROJECT`` payloads for ``projects``, with their evaluation in ``event``."""
+
+    evaluation = Evaluation.objects.filter(project=OuterRef("pk"), subsubevent=event)
+    return STATISTICS_PROJECT.render(
+        projects.annotate(
+            is_evaluated=Exists(evaluation),
+            final_score=Subquery(evaluation.values("final_score")[:1]),
+        )
+    )
 
 
 def _serialize_event_summary(event):
@@ -286,6 +328,8 @@ def _serialize_event_summary(event):
         "maxTeamSize": event.maxTeamSize,
         "minFemaleParticipants": event.minFemaleParticipants,
         "isFacultyMentorRequired": event.isFacultyMentorRequired,
+        "maxTeams": event.maxTeams,
+        "registeredTeams": event.registeredTeams if event.maxTeams is not None else None,
     }
 
 
@@ -313,7 +357,13 @@ def _parse_project_submission_data(data):
     return payload
 
 
-def _validate_project_submission_constraints(event, payload, requester, is_manual_entry=False, current_project=None):
+def _payload_participant_emails(payload):
+    return [payload["captain_email"]] + [_normalize_email(member['email']) for member in payload["team_members"]]
+
+
+def _validate_project_submission_constraints(
+    event, payload, requester, is_manual_entry=False, current_project=None, waitlist_entry=None, users=None
+):
     requester_email = _normalize_email(getattr(requester, "email", None))
     if not is_manual_entry and payload["captain_email"] != requester_email:
         return Response(
@@ -336,25 +386,41 @@ def _validate_project_submission_constraints(event, payload, requester, is_manua
     if event.isFacultyMentorRequired and not payload["faculty_mentor_name"]:
         return Response({"error": "Faculty mentor name is required."}, status=status.HTTP_400_BAD_REQUEST)
 
-    participant_emails = [payload["captain_email"]] + [_normalize_email(member['email']) for member in payload["team_members"]]
+    participant_emails = _payload_participant_emails(payload)
     if len(participant_emails) != len(set(participant_emails)):
         return Response({"error": "Duplicate email addresses found in the team."}, status=status.HTTP_400_BAD_REQUEST)
 
-    for email in participant_emails:
-        team_member_conflicts = TeamMember.objects.filter(email__iexact=email, project__event=event)
-        captain_conflicts = Project.objects.filter(captain_email__iexact=email, event=event)
+    if event.minFemaleParticipants:
+        if users is None:
+            users = resolve_participant_users(participant_emails)
+        female_error = female_participants_error(event, participant_emails, users)
+        if female_error:
+            return Response({"error": female_error}, status=status.HTTP_400_BAD_REQUEST)
+
+    # registrations in other teams are rejected by EventParticipant's unique constraint
+    # when the participants are claimed (see _participant_conflict_response)
+    if event.maxTeams is not None and current_project is None:
+        waiting = WaitlistEntry.objects.filter(
+            event=event, status=WaitlistEntry.Status.WAITING, captain_email__in=participant_emails
+        )
+        if waitlist_entry is not None:
+            waiting = waiting.exclude(pk=waitlist_entry.pk)
+        if waiting.exists():
+            return Response({"error": "This team is already on the waitlist for this event."}, status=status.HTTP_400_BAD_REQUEST)
 
-        if current_project is not None:
-            team_member_conflicts = team_member_conflicts.exclude(project=current_project)
-            captain_conflicts = captain_conflicts.exclude(pk=current_project.pk)
+    return None
 
-        if team_member_conflicts.exists() or captain_conflicts.exists():
-            return Response({"error": f"Email {email} is already registered in this event."}, status=status.HTTP_400_BAD_REQUEST)
 
-    return None
+def _participant_conflict_response(emails):
+    transaction.set_rollback(True)
+    if len(emails) == 1:
+        message = f"Email {emails[0]} is already registered in this event."
+    else:
+        message = f"Emails {', '.join(emails)} are already registered in this event."
+    return Response({"error": message, "conflicts": emails}, status=status.HTTP_400_BAD_REQUEST)
 
 
-def _apply_project_submission(project, payload, created_by=None):
+def _apply_project_submission(project, payload, created_by=None, users=None):
     project.team_name = payload["team_name"]
     project.project_topic = payload["project_topic"]
     project.project_category = payload["project_category"]
@@ -384,13 +450,55 @@ def _apply_project_submission(project, payload, created_by=None):
         update_fields.append("created_by")
 
     project.save(update_fields=update_fields)
-    sync_project_participants(project)
+    sync_project_participants(project, users=users)
+
+
+def _create_registration(event, payload, created_by, users=None):
+    """Create the project for a validated submission that holds a place in ``event``."""
+
+    project = Project.objects.create(
+        event=event,
+        created_by=created_by,
+        team_name=payload["team_name"],
+        project_topic=payload["project_topic"],
+        project_category=payload["project_category"],
+        trl_level=payload["trl_level"],
+        sdgs=payload["sdgs"],
+        captain_name=payload["captain_name"],
+        captain_email=payload["captain_email"],
+        captain_phone=payload["captain_phone"],
+        team_members=payload["team_members"],
+        faculty_mentor_name=payload["faculty_mentor_name"],
+    )
+    sync_project_participants(project, created=True, users=users)
+    team_size = len(payload["team_members"]) + 1
+    live.publish(event.id, "registration", project_id=project.id, team_name=project.team_name, team_size=team_size)
+    return project
+
+
+@api_view(['GET'])
+@authentication_classes([])
+@permission_classes([AllowAny])
+def registration_queue_status(request, event_id):
+    """
+    GET /api/registration-queue/<event id>/?ticket=...
+    Polled by clients waiting to register; the signed ticket identifies them, so
+    this neither authenticates nor touches the database.
+    """
+    payload = queue_status(event_id, request.GET.get("ticket", ""))
+    if payload is None:
+        return Response({"error": "Unknown or expired queue ticket."}, status=status.HTTP_404_NOT_FOUND)
+    return Response(payload, status=status.HTTP_200_OK)
 
 
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
+@log_submission("api.submit_project")
+@admission_required
 @transaction.atomic
 def submit_project(request, event_id):
+    log_event = submission_event(request)
+    log_event.add(event_id=event_id)
     event = get_object_or_404(SubSubEvent, event_id=event_id)
 
     try:
@@ -399,30 +507,55 @@ def submit_project(request, event_id):
         return Response({"error": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
 
     is_manual_entry = _user_can_manage_event(request.user, event)
+    users = resolve_participant_users(_payload_participant_emails(payload))
     validation_error = _validate_project_submission_constraints(
         event=event,
         payload=payload,
         requester=request.user,
         is_manual_entry=is_manual_entry,
+        users=users,
     )
     if validation_error is not None:
         return validation_error
 
-    project = Project.objects.create(
-        event=event,
-        created_by=request.user,
-        team_name=payload["team_name"],
-        project_topic=payload["project_topic"],
-        project_category=payload["project_category"],
-        trl_level=payload["trl_level"],
-        sdgs=payload["sdgs"],
-        captain_name=payload["captain_name"],
-        captain_email=payload["captain_email"],
-        captain_phone=payload["captain_phone"],
-        team_members=payload["team_members"],
-        faculty_mentor_name=payload["faculty_mentor_name"],
-    )
-    sync_project_participants(project)
+    project = None
+    if event.maxTeams is None or not has_waiting_teams(event):
+        try:
+            with transaction.atomic():
+                project = _create_registration(event, payload, request.user, users=users)
+                # last write, so the event row is locked for as little of the request as possible
+                if not take_team_slot(event):
+                    raise EventFull
+        except ParticipantConflict as exc:
+            return _participant_conflict_response(exc.emails)
+        except EventFull:
+            project = None
+
+    if project is None:
+        registered = list(
+            EventParticipant.objects.filter(event=event, email__in=_payload_participant_emails(payload))
+            .order_by("email")
+            .values_list("email", flat=True)
+        )
+        if registered:
+            return _participant_conflict_response(registered)
+        entry = WaitlistEntry.objects.create(
+            event=event,
+            created_by=request.user,
+            manual_entry=is_manual_entry,
+            captain_email=payload["captain_email"],
+            payload=payload,
+        )
+        log_event.add(waitlist_id=entry.id, manual_entry=is_manual_entry)
+        return Response(
+            {
+                "message": "The event is full; your team has been added to the waitlist.",
+                "waitlist": {"id": entry.id, "position": waitlist_position(entry)},
+            },
+            status=status.HTTP_202_ACCEPTED,
+        )
+
+    log_event.add(project_id=project.id, team_size=len(payload["team_members"]) + 1, manual_entry=is_manual_entry)
 
     serialized_project = ProjectSerializer(project).data
     return Response(
@@ -436,23 +569,18 @@ def submit_project(request, event_id):
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@reporting_read
 def event_registrations(request, event_pk):
     event = get_object_or_404(SubSubEvent, pk=event_pk)
     if not _user_can_manage_event(request.user, event):
         return Response({"error": "Unauthorized Access"}, status=status.HTTP_403_FORBIDDEN)
 
-    projects = (
-        Project.objects.filter(event=event)
-        .prefetch_related('members')
-        .order_by('team_name', 'id')
-    )
-    evaluations = Evaluation.objects.filter(subsubevent=event).select_related('project')
-    evaluation_map = {evaluation.project_id: evaluation for evaluation in evaluations}
+    projects = _statistics_projects(Project.objects.filter(event=event).order_by('team_name', 'id'), event)
 
     return Response(
         {
             "event": _serialize_event_summary(event),
-            "projects": [_statistics_project_payload(project, evaluation_map) for project in projects],
+            "projects": projects,
         },
         status=status.HTTP_200_OK,
     )
@@ -471,6 +599,7 @@ def manage_event_registration(request, event_pk, project_id):
     if request.method == 'DELETE':
         team_name = project.team_name
         project.delete()
+        release_team_slot(event)
         return Response(
             {"message": f'Team "{team_name}" deleted successfully.'},
             status=status.HTTP_200_OK,
@@ -481,42 +610,36 @@ def manage_event_registration(request, event_pk, project_id):
     except ValueError as exc:
         return Response({"error": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
 
+    users = resolve_participant_users(_payload_participant_emails(payload))
     validation_error = _validate_project_submission_constraints(
         event=event,
         payload=payload,
         requester=request.user,
         is_manual_entry=True,
         current_project=project,
+        users=users,
     )
     if validation_error is not None:
         return validation_error
 
-    _apply_project_submission(project, payload, created_by=project.created_by or request.user)
-    refreshed_project = Project.objects.prefetch_related('members').get(pk=project.pk)
+    try:
+        _apply_project_submission(project, payload, created_by=project.created_by or request.user, users=users)
+    except ParticipantConflict as exc:
+        return _participant_conflict_response(exc.emails)
+    [refreshed_project] = _statistics_projects(Project.objects.filter(pk=project.pk), event)
 
     return Response(
         {
             "message": "Team updated successfully.",
-            "project": _statistics_project_payload(refreshed_project, {}),
+            "project": refreshed_project,
         },
         status=status.HTTP_200_OK,
     )
 
 
-@api_view(['GET'])
-@permission_classes([IsAuthenticated])
-def user_registrations(request):
-    email = _normalize_email(request.user.email)
-    if not email:
-        return Response({"registrations": []}, status=status.HTTP_200_OK)
-
-    projects = (
-        Project.objects.filter(
-            Q(captain_user=request.user)
-            | Q(captain_email__iexact=email)
-            | Q(members__user=request.user)
-            | Q(members__email__iexact=email)
-        )
+def _user_registrations_queryset(user):
+    return (
+        Project.objects.filter(user_index__user=user)
         .select_related(
             'event',
             'event__parent_subevent',
@@ -524,28 +647,59 @@ def user_registrations(request):
             'captain_user',
         )
         .prefetch_related('members')
-        .distinct()
         .order_by('-submitted_at', '-id')
     )
 
+
+def _archived_registrations_queryset(request, email):
+    """Payloads from archived festivals, only when the client asks for ?includeArchived=true."""
+    if str(request.GET.get("includeArchived", "")).lower() not in ("1", "true", "yes"):
+        return ArchivedRegistration.objects.none().values_list("payload", flat=True)
+    return (
+        ArchivedRegistration.objects.filter(Q(user=request.user) | Q(email=email))
+        .order_by("-id")
+        .values_list("payload", flat=True)
+    )
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def user_registrations(request):
+    email = _normalize_email(request.user.email)
+    if not email:
+        return Response({"registrations": []}, status=status.HTTP_200_OK)
+
+    projects = _user_registrations_queryset(request.user)
     payload = [_serialize_registration(project, request.user) for project in projects if project.event]
+    payload.extend(_archived_registrations_queryset(request, email))
     return Response({"registrations": payload}, status=status.HTTP_200_OK)
 
 
+@async_read_view()
+async def user_registrations_async(request):
+    email = _normalize_email(request.user.email)
+    if not email:
+        return json_response({"registrations": []})
+
+    payload = [
+        _serialize_registration(project, request.user)
+        async for project in _user_registrations_queryset(request.user)
+        if project.event
+    ]
+    payload.extend([archived async for archived in _archived_registrations_queryset(request, email)])
+    return json_response({"registrations": payload})
+
+
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@reporting_read
 def get_event_statistics(request, event_id):
     event = get_object_or_404(SubSubEvent, event_id=event_id)
     if not _user_can_manage_event(request.user, event):
         return Response({"error": "Unauthorized Access"}, status=status.HTTP_403_FORBIDDEN)
 
-    projects = (
-        Project.objects.filter(event=event)
-        .prefetch_related('members')
-        .order_by('team_name', 'id')
-    )
-    evaluations = Evaluation.objects.filter(subsubevent=event).select_related('project')
-    evaluation_map = {evaluation.project_id: evaluation for evaluation in evaluations}
+    project_payload = _statistics_projects(Project.objects.filter(event=event).order_by('team_name', 'id'), event)
+    evaluations = Evaluation.objects.filter(subsubevent=event)
 
     marks = [float(mark) for mark in evaluations.values_list('final_score', flat=True)]
     avg_mark = evaluations.aggregate(Avg('final_score'))['final_score__avg'] or 0
@@ -555,17 +709,15 @@ def get_event_statistics(request, event_id):
     project_category_counter = Counter()
     sdg_counter = Counter()
     total_participants = 0
-    project_payload = []
-
-    for project in projects:
-        total_participants += 1 + len(_project_member_payload(project))
-        if project.project_category:
-            project_category_counter[project.project_category] += 1
-        if project.trl_level:
-            trl_counter[project.trl_level] += 1
-        for sdg in project.sdgs or []:
+
+    for project in project_payload:
+        total_participants += 1 + len(project["teamMembers"])
+        if project["projectCategory"]:
+            project_category_counter[project["projectCategory"]] += 1
+        if project["trlLevel"]:
+            trl_counter[project["trlLevel"]] += 1
+        for sdg in project["sdgs"]:
             sdg_counter[int(sdg)] += 1
-        project_payload.append(_statistics_project_payload(project, evaluation_map))
 
     trl_breakdown = [
         {"trlLevel": level, "count": trl_counter.get(level, 0)}
@@ -602,49 +754,150 @@ def get_event_statistics(request, event_id):
     )
 
 
+def _project_participant_count(project):
+    # Captain is 1 participant
+    participants_count = 1
+
+    seen_emails = set()
+    captain_email = (project.captain_email or "").strip().lower()
+
+    db_members_count = 0
+    for m in project.members.all():
+        m_email = (m.email or "").strip().lower()
+        if m_email and m_email != captain_email and m_email not in seen_emails:
+            seen_emails.add(m_email)
+            db_members_count += 1
+
+    if db_members_count > 0:
+        participants_count += db_members_count
+    elif isinstance(project.team_members, list):
+        fallback_count = 0
+        for m in project.team_members:
+            if isinstance(m, dict):
+                m_email = (m.get('email') or "").strip().lower()
+            else:
+                m_email = ""
+            if m_email and m_email != captain_email and m_email not in seen_emails:
+                seen_emails.add(m_email)
+                fallback_count += 1
+        participants_count += fallback_count
+    return participants_count
+
+
+def _public_stats_payload(events_count, teams_count, participants_count):
+    return {
+        "events_count": events_count,
+        "participants_count": participants_count,
+        "ideas_count": teams_count,
+        "teams_count": teams_count
+    }
+
+
 @api_view(["GET"])
 @permission_classes([])
+@reporting_read
 def get_public_stats(request):
     events_count = SubSubEvent.objects.count()
     if events_count == 0:
         events_count = SubEvent.objects.count()
 
     teams_count = Project.objects.count()
-    ideas_count = teams_count
+    participants_count = sum(
+        _project_participant_count(project)
+        for project in Project.objects.all().prefetch_related('members')
+    )
+    return Response(
+        _public_stats_payload(events_count, teams_count, participants_count),
+        status=status.HTTP_200_OK,
+    )
 
+
+@async_read_view(permission="public")
+@reporting_read
+async def get_public_stats_async(request):
+    events_count = await SubSubEvent.objects.acount()
+    if events_count == 0:
+        events_count = await SubEvent.objects.acount()
+
+    teams_count = await Project.objects.acount()
     participants_count = 0
-    projects = Project.objects.all().prefetch_related('members')
-    for project in projects:
-        # Captain is 1 participant
-        participants_count += 1
-        
-        seen_emails = set()
-        captain_email = (project.captain_email or "").strip().lower()
-        
-        db_members_count = 0
-        for m in project.members.all():
-            m_email = (m.email or "").strip().lower()
-            if m_email and m_email != captain_email and m_email not in seen_emails:
-                seen_emails.add(m_email)
-                db_members_count += 1
-                
-        if db_members_count > 0:
-            participants_count += db_members_count
-        elif isinstance(project.team_members, list):
-            fallback_count = 0
-            for m in project.team_members:
-                if isinstance(m, dict):
-                    m_email = (m.get('email') or "").strip().lower()
-                else:
-                    m_email = ""
-                if m_email and m_email != captain_email and m_email not in seen_emails:
-                    seen_emails.add(m_email)
-                    fallback_count += 1
-            participants_count += fallback_count
-
-    return Response({
-        "events_count": events_count,
-        "participants_count": participants_count,
-        "ideas_count": ideas_count,
-        "teams_count": teams_count
-    }, status=status.HTTP_200_OK)
+    async for project in Project.objects.all().prefetch_related('members'):
+        participants_count += _project_participant_count(project)
+    return json_response(_public_stats_payload(events_count, teams_count, participants_count))
+
+
+def _live_feed_user(request, event_pk):
+    header = request.headers.get("Authorization", "")
+    if header.startswith("Token "):
+        token = Token.objects.select_related("user").filter(key=header[len("Token "):].strip()).first()
+        user = token.user if token is not None else None
+    else:
+        user_id = live.read_stream_token(request.GET.get("stream_token", ""), event_pk)
+        user = User.objects.filter(pk=user_id).first() if user_id is not None else None
+    if user is None or not user.is_active:
+        return None
+    return user
+
+
+def _live_feed_access(request, event_pk):
+    user = _live_feed_user(request, event_pk)
+    if user is None:
+        return status.HTTP_401_UNAUTHORIZED
+    event = SubSubEvent.objects.select_related("parent_event", "parent_subevent").filter(pk=event_pk).first()
+    if event is None:
+        return status.HTTP_404_NOT_FOUND
+    if not _user_can_manage_event(user, event):
+        return status.HTTP_403_FORBIDDEN
+    return None
+
+
+@api_view(["POST"])
+def live_feed_token(request, event_pk):
+    """
+    POST /api/events/<event pk>/live/token/
+
+    Issues a short-lived stream token for live_event_feed, so the account
+    token never has to appear in a URL (and in access logs).
+    """
+    event = get_object_or_404(SubSubEvent.objects.select_related("parent_event", "parent_subevent"), pk=event_pk)
+    if not _user_can_manage_event(request.user, event):
+        return Response({"error": "Unauthorized Access"}, status=status.HTTP_403_FORBIDDEN)
+    token = live.issue_stream_token(request.user, event.pk)
+    return Response(
+        {
+            "streamToken": token,
+            "expiresIn": settings.LIVE_FEED_TOKEN_MAX_AGE,
+            "url": f"/api/events/{event.pk}/live/?stream_token={token}",
+        }
+    )
+
+
+async def live_event_feed(request, event_pk):
+    """
+    Server-Sent Events stream of registration, scored and rank deltas for one sub-sub-event.
+
+    Served by the ASGI app. ``EventSource`` cannot send headers, so browsers
+    pass ``?stream_token=`` from live_feed_token instead; fetch a new one when
+    the stream is refused after it expires. Reconnects resume from
+    ``Last-Event-ID``.
+    """
+    if request.method != "GET":
+        return JsonResponse({"error": "Method not allowed."}, status=status.HTTP_405_METHOD_NOT_ALLOWED)
+
+    denied = await sync_to_async(_live_feed_access)(request, event_pk)
+    if denied is not None:
+        return JsonResponse({"error": "Unauthorized Access"}, status=denied)
+
+    last_event_id = request.headers.get("Last-Event-ID") or request.GET.get("lastEventId")
+    try:
+        last_event_id = int(last_event_id) if last_event_id else None
+    except ValueError:
+        last_event_id = None
+
+    response = StreamingHttpResponse(
+        live.event_stream(live.channel_for_subsubevent(event_pk), last_event_id),
+        content_type="text/event-stream",
+    )
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"
+    return response
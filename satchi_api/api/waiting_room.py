@@ -0,0 +1,220 @@
+"""
+Admission control for project registration.
+
+When a popular sub-sub event opens, ``submit_project`` is only entered by
+requests the event's token bucket admits: it refills at
+``REGISTRATION_QUEUE_RATE`` admissions per second up to
+``REGISTRATION_QUEUE_BURST``. A request that finds the bucket empty (or
+people already waiting) is turned away with 429 and a signed ticket holding
+its place in line. The client polls ``registration_queue_status`` with the
+ticket, which touches neither the database nor the session, and resubmits
+with the ``X-Registration-Ticket`` header once admitted; each ticket is
+good for a single admission.
+
+The bucket and queue counters live in a backend chosen by
+``REGISTRATION_QUEUE_BACKEND``:
+
+``file`` (default)
+    One small JSON file per event in ``REGISTRATION_QUEUE_DIR``, updated
+    under ``flock`` so every worker on the host shares the same queue.
+
+``memory``
+    Process-local state, for single-process development and tests.
+"""
+
+import fcntl
+import json
+import math
+import os
+import re
+import threading
+import time
+from functools import wraps
+
+from django.conf import settings
+from django.core import signing
+from rest_framework import status
+from rest_framework.response import Response
+
+TICKET_HEADER = "HTTP_X_REGISTRATION_TICKET"
+TICKET_SALT = "registration-queue"
+
+
+class FileBackend:
+    def __init__(self, directory):
+        self.directory = directory
+
+    def _path(self, key):
+        return os.path.join(self.directory, re.sub(r"[^A-Za-z0-9_-]", "_", key) + ".json")
+
+    def update(self, key, apply):
+        """Run ``apply(state)`` on the stored state for ``key`` under an exclusive lock."""
+
+        os.makedirs(self.directory, exist_ok=True)
+        fd = os.open(self._path(key), os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            with os.fdopen(os.dup(fd), "r+") as handle:
+                try:
+                    state = json.load(handle)
+                except ValueError:
+                    state = {}
+                result = apply(state)
+                handle.seek(0)
+                handle.truncate()
+                json.dump(state, handle)
+            return result
+        finally:
+            os.close(fd)
+
+
+class MemoryBackend:
+    def __init__(self):
+        self._states = {}
+        self._lock = threading.Lock()
+
+    def update(self, key, apply):
+        with self._lock:
+            return apply(self._states.setdefault(key, {}))
+
+    def clear(self):
+        with self._lock:
+            self._states.clear()
+
+
+_memory_backend = MemoryBackend()
+
+
+def get_backend():
+    if settings.REGISTRATION_QUEUE_BACKEND == "memory":
+        return _memory_backend
+    return FileBackend(settings.REGISTRATION_QUEUE_DIR)
+
+
+def _refill(state, now):
+    """Top up the bucket and admit waiting tickets in order while tokens last."""
+
+    burst = settings.REGISTRATION_QUEUE_BURST
+    tokens = state.get("tokens", burst)
+    updated = state.get("updated", now)
+    tokens = min(burst, tokens + max(0.0, now - updated) * settings.REGISTRATION_QUEUE_RATE)
+    issued = state.get("issued", 0)
+    admitted = state.get("admitted", 0)
+    while admitted < issued and tokens >= 1:
+        admitted += 1
+        tokens -= 1
+    state.update(tokens=tokens, updated=now, issued=issued, admitted=admitted)
+    return state
+
+
+def _position(state, number):
+    return max(0, number - state["admitted"])
+
+
+def _retry_after(position):
+    return max(1, math.ceil(position / settings.REGISTRATION_QUEUE_RATE))
+
+
+def _admit_or_enqueue(number):
+    """
+    Returns ``(admitted, number, position)``. Without a ticket (``number`` is
+    None) the caller is admitted straight away only if nobody is waiting and a
+    token is free; otherwise it takes the next number in line.
+
+    A ticket gets in once: its number is recorded in ``used`` when it is
+    admitted and a second attempt returns a ``position`` of None. Entries are
+    dropped once every ticket that could carry them has expired.
+    """
+
+    def apply(state):
+        now = time.time()
+        _refill(state, now)
+        expired = now - settings.REGISTRATION_QUEUE_TICKET_MAX_AGE
+        used = state["used"] = {key: at for key, at in state.get("used", {}).items() if at > expired}
+        if number is not None:
+            if str(number) in used:
+                return False, number, None
+            position = _position(state, number)
+            if position == 0:
+                used[str(number)] = now
+            return position == 0, number, position
+        if state["admitted"] == state["issued"] and state["tokens"] >= 1:
+            state["tokens"] -= 1
+            return True, None, 0
+        state["issued"] += 1
+        return False, state["issued"], _position(state, state["issued"])
+
+    return apply
+
+
+def _read_ticket(ticket, event_id):
+    try:
+        data = signing.loads(ticket, salt=TICKET_SALT, max_age=settings.REGISTRATION_QUEUE_TICKET_MAX_AGE)
+    except signing.BadSignature:
+        return None
+    if data.get("event") != event_id:
+        return None
+    return data
+
+
+def _queue_payload(event_id, ticket, position):
+    return {
+        "ticket": ticket,
+        "position": position,
+        "admitted": position == 0,
+        "retryAfter": 0 if position == 0 else _retry_after(position),
+        "statusUrl": f"/api/registration-queue/{event_id}/?ticket={ticket}",
+    }
+
+
+def queue_status(event_id, ticket):
+    """The place in line of ``ticket``, or None if it is invalid or expired."""
+
+    data = _read_ticket(ticket, event_id)
+    if data is None:
+        return None
+    position = get_backend().update(event_id, lambda state: _position(_refill(state, time.time()), data["number"]))
+    return _queue_payload(event_id, ticket, position)
+
+
+def admission_required(view):
+    """
+    Decorate a registration view taking ``event_id`` (above ``@transaction.atomic``)
+    so it only runs for admitted requests.
+    """
+
+    @wraps(view)
+    def wrapper(request, *args, event_id, **kwargs):
+        if not settings.REGISTRATION_QUEUE_ENABLED:
+            return view(request, *args, event_id=event_id, **kwargs)
+
+        number = None
+        ticket = request.META.get(TICKET_HEADER)
+        if ticket:
+            data = _read_ticket(ticket, event_id)
+            if data is None or data["user"] != request.user.pk:
+                return Response(
+                    {"error": "Your place in the registration queue has expired. Please try again."},
+                    status=status.HTTP_429_TOO_MANY_REQUESTS,
+                )
+            number = data["number"]
+
+        admitted, number, position = get_backend().update(event_id, _admit_or_enqueue(number))
+        if admitted:
+            return view(request, *args, event_id=event_id, **kwargs)
+        if position is None:
+            return Response(
+                {"error": "This registration ticket has already been used. Please try again."},
+                status=status.HTTP_429_TOO_MANY_REQUESTS,
+            )
+
+        if not ticket:
+            ticket = signing.dumps({"event": event_id, "user": request.user.pk, "number": number}, salt=TICKET_SALT)
+        payload = _queue_payload(event_id, ticket, position)
+        return Response(
+            {"error": "Registration is busy; you are in the queue.", "queue": payload},
+            status=status.HTTP_429_TOO_MANY_REQUESTS,
+            headers={"Retry-After": str(payload["retryAfter"])},
+        )
+
+    return wrapper
@@ -0,0 +1,155 @@
+"""
+Team capacity (``SubSubEvent.maxTeams``) and the registration waitlist.
+
+``SubSubEvent.registeredTeams`` counts the projects of a capped event. A
+registration takes a place with one conditional ``UPDATE ... SET
+registeredTeams = registeredTeams + 1 WHERE registeredTeams < maxTeams``, so
+concurrent submitters can never oversubscribe the event and none of them has
+to lock and count its projects. The update is the last write of the
+registration, so the event row stays locked only until it commits. When no
+place is free (or others are already waiting) the submission is stored as a
+``WaitlistEntry`` instead. Uncapped events skip the counter entirely; it is
+recounted when a cap is set.
+
+Deleting a registration or raising ``maxTeams`` schedules
+``promote_waitlist`` after commit: it registers the oldest waiting entries,
+re-validating each one, while places are free. ``WAITLIST_RUNNER`` selects a
+background thread (default) or running it inline; ``manage.py
+promote_waitlist`` recounts the counters and promotes from the shell.
+"""
+
+import logging
+import threading
+
+from django.conf import settings
+from django.db import connections, transaction
+from django.db.models import Count, F, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
+
+from events.models import SubSubEvent
+
+from .models import Project, WaitlistEntry
+from .services import ParticipantConflict, resolve_participant_users
+
+logger = logging.getLogger(__name__)
+
+
+class EventFull(Exception):
+    """Every place of the event is taken; raised to roll back a registration that came too late."""
+
+
+def take_team_slot(event):
+    """Count one more team against ``event.maxTeams``; False when the event is full."""
+
+    if event.maxTeams is None:
+        return True
+    return bool(
+        SubSubEvent.objects.filter(pk=event.pk)
+        .filter(Q(maxTeams__isnull=True) | Q(registeredTeams__lt=F("maxTeams")))
+        .update(registeredTeams=F("registeredTeams") + 1)
+    )
+
+
+def _return_team_slot(event):
+    if event.maxTeams is not None:
+        SubSubEvent.objects.filter(pk=event.pk, registeredTeams__gt=0).update(registeredTeams=F("registeredTeams") - 1)
+
+
+def release_team_slot(event):
+    """Give back the place of a deleted registration and promote after commit."""
+
+    _return_team_slot(event)
+    schedule_promotion(event.pk)
+
+
+def has_waiting_teams(event):
+    return WaitlistEntry.objects.filter(event=event, status=WaitlistEntry.Status.WAITING).exists()
+
+
+def waitlist_position(entry):
+    return WaitlistEntry.objects.filter(event_id=entry.event_id, status=WaitlistEntry.Status.WAITING, id__lte=entry.id).count()
+
+
+def _promote_next(subsubevent_id):
+    """Register the oldest waiting entry if a place is free. Returns False when done."""
+
+    from .views import _create_registration, _payload_participant_emails, _validate_project_submission_constraints
+
+    with transaction.atomic():
+        entry = (
+            WaitlistEntry.objects.select_for_update(skip_locked=True)
+            .filter(event_id=subsubevent_id, status=WaitlistEntry.Status.WAITING)
+            .select_related("created_by")
+            .order_by("id")
+            .first()
+        )
+        if entry is None:
+            return False
+        event = SubSubEvent.objects.get(pk=subsubevent_id)
+        if not take_team_slot(event):
+            return False
+
+        users = resolve_participant_users(_payload_participant_emails(entry.payload))
+        error = _validate_project_submission_constraints(
+            event=event,
+            payload=entry.payload,
+            requester=entry.created_by,
+            is_manual_entry=entry.manual_entry,
+            waitlist_entry=entry,
+            users=users,
+        )
+        if error is None:
+            try:
+                with transaction.atomic():
+                    entry.project = _create_registration(event, entry.payload, entry.created_by, users=users)
+            except ParticipantConflict as exc:
+                error = f"Already registered in this event: {', '.join(exc.emails)}."
+        else:
+            error = error.data.get("error", "")
+
+        if error is not None:
+            _return_team_slot(event)
+            entry.status = WaitlistEntry.Status.REJECTED
+            entry.error = error
+            entry.save(update_fields=["status", "error"])
+            return True
+
+        entry.status = WaitlistEntry.Status.PROMOTED
+        entry.save(update_fields=["project", "status"])
+        return True
+
+
+def promote_waitlist(subsubevent_id):
+    """Move waiting teams of the event in while it has free places."""
+
+    while _promote_next(subsubevent_id):
+        pass
+
+
+def _promote_in_thread(subsubevent_id):
+    try:
+        promote_waitlist(subsubevent_id)
+    except Exception:
+        logger.exception("Waitlist promotion for sub-sub event %s failed", subsubevent_id)
+    finally:
+        connections.close_all()
+
+
+def schedule_promotion(subsubevent_id):
+    if settings.WAITLIST_RUNNER == "inline":
+        transaction.on_commit(lambda: promote_waitlist(subsubevent_id))
+        return
+    transaction.on_commit(
+        lambda: threading.Thread(
+            target=_promote_in_thread, args=(subsubevent_id,), name=f"waitlist-{subsubevent_id}", daemon=True
+        ).start()
+    )
+
+
+def recount_registered_teams(events=None):
+    """Reset ``registeredTeams`` from the projects table (after manual data fixes)."""
+
+    counts = Project.objects.filter(event=OuterRef("pk")).order_by().values("event").annotate(n=Count("pk")).values("n")
+    if events is None:
+        events = SubSubEvent.objects.all()
+    return events.update(registeredTeams=Coalesce(Subquery(counts), 0))
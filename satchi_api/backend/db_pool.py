@@ -0,0 +1,170 @@
+"""
+In-process database connection pool used by ``backend.pooled_postgresql``.
+
+Each worker process keeps one pool per set of connection parameters. A pool
+keeps up to ``size`` idle connections and lets ``max_overflow`` extra ones be
+opened under bursts; a returned connection is closed instead of kept once
+``size`` connections are already idle. When every connection is checked out, a checkout waits
+up to ``timeout`` seconds and then raises ``PoolTimeout``. Connections older
+than ``recycle`` seconds are replaced on their next checkout.
+
+Returned connections are checked locally (closed flag and transaction status)
+rather than with a ``SELECT 1``, so reusing one costs no round trip.
+"""
+
+import os
+import threading
+import time
+from collections import deque
+
+
+class PoolTimeout(Exception):
+    pass
+
+
+class _Entry:
+    __slots__ = ("connection", "created")
+
+    def __init__(self, connection):
+        self.connection = connection
+        self.created = time.monotonic()
+
+
+class ConnectionPool:
+    def __init__(self, connect, size=5, max_overflow=5, timeout=10.0, recycle=1800.0,
+                 reusable=None, reset=None, close=None):
+        self._connect = connect
+        self._reusable = reusable or (lambda connection: True)
+        self._reset = reset or (lambda connection: None)
+        self._close = close or (lambda connection: connection.close())
+        self.size = size
+        self.max_overflow = max_overflow
+        self.timeout = timeout
+        self.recycle = recycle
+
+        self._idle = deque()
+        self._checked_out = {}
+        self._opening = 0
+        self._condition = threading.Condition()
+        self._counters = dict.fromkeys(
+            ("checkouts", "created", "discarded", "recycled", "waits", "timeouts"), 0
+        )
+        self._peak_in_use = 0
+        self._wait_seconds = 0.0
+
+    @property
+    def limit(self):
+        return self.size + self.max_overflow
+
+    def _open_count(self):
+        return len(self._idle) + len(self._checked_out) + self._opening
+
+    def _discard(self, entry, counter="discarded"):
+        self._counters[counter] += 1
+        try:
+            self._close(entry.connection)
+        except Exception:
+            pass
+
+    def checkout(self):
+        deadline = time.monotonic() + self.timeout
+        waited = False
+        with self._condition:
+            while True:
+                while self._idle:
+                    entry = self._idle.pop()
+                    if self.recycle and time.monotonic() - entry.created > self.recycle:
+                        self._discard(entry, "recycled")
+                    elif not self._reusable(entry.connection):
+                        self._discard(entry)
+                    else:
+                        return self._hand_out(entry)
+
+                if self._open_count() < self.limit:
+                    self._opening += 1
+                    break
+
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._counters["timeouts"] += 1
+                    raise PoolTimeout(
+                        f"Connection pool exhausted: {self.limit} connections in use for {self.timeout}s."
+                    )
+                if not waited:
+                    waited = True
+                    self._counters["waits"] += 1
+                started = time.monotonic()
+                self._condition.wait(remaining)
+                self._wait_seconds += time.monotonic() - started
+
+        # Connect outside the lock so a slow handshake does not block other checkouts.
+        try:
+            entry = _Entry(self._connect())
+        except BaseException:
+            with self._condition:
+                self._opening -= 1
+                self._condition.notify()
+            raise
+        with self._condition:
+            self._opening -= 1
+            self._counters["created"] += 1
+            return self._hand_out(entry)
+
+    def _hand_out(self, entry):
+        self._checked_out[id(entry.connection)] = entry
+        self._counters["checkouts"] += 1
+        self._peak_in_use = max(self._peak_in_use, len(self._checked_out))
+        return entry.connection
+
+    def release(self, connection):
+        with self._condition:
+            if id(connection) not in self._checked_out:
+                return
+        try:
+            self._reset(connection)
+            keep = self._reusable(connection)
+        except Exception:
+            keep = False
+        with self._condition:
+            entry = self._checked_out.pop(id(connection))
+            if keep and len(self._idle) < self.size:
+                self._idle.append(entry)
+            else:
+                self._discard(entry)
+            self._condition.notify()
+
+    def stats(self):
+        with self._condition:
+            in_use = len(self._checked_out)
+            return {
+                "size": self.size,
+                "max_overflow": self.max_overflow,
+                "timeout": self.timeout,
+                "open": self._open_count(),
+                "idle": len(self._idle),
+                "in_use": in_use,
+                "overflow_in_use": max(in_use - self.size, 0),
+                "peak_in_use": self._peak_in_use,
+                "wait_seconds": round(self._wait_seconds, 4),
+                **self._counters,
+            }
+
+
+_pools = {}
+_pools_pid = None
+_pools_lock = threading.Lock()
+
+
+def get_pool(key, factory):
+    """Return this process's pool for ``key``, creating it with ``factory()`` on first use."""
+
+    global _pools_pid
+    with _pools_lock:
+        if _pools_pid != os.getpid():
+            # Connections must never be shared with a forked parent or sibling.
+            _pools.clear()
+            _pools_pid = os.getpid()
+        pool = _pools.get(key)
+        if pool is None:
+            pool = _pools[key] = factory()
+        return pool
@@ -0,0 +1,122 @@
+"""
+Read-replica routing for reporting endpoints.
+
+Only views decorated with ``reporting_read`` read from
+``REPLICA_DATABASE_ALIAS``; everything else, and every write, uses the
+primary. Reads stay on the primary when:
+
+* the request is not a GET/HEAD,
+* the client wrote recently (``PrimaryPinningMiddleware`` sets a short-lived
+  cookie after each successful write, for ``REPLICA_PIN_SECONDS``),
+* the view itself has written during the request, or
+* a transaction is open on the primary.
+"""
+
+import asyncio
+from contextvars import ContextVar
+from functools import wraps
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+PIN_COOKIE = "satchi_primary"
+SAFE_METHODS = ("GET", "HEAD")
+
+_reporting = ContextVar("satchi_reporting_read", default=False)
+_pinned = ContextVar("satchi_primary_pinned", default=False)
+
+
+def replica_alias():
+    alias = settings.REPLICA_DATABASE_ALIAS
+    if settings.REPLICA_READS_ENABLED and alias in settings.DATABASES:
+        return alias
+    return None
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        if not _reporting.get() or _pinned.get():
+            return None
+        alias = replica_alias()
+        if alias is None or connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return None
+        return alias
+
+    def db_for_write(self, model, **hints):
+        if _reporting.get():
+            # Later reads in this request must see the write.
+            _pinned.set(True)
+        # Explicit, so instances read from the replica are never saved back to it.
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {DEFAULT_DB_ALIAS, settings.REPLICA_DATABASE_ALIAS}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, **hints):
+        if db == settings.REPLICA_DATABASE_ALIAS:
+            return False
+        return None
+
+
+def _use_replica(request):
+    return request.method in SAFE_METHODS and not request.COOKIES.get(PIN_COOKIE)
+
+
+def reporting_read(view):
+    """Mark a read-only view (sync or async) whose queries may be served by the replica."""
+
+    if asyncio.iscoroutinefunction(view):
+
+        @wraps(view)
+        async def async_wrapper(request, *args, **kwargs):
+            if not _use_replica(request):
+                return await view(request, *args, **kwargs)
+            reporting, pinned = _reporting.set(True), _pinned.set(False)
+            try:
+                return await view(request, *args, **kwargs)
+            finally:
+                _pinned.reset(pinned)
+                _reporting.reset(reporting)
+
+        return async_wrapper
+
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        if not _use_replica(request):
+            return view(request, *args, **kwargs)
+        reporting, pinned = _reporting.set(True), _pinned.set(False)
+        try:
+            return view(request, *args, **kwargs)
+        finally:
+            _pinned.reset(pinned)
+            _reporting.reset(reporting)
+
+    return wrapper
+
+
+class PrimaryPinningMiddleware:
+    """After a successful write, keep the client's reporting reads on the primary for a while."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if (
+            request.method not in SAFE_METHODS
+            and response.status_code < 400
+            and settings.REPLICA_PIN_SECONDS > 0
+            and replica_alias() is not None
+        ):
+            response.set_cookie(
+                PIN_COOKIE,
+                "1",
+                max_age=settings.REPLICA_PIN_SECONDS,
+                secure=request.is_secure(),
+                httponly=True,
+                samesite="Lax",
+            )
+        return response
@@ -0,0 +1,271 @@
+"""
+Live per-event feed delivered to dashboards as Server-Sent Events.
+
+Write paths call ``publish`` inside their transaction; the event is handed to
+the broker only after commit, so a rolled-back registration or score is never
+announced. Two brokers are available through ``LIVE_FEED_BROKER``:
+
+``spool`` (default)
+    One append-only JSON-lines file per channel in ``LIVE_FEED_DIR``. Every
+    gunicorn or uvicorn worker on the host appends to and tails the same
+    files, which fans events out across processes without extra services.
+    The SSE event id is the byte offset after each line, so a reconnecting
+    ``EventSource`` resumes exactly where it stopped via ``Last-Event-ID``.
+    Files are rotated past ``LIVE_FEED_SPOOL_MAX_BYTES``; see ``SpoolBroker``.
+
+``memory``
+    A process-local list per channel, for single-process development and
+    tests.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import threading
+import time
+
+from django.conf import settings
+from django.core import signing
+from django.db import transaction
+
+logger = logging.getLogger(__name__)
+
+STREAM_TOKEN_SALT = "backend.live.stream"
+# a rotation lock older than this was left by a writer that died mid-rotation
+ROTATION_LOCK_TIMEOUT = 30
+
+
+def channel_for_subsubevent(subsubevent_id):
+    return f"subsubevent-{int(subsubevent_id)}"
+
+
+class SpoolBroker:
+    """
+    Channels as JSON-lines files, rotated once they exceed ``max_bytes``.
+
+    Rotation keeps the previous segment as ``<channel>.jsonl.1`` and starts
+    the new file with a ``{"spool_base": N}`` line, where ``N`` is the
+    previous segment's base plus its size. An event's id is its segment's
+    base plus its offset in the file, so ids keep increasing across
+    rotations and a reader still in the previous segment finishes it before
+    moving on. A channel therefore takes at most about twice ``max_bytes``.
+    """
+
+    def __init__(self, directory, max_bytes=None):
+        self.directory = directory
+        self.max_bytes = max_bytes
+
+    def _path(self, channel):
+        return os.path.join(self.directory, f"{channel}.jsonl")
+
+    def append(self, channel, payload):
+        os.makedirs(self.directory, exist_ok=True)
+        line = (json.dumps(payload, default=str, separators=(",", ":")) + "\n").encode()
+        # O_APPEND makes each single write land whole at the current end of file.
+        fd = os.open(self._path(channel), os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            os.write(fd, line)
+            stat = os.fstat(fd)
+        finally:
+            os.close(fd)
+        if self.max_bytes and stat.st_size > self.max_bytes:
+            self._rotate(channel, stat)
+
+    def _rotate(self, channel, stat):
+        path = self._path(channel)
+        # the next segment doubles as the rotation lock; only one writer rotates a given segment
+        next_path = f"{path}.next"
+        try:
+            fd = os.open(next_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o644)
+        except FileExistsError:
+            try:
+                if time.time() - os.path.getmtime(next_path) > ROTATION_LOCK_TIMEOUT:
+                    os.unlink(next_path)
+            except FileNotFoundError:
+                pass
+            return
+        try:
+            if os.stat(path).st_ino != stat.st_ino:
+                return  # another writer rotated this segment already
+            with open(path, "rb") as handle:
+                base, _ = self._header(handle)
+            os.write(fd, (json.dumps({"spool_base": base + stat.st_size}) + "\n").encode())
+            os.close(fd)
+            fd = None
+            # keep a name on the current file at every moment, so appends never recreate it headerless
+            os.link(path, f"{path}.prev")
+            os.replace(f"{path}.prev", f"{path}.1")
+            os.replace(next_path, path)
+        finally:
+            if fd is not None:
+                os.close(fd)
+            if os.path.exists(next_path):
+                os.unlink(next_path)
+
+    @staticmethod
+    def _header(handle):
+        """``(base, start)``: the segment's base id and where its events begin."""
+
+        first = handle.readline()
+        if first.startswith(b'{"spool_base"') and first.endswith(b"\n"):
+            return json.loads(first)["spool_base"], len(first)
+        return 0, 0
+
+    def tail(self, channel):
+        try:
+            with open(self._path(channel), "rb") as handle:
+                base, _ = self._header(handle)
+                return base + os.fstat(handle.fileno()).st_size
+        except FileNotFoundError:
+            return 0
+
+    def _read_segment(self, path, position):
+        """Events of one segment after ``position``, its base and the position after its last complete line."""
+
+        with open(path, "rb") as handle:
+            base, start = self._header(handle)
+            size = os.fstat(handle.fileno()).st_size
+            offset = position - base
+            if offset > size:
+                # the spool file was removed and recreated; start again from its beginning
+                offset = start
+            offset = max(offset, start)
+            handle.seek(offset)
+            chunk = handle.read()
+
+        events = []
+        for line in chunk.splitlines(keepends=True):
+            if not line.endswith(b"\n"):
+                break
+            offset += len(line)
+            try:
+                events.append((base + offset, json.loads(line)))
+            except ValueError:
+                continue
+        return events, base, base + offset
+
+    def read(self, channel, position):
+        """Return ``([(event_id, payload), ...], new_position)`` for complete lines after ``position``."""
+
+        path = self._path(channel)
+        try:
+            events, base, new_position = self._read_segment(path, position)
+        except FileNotFoundError:
+            return [], 0
+        if position < base:
+            # the reader stopped in the previous segment: finish it first
+            try:
+                previous, previous_base, _ = self._read_segment(f"{path}.1", position)
+            except FileNotFoundError:
+                previous, previous_base = [], None
+            if previous_base is not None and previous_base <= position:
+                events = previous + events
+        return events, new_position
+
+
+class MemoryBroker:
+    def __init__(self):
+        self._channels = {}
+        self._lock = threading.Lock()
+
+    def append(self, channel, payload):
+        with self._lock:
+            self._channels.setdefault(channel, []).append(payload)
+
+    def tail(self, channel):
+        with self._lock:
+            return len(self._channels.get(channel, ()))
+
+    def read(self, channel, position):
+        with self._lock:
+            pending = self._channels.get(channel, [])[position:]
+        return [(position + index + 1, payload) for index, payload in enumerate(pending)], position + len(pending)
+
+
+_memory_broker = MemoryBroker()
+
+
+def get_broker():
+    if settings.LIVE_FEED_BROKER == "memory":
+        return _memory_broker
+    return SpoolBroker(settings.LIVE_FEED_DIR, settings.LIVE_FEED_SPOOL_MAX_BYTES)
+
+
+def _deliver(channel, payload):
+    try:
+        get_broker().append(channel, payload)
+    except OSError:
+        logger.exception("Could not publish %s event to %s", payload.get("type"), channel)
+
+
+def publish(subsubevent_id, event_type, **data):
+    """Queue a live event for the sub-sub-event; it is delivered when the current transaction commits."""
+
+    if not settings.LIVE_FEED_ENABLED:
+        return
+    payload = {"type": event_type, "at": round(time.time(), 3), **data}
+    transaction.on_commit(lambda: _deliver(channel_for_subsubevent(subsubevent_id), payload))
+
+
+def publish_after_commit(callback):
+    """Run ``callback`` (which may publish several events) once the transaction commits."""
+
+    if settings.LIVE_FEED_ENABLED:
+        transaction.on_commit(callback)
+
+
+def issue_stream_token(user, subsubevent_id):
+    """
+    A signed token that lets ``user`` open the feed of one sub-sub-event.
+
+    ``EventSource`` cannot send headers, so the stream URL carries this
+    instead of the account token; it expires after
+    ``LIVE_FEED_TOKEN_MAX_AGE`` seconds and only names the user and event.
+    """
+
+    return signing.dumps({"user": user.pk, "event": int(subsubevent_id)}, salt=STREAM_TOKEN_SALT)
+
+
+def read_stream_token(token, subsubevent_id):
+    """The user id a stream token was issued to, or None if it is invalid, expired or for another event."""
+
+    try:
+        data = signing.loads(token, salt=STREAM_TOKEN_SALT, max_age=settings.LIVE_FEED_TOKEN_MAX_AGE)
+    except signing.BadSignature:
+        return None
+    if data.get("event") != int(subsubevent_id):
+        return None
+    return data.get("user")
+
+
+def _format(event_id, payload):
+    return f"id: {event_id}\nevent: {payload.get('type', 'message')}\ndata: {json.dumps(payload, default=str)}\n\n"
+
+
+async def event_stream(channel, last_event_id=None):
+    """
+    Yield SSE frames for ``channel`` until ``LIVE_FEED_MAX_DURATION`` elapses.
+
+    Without ``last_event_id`` the stream starts at the current end of the
+    channel. Closing periodically bounds the lifetime of abandoned
+    connections; ``EventSource`` reconnects on its own and resumes from the
+    last id it saw.
+    """
+
+    broker = get_broker()
+    position = last_event_id if last_event_id is not None else broker.tail(channel)
+    deadline = time.monotonic() + settings.LIVE_FEED_MAX_DURATION
+    heartbeat_at = time.monotonic() + settings.LIVE_FEED_HEARTBEAT
+
+    yield f"retry: {int(settings.LIVE_FEED_RETRY_MS)}\n\n"
+    while time.monotonic() < deadline:
+        events, position = broker.read(channel, position)
+        for event_id, payload in events:
+            yield _format(event_id, payload)
+        if events:
+            heartbeat_at = time.monotonic() + settings.LIVE_FEED_HEARTBEAT
+        elif time.monotonic() >= heartbeat_at:
+            yield ": keepalive\n\n"
+            heartbeat_at = time.monotonic() + settings.LIVE_FEED_HEARTBEAT
+        await asyncio.sleep(settings.LIVE_FEED_POLL_INTERVAL)
@@ -0,0 +1,387 @@
+"""
+Request and database metrics rendered in the Prometheus text format.
+
+Each worker process keeps its counters in memory and a background thread
+writes a snapshot to ``METRICS_DIR`` (one JSON file per PID) at most once per
+``METRICS_FLUSH_INTERVAL``. The metrics endpoint
+merges every snapshot it finds, so the numbers cover all gunicorn workers no
+matter which one answers the scrape; snapshots of workers that have exited
+are deleted as they are read.
+"""
+
+import json
+import os
+import socket
+import tempfile
+import threading
+import time
+from contextlib import ExitStack
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.utils import timezone
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200, 500, 1000)
+QUERY_DURATION_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0)
+
+SNAPSHOT_PREFIX = "worker-"
+
+
+def _bucket_index(buckets, value):
+    for index, bound in enumerate(buckets):
+        if value <= bound:
+            return index
+    return len(buckets)
+
+
+class Histogram:
+    """Fixed-bucket histogram; the last slot holds observations above every bound."""
+
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets, counts=None, total=0.0, count=0):
+        self.buckets = buckets
+        self.counts = list(counts) if counts else [0] * (len(buckets) + 1)
+        self.sum = total
+        self.count = count
+
+    def observe(self, value):
+        self.counts[_bucket_index(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def merge(self, other):
+        for index, value in enumerate(other.counts):
+            self.counts[index] += value
+        self.sum += other.sum
+        self.count += other.count
+
+    def to_dict(self):
+        return {"counts": self.counts, "sum": self.sum, "count": self.count}
+
+    @classmethod
+    def from_dict(cls, buckets, data):
+        return cls(buckets, data.get("counts"), data.get("sum", 0.0), data.get("count", 0))
+
+
+class MetricsRegistry:
+    """In-memory counters for one worker process."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = {}
+        self.errors = {}
+        self.latency = {}
+        self.query_counts = {}
+        self.query_durations = Histogram(QUERY_DURATION_BUCKETS)
+        self.started_at = time.time()
+        self._dirty = False
+        self._flusher_pid = None
+
+    def observe_request(self, endpoint, method, status_code, duration, query_durations):
+        status_class = f"{status_code // 100}xx"
+        with self._lock:
+            request_key = (endpoint, method, status_class)
+            self.requests[request_key] = self.requests.get(request_key, 0) + 1
+            if status_code >= 500:
+                error_key = (endpoint, method)
+                self.errors[error_key] = self.errors.get(error_key, 0) + 1
+
+            latency = self.latency.get(endpoint)
+            if latency is None:
+                latency = self.latency[endpoint] = Histogram(LATENCY_BUCKETS)
+            latency.observe(duration)
+
+            query_count = self.query_counts.get(endpoint)
+            if query_count is None:
+                query_count = self.query_counts[endpoint] = Histogram(QUERY_COUNT_BUCKETS)
+            query_count.observe(len(query_durations))
+
+            for query_duration in query_durations:
+                self.query_durations.observe(query_duration)
+            self._dirty = True
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                "pid": os.getpid(),
+                "hostname": socket.gethostname(),
+                "started_at": self.started_at,
+                "updated_at": time.time(),
+                "requests": [[*key, value] for key, value in self.requests.items()],
+                "errors": [[*key, value] for key, value in self.errors.items()],
+                "latency": {key: value.to_dict() for key, value in self.latency.items()},
+                "query_counts": {key: value.to_dict() for key, value in self.query_counts.items()},
+                "query_durations": self.query_durations.to_dict(),
+            }
+
+    def flush(self, store):
+        self._dirty = False
+        store.write(self.snapshot())
+
+    def ensure_flusher(self, store):
+        """Start (once per process, so also after a fork) a thread that writes dirty snapshots."""
+
+        pid = os.getpid()
+        if self._flusher_pid == pid:
+            return
+        with self._lock:
+            if self._flusher_pid == pid:
+                return
+            self._flusher_pid = pid
+        threading.Thread(target=self._flush_forever, args=(store,), name="metrics-flusher", daemon=True).start()
+
+    def _flush_forever(self, store):
+        while True:
+            time.sleep(store.flush_interval)
+            if not self._dirty:
+                continue
+            try:
+                self.flush(store)
+            except OSError:
+                pass
+
+
+class SharedMetricsStore:
+    """Directory of per-worker snapshot files shared by all workers on the host."""
+
+    def __init__(self, directory, flush_interval=1.0):
+        self.directory = directory
+        self.flush_interval = flush_interval
+
+    def write(self, snapshot):
+        os.makedirs(self.directory, exist_ok=True)
+        target = os.path.join(self.directory, f"{SNAPSHOT_PREFIX}{snapshot['pid']}.json")
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "w") as handle:
+                json.dump(snapshot, handle)
+            os.replace(tmp_path, target)
+        except OSError:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+
+    def read_all(self):
+        try:
+            names = os.listdir(self.directory)
+        except FileNotFoundError:
+            return []
+
+        hostname = socket.gethostname()
+        snapshots = []
+        for name in names:
+            if not name.startswith(SNAPSHOT_PREFIX):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                with open(path) as handle:
+                    snapshot = json.load(handle)
+            except (OSError, ValueError):
+                continue
+            if snapshot.get("hostname") == hostname and not _pid_alive(snapshot.get("pid", 0)):
+                # The worker that wrote this file has exited; drop it so the
+                # directory does not grow with every gunicorn restart.
+                try:
+                    os.unlink(path)
+                except OSError:
+                    pass
+                continue
+            snapshots.append(snapshot)
+        return snapshots
+
+
+registry = MetricsRegistry()
+
+
+def get_store():
+    return SharedMetricsStore(settings.METRICS_DIR, settings.METRICS_FLUSH_INTERVAL)
+
+
+def _endpoint_label(request):
+    match = getattr(request, "resolver_match", None)
+    if match is None:
+        return "unmatched"
+    return match.url_name or match.route or "unmatched"
+
+
+class MetricsMiddleware:
+    """Times every request and records the queries it ran on each database alias."""
+
+    def __init__(self, get_response):
+        if not getattr(settings, "METRICS_ENABLED", False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.store = get_store()
+
+    def __call__(self, request):
+        registry.ensure_flusher(self.store)
+        query_durations = []
+
+        def record_query(execute, sql, params, many, context):
+            started = time.perf_counter()
+            try:
+                return execute(sql, params, many, context)
+            finally:
+                query_durations.append(time.perf_counter() - started)
+
+        started = time.perf_counter()
+        status_code = 500
+        try:
+            with ExitStack() as stack:
+                for alias in connections:
+                    stack.enter_context(connections[alias].execute_wrapper(record_query))
+                response = self.get_response(request)
+            status_code = response.status_code
+            return response
+        finally:
+            registry.observe_request(
+                _endpoint_label(request),
+                request.method,
+                status_code,
+                time.perf_counter() - started,
+                query_durations,
+            )
+
+
+def _pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(**labels):
+    if not labels:
+        return ""
+    body = ",".join(f'{key}="{_escape(value)}"' for key, value in labels.items())
+    return "{" + body + "}"
+
+
+def _format_bound(bound):
+    return repr(float(bound))
+
+
+class _Writer:
+    def __init__(self):
+        self.lines = []
+
+    def header(self, name, metric_type, help_text):
+        self.lines.append(f"# HELP {name} {help_text}")
+        self.lines.append(f"# TYPE {name} {metric_type}")
+
+    def sample(self, name, value, **labels):
+        self.lines.append(f"{name}{_labels(**labels)} {value}")
+
+    def histogram(self, name, histogram, **labels):
+        cumulative = 0
+        for bound, count in zip(histogram.buckets, histogram.counts):
+            cumulative += count
+            self.sample(f"{name}_bucket", cumulative, **labels, le=_format_bound(bound))
+        self.sample(f"{name}_bucket", histogram.count, **labels, le="+Inf")
+        self.sample(f"{name}_sum", round(histogram.sum, 6), **labels)
+        self.sample(f"{name}_count", histogram.count, **labels)
+
+    def render(self):
+        return "\n".join(self.lines) + "\n"
+
+
+def merge_snapshots(snapshots):
+    requests = {}
+    errors = {}
+    latency = {}
+    query_counts = {}
+    query_durations = Histogram(QUERY_DURATION_BUCKETS)
+
+    for snapshot in snapshots:
+        for endpoint, method, status_class, value in snapshot.get("requests", []):
+            key = (endpoint, method, status_class)
+            requests[key] = requests.get(key, 0) + value
+        for endpoint, method, value in snapshot.get("errors", []):
+            key = (endpoint, method)
+            errors[key] = errors.get(key, 0) + value
+        for endpoint, data in snapshot.get("latency", {}).items():
+            latency.setdefault(endpoint, Histogram(LATENCY_BUCKETS)).merge(
+                Histogram.from_dict(LATENCY_BUCKETS, data)
+            )
+        for endpoint, data in snapshot.get("query_counts", {}).items():
+            query_counts.setdefault(endpoint, Histogram(QUERY_COUNT_BUCKETS)).merge(
+                Histogram.from_dict(QUERY_COUNT_BUCKETS, data)
+            )
+        query_durations.merge(
+            Histogram.from_dict(QUERY_DURATION_BUCKETS, snapshot.get("query_durations", {}))
+        )
+
+    return requests, errors, latency, query_counts, query_durations
+
+
+def domain_gauges():
+    """Per-minute activity gauges read straight from the database."""
+
+    from api.models import Project
+    from eval.models import Evaluation
+
+    since = timezone.now() - timedelta(minutes=1)
+    return {
+        "satchi_registrations_last_minute": (
+            "Projects registered during the last 60 seconds.",
+            Project.objects.filter(submitted_at__gte=since).count(),
+        ),
+        "satchi_evaluations_last_minute": (
+            "Evaluations created during the last 60 seconds.",
+            Evaluation.objects.filter(submitted_at__gte=since).count(),
+        ),
+    }
+
+
+def render_metrics(snapshots, gauges):
+    requests, errors, latency, query_counts, query_durations = merge_snapshots(snapshots)
+    writer = _Writer()
+
+    writer.header("satchi_http_requests_total", "counter", "HTTP requests by endpoint, method and status class.")
+    for (endpoint, method, status_class), value in sorted(requests.items()):
+        writer.sample("satchi_http_requests_total", value, endpoint=endpoint, method=method, status=status_class)
+
+    writer.header("satchi_http_errors_total", "counter", "HTTP requests that ended with a 5xx status.")
+    for (endpoint, method), value in sorted(errors.items()):
+        writer.sample("satchi_http_errors_total", value, endpoint=endpoint, method=method)
+
+    writer.header("satchi_http_request_duration_seconds", "histogram", "Request latency by endpoint.")
+    for endpoint, histogram in sorted(latency.items()):
+        writer.histogram("satchi_http_request_duration_seconds", histogram, endpoint=endpoint)
+
+    writer.header("satchi_db_queries_per_request", "histogram", "Database queries issued per request by endpoint.")
+    for endpoint, histogram in sorted(query_counts.items()):
+        writer.histogram("satchi_db_queries_per_request", histogram, endpoint=endpoint)
+
+    writer.header("satchi_db_query_duration_seconds", "histogram", "Duration of individual database queries.")
+    writer.histogram("satchi_db_query_duration_seconds", query_durations)
+
+    writer.header("satchi_worker_info", "gauge", "Live worker processes that have reported metrics.")
+    for snapshot in sorted(snapshots, key=lambda item: item.get("pid", 0)):
+        pid = snapshot.get("pid")
+        if pid is None or not _pid_alive(pid):
+            continue
+        writer.sample(
+            "satchi_worker_info",
+            1,
+            pid=pid,
+            hostname=snapshot.get("hostname", ""),
+            started_at=int(snapshot.get("started_at", 0)),
+        )
+
+    for name, (help_text, value) in gauges.items():
+        writer.header(name, "gauge", help_text)
+        writer.sample(name, value)
+
+    return writer.render()
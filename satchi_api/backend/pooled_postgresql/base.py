@@ -0,0 +1,62 @@
+"""
+PostgreSQL backend that borrows connections from ``backend.db_pool``.
+
+Django opens a connection at the first query of a request and, with
+``CONN_MAX_AGE = 0``, closes it when the request finishes; this backend turns
+those into a pool checkout and a return. Pool settings come from the
+database's ``POOL`` dict (``SIZE``, ``MAX_OVERFLOW``, ``TIMEOUT``, ``RECYCLE``).
+"""
+
+from django.db.backends.postgresql.base import DatabaseWrapper as PostgresDatabaseWrapper
+from psycopg2 import extensions
+
+from backend.db_pool import ConnectionPool, PoolTimeout, get_pool
+
+
+class PoolExhausted(PostgresDatabaseWrapper.Database.OperationalError):
+    pass
+
+
+def _reusable(connection):
+    return (
+        not connection.closed
+        and connection.get_transaction_status() != extensions.TRANSACTION_STATUS_UNKNOWN
+    )
+
+
+def _reset(connection):
+    if connection.get_transaction_status() != extensions.TRANSACTION_STATUS_IDLE:
+        connection.rollback()
+
+
+class DatabaseWrapper(PostgresDatabaseWrapper):
+    def _pool(self, conn_params):
+        options = self.settings_dict.get("POOL", {})
+        key = (self.alias, tuple(sorted((name, repr(value)) for name, value in conn_params.items())))
+        connect = super().get_new_connection
+        return get_pool(
+            key,
+            lambda: ConnectionPool(
+                lambda: connect(conn_params),
+                size=int(options.get("SIZE", 5)),
+                max_overflow=int(options.get("MAX_OVERFLOW", 5)),
+                timeout=float(options.get("TIMEOUT", 10)),
+                recycle=float(options.get("RECYCLE", 1800)),
+                reusable=_reusable,
+                reset=_reset,
+            ),
+        )
+
+    def get_new_connection(self, conn_params):
+        try:
+            return self._pool(conn_params).checkout()
+        except PoolTimeout as exc:
+            raise PoolExhausted(str(exc)) from exc
+
+    def _close(self):
+        if self.connection is not None:
+            with self.wrap_database_errors:
+                self._pool(self.get_connection_params()).release(self.connection)
+
+    def pool_stats(self):
+        return self._pool(self.get_connection_params()).stats()
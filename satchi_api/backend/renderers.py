@@ -0,0 +1,100 @@
+"""
+JSON rendering for API responses.
+
+``FastJSONRenderer`` encodes with orjson when it is installed and falls back
+to DRF's stdlib encoder otherwise; both produce the same bytes as DRF's
+``JSONRenderer`` with the default compact/unicode settings. Datetimes,
+dates, UUIDs, dicts and lists are encoded natively by orjson. Anything else
+(``Decimal``, lazy strings, querysets) goes through DRF's ``JSONEncoder``,
+which is only reached for the rare values views leave unconverted.
+
+``JSONGzipMiddleware`` gzips JSON responses of at least
+``API_GZIP_MIN_BYTES`` when the client accepts it; ``0`` turns compression
+off. Compressing the finished response, rather than inside ``render()``,
+keeps other renderers that embed this one (the browsable API calls it with
+``indent=4`` and decodes the result) working on plain bytes.
+"""
+
+import json
+import re
+
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+from django.utils.text import compress_string
+from rest_framework.renderers import JSONRenderer
+from rest_framework.settings import api_settings
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is in requirements.txt
+    orjson = None
+
+_ACCEPTS_GZIP = re.compile(r"\bgzip\b")
+_drf_default = JSONEncoder().default
+
+
+def dumps(data):
+    """Compact UTF-8 JSON bytes for ``data``, identical to DRF's default rendering."""
+
+    if orjson is not None:
+        body = orjson.dumps(data, default=_drf_default, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_UTC_Z)
+        if b"\xe2\x80\xa8" in body or b"\xe2\x80\xa9" in body:
+            # DRF escapes the JavaScript line terminators; orjson writes them raw.
+            body = body.replace(b"\xe2\x80\xa8", b"\\u2028").replace(b"\xe2\x80\xa9", b"\\u2029")
+        return body
+    body = json.dumps(
+        data, cls=JSONEncoder, ensure_ascii=False, allow_nan=not api_settings.STRICT_JSON, separators=(",", ":")
+    )
+    return body.replace("\u2028", "\\u2028").replace("\u2029", "\\u2029").encode()
+
+
+def gzip_body(request, response, body):
+    """Return ``body`` gzipped (and mark ``response``) when it is large enough and the client accepts gzip."""
+
+    threshold = settings.API_GZIP_MIN_BYTES
+    if (
+        not threshold
+        or len(body) < threshold
+        or request is None
+        or response is None
+        or response.has_header("Content-Encoding")
+        or not _ACCEPTS_GZIP.search(request.headers.get("Accept-Encoding", ""))
+    ):
+        return body
+    compressed = compress_string(body)
+    patch_vary_headers(response, ("Accept-Encoding",))
+    if len(compressed) >= len(body):
+        return body
+    response["Content-Encoding"] = "gzip"
+    return compressed
+
+
+class FastJSONRenderer(JSONRenderer):
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        renderer_context = renderer_context or {}
+        if (
+            orjson is None
+            or not api_settings.COMPACT_JSON
+            or not api_settings.UNICODE_JSON
+            or self.get_indent(accepted_media_type, renderer_context)
+        ):
+            body = super().render(data, accepted_media_type, renderer_context)
+        elif data is None:
+            body = b""
+        else:
+            body = dumps(data)
+        return body
+
+
+class JSONGzipMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if not response.streaming and response.get("Content-Type", "").startswith("application/json"):
+            response.content = gzip_body(request, response, response.content)
+            if response.has_header("Content-Encoding"):
+                response["Content-Length"] = str(len(response.content))
+        return response
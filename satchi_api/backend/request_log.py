@@ -0,0 +1,149 @@
+"""
+Structured, sampled logging for submission endpoints.
+
+``log_submission`` wraps a DRF view and emits one compact JSON line per call
+on the ``satchi.requests`` logger: the endpoint name, status, duration, user
+and whatever ids and counts the view attached with ``submission_event``.
+The request payload is only serialised for failing requests and for a
+``REQUEST_LOG_SAMPLE_RATE`` fraction of successful ones, with credentials
+and personal contact fields (``REDACTED_KEYS``) masked. When logging is
+disabled the wrapper calls the view directly and ``submission_event``
+returns a shared no-op object, so nothing is allocated or formatted.
+"""
+
+import json
+import logging
+import random
+import time
+from functools import wraps
+
+from django.conf import settings
+from django.http import Http404
+from rest_framework.exceptions import APIException
+
+logger = logging.getLogger("satchi.requests")
+
+# credentials, and the names and contact details of participants, captains and mentors
+REDACTED_KEYS = frozenset({
+    "password", "token", "access", "refresh",
+    "name", "full_name", "username", "email", "phone",
+    "captain_name", "captain_email", "captain_phone", "faculty_mentor_name",
+})
+
+
+class _NullEvent:
+    __slots__ = ()
+
+    def add(self, **fields):
+        pass
+
+    def __bool__(self):
+        return False
+
+
+NULL_EVENT = _NullEvent()
+
+
+class SubmissionEvent:
+    __slots__ = ("name", "fields", "started", "sampled")
+
+    def __init__(self, name, sampled):
+        self.name = name
+        self.fields = {}
+        self.started = time.perf_counter()
+        self.sampled = sampled
+
+    def add(self, **fields):
+        self.fields.update(fields)
+
+    def __bool__(self):
+        return True
+
+
+def _enabled():
+    return settings.REQUEST_LOG_ENABLED and logger.isEnabledFor(logging.INFO)
+
+
+def _redact(value):
+    if isinstance(value, dict):
+        return {key: "***" if key in REDACTED_KEYS else _redact(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_redact(item) for item in value]
+    return value
+
+
+def _capture_body(request):
+    try:
+        data = request.data
+    except Exception:
+        return None
+    if hasattr(data, "dict"):
+        data = data.dict()
+    body = json.dumps(_redact(data), default=str, separators=(",", ":"))
+    limit = settings.REQUEST_LOG_BODY_LIMIT
+    return body if len(body) <= limit else body[:limit] + "...(truncated)"
+
+
+def _status_for_exception(exc):
+    if isinstance(exc, APIException):
+        return exc.status_code
+    if isinstance(exc, Http404):
+        return 404
+    return 500
+
+
+def _emit(request, event, status_code, error=None):
+    failed = status_code >= 400
+    record = {
+        "event": event.name,
+        "status": status_code,
+        "duration_ms": round((time.perf_counter() - event.started) * 1000, 2),
+        "user_id": getattr(request.user, "id", None),
+        **event.fields,
+    }
+    if error is not None:
+        record["error"] = error
+    if failed or event.sampled:
+        record["body"] = _capture_body(request)
+
+    if status_code >= 500:
+        level = logging.ERROR
+    elif failed:
+        level = logging.WARNING
+    else:
+        level = logging.INFO
+    logger.log(level, json.dumps(record, default=str, separators=(",", ":")))
+
+
+def submission_event(request):
+    """The event attached to ``request`` by ``log_submission``, or a no-op stand-in."""
+
+    return getattr(request, "_submission_event", NULL_EVENT)
+
+
+def log_submission(name):
+    """Decorate a DRF view (below ``@api_view``) to log one event per call."""
+
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if not _enabled():
+                return view(request, *args, **kwargs)
+
+            event = SubmissionEvent(name, sampled=random.random() < settings.REQUEST_LOG_SAMPLE_RATE)
+            request._submission_event = event
+            try:
+                response = view(request, *args, **kwargs)
+            except Exception as exc:
+                _emit(request, event, _status_for_exception(exc), error=type(exc).__name__)
+                raise
+
+            error = None
+            if response.status_code >= 400 and isinstance(getattr(response, "data", None), dict):
+                error = response.data.get("error")
+            _emit(request, event, response.status_code, error=error)
+            return response
+
+        return wrapper
+
+    return decorator
@@ -1,7 +1,10 @@
 import os
+import sys
+import tempfile
 from pathlib import Path
 
 import dj_database_url
+from corsheaders.defaults import default_headers
 from dotenv import load_dotenv
 
 
@@ -25,6 +28,8 @@ def env_list(name: str, default: str = "") -> list[str]:
     return [item.strip() for item in value.split(",") if item.strip()]
 
 
+TESTING = len(sys.argv) > 1 and sys.argv[1] == "test"
+
 SECRET_KEY = os.getenv("DJANGO_SECRET_KEY", "django-insecure-change-me")
 DEBUG = env_bool("DJANGO_DEBUG", True)
 
@@ -40,6 +45,7 @@ CORS_ALLOWED_ORIGINS = env_list(
     "DJANGO_CORS_ALLOWED_ORIGINS",
     "http://localhost:5173,http://127.0.0.1:5173",
 )
+CORS_ALLOW_HEADERS = (*default_headers, "x-registration-ticket")
 
 INSTALLED_APPS = [
     "django.contrib.admin",
@@ -55,6 +61,7 @@ INSTALLED_APPS = [
     "users",
     "events",
     "eval",
+    "perf",
 ]
 
 REST_FRAMEWORK = {
@@ -64,9 +71,18 @@ REST_FRAMEWORK = {
     "DEFAULT_PERMISSION_CLASSES": [
         "rest_framework.permissions.IsAuthenticated",
     ],
+    "DEFAULT_RENDERER_CLASSES": [
+        "backend.renderers.FastJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
 }
+# JSON bodies at least this large are gzipped (backend.renderers.JSONGzipMiddleware)
+# for clients that accept it; 0 disables.
+API_GZIP_MIN_BYTES = int(os.getenv("DJANGO_API_GZIP_MIN_BYTES", "16384"))
 
 MIDDLEWARE = [
+    "backend.metrics.MetricsMiddleware",
+    "backend.renderers.JSONGzipMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "whitenoise.middleware.WhiteNoiseMiddleware",
     "corsheaders.middleware.CorsMiddleware",
@@ -76,6 +92,7 @@ MIDDLEWARE = [
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    "backend.db_router.PrimaryPinningMiddleware",
 ]
 
 ROOT_URLCONF = "backend.urls"
@@ -107,6 +124,50 @@ DATABASES = {
     )
 }
 
+# Reporting views marked with backend.db_router.reporting_read read from this
+# alias. Under the test runner it mirrors the test database so routing can be
+# exercised with two aliases; REPLICA_READS_ENABLED stays off unless a test
+# turns it on.
+DATABASE_REPLICA_URL = os.getenv("DATABASE_REPLICA_URL", "")
+if DATABASE_REPLICA_URL or TESTING:
+    DATABASES["replica"] = {
+        **(
+            dj_database_url.parse(
+                DATABASE_REPLICA_URL,
+                conn_max_age=int(os.getenv("DATABASE_CONN_MAX_AGE", "600")),
+                conn_health_checks=True,
+                ssl_require=env_bool("DATABASE_SSL_REQUIRE", False),
+            )
+            if DATABASE_REPLICA_URL
+            else DATABASES["default"]
+        ),
+        "TEST": {"MIRROR": "default"},
+    }
+REPLICA_DATABASE_ALIAS = "replica"
+REPLICA_READS_ENABLED = bool(DATABASE_REPLICA_URL)
+# After a successful write, the client's reporting reads stay on the primary for
+# this long so it does not read its own write from a lagging replica.
+REPLICA_PIN_SECONDS = int(os.getenv("DATABASE_REPLICA_PIN_SECONDS", "10"))
+DATABASE_ROUTERS = ["backend.db_router.ReplicaRouter"]
+
+# Pooled PostgreSQL: each worker checks connections out of a bounded in-process
+# pool instead of holding one persistent connection per thread. The test runner
+# keeps the stock backend because a pool would hold the test database open.
+DATABASE_POOL_ENABLED = env_bool("DATABASE_POOL_ENABLED", False) and not TESTING
+for database in DATABASES.values():
+    if DATABASE_POOL_ENABLED and database["ENGINE"] == "django.db.backends.postgresql":
+        database.update(
+            ENGINE="backend.pooled_postgresql",
+            CONN_MAX_AGE=0,
+            CONN_HEALTH_CHECKS=False,
+            POOL={
+                "SIZE": int(os.getenv("DATABASE_POOL_SIZE", "5")),
+                "MAX_OVERFLOW": int(os.getenv("DATABASE_POOL_MAX_OVERFLOW", "5")),
+                "TIMEOUT": float(os.getenv("DATABASE_POOL_TIMEOUT", "10")),
+                "RECYCLE": float(os.getenv("DATABASE_POOL_RECYCLE", "1800")),
+            },
+        )
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         "NAME": "django.contrib.auth.password_validation.UserAttributeSimilarityValidator",
@@ -155,5 +216,76 @@ SECURE_CONTENT_TYPE_NOSNIFF = env_bool("DJANGO_SECURE_CONTENT_TYPE_NOSNIFF", Tru
 SECURE_REFERRER_POLICY = os.getenv("DJANGO_SECURE_REFERRER_POLICY", "same-origin")
 X_FRAME_OPTIONS = os.getenv("DJANGO_X_FRAME_OPTIONS", "DENY")
 
+METRICS_ENABLED = env_bool("DJANGO_METRICS_ENABLED", True)
+METRICS_DIR = os.getenv(
+    "DJANGO_METRICS_DIR", os.path.join(tempfile.gettempdir(), "satchi-metrics")
+)
+METRICS_FLUSH_INTERVAL = float(os.getenv("DJANGO_METRICS_FLUSH_INTERVAL", "1.0"))
+METRICS_TOKEN = os.getenv("DJANGO_METRICS_TOKEN", "")
+
+REQUEST_LOG_ENABLED = env_bool("DJANGO_REQUEST_LOG_ENABLED", not TESTING)
+REQUEST_LOG_SAMPLE_RATE = float(os.getenv("DJANGO_REQUEST_LOG_SAMPLE_RATE", "0.01"))
+REQUEST_LOG_BODY_LIMIT = int(os.getenv("DJANGO_REQUEST_LOG_BODY_LIMIT", "4096"))
+
+LIVE_FEED_ENABLED = env_bool("DJANGO_LIVE_FEED_ENABLED", True)
+LIVE_FEED_BROKER = os.getenv("DJANGO_LIVE_FEED_BROKER", "spool")
+LIVE_FEED_DIR = os.getenv(
+    "DJANGO_LIVE_FEED_DIR", os.path.join(tempfile.gettempdir(), "satchi-live")
+)
+LIVE_FEED_POLL_INTERVAL = float(os.getenv("DJANGO_LIVE_FEED_POLL_INTERVAL", "0.5"))
+LIVE_FEED_HEARTBEAT = float(os.getenv("DJANGO_LIVE_FEED_HEARTBEAT", "15"))
+LIVE_FEED_MAX_DURATION = float(os.getenv("DJANGO_LIVE_FEED_MAX_DURATION", "300"))
+LIVE_FEED_RETRY_MS = int(os.getenv("DJANGO_LIVE_FEED_RETRY_MS", "3000"))
+# a channel's spool file is rotated past this size; one previous segment is kept
+LIVE_FEED_SPOOL_MAX_BYTES = int(os.getenv("DJANGO_LIVE_FEED_SPOOL_MAX_BYTES", str(4 * 1024 * 1024)))
+# lifetime of the signed ?stream_token= issued by live_feed_token
+LIVE_FEED_TOKEN_MAX_AGE = int(os.getenv("DJANGO_LIVE_FEED_TOKEN_MAX_AGE", "900"))
+
+# Route the read-only endpoints to their async views; set when serving backend.asgi
+# with uvicorn workers (see docker-compose's SERVER_MODE).
+ASYNC_READ_VIEWS = env_bool("DJANGO_ASYNC_READ_VIEWS", False)
+
+# Waiting room for submit_project (api.waiting_room): per-event token bucket.
+REGISTRATION_QUEUE_ENABLED = env_bool("DJANGO_REGISTRATION_QUEUE_ENABLED", not TESTING)
+REGISTRATION_QUEUE_BACKEND = os.getenv("DJANGO_REGISTRATION_QUEUE_BACKEND", "file")
+REGISTRATION_QUEUE_DIR = os.getenv(
+    "DJANGO_REGISTRATION_QUEUE_DIR", os.path.join(tempfile.gettempdir(), "satchi-registration-queue")
+)
+REGISTRATION_QUEUE_RATE = float(os.getenv("DJANGO_REGISTRATION_QUEUE_RATE", "5"))
+REGISTRATION_QUEUE_BURST = int(os.getenv("DJANGO_REGISTRATION_QUEUE_BURST", "10"))
+REGISTRATION_QUEUE_TICKET_MAX_AGE = int(os.getenv("DJANGO_REGISTRATION_QUEUE_TICKET_MAX_AGE", "1800"))
+
+# Promotion of waitlisted teams (api.waitlist) after a registration is deleted.
+WAITLIST_RUNNER = os.getenv("DJANGO_WAITLIST_RUNNER", "inline" if TESTING else "thread")
+
+# minFemaleParticipants: how team members without an account (or without sex on
+# it) are treated - "ignore" (not counted), "count" (counted) or "reject".
+FEMALE_PARTICIPANTS_UNREGISTERED_POLICY = os.getenv("DJANGO_FEMALE_PARTICIPANTS_UNREGISTERED_POLICY", "ignore")
+
+# Event deletes (events.purge) and archives (events.archive): trees with more
+# projects than the threshold are handled by a background job; "inline" runs
+# jobs in the request instead.
+EVENT_PURGE_RUNNER = os.getenv("DJANGO_EVENT_PURGE_RUNNER", "inline" if TESTING else "thread")
+EVENT_PURGE_CHUNK_SIZE = int(os.getenv("DJANGO_EVENT_PURGE_CHUNK_SIZE", "1000"))
+EVENT_PURGE_ASYNC_THRESHOLD = int(os.getenv("DJANGO_EVENT_PURGE_ASYNC_THRESHOLD", "500"))
+
+# Admin tree endpoints (events.admin_tree): nodes per page / search results per level.
+ADMIN_TREE_PAGE_SIZE = int(os.getenv("DJANGO_ADMIN_TREE_PAGE_SIZE", "100"))
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {
+        "console": {"class": "logging.StreamHandler"},
+    },
+    "loggers": {
+        "satchi.requests": {
+            "handlers": ["console"],
+            "level": os.getenv("DJANGO_REQUEST_LOG_LEVEL", "INFO"),
+            "propagate": False,
+        },
+    },
+}
+
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 AUTH_USER_MODEL = "users.User"
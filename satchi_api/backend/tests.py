@@ -0,0 +1,534 @@
+import gzip
+import json
+import os
+import tempfile
+import threading
+import time
+import uuid
+from datetime import date, datetime, timezone as dt_timezone
+from decimal import Decimal
+
+from asgiref.sync import async_to_sync
+from django.conf import settings
+from django.db import connections
+from django.http import HttpResponse
+from django.test import AsyncRequestFactory, SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.authtoken.models import Token
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import AllowAny
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.serializer_helpers import ReturnDict
+from rest_framework.response import Response
+from rest_framework.test import APIRequestFactory
+
+from api import views as api_views
+from api.models import Project, TeamMember, UserProjectMembership
+from backend import db_pool, db_router, live, metrics, renderers, request_log
+from eval import views as eval_views
+from eval.models import Rubric, SubSubEventJudge
+from events import views as event_views
+from events.models import MainEvent, SubEvent, SubSubEvent
+from users.models import User
+
+
+class MetricsEndpointTests(TestCase):
+    def setUp(self):
+        self.metrics_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.metrics_dir.cleanup)
+        override = override_settings(METRICS_DIR=self.metrics_dir.name, METRICS_TOKEN="secret")
+        override.enable()
+        self.addCleanup(override.disable)
+
+    def _scrape(self, **headers):
+        return self.client.get("/api/metrics/", secure=True, **headers)
+
+    def test_metrics_exposes_request_counters_and_histograms(self):
+        self.client.get("/api/health/", secure=True)
+        response = self._scrape(HTTP_AUTHORIZATION="Bearer secret")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response["Content-Type"].startswith("text/plain"))
+        body = response.content.decode()
+        self.assertIn('satchi_http_requests_total{endpoint="api/health/",method="GET",status="2xx"}', body)
+        self.assertIn('satchi_http_request_duration_seconds_bucket{endpoint="api/health/",le="+Inf"}', body)
+        self.assertIn('satchi_db_queries_per_request_count{endpoint="api/health/"}', body)
+        self.assertIn("satchi_worker_info{", body)
+        self.assertIn("satchi_registrations_last_minute 0", body)
+
+    def test_metrics_requires_token(self):
+        self.assertEqual(self._scrape().status_code, 403)
+        self.assertEqual(self._scrape(HTTP_AUTHORIZATION="Bearer wrong").status_code, 403)
+        self.assertEqual(self._scrape(HTTP_AUTHORIZATION="Bearer secret").status_code, 200)
+
+    @override_settings(METRICS_TOKEN="")
+    def test_metrics_without_token_is_staff_only(self):
+        self.assertEqual(self._scrape().status_code, 403)
+        member = User.objects.create_user(username="member", email="member@example.com", password="pw")
+        staff = User.objects.create_user(username="ops", email="ops@example.com", password="pw", is_staff=True)
+
+        self.client.force_login(member)
+        self.assertEqual(self._scrape().status_code, 403)
+        self.client.force_login(staff)
+        self.assertEqual(self._scrape().status_code, 200)
+
+    def test_snapshots_of_exited_workers_are_pruned(self):
+        store = metrics.SharedMetricsStore(self.metrics_dir.name)
+        live_worker = metrics.MetricsRegistry().snapshot()
+        dead_worker = dict(live_worker, pid=2**22 + 1)
+        store.write(live_worker)
+        store.write(dead_worker)
+
+        self.assertEqual([snapshot["pid"] for snapshot in store.read_all()], [os.getpid()])
+        self.assertEqual(os.listdir(self.metrics_dir.name), [f"worker-{os.getpid()}.json"])
+
+    def test_snapshots_from_several_workers_are_summed(self):
+        first = metrics.MetricsRegistry()
+        second = metrics.MetricsRegistry()
+        first.observe_request("get_events", "GET", 200, 0.02, [0.001])
+        second.observe_request("get_events", "GET", 200, 0.2, [0.001, 0.002])
+        second.observe_request("get_events", "GET", 503, 0.3, [])
+
+        body = metrics.render_metrics([first.snapshot(), second.snapshot()], {})
+
+        self.assertIn('satchi_http_requests_total{endpoint="get_events",method="GET",status="2xx"} 2', body)
+        self.assertIn('satchi_http_errors_total{endpoint="get_events",method="GET"} 1', body)
+        self.assertIn('satchi_http_request_duration_seconds_count{endpoint="get_events"} 3', body)
+        self.assertIn("satchi_db_query_duration_seconds_count 3", body)
+
+
+@api_view(["POST"])
+@permission_classes([AllowAny])
+@request_log.log_submission("test.submit")
+def _submit_view(request):
+    event = request_log.submission_event(request)
+    event.add(item_id=7)
+    if request.data.get("fail") == "response":
+        return Response({"error": "Nope."}, status=400)
+    if request.data.get("fail") == "raise":
+        raise ValidationError({"marks": "Expected a list of mark objects."})
+    return Response({"ok": True, "event": type(event).__name__}, status=201)
+
+
+@override_settings(REQUEST_LOG_ENABLED=True, REQUEST_LOG_SAMPLE_RATE=0.0)
+class RequestLogTests(SimpleTestCase):
+    def setUp(self):
+        self.factory = APIRequestFactory()
+
+    def _call(self, payload):
+        return _submit_view(self.factory.post("/submit/", payload, format="json"))
+
+    def _record(self, logs):
+        self.assertEqual(len(logs.records), 1)
+        return json.loads(logs.records[0].getMessage())
+
+    def test_success_logs_compact_event_without_body(self):
+        with self.assertLogs("satchi.requests", "INFO") as logs:
+            response = self._call({"password": "secret"})
+
+        self.assertEqual(response.status_code, 201)
+        record = self._record(logs)
+        self.assertEqual(logs.records[0].levelname, "INFO")
+        self.assertEqual(record["event"], "test.submit")
+        self.assertEqual(record["status"], 201)
+        self.assertEqual(record["item_id"], 7)
+        self.assertIn("duration_ms", record)
+        self.assertNotIn("body", record)
+
+    def test_failed_response_captures_redacted_body_and_error(self):
+        with self.assertLogs("satchi.requests", "INFO") as logs:
+            self._call({"fail": "response", "password": "secret"})
+
+        record = self._record(logs)
+        self.assertEqual(logs.records[0].levelname, "WARNING")
+        self.assertEqual(record["error"], "Nope.")
+        self.assertEqual(json.loads(record["body"]), {"fail": "response", "password": "***"})
+
+    def test_participant_contact_details_are_redacted(self):
+        with self.assertLogs("satchi.requests", "INFO") as logs:
+            self._call({
+                "fail": "response",
+                "team_name": "Rockets",
+                "captain_name": "Asha",
+                "captain_email": "asha@example.com",
+                "captain_phone": "9000000000",
+                "team_members": [{"name": "Ravi", "email": "ravi@example.com", "phone": "9000000001"}],
+            })
+
+        body = json.loads(self._record(logs)["body"])
+        self.assertEqual(body["team_name"], "Rockets")
+        self.assertEqual((body["captain_name"], body["captain_email"], body["captain_phone"]), ("***", "***", "***"))
+        self.assertEqual(body["team_members"], [{"name": "***", "email": "***", "phone": "***"}])
+
+    def test_exception_is_logged_and_reraised(self):
+        with self.assertLogs("satchi.requests", "INFO") as logs:
+            response = self._call({"fail": "raise"})
+
+        self.assertEqual(response.status_code, 400)
+        record = self._record(logs)
+        self.assertEqual(record["status"], 400)
+        self.assertEqual(record["error"], "ValidationError")
+        self.assertIn("body", record)
+
+    @override_settings(REQUEST_LOG_SAMPLE_RATE=1.0)
+    def test_sampled_success_captures_body(self):
+        with self.assertLogs("satchi.requests", "INFO") as logs:
+            self._call({"value": 1})
+
+        self.assertEqual(json.loads(self._record(logs)["body"]), {"value": 1})
+
+    @override_settings(REQUEST_LOG_ENABLED=False)
+    def test_disabled_logging_uses_null_event(self):
+        with self.assertNoLogs("satchi.requests"):
+            response = self._call({"value": 1})
+
+        self.assertEqual(response.data["event"], "_NullEvent")
+
+
+class LiveBrokerTests(SimpleTestCase):
+    def setUp(self):
+        self.spool_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.spool_dir.cleanup)
+
+    def test_spool_broker_resumes_from_offsets_and_skips_partial_lines(self):
+        broker = live.SpoolBroker(self.spool_dir.name)
+        self.assertEqual(broker.tail("subsubevent-1"), 0)
+        broker.append("subsubevent-1", {"type": "registration", "project_id": 1})
+        broker.append("subsubevent-1", {"type": "scored", "project_id": 1})
+
+        events, position = broker.read("subsubevent-1", 0)
+        self.assertEqual([payload["type"] for _, payload in events], ["registration", "scored"])
+        self.assertEqual(position, broker.tail("subsubevent-1"))
+        self.assertEqual(broker.read("subsubevent-1", events[0][0])[0][0][1]["type"], "scored")
+
+        with open(os.path.join(self.spool_dir.name, "subsubevent-1.jsonl"), "ab") as handle:
+            handle.write(b'{"type": "ra')
+        self.assertEqual(broker.read("subsubevent-1", position), ([], position))
+
+    def test_spool_broker_rotates_and_keeps_ids_increasing(self):
+        # each event line is 33 bytes, so the fourth append rotates the file
+        broker = live.SpoolBroker(self.spool_dir.name, max_bytes=100)
+        for index in range(6):
+            broker.append("subsubevent-1", {"type": "scored", "project_id": index})
+        path = os.path.join(self.spool_dir.name, "subsubevent-1.jsonl")
+        self.assertEqual(os.path.getsize(f"{path}.1"), 132)
+        self.assertFalse(os.path.exists(f"{path}.next"))
+
+        events, position = broker.read("subsubevent-1", 0)
+        self.assertEqual([payload["project_id"] for _, payload in events], list(range(6)))
+        ids = [event_id for event_id, _ in events]
+        self.assertEqual(ids, sorted(set(ids)))
+        self.assertEqual(position, broker.tail("subsubevent-1"))
+
+        # a reader left in the previous segment finishes it before moving on
+        resumed, _ = broker.read("subsubevent-1", ids[1])
+        self.assertEqual([event_id for event_id, _ in resumed], ids[2:])
+        self.assertEqual(broker.read("subsubevent-1", ids[4])[0], events[5:])
+
+    def test_memory_broker_ids_are_sequential(self):
+        broker = live.MemoryBroker()
+        broker.append("c", {"type": "a"})
+        broker.append("c", {"type": "b"})
+        self.assertEqual(broker.read("c", 1), ([(2, {"type": "b"})], 2))
+
+
+@override_settings(LIVE_FEED_ENABLED=True, LIVE_FEED_BROKER="spool")
+class LivePublishTests(TestCase):
+    def setUp(self):
+        self.spool_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.spool_dir.cleanup)
+        override = override_settings(LIVE_FEED_DIR=self.spool_dir.name)
+        override.enable()
+        self.addCleanup(override.disable)
+
+    def test_events_are_delivered_only_after_commit(self):
+        broker = live.get_broker()
+        with self.captureOnCommitCallbacks(execute=True):
+            live.publish(5, "registration", project_id=9)
+            self.assertEqual(broker.tail("subsubevent-5"), 0)
+
+        events, _ = broker.read("subsubevent-5", 0)
+        self.assertEqual(events[0][1]["type"], "registration")
+        self.assertEqual(events[0][1]["project_id"], 9)
+
+    @override_settings(LIVE_FEED_ENABLED=False)
+    def test_disabled_feed_publishes_nothing(self):
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            live.publish(5, "registration", project_id=9)
+        self.assertEqual(callbacks, [])
+
+
+class AsyncReadViewTests(TestCase):
+    def setUp(self):
+        main_event = MainEvent.objects.create(name="Main Event")
+        sub_event = SubEvent.objects.create(parent_event=main_event, name="Sub Event")
+        self.event = SubSubEvent.objects.create(
+            parent_event=main_event, parent_subevent=sub_event, name="Hackathon", minTeamSize=1, maxTeamSize=4
+        )
+        self.captain = User.objects.create_user(
+            username="captain@example.com", email="captain@example.com", password="pw", full_name="Captain"
+        )
+        self.token = Token.objects.create(user=self.captain).key
+        project = Project.objects.create(
+            event=self.event,
+            team_name="Rockets",
+            captain_user=self.captain,
+            captain_name="Captain",
+            captain_email="captain@example.com",
+            captain_phone="9000000000",
+        )
+        TeamMember.objects.create(project=project, name="Member", email="member@example.com", phone="9000000001")
+        UserProjectMembership.objects.create(user=self.captain, project=project, event=self.event)
+        SubSubEventJudge.objects.create(subsubevent=self.event, name="Judge Alice")
+        Rubric.objects.create(subsubevent=self.event, name="Design", max_mark=20)
+
+    def _call_async(self, view, path, token=None, **kwargs):
+        headers = {"Authorization": f"Token {token}"} if token else {}
+        request = AsyncRequestFactory().get(path, secure=True, headers=headers)
+        return async_to_sync(view)(request, **kwargs)
+
+    def _assert_same(self, path, async_view, token=None, **kwargs):
+        headers = {"HTTP_AUTHORIZATION": f"Token {token}"} if token else {}
+        expected = self.client.get(path, secure=True, **headers)
+        actual = self._call_async(async_view, path, token=token, **kwargs)
+        self.assertEqual(actual.status_code, expected.status_code)
+        self.assertEqual(json.loads(actual.content), expected.json())
+        return actual
+
+    def test_async_views_match_sync_payloads(self):
+        cases = [
+            ("/events/getEvents/", event_views.get_events_async, {}),
+            (f"/events/details/{self.event.id}/", event_views.getSubSubEventDetailsAsync, {"event_id": self.event.id}),
+            (
+                f"/eval/subsubevents/{self.event.id}/judges/",
+                eval_views.list_judges_for_subsubevent_async,
+                {"subsubevent_id": self.event.id},
+            ),
+            ("/api/public-stats/", api_views.get_public_stats_async, {}),
+            ("/api/my-registrations/", api_views.user_registrations_async, {}),
+        ]
+        for path, view, kwargs in cases:
+            with self.subTest(path=path):
+                response = self._assert_same(path, view, token=self.token, **kwargs)
+                self.assertEqual(response.status_code, 200)
+
+        events = json.loads(self._call_async(event_views.get_events_async, "/events/getEvents/", token=self.token).content)
+        self.assertTrue(events[0]["subEvents"][0]["subSubEvents"][0]["isRegistered"])
+        stats = json.loads(self._call_async(api_views.get_public_stats_async, "/api/public-stats/").content)
+        self.assertEqual(stats["participants_count"], 2)
+
+    def test_async_views_apply_the_same_permissions(self):
+        self._assert_same("/events/getEvents/", event_views.get_events_async)
+        self._assert_same(
+            "/eval/subsubevents/999/judges/", eval_views.list_judges_for_subsubevent_async, subsubevent_id=999
+        )
+        self._assert_same(
+            "/events/details/999/", event_views.getSubSubEventDetailsAsync, token=self.token, event_id=999
+        )
+
+        response = self._assert_same("/api/my-registrations/", api_views.user_registrations_async)
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(response["WWW-Authenticate"], "Token")
+        response = self._assert_same("/api/my-registrations/", api_views.user_registrations_async, token="bogus")
+        self.assertEqual(response.status_code, 401)
+
+        request = AsyncRequestFactory().post("/api/public-stats/")
+        self.assertEqual(async_to_sync(api_views.get_public_stats_async)(request).status_code, 405)
+
+    @override_settings(
+        API_GZIP_MIN_BYTES=1,
+        STORAGES={**settings.STORAGES, "staticfiles": {"BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"}},
+    )
+    def test_only_json_responses_are_gzipped(self):
+        headers = {"HTTP_AUTHORIZATION": f"Token {self.token}", "HTTP_ACCEPT_ENCODING": "gzip"}
+        response = self.client.get("/api/my-registrations/", secure=True, **headers)
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertEqual(int(response["Content-Length"]), len(response.content))
+        self.assertEqual(len(json.loads(gzip.decompress(response.content))["registrations"]), 1)
+
+        # the browsable API renders the JSON with indent=4 and decodes it into the page
+        response = self.client.get("/api/my-registrations/", secure=True, HTTP_ACCEPT="text/html", **headers)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response["Content-Type"].startswith("text/html"))
+        self.assertFalse(response.has_header("Content-Encoding"))
+
+
+class _FakeConnection:
+    def __init__(self):
+        self.closed = False
+        self.broken = False
+
+    def close(self):
+        self.closed = True
+
+
+class ConnectionPoolTests(SimpleTestCase):
+    def _pool(self, **options):
+        self.opened = []
+
+        def connect():
+            self.opened.append(_FakeConnection())
+            return self.opened[-1]
+
+        return db_pool.ConnectionPool(
+            connect, reusable=lambda conn: not conn.closed and not conn.broken, **options
+        )
+
+    def test_returned_connections_are_reused(self):
+        pool = self._pool(size=2, max_overflow=0)
+        first = pool.checkout()
+        pool.release(first)
+        self.assertIs(pool.checkout(), first)
+        self.assertEqual(len(self.opened), 1)
+        self.assertEqual(pool.stats()["checkouts"], 2)
+
+    def test_overflow_connections_are_closed_on_release(self):
+        pool = self._pool(size=1, max_overflow=1)
+        base, overflow = pool.checkout(), pool.checkout()
+        self.assertEqual(pool.stats()["overflow_in_use"], 1)
+        pool.release(base)
+        pool.release(overflow)
+
+        stats = pool.stats()
+        self.assertEqual((stats["open"], stats["idle"], stats["peak_in_use"]), (1, 1, 2))
+        self.assertTrue(overflow.closed)
+        self.assertFalse(base.closed)
+
+    def test_checkout_times_out_when_exhausted(self):
+        pool = self._pool(size=1, max_overflow=0, timeout=0.05)
+        pool.checkout()
+        with self.assertRaises(db_pool.PoolTimeout):
+            pool.checkout()
+        stats = pool.stats()
+        self.assertEqual((stats["waits"], stats["timeouts"]), (1, 1))
+
+    def test_waiting_checkout_gets_a_released_connection(self):
+        pool = self._pool(size=1, max_overflow=0, timeout=5)
+        held = pool.checkout()
+        timer = threading.Timer(0.05, pool.release, args=(held,))
+        timer.start()
+        self.addCleanup(timer.cancel)
+        self.assertIs(pool.checkout(), held)
+        self.assertEqual(pool.stats()["waits"], 1)
+
+    def test_broken_and_expired_connections_are_replaced(self):
+        pool = self._pool(size=2, max_overflow=0, recycle=0.01)
+        conn = pool.checkout()
+        pool.release(conn)
+        time.sleep(0.02)
+        self.assertIsNot(pool.checkout(), conn)
+        self.assertEqual(pool.stats()["recycled"], 1)
+
+        pool.recycle = 0
+        broken = pool.checkout()
+        broken.broken = True
+        pool.release(broken)
+        self.assertTrue(broken.closed)
+        self.assertEqual(pool.stats()["discarded"], 1)
+
+
+class HealthCheckTests(TestCase):
+    def test_health_check_reports_pool_only_when_pooled(self):
+        response = self.client.get("/api/health/", secure=True)
+        self.assertEqual(response.json(), {"status": "ok", "database": "available"})
+
+
+@override_settings(REPLICA_READS_ENABLED=True)
+class ReplicaRoutingTests(TransactionTestCase):
+    databases = {"default", "replica"}
+
+    def setUp(self):
+        self.main_event = MainEvent.objects.create(name="Main Event")
+        self.router = db_router.ReplicaRouter()
+        self.factory = APIRequestFactory()
+
+    def _queries(self, path, **extra):
+        with CaptureQueriesContext(connections["default"]) as primary, \
+                CaptureQueriesContext(connections["replica"]) as replica:
+            response = self.client.get(path, secure=True, **extra)
+        self.assertEqual(response.status_code, 200)
+        return len(primary), len(replica)
+
+    def test_only_reporting_views_read_from_the_replica(self):
+        primary, replica = self._queries("/api/public-stats/")
+        self.assertEqual(primary, 0)
+        self.assertGreater(replica, 0)
+
+        primary, replica = self._queries("/events/getEvents/")
+        self.assertGreater(primary, 0)
+        self.assertEqual(replica, 0)
+
+    def test_recent_writers_are_pinned_to_the_primary(self):
+        primary, replica = self._queries("/api/public-stats/", HTTP_COOKIE=f"{db_router.PIN_COOKIE}=1")
+        self.assertGreater(primary, 0)
+        self.assertEqual(replica, 0)
+
+    def test_writes_and_reads_after_them_use_the_primary(self):
+        observed = []
+
+        @db_router.reporting_read
+        def view(request):
+            event = MainEvent.objects.get(pk=self.main_event.pk)
+            observed.append(event._state.db)
+            event.save()
+            observed.append(self.router.db_for_read(MainEvent))
+            return None
+
+        view(self.factory.get("/"))
+        self.assertEqual(observed, ["replica", None])
+        self.assertIsNone(self.router.db_for_read(MainEvent))
+        self.assertEqual(self.router.db_for_write(MainEvent), "default")
+
+    def test_successful_writes_set_the_pin_cookie(self):
+        middleware = db_router.PrimaryPinningMiddleware(lambda request: Response(status=201))
+        response = middleware(self.factory.post("/"))
+        self.assertEqual(response.cookies[db_router.PIN_COOKIE]["max-age"], settings.REPLICA_PIN_SECONDS)
+
+        middleware = db_router.PrimaryPinningMiddleware(lambda request: Response(status=400))
+        self.assertNotIn(db_router.PIN_COOKIE, middleware(self.factory.post("/")).cookies)
+
+
+class FastJSONRendererTests(SimpleTestCase):
+    payload = {
+        "score": Decimal("8.50"),
+        "at": datetime(2026, 3, 1, 9, 30, 15, 120000, tzinfo=dt_timezone.utc),
+        "naive": datetime(2026, 3, 1, 9, 30),
+        "day": date(2026, 3, 1),
+        "id": uuid.UUID("12345678-1234-5678-1234-567812345678"),
+        "counts": {1: 2, "sdg": [7, 13]},
+        "name": "Équipe \u2028 Ünïcode",
+        "nested": ReturnDict({"ok": True, "none": None, "ratio": 0.1}, serializer=None),
+    }
+
+    def test_matches_drf_json_renderer(self):
+        expected = JSONRenderer().render(self.payload)
+        self.assertEqual(renderers.FastJSONRenderer().render(self.payload), expected)
+
+        original = renderers.orjson
+        renderers.orjson = None
+        self.addCleanup(setattr, renderers, "orjson", original)
+        self.assertEqual(renderers.FastJSONRenderer().render(self.payload), expected)
+
+    @override_settings(API_GZIP_MIN_BYTES=64)
+    def test_large_json_responses_are_gzipped_for_clients_that_accept_it(self):
+        data = {"rows": [{"team": f"Team {index}"} for index in range(50)]}
+
+        def respond(payload, content_type="application/json"):
+            return lambda request: HttpResponse(renderers.FastJSONRenderer().render(payload), content_type=content_type)
+
+        request = APIRequestFactory().get("/", HTTP_ACCEPT_ENCODING="gzip, deflate")
+        response = renderers.JSONGzipMiddleware(respond(data))(request)
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertIn("Accept-Encoding", response["Vary"])
+        self.assertEqual(json.loads(gzip.decompress(response.content)), data)
+
+        plain = renderers.JSONGzipMiddleware(respond(data))(APIRequestFactory().get("/"))
+        self.assertFalse(plain.has_header("Content-Encoding"))
+        self.assertEqual(json.loads(plain.content), data)
+
+        for small in (
+            renderers.JSONGzipMiddleware(respond({"ok": 1}))(request),
+            renderers.JSONGzipMiddleware(respond(data, "text/html; charset=utf-8"))(request),
+        ):
+            self.assertFalse(small.has_header("Content-Encoding"))
@@ -1,6 +1,16 @@
+import hmac
+
+from django.conf import settings
 from django.db import connections
 from django.db.utils import OperationalError
-from django.http import JsonResponse
+from django.http import HttpResponse, HttpResponseForbidden, JsonResponse
+
+from . import metrics as metrics_module
+
+
+def _pool_stats():
+    pool_stats = getattr(connections["default"], "pool_stats", None)
+    return pool_stats() if pool_stats is not None else None
 
 
 def health_check(_request):
@@ -9,13 +19,44 @@ def health_check(_request):
             cursor.execute("SELECT 1")
             cursor.fetchone()
     except OperationalError as exc:
-        return JsonResponse(
-            {
-                "status": "error",
-                "database": "unavailable",
-                "detail": str(exc),
-            },
-            status=503,
-        )
-
-    return JsonResponse({"status": "ok", "database": "available"})
+        payload = {
+            "status": "error",
+            "database": "unavailable",
+            "detail": str(exc),
+        }
+        status = 503
+    else:
+        payload = {"status": "ok", "database": "available"}
+        status = 200
+
+    pool = _pool_stats()
+    if pool is not None:
+        payload["pool"] = pool
+    return JsonResponse(payload, status=status)
+
+
+def _metrics_authorized(request):
+    """Scrapes need the ``METRICS_TOKEN`` bearer token or a signed-in staff session."""
+
+    token = settings.METRICS_TOKEN
+    if token:
+        supplied = request.headers.get("Authorization", "")
+        if hmac.compare_digest(supplied.encode(), f"Bearer {token}".encode()):
+            return True
+    user = getattr(request, "user", None)
+    return bool(user is not None and user.is_staff)
+
+
+def metrics(request):
+    if not _metrics_authorized(request):
+        return HttpResponseForbidden("Invalid metrics token.")
+
+    store = metrics_module.get_store()
+    try:
+        metrics_module.registry.flush(store)
+    except OSError:
+        pass
+
+    snapshots = store.read_all() or [metrics_module.registry.snapshot()]
+    body = metrics_module.render_metrics(snapshots, metrics_module.domain_gauges())
+    return HttpResponse(body, content_type="text/plain; version=0.0.4; charset=utf-8")
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.23 on 2026-10-19 15:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('eval', '0004_rubric_evaluationjudgerubricmark'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='evaluationjudgemark',
+            name='version',
+            field=models.PositiveIntegerField(default=1),
+        ),
+    ]
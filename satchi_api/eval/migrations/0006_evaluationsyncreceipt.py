@@ -0,0 +1,28 @@
+# Generated by Django 4.2.23 on 2026-10-19 15:58
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0002_mainevent_isopen_subevent_isopen_subsubevent_isopen'),
+        ('eval', '0005_evaluationjudgemark_version'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EvaluationSyncReceipt',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('idempotency_key', models.CharField(max_length=100)),
+                ('result', models.JSONField(default=dict)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('subsubevent', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='sync_receipts', to='events.subsubevent')),
+            ],
+            options={
+                'unique_together': {('subsubevent', 'idempotency_key')},
+            },
+        ),
+    ]
@@ -124,6 +124,9 @@ class EvaluationJudgeMark(models.Model):
     comments = models.TextField(blank=True, null=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    # bumped on every per-judge update; clients send it back for optimistic concurrency
+    version = models.PositiveIntegerField(default=1)
+
     class Meta:
         unique_together = ("evaluation", "judge_name")
 
@@ -171,3 +174,22 @@ class EvaluationJudgeRubricMark(models.Model):
 
     def __str__(self):
         return f"{self.rubric.name}: {self.mark} (judge: {self.judge_mark.judge_name})"
+
+
+class EvaluationSyncReceipt(models.Model):
+    """
+    Result of one item applied through the batch sync endpoint, keyed by the
+    client-generated idempotency key so a re-sent queue is not applied twice.
+    """
+    subsubevent = models.ForeignKey(
+        SubSubEvent, on_delete=models.CASCADE, related_name="sync_receipts"
+    )
+    idempotency_key = models.CharField(max_length=100)
+    result = models.JSONField(default=dict)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        unique_together = ("subsubevent", "idempotency_key")
+
+    def __str__(self):
+        return f"{self.idempotency_key} @ {self.subsubevent}"
@@ -0,0 +1,89 @@
+"""
+Per-SubSubEvent scoring configuration (judges and rubrics), cached in memory.
+
+Judges and rubrics change a couple of times per event but are read on every
+listing and every submitted mark. ``SubSubEvent.scoring_config_version`` is
+replaced whenever ``link_judges_to_subsubevent`` changes them, and the
+configuration is cached per process under ``(id, version)``. Callers already
+hold the ``SubSubEvent`` row, so a cache hit costs no query, and a worker
+whose copy is stale misses simply because the row it just read carries the
+new version. The version is a random UUID rather than a counter so a
+recreated event that happens to reuse an id never matches an old entry.
+
+Entries are immutable and shared between threads: write paths link rows by
+id (``subsubevent_judge_id``, ``rubric_id``) rather than by instance.
+"""
+
+import uuid
+from decimal import Decimal
+from functools import lru_cache
+from typing import NamedTuple
+
+from asgiref.sync import sync_to_async
+
+from events.models import SubSubEvent
+
+from .models import Rubric, SubSubEventJudge
+
+CACHE_SIZE = 512
+
+
+class JudgeConfig(NamedTuple):
+    id: int
+    name: str
+    order: int
+
+
+class RubricConfig(NamedTuple):
+    id: int
+    name: str
+    max_mark: Decimal
+
+
+class ScoringConfig:
+    __slots__ = ("subsubevent_id", "version", "judges", "rubrics", "judge_ids", "rubrics_by_name", "max_mark")
+
+    def __init__(self, subsubevent_id, version, judges, rubrics):
+        self.subsubevent_id = subsubevent_id
+        self.version = version
+        self.judges = tuple(judges)
+        self.rubrics = tuple(rubrics)
+        self.judge_ids = {judge.name: judge.id for judge in self.judges}
+        self.rubrics_by_name = {rubric.name: rubric for rubric in self.rubrics}
+        # the highest mark one judge can award through rubrics (None when marks are flat)
+        self.max_mark = sum((rubric.max_mark for rubric in self.rubrics), Decimal("0.00")) if self.rubrics else None
+
+    def payload(self):
+        return {
+            "subsubevent_id": self.subsubevent_id,
+            "judges": [judge._asdict() for judge in self.judges],
+            "rubrics": [{**rubric._asdict(), "max_mark": float(rubric.max_mark)} for rubric in self.rubrics],
+        }
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _load(subsubevent_id, version):
+    judges = SubSubEventJudge.objects.filter(subsubevent_id=subsubevent_id).order_by("order", "name")
+    rubrics = Rubric.objects.filter(subsubevent_id=subsubevent_id).order_by("id")
+    return ScoringConfig(
+        subsubevent_id,
+        version,
+        (JudgeConfig(*row) for row in judges.values_list("id", "name", "order")),
+        (RubricConfig(*row) for row in rubrics.values_list("id", "name", "max_mark")),
+    )
+
+
+def get_scoring_config(subsubevent):
+    """The judges and rubrics of ``subsubevent`` as of the version on the instance."""
+
+    return _load(subsubevent.id, subsubevent.scoring_config_version)
+
+
+aget_scoring_config = sync_to_async(get_scoring_config)
+
+
+def invalidate_scoring_config(subsubevent):
+    """Give ``subsubevent`` a new configuration version; call after changing its judges or rubrics."""
+
+    subsubevent.scoring_config_version = uuid.uuid4()
+    SubSubEvent.objects.filter(pk=subsubevent.pk).update(scoring_config_version=subsubevent.scoring_config_version)
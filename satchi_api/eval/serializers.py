@@ -12,25 +12,62 @@ class SubSubEventJudgeSerializer(serializers.ModelSerializer):
 
 
 class RubricInputSerializer(serializers.Serializer):
+    id = serializers.IntegerField(required=False)
+    name = serializers.CharField(max_length=200)
+    max_mark = serializers.DecimalField(max_digits=5, decimal_places=2, min_value=Decimal("0.01"))
+
+
+class JudgeInputSerializer(serializers.Serializer):
+    id = serializers.IntegerField(required=False)
     name = serializers.CharField(max_length=200)
-    max_mark = serializers.DecimalField(max_digits=5, decimal_places=2)
 
 
 class CreateJudgesSerializer(serializers.Serializer):
     """
     Input for linking judges to a subsubevent:
     { "subsubevent_id": 5, "names": ["Judge A", "Judge B"], "replace": true, "rubrics": [{"name": "Innovation", "max_mark": 10}] }
+
+    Judges may instead be sent as ``"judges": [{"id": 3, "name": "Judge A"}]``;
+    an ``id`` (on a judge or a rubric) renames that row instead of replacing it.
+    ``force`` allows changes that would detach or delete existing marks.
     """
     subsubevent_id = serializers.IntegerField()
-    names = serializers.ListField(child=serializers.CharField(max_length=200))
+    names = serializers.ListField(child=serializers.CharField(max_length=200), required=False)
+    judges = serializers.ListField(child=JudgeInputSerializer(), required=False)
     rubrics = serializers.ListField(child=RubricInputSerializer(), required=False, default=list)
     replace = serializers.BooleanField(default=False)
+    force = serializers.BooleanField(default=False)
 
     def validate_subsubevent_id(self, v):
         if not SubSubEvent.objects.filter(id=v).exists():
             raise serializers.ValidationError("SubSubEvent not found.")
         return v
 
+    @staticmethod
+    def _unique_names(entries):
+        seen = set()
+        for entry in entries:
+            entry["name"] = entry["name"].strip()
+            if not entry["name"] or entry["name"] in seen:
+                raise serializers.ValidationError("Names must be present and unique.")
+            seen.add(entry["name"])
+        return entries
+
+    def validate(self, attrs):
+        if "judges" not in attrs:
+            if "names" not in attrs:
+                raise serializers.ValidationError({"names": "This field is required."})
+            attrs["judges"] = [{"name": name} for name in attrs["names"]]
+        try:
+            self._unique_names(attrs["judges"])
+        except serializers.ValidationError as exc:
+            raise serializers.ValidationError({"names": exc.detail})
+        try:
+            self._unique_names(attrs["rubrics"])
+        except serializers.ValidationError as exc:
+            raise serializers.ValidationError({"rubrics": exc.detail})
+        return attrs
+
 
 class JudgeListResponseSerializer(serializers.Serializer):
     id = serializers.IntegerField()
@@ -70,4 +107,53 @@ class CreateEvaluationSerializer(serializers.Serializer):
     def validate_marks(self, v):
         if not isinstance(v, list) or len(v) == 0:
             raise serializers.ValidationError("You must provide at least one judge mark.")
-        return v
\ No newline at end of file
+        return v
+
+class JudgeMarkUpsertSerializer(serializers.Serializer):
+    """
+    One judge's mark for one project:
+    { "project_id": 1, "subsubevent_id": 2, "judge_name": "Judge A", "mark": "8.5", "version": 3 }
+    ``version`` is the judge mark version last read (0 when the judge has not scored yet).
+    """
+    project_id = serializers.IntegerField()
+    subsubevent_id = serializers.IntegerField()
+    judge_name = serializers.CharField(max_length=200)
+    mark = serializers.DecimalField(max_digits=7, decimal_places=2, required=False, allow_null=True,
+                                    min_value=Decimal("0.00"))
+    comments = serializers.CharField(required=False, allow_blank=True, allow_null=True)
+    rubric_marks = serializers.ListField(child=EvaluationJudgeRubricMarkInputSerializer(), required=False, default=list)
+    version = serializers.IntegerField(min_value=0, default=0)
+
+
+class SyncItemSerializer(serializers.Serializer):
+    """
+    One queued item from a judging tablet. ``judge_mark`` items carry one judge's
+    mark (see JudgeMarkUpsertSerializer); ``evaluation`` items replace every mark
+    on the evaluation, like evaluations/submit/.
+    """
+    TYPE_JUDGE_MARK = "judge_mark"
+    TYPE_EVALUATION = "evaluation"
+
+    idempotency_key = serializers.CharField(max_length=100)
+    type = serializers.ChoiceField(choices=[TYPE_JUDGE_MARK, TYPE_EVALUATION], default=TYPE_JUDGE_MARK)
+    project_id = serializers.IntegerField()
+    judge_name = serializers.CharField(max_length=200, required=False)
+    mark = serializers.DecimalField(max_digits=7, decimal_places=2, required=False, allow_null=True,
+                                    min_value=Decimal("0.00"))
+    comments = serializers.CharField(required=False, allow_blank=True, allow_null=True)
+    rubric_marks = serializers.ListField(child=EvaluationJudgeRubricMarkInputSerializer(), required=False, default=list)
+    version = serializers.IntegerField(min_value=0, default=0)
+    is_disqualified = serializers.BooleanField(default=False)
+    remarks = serializers.CharField(required=False, allow_blank=True, allow_null=True)
+    marks = serializers.ListField(child=EvaluationJudgeMarkInputSerializer(), required=False, default=list)
+
+    def validate(self, attrs):
+        if attrs["type"] == self.TYPE_JUDGE_MARK and not (attrs.get("judge_name") or "").strip():
+            raise serializers.ValidationError({"judge_name": "This field is required."})
+        if attrs["type"] == self.TYPE_EVALUATION and not attrs["marks"]:
+            raise serializers.ValidationError({"marks": "You must provide at least one judge mark."})
+        return attrs
+
+
+class SyncBatchSerializer(serializers.Serializer):
+    items = serializers.ListField(child=serializers.DictField(), allow_empty=False, max_length=500)
@@ -0,0 +1,692 @@
+from decimal import Decimal
+
+from django.db import IntegrityError, transaction
+from django.db.models import Case, Count, F, Max, Q, Value, When
+from rest_framework.exceptions import ValidationError
+
+from api.models import Project
+from backend import live
+
+from .models import (
+    Evaluation,
+    EvaluationJudgeMark,
+    EvaluationJudgeRubricMark,
+    EvaluationSyncReceipt,
+    Rubric,
+    SubSubEventJudge,
+)
+from .scoring_config import get_scoring_config, invalidate_scoring_config
+from .serializers import SyncItemSerializer
+
+TWO_PLACES = Decimal("0.01")
+
+
+class StaleJudgeMark(Exception):
+    """Raised when a judge mark changed since the version the client last saw."""
+
+    def __init__(self, current):
+        super().__init__("Stale judge mark.")
+        self.current = current
+
+
+class DestructiveConfigChange(Exception):
+    """Raised when a judge/rubric change would detach or delete existing marks and was not forced."""
+
+    def __init__(self, conflicts):
+        super().__init__("Configuration change affects existing marks.")
+        self.conflicts = conflicts
+
+
+def score_judge_mark(mark, rubric_marks, rubrics_by_name):
+    """
+    Return ``(mark, [(rubric, rubric_mark), ...])`` for one judge's input.
+
+    ``rubrics_by_name`` is ``ScoringConfig.rubrics_by_name``.
+
+    With rubric marks (and rubrics configured) the mark is their sum; otherwise
+    the flat ``mark`` is required.
+    """
+
+    if rubric_marks and rubrics_by_name:
+        total = Decimal("0.00")
+        scores = []
+        for rubric_input in rubric_marks:
+            rubric = rubrics_by_name.get(rubric_input["rubric_name"])
+            if rubric is None:
+                raise ValidationError({
+                    "error": f"Invalid rubric criterion '{rubric_input['rubric_name']}' for this sub-sub-event."
+                })
+            rubric_mark = Decimal(str(rubric_input.get("mark") or 0))
+            if rubric_mark < 0 or rubric_mark > rubric.max_mark:
+                raise ValidationError({
+                    "error": f"Score {rubric_mark} for '{rubric.name}' exceeds the maximum permitted mark of {rubric.max_mark}."
+                })
+            total += rubric_mark
+            scores.append((rubric, rubric_mark))
+        return total, scores
+
+    if mark in (None, ""):
+        raise ValidationError({"mark": "This field is required."})
+    return Decimal(str(mark)), []
+
+
+def judge_mark_payload(judge_mark):
+    return {
+        "id": judge_mark.id,
+        "judge_name": judge_mark.judge_name,
+        "mark": str(judge_mark.mark),
+        "comments": judge_mark.comments or "",
+        "subsubevent_judge_id": judge_mark.subsubevent_judge_id,
+        "version": judge_mark.version,
+    }
+
+
+def previous_rank_score(evaluation, created=False):
+    """The score an evaluation was ranked by before this write, or None if it was not ranked."""
+
+    if created or evaluation.pk is None or evaluation.is_disqualified:
+        return None
+    return evaluation.final_score
+
+
+def _ranks(scores):
+    ordered = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+    return {project_id: rank for rank, (project_id, _) in enumerate(ordered, start=1)}
+
+
+def publish_rank_changes(subsubevent_id, previous_scores):
+    """
+    Publish a ``rank`` event for each re-scored project whose position moved.
+
+    ``previous_scores`` maps project id to the score it was ranked by before
+    the write (None when it was unranked). Teams that merely shifted by one
+    place are left for the client to derive from these deltas.
+    """
+
+    current = dict(
+        Evaluation.objects.filter(subsubevent_id=subsubevent_id, is_disqualified=False)
+        .values_list("project_id", "final_score")
+    )
+    previous = dict(current)
+    for project_id, score in previous_scores.items():
+        if score is None:
+            previous.pop(project_id, None)
+        else:
+            previous[project_id] = score
+
+    ranks_now, ranks_before = _ranks(current), _ranks(previous)
+    for project_id in previous_scores:
+        rank, previous_rank = ranks_now.get(project_id), ranks_before.get(project_id)
+        if rank != previous_rank:
+            live.publish(subsubevent_id, "rank", project_id=project_id, rank=rank, previous_rank=previous_rank)
+
+
+def publish_scores(subsubevent_id, evaluations, previous_scores):
+    """Announce re-scored evaluations on the live feed once the transaction commits."""
+
+    for evaluation in evaluations:
+        live.publish(
+            subsubevent_id,
+            "scored",
+            project_id=evaluation.project_id,
+            evaluation_id=evaluation.id,
+            final_score=str(evaluation.final_score),
+            number_of_judges=evaluation.number_of_judges,
+            is_disqualified=evaluation.is_disqualified,
+        )
+    live.publish_after_commit(lambda: publish_rank_changes(subsubevent_id, previous_scores))
+
+
+def apply_mark_delta(evaluation_id, delta, added_judges=0):
+    """
+    Shift an evaluation's aggregate by ``delta`` marks and ``added_judges`` judges.
+
+    Only the evaluation row is locked, and only for the rest of the caller's
+    transaction, so judges scoring the same team serialise on this update
+    alone rather than on each other's mark rows.
+    """
+
+    evaluation = (
+        Evaluation.objects.select_for_update()
+        .only("id", "total", "number_of_judges")
+        .get(pk=evaluation_id)
+    )
+    number_of_judges = evaluation.number_of_judges + added_judges
+    total = evaluation.total + delta
+    final_score = (total / number_of_judges).quantize(TWO_PLACES) if number_of_judges else Decimal("0.00")
+    Evaluation.objects.filter(pk=evaluation_id).update(
+        number_of_judges=number_of_judges,
+        total=total,
+        final_score=final_score,
+    )
+    return number_of_judges, total, final_score
+
+
+@transaction.atomic
+def upsert_judge_mark(project, subsubevent, judge_id, judge_name, mark, comments, rubric_scores, expected_version):
+    """
+    Create or update one judge's mark (and rubric marks) on an evaluation.
+
+    ``judge_id`` links the mark to the configured ``SubSubEventJudge`` (or is
+    None for an unlisted judge).
+
+    ``expected_version`` is 0 when the client believes the judge has not scored
+    the team yet, otherwise the version it last read. A mismatch raises
+    ``StaleJudgeMark`` instead of overwriting someone else's edit. Returns
+    ``(evaluation, judge_mark, created)``.
+    """
+
+    evaluation, evaluation_created = Evaluation.objects.get_or_create(project=project, subsubevent=subsubevent)
+    previous_score = previous_rank_score(evaluation, evaluation_created)
+    current = EvaluationJudgeMark.objects.filter(evaluation=evaluation, judge_name=judge_name).first()
+
+    if current is None:
+        if expected_version:
+            raise StaleJudgeMark(None)
+        try:
+            with transaction.atomic():
+                judge_mark = EvaluationJudgeMark.objects.create(
+                    evaluation=evaluation,
+                    subsubevent_judge_id=judge_id,
+                    judge_name=judge_name,
+                    mark=mark,
+                    comments=comments,
+                )
+        except IntegrityError:
+            raise StaleJudgeMark(
+                EvaluationJudgeMark.objects.filter(evaluation=evaluation, judge_name=judge_name).first()
+            )
+        previous_mark = None
+    else:
+        updated = EvaluationJudgeMark.objects.filter(pk=current.pk, version=expected_version).update(
+            subsubevent_judge_id=judge_id,
+            mark=mark,
+            comments=comments,
+            version=F("version") + 1,
+        )
+        if not updated:
+            current.refresh_from_db()
+            raise StaleJudgeMark(current)
+        previous_mark = current.mark
+        judge_mark = current
+        judge_mark.subsubevent_judge_id = judge_id
+        judge_mark.mark = mark
+        judge_mark.comments = comments
+        judge_mark.version = expected_version + 1
+        judge_mark.rubric_marks.all().delete()
+
+    if rubric_scores:
+        EvaluationJudgeRubricMark.objects.bulk_create(
+            EvaluationJudgeRubricMark(judge_mark=judge_mark, rubric_id=rubric.id, mark=rubric_mark)
+            for rubric, rubric_mark in rubric_scores
+        )
+
+    delta = mark - (previous_mark or Decimal("0.00"))
+    evaluation.number_of_judges, evaluation.total, evaluation.final_score = apply_mark_delta(
+        evaluation.id, delta, added_judges=1 if previous_mark is None else 0
+    )
+    publish_scores(subsubevent.id, [evaluation], {project.id: previous_score})
+    return evaluation, judge_mark, previous_mark is None
+
+
+def evaluation_summary(evaluation):
+    return {
+        "id": evaluation.id,
+        "project_id": evaluation.project_id,
+        "subsubevent_id": evaluation.subsubevent_id,
+        "number_of_judges": evaluation.number_of_judges,
+        "total": str(evaluation.total),
+        "final_score": str(evaluation.final_score),
+        "is_disqualified": evaluation.is_disqualified,
+    }
+
+
+class _EvaluationState:
+    """In-memory view of one evaluation and all of its judge marks during a batch."""
+
+    def __init__(self, evaluation):
+        self.evaluation = evaluation
+        self.previous_score = previous_rank_score(evaluation)
+        self.marks = {}
+        self.rubric_scores = {}
+        self.deleted_mark_ids = []
+        self.dirty = False
+
+    def recalculate(self):
+        total = sum((mark.mark for mark in self.marks.values()), Decimal("0.00"))
+        count = len(self.marks)
+        self.evaluation.number_of_judges = count
+        self.evaluation.total = total
+        self.evaluation.final_score = (total / count).quantize(TWO_PLACES) if count else Decimal("0.00")
+
+
+class _BatchSync:
+    def __init__(self, subsubevent, items):
+        self.subsubevent = subsubevent
+        self.items = items
+        self.states = {}
+        self.applied = []
+
+    def load(self, project_ids, keys):
+        self.receipts = dict(
+            EvaluationSyncReceipt.objects.filter(subsubevent=self.subsubevent, idempotency_key__in=keys)
+            .values_list("idempotency_key", "result")
+        )
+        self.project_ids = set(
+            Project.objects.filter(event=self.subsubevent, id__in=project_ids).values_list("id", flat=True)
+        )
+        scoring_config = get_scoring_config(self.subsubevent)
+        self.judge_ids = scoring_config.judge_ids
+        self.rubrics = scoring_config.rubrics_by_name
+
+        evaluations = Evaluation.objects.select_for_update().filter(
+            subsubevent=self.subsubevent, project_id__in=self.project_ids
+        )
+        states_by_id = {}
+        for evaluation in evaluations:
+            state = self.states[evaluation.project_id] = _EvaluationState(evaluation)
+            states_by_id[evaluation.id] = state
+        if states_by_id:
+            marks = EvaluationJudgeMark.objects.select_for_update().filter(evaluation_id__in=states_by_id)
+            for mark in marks:
+                states_by_id[mark.evaluation_id].marks[mark.judge_name] = mark
+
+    def state_for(self, project_id):
+        state = self.states.get(project_id)
+        if state is None:
+            state = self.states[project_id] = _EvaluationState(
+                Evaluation(project_id=project_id, subsubevent=self.subsubevent, remarks="")
+            )
+        return state
+
+    def set_mark(self, state, judge_name, mark, comments, rubric_scores, expected_version=None):
+        judge_mark = state.marks.get(judge_name)
+        if judge_mark is None:
+            if expected_version:
+                raise StaleJudgeMark(None)
+            judge_mark = state.marks[judge_name] = EvaluationJudgeMark(
+                evaluation=state.evaluation, judge_name=judge_name
+            )
+        else:
+            if expected_version is not None and judge_mark.version != expected_version:
+                raise StaleJudgeMark(judge_mark)
+            # the row is locked by load(), so bumping the loaded version is exact
+            judge_mark.version += 1
+        judge_mark.subsubevent_judge_id = self.judge_ids.get(judge_name)
+        judge_mark.mark = mark
+        judge_mark.comments = comments
+        state.rubric_scores[judge_name] = rubric_scores
+        state.dirty = True
+        return judge_mark
+
+    def apply_judge_mark(self, data):
+        judge_name = data["judge_name"].strip()
+        mark, rubric_scores = score_judge_mark(data.get("mark"), data["rubric_marks"], self.rubrics)
+        state = self.state_for(data["project_id"])
+        judge_mark = self.set_mark(
+            state, judge_name, mark, data.get("comments") or "", rubric_scores, expected_version=data["version"]
+        )
+        return state, {"mark": judge_mark_payload(judge_mark)}, [judge_mark]
+
+    def apply_evaluation(self, data):
+        scored = {}
+        for index, mark_input in enumerate(data["marks"]):
+            judge_name = mark_input["judge_name"].strip()
+            if not judge_name or judge_name in scored:
+                raise ValidationError({"marks": {index: {"judge_name": "Judge names must be present and unique."}}})
+            scored[judge_name] = (
+                score_judge_mark(mark_input.get("mark"), mark_input["rubric_marks"], self.rubrics),
+                mark_input.get("comments") or "",
+            )
+
+        state = self.state_for(data["project_id"])
+        for judge_name, judge_mark in list(state.marks.items()):
+            if judge_name in scored:
+                continue
+            if judge_mark.pk is not None:
+                state.deleted_mark_ids.append(judge_mark.pk)
+            del state.marks[judge_name]
+            state.rubric_scores.pop(judge_name, None)
+        state.evaluation.is_disqualified = data["is_disqualified"]
+        state.evaluation.remarks = data.get("remarks") or ""
+
+        judge_marks = [
+            self.set_mark(state, judge_name, mark, comments, rubric_scores)
+            for judge_name, ((mark, rubric_scores), comments) in scored.items()
+        ]
+        return state, {"marks": [judge_mark_payload(judge_mark) for judge_mark in judge_marks]}, judge_marks
+
+    def flush(self):
+        states = [state for state in self.states.values() if state.dirty]
+        for state in states:
+            state.recalculate()
+
+        Evaluation.objects.bulk_create([state.evaluation for state in states if state.evaluation.pk is None])
+        Evaluation.objects.bulk_update(
+            [state.evaluation for state in states if state.evaluation.pk is not None],
+            ["is_disqualified", "remarks", "number_of_judges", "total", "final_score"],
+        )
+
+        deleted_ids = [pk for state in states for pk in state.deleted_mark_ids]
+        if deleted_ids:
+            EvaluationJudgeMark.objects.filter(pk__in=deleted_ids).delete()
+
+        touched = [
+            (state.marks[judge_name], rubric_scores)
+            for state in states
+            for judge_name, rubric_scores in state.rubric_scores.items()
+        ]
+        existing = [judge_mark for judge_mark, _ in touched if judge_mark.pk is not None]
+        if existing:
+            EvaluationJudgeMark.objects.bulk_update(existing, ["subsubevent_judge", "mark", "comments", "version"])
+            EvaluationJudgeRubricMark.objects.filter(judge_mark__in=existing).delete()
+        EvaluationJudgeMark.objects.bulk_create([judge_mark for judge_mark, _ in touched if judge_mark.pk is None])
+        EvaluationJudgeRubricMark.objects.bulk_create(
+            EvaluationJudgeRubricMark(judge_mark=judge_mark, rubric_id=rubric.id, mark=rubric_mark)
+            for judge_mark, rubric_scores in touched
+            for rubric, rubric_mark in rubric_scores
+        )
+        if states:
+            publish_scores(
+                self.subsubevent.id,
+                [state.evaluation for state in states],
+                {state.evaluation.project_id: state.previous_score for state in states},
+            )
+
+    def run(self):
+        results = [None] * len(self.items)
+        parsed = []
+        for index, raw in enumerate(self.items):
+            serializer = SyncItemSerializer(data=raw)
+            if serializer.is_valid():
+                parsed.append((index, serializer.validated_data))
+            else:
+                results[index] = {"idempotency_key": raw.get("idempotency_key"), "status": 400, "errors": serializer.errors}
+
+        self.load({data["project_id"] for _, data in parsed}, {data["idempotency_key"] for _, data in parsed})
+
+        seen = {}
+        duplicates = []
+        for index, data in parsed:
+            key = data["idempotency_key"]
+            if key in self.receipts:
+                results[index] = {**self.receipts[key], "replayed": True}
+                continue
+            if key in seen:
+                duplicates.append((index, key))
+                continue
+            if data["project_id"] not in self.project_ids:
+                results[index] = {"idempotency_key": key, "status": 404, "error": "Project not found in this sub-sub-event."}
+                continue
+
+            apply = self.apply_judge_mark if data["type"] == SyncItemSerializer.TYPE_JUDGE_MARK else self.apply_evaluation
+            try:
+                state, result, judge_marks = apply(data)
+            except ValidationError as exc:
+                results[index] = {"idempotency_key": key, "status": 400, "errors": exc.detail}
+                continue
+            except StaleJudgeMark as exc:
+                results[index] = {
+                    "idempotency_key": key,
+                    "status": 409,
+                    "error": "This mark was changed by another submission. Reload it and try again.",
+                    "current": judge_mark_payload(exc.current) if exc.current is not None else None,
+                }
+                continue
+
+            result = {"idempotency_key": key, "status": 200, **result}
+            results[index] = seen[key] = result
+            self.applied.append((result, state, judge_marks))
+
+        self.flush()
+
+        receipts = []
+        for result, state, judge_marks in self.applied:
+            payloads = [result["mark"]] if "mark" in result else result["marks"]
+            for payload, judge_mark in zip(payloads, judge_marks):
+                payload["id"] = judge_mark.pk
+            result["evaluation"] = evaluation_summary(state.evaluation)
+            receipts.append(
+                EvaluationSyncReceipt(subsubevent=self.subsubevent, idempotency_key=result["idempotency_key"], result=result)
+            )
+        EvaluationSyncReceipt.objects.bulk_create(receipts)
+        for index, key in duplicates:
+            results[index] = {**seen[key], "replayed": True}
+        return results
+
+
+@transaction.atomic
+def sync_evaluation_batch(subsubevent, items):
+    """
+    Apply a tablet's queued marks for one sub-sub-event in a single transaction.
+
+    Judges, rubrics, evaluations and marks are loaded once, every item is
+    validated and applied in memory, then everything is written with bulk
+    queries. Returns one result per item, in order; items whose idempotency
+    key was already applied return the stored result with ``replayed``.
+    """
+
+    return _BatchSync(subsubevent, items).run()
+
+
+def _match_rows(existing, entries, field, kind):
+    """
+    Pair each input entry with the existing row it updates, or None for a new row.
+
+    Entries with an ``id`` claim that row (a rename when the name differs);
+    the others match an unclaimed row by name. Returns ``(pairs, unlisted)``.
+    """
+
+    by_id = {row.pk: row for row in existing}
+    claimed = set()
+    for entry in entries:
+        if "id" in entry:
+            if entry["id"] not in by_id:
+                raise ValidationError({field: f"Unknown {kind} id {entry['id']}."})
+            if entry["id"] in claimed:
+                raise ValidationError({field: f"{kind.capitalize()} id {entry['id']} is listed twice."})
+            claimed.add(entry["id"])
+
+    by_name = {row.name: row for row in existing if row.pk not in claimed}
+    pairs = [
+        (entry, by_id[entry["id"]] if "id" in entry else by_name.pop(entry["name"], None))
+        for entry in entries
+    ]
+    matched = {row.pk for _, row in pairs if row is not None}
+    return pairs, [row for row in existing if row.pk not in matched]
+
+
+def _check_names(pairs, unlisted, field):
+    taken = {row.name for row in unlisted}
+    clashes = sorted(entry["name"] for entry, _ in pairs if entry["name"] in taken)
+    if clashes:
+        raise ValidationError({field: f"Names already used by unlisted entries: {', '.join(clashes)}."})
+
+
+def _apply_rows(model, removed, renamed, changed, created, fields):
+    """Delete, update and create rows in a fixed number of queries without tripping the unique names."""
+
+    if removed:
+        model.objects.filter(pk__in=[row.pk for row in removed]).delete()
+    if renamed:
+        # a rename may take a name another row gives up in the same change (e.g. a swap)
+        new_names = {row.pk: row.name for row in renamed}
+        for row in renamed:
+            row.name = f"#renaming-{row.pk}"
+        model.objects.bulk_update(renamed, ["name"])
+        for row in renamed:
+            row.name = new_names[row.pk]
+        changed = [*renamed, *(row for row in changed if row.pk not in new_names)]
+        fields = ["name", *fields]
+    if changed:
+        model.objects.bulk_update(changed, fields)
+    if created:
+        model.objects.bulk_create(created)
+
+
+def _rename_clashes(renamed_judges):
+    """
+    Marks that hold a renamed judge's new name on an evaluation the judge has also marked.
+
+    They are left over from a removed judge, or were unlinked earlier, and
+    would collide with the renamed judge's mark on ``(evaluation, judge_name)``.
+    """
+
+    if not renamed_judges:
+        return EvaluationJudgeMark.objects.none()
+    clashes = Q()
+    for row in renamed_judges:
+        evaluations = EvaluationJudgeMark.objects.filter(subsubevent_judge_id=row.pk).values("evaluation_id")
+        clashes |= Q(judge_name=row.name, evaluation_id__in=evaluations)
+    return EvaluationJudgeMark.objects.filter(clashes).exclude(subsubevent_judge__in=renamed_judges)
+
+
+def _rename_marks(renamed_judges):
+    # same two phases as _apply_rows: a swap must not collide on (evaluation, judge_name)
+    marks = EvaluationJudgeMark.objects.filter(subsubevent_judge__in=renamed_judges)
+    marks.update(judge_name=Case(
+        *(When(subsubevent_judge_id=row.pk, then=Value(f"#renaming-{row.pk}")) for row in renamed_judges)
+    ))
+    marks.update(judge_name=Case(
+        *(When(subsubevent_judge_id=row.pk, then=Value(row.name)) for row in renamed_judges)
+    ))
+
+
+def _marks_conflicts(removed_judges, removed_rubrics, lowered_rubrics, renamed_judges=()):
+    conflicts = []
+    if renamed_judges:
+        ids = {row.name: row.pk for row in renamed_judges}
+        usage = _rename_clashes(renamed_judges).values("judge_name").annotate(marks=Count("id"))
+        conflicts.extend(
+            {
+                "kind": "judge",
+                "id": ids[row["judge_name"]],
+                "name": row["judge_name"],
+                "change": "renamed",
+                "marks": row["marks"],
+            }
+            for row in usage
+        )
+    if removed_judges:
+        names = {row.pk: row.name for row in removed_judges}
+        usage = (
+            EvaluationJudgeMark.objects.filter(subsubevent_judge__in=removed_judges)
+            .values("subsubevent_judge_id")
+            .annotate(marks=Count("id"))
+        )
+        conflicts.extend(
+            {
+                "kind": "judge",
+                "id": row["subsubevent_judge_id"],
+                "name": names[row["subsubevent_judge_id"]],
+                "change": "removed",
+                "marks": row["marks"],
+            }
+            for row in usage
+        )
+    if removed_rubrics or lowered_rubrics:
+        rubrics = {rubric.pk: rubric for rubric in [*removed_rubrics, *lowered_rubrics]}
+        lowered = {rubric.pk for rubric in lowered_rubrics}
+        usage = (
+            EvaluationJudgeRubricMark.objects.filter(rubric_id__in=rubrics)
+            .values("rubric_id")
+            .annotate(marks=Count("id"), highest=Max("mark"))
+        )
+        for row in usage:
+            rubric = rubrics[row["rubric_id"]]
+            conflict = {"kind": "rubric", "id": rubric.pk, "name": rubric.name, "marks": row["marks"]}
+            if rubric.pk not in lowered:
+                conflicts.append({**conflict, "change": "removed"})
+            elif row["highest"] > rubric.max_mark:
+                conflicts.append({**conflict, "change": "max_mark", "highest_mark": str(row["highest"])})
+    return conflicts
+
+
+@transaction.atomic
+def reconcile_scoring_config(subsubevent, judges, rubrics, replace=False, force=False):
+    """
+    Make ``subsubevent``'s judges and rubrics match the input.
+
+    ``judges`` and ``rubrics`` are the validated ``CreateJudgesSerializer``
+    lists. Existing rows are matched by id or name and kept, so their marks
+    survive; only the differences are written, with bulk queries. Unlisted
+    rows are removed when ``replace`` is set. Removing a judge or rubric that
+    has marks, or lowering a rubric's ``max_mark`` below a mark already
+    given, raises ``DestructiveConfigChange`` unless ``force`` is set.
+    Renaming a judge renames its marks too; a mark left under the new name by
+    a removed or unlinked judge on the same evaluation is a conflict as well,
+    and is deleted when forced.
+
+    Returns ``(judge_rows, rubric_rows, changes)`` with the rows in input order.
+    """
+
+    judge_pairs, unlisted_judges = _match_rows(
+        list(SubSubEventJudge.objects.filter(subsubevent=subsubevent)), judges, "names", "judge"
+    )
+    rubric_pairs, unlisted_rubrics = _match_rows(
+        list(Rubric.objects.filter(subsubevent=subsubevent)), rubrics, "rubrics", "rubric"
+    )
+    if replace:
+        removed_judges, removed_rubrics = unlisted_judges, unlisted_rubrics
+    else:
+        removed_judges, removed_rubrics = [], []
+        _check_names(judge_pairs, unlisted_judges, "names")
+        _check_names(rubric_pairs, unlisted_rubrics, "rubrics")
+
+    changes = {
+        "judges": {"added": [], "removed": [row.name for row in removed_judges], "renamed": [], "reordered": []},
+        "rubrics": {"added": [], "removed": [row.name for row in removed_rubrics], "renamed": [], "updated": []},
+    }
+
+    judge_rows, renamed_judges, reordered_judges, new_judges = [], [], [], []
+    for order, (entry, row) in enumerate(judge_pairs, start=1):
+        if row is None:
+            row = SubSubEventJudge(subsubevent=subsubevent, name=entry["name"], order=order)
+            new_judges.append(row)
+            changes["judges"]["added"].append(row.name)
+        else:
+            if row.name != entry["name"]:
+                changes["judges"]["renamed"].append({"id": row.pk, "from": row.name, "to": entry["name"]})
+                row.name = entry["name"]
+                renamed_judges.append(row)
+            if row.order != order:
+                changes["judges"]["reordered"].append(row.name)
+                row.order = order
+                reordered_judges.append(row)
+        judge_rows.append(row)
+
+    rubric_rows, renamed_rubrics, updated_rubrics, new_rubrics, lowered_rubrics = [], [], [], [], []
+    for entry, row in rubric_pairs:
+        if row is None:
+            row = Rubric(subsubevent=subsubevent, name=entry["name"], max_mark=entry["max_mark"])
+            new_rubrics.append(row)
+            changes["rubrics"]["added"].append(row.name)
+        else:
+            if row.name != entry["name"]:
+                changes["rubrics"]["renamed"].append({"id": row.pk, "from": row.name, "to": entry["name"]})
+                row.name = entry["name"]
+                renamed_rubrics.append(row)
+            if row.max_mark != entry["max_mark"]:
+                changes["rubrics"]["updated"].append(row.name)
+                if entry["max_mark"] < row.max_mark:
+                    lowered_rubrics.append(row)
+                row.max_mark = entry["max_mark"]
+                updated_rubrics.append(row)
+        rubric_rows.append(row)
+
+    if not force:
+        conflicts = _marks_conflicts(removed_judges, removed_rubrics, lowered_rubrics, renamed_judges)
+        if conflicts:
+            raise DestructiveConfigChange(conflicts)
+
+    _apply_rows(SubSubEventJudge, removed_judges, renamed_judges, reordered_judges, new_judges, ["order"])
+    if renamed_judges:
+        for mark in _rename_clashes(renamed_judges).only("id", "evaluation_id", "mark"):
+            mark.delete()
+            apply_mark_delta(mark.evaluation_id, -mark.mark, added_judges=-1)
+        _rename_marks(renamed_judges)
+    _apply_rows(Rubric, removed_rubrics, renamed_rubrics, updated_rubrics, new_rubrics, ["max_mark"])
+
+    if any(changes["judges"].values()) or any(changes["rubrics"].values()):
+        invalidate_scoring_config(subsubevent)
+    return judge_rows, rubric_rows, changes
@@ -1,8 +1,9 @@
-from django.test import TestCase
+from django.test import TestCase, override_settings
 from django.contrib.auth import get_user_model
 from rest_framework.test import APIClient
 from rest_framework import status
 
+from backend import live
 from events.models import MainEvent, SubEvent, SubSubEvent
 from api.models import Project
 from eval.models import (
@@ -165,3 +166,528 @@ class RubricEvaluationTests(TestCase):
         response = self.client.post(url, payload, format="json", secure=True)
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
         self.assertIn("exceeds the maximum permitted mark", response.json()["error"])
+
+
+class JudgeMarkUpsertTests(TestCase):
+    url = "/eval/evaluations/judge-mark/"
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(username="judgeadmin", password="password123")
+        self.client.force_authenticate(user=self.user)
+
+        main_event = MainEvent.objects.create(name="Main Event")
+        sub_event = SubEvent.objects.create(parent_event=main_event, name="Sub Event")
+        self.subsub_event = SubSubEvent.objects.create(
+            parent_event=main_event, parent_subevent=sub_event, name="Sub Sub Event"
+        )
+        self.project = Project.objects.create(
+            event=self.subsub_event,
+            team_name="Team Beta",
+            captain_name="Captain Beta",
+            captain_email="beta@gmail.com",
+            captain_phone="1234567890",
+        )
+        Rubric.objects.create(subsubevent=self.subsub_event, name="Innovation", max_mark=10)
+        Rubric.objects.create(subsubevent=self.subsub_event, name="Clarity", max_mark=5)
+        self.alice = SubSubEventJudge.objects.create(subsubevent=self.subsub_event, name="Judge Alice")
+
+    def _put(self, judge_name, innovation, clarity, version=0):
+        payload = {
+            "project_id": self.project.id,
+            "subsubevent_id": self.subsub_event.id,
+            "judge_name": judge_name,
+            "rubric_marks": [
+                {"rubric_name": "Innovation", "mark": innovation},
+                {"rubric_name": "Clarity", "mark": clarity},
+            ],
+            "version": version,
+        }
+        return self.client.put(self.url, payload, format="json", secure=True)
+
+    def test_judges_score_independently_and_aggregate_incrementally(self):
+        alice = self._put("Judge Alice", "8.00", "4.00")
+        self.assertEqual(alice.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(alice.json()["mark"]["version"], 1)
+        self.assertEqual(alice.json()["mark"]["subsubevent_judge_id"], self.alice.id)
+
+        bob = self._put("Judge Bob", "6.00", "3.00")
+        self.assertEqual(bob.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(bob.json()["evaluation"]["total"], "21.00")
+        self.assertEqual(bob.json()["evaluation"]["final_score"], "10.50")
+
+        alice_mark = EvaluationJudgeMark.objects.get(judge_name="Judge Alice")
+        bob_mark = EvaluationJudgeMark.objects.get(judge_name="Judge Bob")
+        updated = self._put("Judge Alice", "10.00", "5.00", version=1)
+        self.assertEqual(updated.status_code, status.HTTP_200_OK)
+        self.assertEqual(updated.json()["mark"]["version"], 2)
+        self.assertEqual(updated.json()["mark"]["id"], alice_mark.id)
+
+        evaluation = Evaluation.objects.get(project=self.project)
+        self.assertEqual(evaluation.number_of_judges, 2)
+        self.assertEqual(float(evaluation.total), 24.0)
+        self.assertEqual(float(evaluation.final_score), 12.0)
+        self.assertEqual(EvaluationJudgeMark.objects.get(pk=bob_mark.pk).version, 1)
+        self.assertEqual(EvaluationJudgeRubricMark.objects.filter(judge_mark=alice_mark).count(), 2)
+        self.assertEqual(EvaluationJudgeRubricMark.objects.filter(judge_mark=bob_mark).count(), 2)
+
+        # the incremental aggregate agrees with a full recalculation
+        evaluation.recalculate_scores()
+        self.assertEqual(float(evaluation.total), 24.0)
+
+    def test_stale_version_is_rejected_with_current_mark(self):
+        self._put("Judge Alice", "8.00", "4.00")
+        self._put("Judge Alice", "9.00", "4.00", version=1)
+
+        stale = self._put("Judge Alice", "1.00", "1.00", version=1)
+        self.assertEqual(stale.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(stale.json()["current"]["version"], 2)
+        self.assertEqual(stale.json()["current"]["mark"], "13.00")
+
+        duplicate_create = self._put("Judge Alice", "1.00", "1.00", version=0)
+        self.assertEqual(duplicate_create.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(float(Evaluation.objects.get(project=self.project).total), 13.0)
+
+    def test_full_overwrite_invalidates_versions_read_before_it(self):
+        self._put("Judge Alice", "8.00", "4.00")
+        self._put("Judge Bob", "6.00", "3.00")
+        alice_mark = EvaluationJudgeMark.objects.get(judge_name="Judge Alice")
+
+        overwrite = self.client.post(
+            "/eval/evaluations/submit/",
+            {
+                "project_id": self.project.id,
+                "subsubevent_id": self.subsub_event.id,
+                "marks": [{"judge_name": "Judge Alice", "mark": "7.00"}],
+            },
+            format="json",
+            secure=True,
+        )
+        self.assertEqual(overwrite.status_code, status.HTTP_201_CREATED)
+        alice_mark.refresh_from_db()
+        self.assertEqual((alice_mark.version, alice_mark.mark), (2, 7))
+        self.assertFalse(EvaluationJudgeMark.objects.filter(judge_name="Judge Bob").exists())
+        self.assertFalse(EvaluationJudgeRubricMark.objects.filter(judge_mark=alice_mark).exists())
+
+        stale = self._put("Judge Alice", "1.00", "1.00", version=1)
+        self.assertEqual(stale.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(stale.json()["current"]["version"], 2)
+
+    def test_rubric_limits_are_enforced(self):
+        response = self._put("Judge Alice", "11.00", "4.00")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(Evaluation.objects.filter(project=self.project).exists())
+
+
+class ScoringConfigCacheTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(username="configadmin", password="password123")
+        self.client.force_authenticate(user=self.user)
+
+        main_event = MainEvent.objects.create(name="Main Event")
+        sub_event = SubEvent.objects.create(parent_event=main_event, name="Sub Event")
+        self.subsub_event = SubSubEvent.objects.create(
+            parent_event=main_event, parent_subevent=sub_event, name="Sub Sub Event"
+        )
+        self.project = Project.objects.create(
+            event=self.subsub_event,
+            team_name="Team Gamma",
+            captain_name="Captain Gamma",
+            captain_email="gamma@gmail.com",
+            captain_phone="1234567890",
+        )
+        self.url = f"/eval/subsubevents/{self.subsub_event.id}/judges/"
+
+    def _link(self, names, rubrics, force=False):
+        payload = {
+            "subsubevent_id": self.subsub_event.id,
+            "names": names,
+            "rubrics": rubrics,
+            "replace": True,
+            "force": force,
+        }
+        response = self.client.post("/eval/subsubevents/judges/link/", payload, format="json", secure=True)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.json()
+
+    def test_listing_is_served_from_memory_until_judges_are_relinked(self):
+        self._link(["Judge Alice"], [{"name": "Design", "max_mark": 20}])
+        self.assertEqual(self.client.get(self.url, secure=True).json()["judges"][0]["name"], "Judge Alice")
+
+        # only the SubSubEvent row is read once the configuration is cached
+        with self.assertNumQueries(1):
+            cached = self.client.get(self.url, secure=True).json()
+        self.assertEqual(cached["rubrics"][0]["max_mark"], 20.0)
+
+        linked = self._link(["Judge Bob", "Judge Carol"], [{"name": "Impact", "max_mark": 5}])
+        refreshed = self.client.get(self.url, secure=True).json()
+        self.assertEqual(refreshed["judges"], linked["judges"])
+        self.assertEqual(refreshed["rubrics"], linked["rubrics"])
+
+    def test_submission_links_judges_and_rubrics_from_the_cached_config(self):
+        linked = self._link(["Judge Alice", "Judge Bob"], [{"name": "Innovation", "max_mark": 10}])
+        alice_id = next(judge["id"] for judge in linked["judges"] if judge["name"] == "Judge Alice")
+
+        payload = {
+            "project_id": self.project.id,
+            "subsubevent_id": self.subsub_event.id,
+            "marks": [
+                {"judge_name": "Judge Alice", "rubric_marks": [{"rubric_name": "Innovation", "mark": "7"}]},
+                {"judge_name": "Guest Judge", "rubric_marks": [{"rubric_name": "Innovation", "mark": "9"}]},
+            ],
+        }
+        response = self.client.post("/eval/evaluations/submit/", payload, format="json", secure=True)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.json()["final_score"], "8.00")
+
+        marks = {mark.judge_name: mark for mark in EvaluationJudgeMark.objects.all()}
+        self.assertEqual(marks["Judge Alice"].subsubevent_judge_id, alice_id)
+        self.assertIsNone(marks["Guest Judge"].subsubevent_judge_id)
+        self.assertEqual(
+            EvaluationJudgeRubricMark.objects.get(judge_mark=marks["Judge Alice"]).rubric_id,
+            linked["rubrics"][0]["id"],
+        )
+
+        # replacing the rubrics invalidates the config the submission validated against
+        self._link(["Judge Alice"], [{"name": "Impact", "max_mark": 10}], force=True)
+        response = self.client.post("/eval/evaluations/submit/", payload, format="json", secure=True)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class ReconcileJudgesTests(TestCase):
+    url = "/eval/subsubevents/judges/link/"
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(username="linkadmin", password="password123")
+        self.client.force_authenticate(user=self.user)
+
+        main_event = MainEvent.objects.create(name="Main Event")
+        sub_event = SubEvent.objects.create(parent_event=main_event, name="Sub Event")
+        self.subsub_event = SubSubEvent.objects.create(
+            parent_event=main_event, parent_subevent=sub_event, name="Sub Sub Event"
+        )
+        self.project = Project.objects.create(
+            event=self.subsub_event,
+            team_name="Team Delta",
+            captain_name="Captain Delta",
+            captain_email="delta@gmail.com",
+            captain_phone="1234567890",
+        )
+        self.linked = self._link(
+            names=["Judge Alice", "Judge Bob"],
+            rubrics=[{"name": "Innovation", "max_mark": 10}, {"name": "Clarity", "max_mark": 5}],
+        ).json()
+        response = self.client.post(
+            "/eval/evaluations/submit/",
+            {
+                "project_id": self.project.id,
+                "subsubevent_id": self.subsub_event.id,
+                "marks": [
+                    {
+                        "judge_name": "Judge Alice",
+                        "rubric_marks": [
+                            {"rubric_name": "Innovation", "mark": "8"},
+                            {"rubric_name": "Clarity", "mark": "4"},
+                        ],
+                    }
+                ],
+            },
+            format="json",
+            secure=True,
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+    def _link(self, replace=True, force=False, **payload):
+        payload = {"subsubevent_id": self.subsub_event.id, "replace": replace, "force": force, **payload}
+        return self.client.post(self.url, payload, format="json", secure=True)
+
+    def _ids(self, key):
+        return {entry["name"]: entry["id"] for entry in self.linked[key]}
+
+    def test_replace_keeps_existing_rows_and_their_marks(self):
+        response = self._link(
+            names=["Judge Bob", "Judge Alice", "Judge Carol"],
+            rubrics=[{"name": "Innovation", "max_mark": 10}, {"name": "Clarity", "max_mark": 8}],
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        data = response.json()
+        self.assertEqual([judge["name"] for judge in data["judges"]], ["Judge Bob", "Judge Alice", "Judge Carol"])
+        self.assertEqual(data["judges"][1]["id"], self._ids("judges")["Judge Alice"])
+        self.assertEqual(data["rubrics"][1], {"id": self._ids("rubrics")["Clarity"], "name": "Clarity", "max_mark": 8.0})
+        self.assertEqual(data["changes"]["judges"]["added"], ["Judge Carol"])
+        self.assertEqual(data["changes"]["judges"]["reordered"], ["Judge Bob", "Judge Alice"])
+        self.assertEqual(data["changes"]["rubrics"]["updated"], ["Clarity"])
+
+        self.assertEqual(EvaluationJudgeRubricMark.objects.count(), 2)
+        mark = EvaluationJudgeMark.objects.get()
+        self.assertEqual(mark.subsubevent_judge_id, self._ids("judges")["Judge Alice"])
+
+    def test_destructive_changes_need_force(self):
+        response = self._link(names=["Judge Bob"], rubrics=[{"name": "Innovation", "max_mark": 5}])
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        conflicts = {(conflict["kind"], conflict["name"], conflict["change"]) for conflict in response.json()["conflicts"]}
+        self.assertEqual(
+            conflicts,
+            {("judge", "Judge Alice", "removed"), ("rubric", "Clarity", "removed"), ("rubric", "Innovation", "max_mark")},
+        )
+        self.assertEqual(SubSubEventJudge.objects.filter(subsubevent=self.subsub_event).count(), 2)
+        self.assertEqual(EvaluationJudgeRubricMark.objects.count(), 2)
+
+        # removing a judge without marks is not destructive
+        self.assertEqual(
+            self._link(names=["Judge Alice"], rubrics=self.linked["rubrics"]).status_code, status.HTTP_200_OK
+        )
+
+        forced = self._link(force=True, names=["Judge Bob"], rubrics=[{"name": "Innovation", "max_mark": 5}])
+        self.assertEqual(forced.status_code, status.HTTP_200_OK)
+        self.assertEqual(forced.json()["changes"]["rubrics"]["removed"], ["Clarity"])
+        self.assertEqual(EvaluationJudgeRubricMark.objects.count(), 1)
+        self.assertIsNone(EvaluationJudgeMark.objects.get().subsubevent_judge_id)
+
+    def test_renames_by_id_carry_marks_along(self):
+        judges = self._ids("judges")
+        response = self._link(
+            judges=[{"id": judges["Judge Alice"], "name": "Judge Bob"}, {"id": judges["Judge Bob"], "name": "Judge Alice"}],
+            rubrics=[{"id": self._ids("rubrics")["Clarity"], "name": "Presentation", "max_mark": 5}],
+            replace=False,
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.json()["changes"]["judges"]["renamed"]), 2)
+        self.assertEqual(SubSubEventJudge.objects.get(pk=judges["Judge Alice"]).name, "Judge Bob")
+        self.assertEqual(EvaluationJudgeMark.objects.get().judge_name, "Judge Bob")
+        self.assertEqual(
+            set(Rubric.objects.filter(subsubevent=self.subsub_event).values_list("name", flat=True)),
+            {"Innovation", "Presentation"},
+        )
+
+        clash = self._link(judges=[{"name": "Judge Carol"}, {"name": "Judge Carol"}], rubrics=[], replace=False)
+        self.assertEqual(clash.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def _add_mark(self, judge_name, mark, judge_id=None):
+        evaluation = Evaluation.objects.get(project=self.project)
+        EvaluationJudgeMark.objects.create(
+            evaluation=evaluation, subsubevent_judge_id=judge_id, judge_name=judge_name, mark=mark
+        )
+        evaluation.save()
+
+    def test_swapping_judges_with_marks_on_one_evaluation(self):
+        judges = self._ids("judges")
+        self._add_mark("Judge Bob", "3", judges["Judge Bob"])
+
+        response = self._link(
+            judges=[{"id": judges["Judge Alice"], "name": "Judge Bob"}, {"id": judges["Judge Bob"], "name": "Judge Alice"}],
+            rubrics=self.linked["rubrics"],
+            replace=False,
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            dict(EvaluationJudgeMark.objects.values_list("subsubevent_judge_id", "judge_name")),
+            {judges["Judge Alice"]: "Judge Bob", judges["Judge Bob"]: "Judge Alice"},
+        )
+
+    def test_rename_onto_an_unlinked_mark_needs_force(self):
+        judges = self._ids("judges")
+        self._add_mark("Judge Zoe", "6")
+
+        rename = {
+            "judges": [{"id": judges["Judge Alice"], "name": "Judge Zoe"}, {"id": judges["Judge Bob"], "name": "Judge Bob"}],
+            "rubrics": self.linked["rubrics"],
+        }
+        response = self._link(**rename)
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(
+            response.json()["conflicts"],
+            [{"kind": "judge", "id": judges["Judge Alice"], "name": "Judge Zoe", "change": "renamed", "marks": 1}],
+        )
+
+        forced = self._link(force=True, **rename)
+        self.assertEqual(forced.status_code, status.HTTP_200_OK)
+        mark = EvaluationJudgeMark.objects.get()
+        self.assertEqual((mark.subsubevent_judge_id, mark.judge_name), (judges["Judge Alice"], "Judge Zoe"))
+        evaluation = Evaluation.objects.get(project=self.project)
+        self.assertEqual((evaluation.number_of_judges, evaluation.total), (1, 12))
+
+
+class EvaluationSyncTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(username="tablet", password="password123")
+        self.client.force_authenticate(user=self.user)
+
+        main_event = MainEvent.objects.create(name="Main Event")
+        sub_event = SubEvent.objects.create(parent_event=main_event, name="Sub Event")
+        self.subsub_event = SubSubEvent.objects.create(
+            parent_event=main_event, parent_subevent=sub_event, name="Sub Sub Event"
+        )
+        self.url = f"/eval/subsubevents/{self.subsub_event.id}/evaluations/sync/"
+        self.projects = [
+            Project.objects.create(
+                event=self.subsub_event,
+                team_name=f"Team {index}",
+                captain_name=f"Captain {index}",
+                captain_email=f"captain{index}@gmail.com",
+                captain_phone="1234567890",
+            )
+            for index in range(3)
+        ]
+        Rubric.objects.create(subsubevent=self.subsub_event, name="Innovation", max_mark=10)
+        SubSubEventJudge.objects.create(subsubevent=self.subsub_event, name="Judge Alice")
+
+    def _sync(self, items):
+        return self.client.post(self.url, {"items": items}, format="json", secure=True)
+
+    def _judge_mark(self, key, project, judge_name, mark, version=0):
+        return {
+            "idempotency_key": key,
+            "project_id": project.id,
+            "judge_name": judge_name,
+            "rubric_marks": [{"rubric_name": "Innovation", "mark": mark}],
+            "version": version,
+        }
+
+    def test_batch_applies_items_and_reports_each_result(self):
+        first, second, third = self.projects
+        items = [
+            self._judge_mark("k1", first, "Judge Alice", "8.00"),
+            self._judge_mark("k2", first, "Judge Bob", "6.00"),
+            self._judge_mark("k3", first, "Judge Alice", "9.00", version=1),
+            {
+                "idempotency_key": "k4",
+                "type": "evaluation",
+                "project_id": second.id,
+                "is_disqualified": True,
+                "remarks": "Late",
+                "marks": [{"judge_name": "Judge Alice", "mark": "5.00"}, {"judge_name": "Judge Bob", "mark": "7.00"}],
+            },
+            self._judge_mark("k5", third, "Judge Alice", "11.00"),
+            self._judge_mark("k6", third, "Judge Alice", "4.00", version=3),
+            {"idempotency_key": "k7", "project_id": 999999, "judge_name": "Judge Alice", "mark": "1.00"},
+            {"project_id": third.id},
+            self._judge_mark("k1", first, "Judge Alice", "8.00"),
+        ]
+
+        response = self._sync(items)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        body = response.json()
+        self.assertEqual([result["status"] for result in body["results"]], [200, 200, 200, 200, 400, 409, 404, 400, 200])
+        self.assertEqual((body["applied"], body["replayed"], body["failed"]), (4, 1, 4))
+        self.assertTrue(body["results"][8]["replayed"])
+        self.assertEqual(body["results"][2]["mark"]["version"], 2)
+        self.assertEqual(body["results"][2]["mark"]["id"], body["results"][0]["mark"]["id"])
+
+        evaluation = Evaluation.objects.get(project=first)
+        self.assertEqual(float(evaluation.total), 15.0)
+        self.assertEqual(float(evaluation.final_score), 7.5)
+        self.assertEqual(evaluation.judge_marks.count(), 2)
+        alice = evaluation.judge_marks.get(judge_name="Judge Alice")
+        self.assertEqual(alice.version, 2)
+        self.assertIsNotNone(alice.subsubevent_judge_id)
+        self.assertEqual(EvaluationJudgeRubricMark.objects.get(judge_mark=alice).mark, 9)
+
+        replaced = Evaluation.objects.get(project=second)
+        self.assertTrue(replaced.is_disqualified)
+        self.assertEqual(float(replaced.final_score), 6.0)
+        self.assertFalse(Evaluation.objects.filter(project=third).exists())
+
+    def test_resent_batch_is_not_applied_twice(self):
+        items = [self._judge_mark("once", self.projects[0], "Judge Alice", "8.00")]
+        self._sync(items)
+        response = self._sync(items)
+
+        self.assertEqual(response.json()["replayed"], 1)
+        self.assertEqual(response.json()["results"][0]["evaluation"]["total"], "8.00")
+        self.assertEqual(EvaluationJudgeMark.objects.count(), 1)
+        self.assertEqual(EvaluationJudgeMark.objects.get().version, 1)
+
+    def test_evaluation_item_replaces_existing_marks(self):
+        self._sync([self._judge_mark("a", self.projects[0], "Judge Bob", "3.00")])
+        self._sync([{
+            "idempotency_key": "b",
+            "type": "evaluation",
+            "project_id": self.projects[0].id,
+            "marks": [{"judge_name": "Judge Alice", "rubric_marks": [{"rubric_name": "Innovation", "mark": "10"}]}],
+        }])
+
+        evaluation = Evaluation.objects.get(project=self.projects[0])
+        self.assertEqual(list(evaluation.judge_marks.values_list("judge_name", flat=True)), ["Judge Alice"])
+        self.assertEqual(float(evaluation.total), 10.0)
+        self.assertEqual(evaluation.number_of_judges, 1)
+
+    def test_evaluation_item_bumps_versions_of_kept_marks(self):
+        project = self.projects[0]
+        self._sync([self._judge_mark("a", project, "Judge Alice", "3.00")])
+        self._sync([{
+            "idempotency_key": "b",
+            "type": "evaluation",
+            "project_id": project.id,
+            "marks": [{"judge_name": "Judge Alice", "rubric_marks": [{"rubric_name": "Innovation", "mark": "5"}]}],
+        }])
+
+        alice = EvaluationJudgeMark.objects.get(evaluation__project=project)
+        self.assertEqual(alice.version, 2)
+        response = self._sync([self._judge_mark("c", project, "Judge Alice", "9.00", version=1)])
+        self.assertEqual(response.json()["results"][0]["status"], 409)
+        self.assertEqual(EvaluationJudgeMark.objects.get(pk=alice.pk).mark, 5)
+
+
+@override_settings(LIVE_FEED_ENABLED=True, LIVE_FEED_BROKER="memory")
+class LiveScoreFeedTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(user=User.objects.create_user(username="scorer", password="password123"))
+        main_event = MainEvent.objects.create(name="Main Event")
+        sub_event = SubEvent.objects.create(parent_event=main_event, name="Sub Event")
+        self.subsub_event = SubSubEvent.objects.create(
+            parent_event=main_event, parent_subevent=sub_event, name="Sub Sub Event"
+        )
+        self.first, self.second = [
+            Project.objects.create(
+                event=self.subsub_event,
+                team_name=f"Team {index}",
+                captain_name=f"Captain {index}",
+                captain_email=f"rank{index}@gmail.com",
+                captain_phone="1234567890",
+            )
+            for index in range(2)
+        ]
+        self.channel = live.channel_for_subsubevent(self.subsub_event.id)
+
+    def _score(self, project, mark, version=0):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.put(
+                "/eval/evaluations/judge-mark/",
+                {
+                    "project_id": project.id,
+                    "subsubevent_id": self.subsub_event.id,
+                    "judge_name": "Judge Alice",
+                    "mark": mark,
+                    "version": version,
+                },
+                format="json",
+                secure=True,
+            )
+        self.assertIn(response.status_code, (200, 201))
+
+    def test_scores_publish_scored_and_rank_deltas(self):
+        broker = live.get_broker()
+        start = broker.tail(self.channel)
+        self._score(self.first, "5.00")
+        self._score(self.second, "7.00")
+        self._score(self.first, "9.00", version=1)
+
+        events = [payload for _, payload in broker.read(self.channel, start)[0]]
+        self.assertEqual(
+            [(event["type"], event["project_id"]) for event in events],
+            [
+                ("scored", self.first.id), ("rank", self.first.id),
+                ("scored", self.second.id), ("rank", self.second.id),
+                ("scored", self.first.id), ("rank", self.first.id),
+            ],
+        )
+        self.assertEqual(events[1]["rank"], 1)
+        self.assertIsNone(events[1]["previous_rank"])
+        self.assertEqual(events[3]["rank"], 1)
+        self.assertEqual((events[5]["rank"], events[5]["previous_rank"]), (1, 2))
+        self.assertEqual(events[4]["final_score"], "9.00")
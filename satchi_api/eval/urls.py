@@ -1,4 +1,6 @@
 from django.urls import path
+from backend.async_views import read_view
+
 from .views import *
 
 urlpatterns = [
@@ -7,8 +9,10 @@ urlpatterns = [
     path('get_subsubevents/<int:sub_event_id>/', get_subsubevents, name='get_subsubevents'),
     path('get_projects/<int:event_id>/', getProjectsByEvent, name='get_projects_by_event'),
     path("subsubevents/judges/link/", link_judges_to_subsubevent, name="link-judges"),
-    path("subsubevents/<int:subsubevent_id>/judges/", list_judges_for_subsubevent, name="list-judges"),
+    path("subsubevents/<int:subsubevent_id>/judges/", read_view(list_judges_for_subsubevent, list_judges_for_subsubevent_async), name="list-judges"),
     path("subsubevents/<int:subsubevent_id>/summary.csv", download_evaluation_summary, name="download-summary"),
     path("evaluations/detail/", get_evaluation_submission, name="get-evaluation-detail"),
     path("evaluations/submit/", submit_evaluation_marks, name="submit-evaluation"), 
+    path("evaluations/judge-mark/", upsert_judge_mark_view, name="upsert-judge-mark"),
+    path("subsubevents/<int:subsubevent_id>/evaluations/sync/", sync_evaluations, name="sync-evaluations"),
 ]
\ No newline at end of file
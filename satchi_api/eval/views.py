@@ -5,11 +5,11 @@ from rest_framework import status
 from events.models import MainEvent, SubEvent, SubSubEvent
 from users.models import User
 from api.models import Project
-from api.serializers import ProjectSerializer
+from api.projections import PROJECT_LISTING
 from eval.models import Evaluation
 
 from django.db import transaction, IntegrityError
-from django.db.models import Exists, OuterRef
+from django.db.models import Exists, F, OuterRef
 from django.http import HttpResponse
 from django.shortcuts import get_object_or_404
 from rest_framework.permissions import IsAuthenticatedOrReadOnly
@@ -18,12 +18,29 @@ import csv
 from io import StringIO
 from django.utils.text import slugify
 
+from backend.async_views import aget_object_or_404, async_read_view, json_response
+from backend.db_router import reporting_read
+
 from .models import SubSubEventJudge, Evaluation, EvaluationJudgeMark, Rubric, EvaluationJudgeRubricMark
+from .scoring_config import aget_scoring_config, get_scoring_config
 from .serializers import (
     CreateJudgesSerializer,
     SubSubEventJudgeSerializer,
     JudgeListResponseSerializer,
     CreateEvaluationSerializer,
+    JudgeMarkUpsertSerializer,
+    SyncBatchSerializer,
+)
+from .services import (
+    DestructiveConfigChange,
+    StaleJudgeMark,
+    judge_mark_payload,
+    previous_rank_score,
+    publish_scores,
+    reconcile_scoring_config,
+    score_judge_mark,
+    sync_evaluation_batch,
+    upsert_judge_mark,
 )
 
 @api_view(['POST'])
@@ -90,7 +107,6 @@ def getProjectsByEvent(request, event_id):
 
     projects = (
         Project.objects.filter(event=subsubevent)
-        .prefetch_related("members")
         .annotate(
             has_evaluation=Exists(
                 Evaluation.objects.filter(
@@ -101,8 +117,7 @@ def getProjectsByEvent(request, event_id):
         )
         .order_by("id")
     )
-    serializer = ProjectSerializer(projects, many=True)
-    return Response(serializer.data, status=status.HTTP_200_OK)
+    return Response(PROJECT_LISTING.render(projects), status=status.HTTP_200_OK)
 
 
 @api_view(["POST"])
@@ -116,6 +131,10 @@ def link_judges_to_subsubevent(request):
       "replace": true,
       "rubrics": [{"name": "Innovation", "max_mark": 10}]
     }
+
+    Judges and rubrics are reconciled with what is configured (see
+    ``reconcile_scoring_config``); changes that would drop marks need
+    ``"force": true`` and otherwise return 409 with the conflicts.
     """
     serializer = CreateJudgesSerializer(data=request.data)
     serializer.is_valid(raise_exception=True)
@@ -123,45 +142,24 @@ def link_judges_to_subsubevent(request):
 
     subsub = get_object_or_404(SubSubEvent, id=data["subsubevent_id"])
 
-    with transaction.atomic():
-        if data.get("replace"):
-            SubSubEventJudge.objects.filter(subsubevent=subsub).delete()
-            Rubric.objects.filter(subsubevent=subsub).delete()
-
-        created_judges = []
-        order = 0
-        for name in data["names"]:
-            order += 1
-            obj, created_flag = SubSubEventJudge.objects.get_or_create(
-                subsubevent=subsub,
-                name=name.strip(),
-                defaults={"order": order},
-            )
-            if not created_flag and obj.order != order:
-                obj.order = order
-                obj.save(update_fields=["order"])
-            created_judges.append({"id": obj.id, "name": obj.name, "order": obj.order})
-
-        created_rubrics = []
-        for r_data in data.get("rubrics", []):
-            rubric_obj, created_flag = Rubric.objects.get_or_create(
-                subsubevent=subsub,
-                name=r_data["name"].strip(),
-                defaults={"max_mark": r_data["max_mark"]}
-            )
-            if not created_flag and rubric_obj.max_mark != r_data["max_mark"]:
-                rubric_obj.max_mark = r_data["max_mark"]
-                rubric_obj.save(update_fields=["max_mark"])
-            created_rubrics.append({
-                "id": rubric_obj.id,
-                "name": rubric_obj.name,
-                "max_mark": float(rubric_obj.max_mark)
-            })
+    try:
+        judges, rubrics, changes = reconcile_scoring_config(
+            subsub, data["judges"], data["rubrics"], replace=data["replace"], force=data["force"]
+        )
+    except DestructiveConfigChange as exc:
+        return Response(
+            {
+                "error": "These changes would remove or invalidate existing marks. Resend with force to apply them.",
+                "conflicts": exc.conflicts,
+            },
+            status=status.HTTP_409_CONFLICT,
+        )
 
     return Response({
         "subsubevent_id": subsub.id,
-        "judges": created_judges,
-        "rubrics": created_rubrics
+        "judges": [{"id": judge.id, "name": judge.name, "order": judge.order} for judge in judges],
+        "rubrics": [{"id": rubric.id, "name": rubric.name, "max_mark": float(rubric.max_mark)} for rubric in rubrics],
+        "changes": changes,
     }, status=status.HTTP_200_OK)
 
 
@@ -173,20 +171,15 @@ def list_judges_for_subsubevent(request, subsubevent_id):
     Returns list of judges and configured rubrics
     """
     subsub = get_object_or_404(SubSubEvent, id=subsubevent_id)
-    qs = SubSubEventJudge.objects.filter(subsubevent=subsub).order_by("order", "name")
-    judges_data = [{"id": j.id, "name": j.name, "order": j.order} for j in qs]
-    
-    rubrics_qs = Rubric.objects.filter(subsubevent=subsub).order_by("id")
-    rubrics_data = [{"id": r.id, "name": r.name, "max_mark": float(r.max_mark)} for r in rubrics_qs]
-    
-    return Response({
-        "subsubevent_id": subsub.id,
-        "judges": judges_data,
-        "rubrics": rubrics_data
-    }, status=status.HTTP_200_OK)
+    return Response(get_scoring_config(subsub).payload(), status=status.HTTP_200_OK)
+
+
+@async_read_view(permission="read_only")
+async def list_judges_for_subsubevent_async(request, subsubevent_id):
+    subsub = await aget_object_or_404(SubSubEvent, id=subsubevent_id)
+    return json_response((await aget_scoring_config(subsub)).payload())
 
 
-import logging
 from decimal import Decimal, InvalidOperation
 
 from django.db import transaction
@@ -197,7 +190,7 @@ from rest_framework.response import Response
 from rest_framework import status
 from rest_framework.exceptions import ValidationError
 
-logger = logging.getLogger(__name__)
+from backend.request_log import log_submission, submission_event
 
 
 @api_view(["GET"])
@@ -239,6 +232,7 @@ def get_evaluation_submission(request):
             "mark": str(mark.mark),
             "comments": mark.comments or "",
             "subsubevent_judge_id": mark.subsubevent_judge_id,
+            "version": mark.version,
         }
         for mark in evaluation.judge_marks.order_by("judge_name")
     ]
@@ -263,6 +257,7 @@ def get_evaluation_submission(request):
 
 @api_view(["GET"])
 @permission_classes([IsAuthenticatedOrReadOnly])
+@reporting_read
 def download_evaluation_summary(request, subsubevent_id):
     """Generate CSV containing registrations (and evaluation scores if available)."""
 
@@ -389,6 +384,7 @@ def download_evaluation_summary(request, subsubevent_id):
 
 @api_view(["POST"])
 @permission_classes([IsAuthenticatedOrReadOnly])
+@log_submission("eval.submit_marks")
 def submit_evaluation_marks(request):
     """
     Create an Evaluation and EvaluationJudgeMark rows.
@@ -405,187 +401,133 @@ def submit_evaluation_marks(request):
       ]
     }
     """
-    # ---- Basic request-level debug info ----
-    try:
-        remote_addr = request.META.get("REMOTE_ADDR")
-    except Exception:
-        remote_addr = None
-
-    logger.debug("submit_evaluation_marks called by user=%s (id=%s) ip=%s",
-                 getattr(request.user, "username", None),
-                 getattr(request.user, "id", None),
-                 remote_addr)
-    logger.debug("Request method=%s path=%s content_type=%s",
-                 request.method, request.path, request.content_type)
-    # Log headers (careful not to log sensitive auth token if present)
-    try:
-        headers = {k: v for k, v in request.headers.items() if k.lower() not in ("authorization", "cookie")}
-        logger.debug("Request headers (sanitized): %s", headers)
-    except Exception:
-        logger.debug("Could not read request.headers")
-
-    # Log raw body for debugging (may be large; consider removing in prod)
-    try:
-        raw = request.body.decode("utf-8")
-        logger.debug("Raw request body: %s", raw)
-    except Exception:
-        logger.debug("Could not decode request.body")
+    event = submission_event(request)
 
-    # ---- Serializer validation ----
     serializer = CreateEvaluationSerializer(data=request.data)
-    if not serializer.is_valid():
-        # Log errors explicitly before raising
-        logger.error("CreateEvaluationSerializer.is_valid() failed: errors=%s data=%s",
-                     serializer.errors, request.data)
-        # re-raise to preserve original behavior (DRF will convert to 400 response)
-        raise ValidationError(serializer.errors)
-
+    serializer.is_valid(raise_exception=True)
     data = serializer.validated_data
-    logger.debug("Serializer validated_data: %s", data)
-
-    # ---- Object lookups with logging ----
-    try:
-        project = get_object_or_404(Project, id=data["project_id"])
-        logger.debug("Found project id=%s", project.id)
-    except Exception as exc:
-        logger.exception("Failed to get Project with id=%s", data.get("project_id"))
-        raise
+    event.add(project_id=data["project_id"], subsubevent_id=data["subsubevent_id"])
 
-    try:
-        subsub = get_object_or_404(SubSubEvent, id=data["subsubevent_id"])
-        logger.debug("Found SubSubEvent id=%s", subsub.id)
-    except Exception as exc:
-        logger.exception("Failed to get SubSubEvent with id=%s", data.get("subsubevent_id"))
-        raise
+    project = get_object_or_404(Project, id=data["project_id"])
+    subsub = get_object_or_404(SubSubEvent, id=data["subsubevent_id"])
 
-    # ---- Atomic create/update and per-mark debug ----
     created_marks = []
-    try:
-        with transaction.atomic():
-            evaluation, created = Evaluation.objects.get_or_create(
-                project=project,
-                subsubevent=subsub,
-                defaults={
-                    "is_disqualified": data.get("is_disqualified", False),
-                    "remarks": data.get("remarks", "") or "",
-                },
-            )
-            if created:
-                logger.info("Created new Evaluation id=%s for project=%s subsub=%s",
-                            evaluation.id, project.id, subsub.id)
-            else:
-                logger.info("Using existing Evaluation id=%s for project=%s subsub=%s (clearing existing marks)",
-                            evaluation.id, project.id, subsub.id)
-                # optional: clear existing marks to overwrite
-                deleted_count, _ = evaluation.judge_marks.all().delete()
-                logger.debug("Deleted %d existing EvaluationJudgeMark rows for evaluation id=%s",
-                             deleted_count, evaluation.id)
-                evaluation.is_disqualified = data.get("is_disqualified", evaluation.is_disqualified)
-                evaluation.remarks = data.get("remarks", evaluation.remarks)
-                evaluation.save(update_fields=["is_disqualified", "remarks"])
-
-            marks_input = data.get("marks", [])
-            if not isinstance(marks_input, (list, tuple)):
-                logger.error("marks must be a list/tuple, got: %s", type(marks_input))
-                raise ValidationError({"marks": "Expected a list of mark objects."})
-
-            # Get existing rubrics for this sub-sub-event to validate against
-            valid_rubrics = {r.name: r for r in Rubric.objects.filter(subsubevent=subsub)}
-
-            for idx, mi in enumerate(marks_input, start=1):
-                logger.debug("Processing mark #%d: %s", idx, mi)
-                judge_name = (mi.get("judge_name") or "").strip()
-                if not judge_name:
-                    logger.error("Empty judge_name at marks index %d: %s", idx, mi)
-                    raise ValidationError({"marks": {idx - 1: {"judge_name": "This field may not be blank."}}})
-
-                rubric_marks_input = mi.get("rubric_marks", [])
+    rubric_mark_count = 0
+    with transaction.atomic():
+        evaluation, created = Evaluation.objects.get_or_create(
+            project=project,
+            subsubevent=subsub,
+            defaults={
+                "is_disqualified": data.get("is_disqualified", False),
+                "remarks": data.get("remarks", "") or "",
+            },
+        )
+        previous_score = previous_rank_score(evaluation, created)
+        existing_marks = {}
+        if not created:
+            # overwrite: judges still listed are updated in place (bumping their
+            # version), the rest are deleted after the loop
+            existing_marks = {mark.judge_name: mark for mark in evaluation.judge_marks.all()}
+            evaluation.is_disqualified = data.get("is_disqualified", evaluation.is_disqualified)
+            evaluation.remarks = data.get("remarks", evaluation.remarks)
+            evaluation.save(update_fields=["is_disqualified", "remarks"])
+
+        marks_input = data.get("marks", [])
+        if not isinstance(marks_input, (list, tuple)):
+            raise ValidationError({"marks": "Expected a list of mark objects."})
+
+        # Judges and rubrics configured for this sub-sub-event, to validate and link against
+        scoring_config = get_scoring_config(subsub)
+        valid_rubrics = scoring_config.rubrics_by_name
+
+        for idx, mi in enumerate(marks_input, start=1):
+            judge_name = (mi.get("judge_name") or "").strip()
+            if not judge_name:
+                raise ValidationError({"marks": {idx - 1: {"judge_name": "This field may not be blank."}}})
+
+            rubric_marks_input = mi.get("rubric_marks", [])
+            
+            # If rubric marks are provided and rubrics are configured, compute mark_decimal as sum of rubric marks
+            if rubric_marks_input and valid_rubrics:
+                mark_decimal = Decimal("0.00")
+                rubric_save_payload = []
                 
-                # If rubric marks are provided and rubrics are configured, compute mark_decimal as sum of rubric marks
-                if rubric_marks_input and valid_rubrics:
-                    mark_decimal = Decimal("0.00")
-                    rubric_save_payload = []
+                for rmi in rubric_marks_input:
+                    r_name = rmi.get("rubric_name")
+                    if r_name not in valid_rubrics:
+                        raise ValidationError({
+                            "error": f"Invalid rubric criterion '{r_name}' for this sub-sub-event."
+                        })
                     
-                    for rmi in rubric_marks_input:
-                        r_name = rmi.get("rubric_name")
-                        if r_name not in valid_rubrics:
-                            raise ValidationError({
-                                "error": f"Invalid rubric criterion '{r_name}' for this sub-sub-event."
-                            })
-                        
-                        r_obj = valid_rubrics[r_name]
-                        r_mark = Decimal(str(rmi.get("mark") or 0))
-                        
-                        if r_mark < 0 or r_mark > r_obj.max_mark:
-                            raise ValidationError({
-                                "error": f"Score {r_mark} for '{r_name}' exceeds the maximum permitted mark of {r_obj.max_mark}."
-                            })
-                        
-                        mark_decimal += r_mark
-                        rubric_save_payload.append((r_obj, r_mark))
-                else:
-                    # Legacy flat grading validation
-                    raw_mark = mi.get("mark")
-                    if raw_mark in (None, ""):
-                        logger.error("Missing mark value for judge '%s' at index %d", judge_name, idx)
-                        raise ValidationError({"marks": {idx - 1: {"mark": "This field is required."}}})
-                    try:
-                        mark_decimal = Decimal(str(raw_mark))
-                    except (InvalidOperation, ValueError, TypeError) as exc:
-                        logger.exception("Invalid mark for judge '%s' at index %d: raw_mark=%r", judge_name, idx, raw_mark)
-                        raise ValidationError({"marks": {idx - 1: {"mark": f"Invalid numeric value: {raw_mark}"}}})
-
-                comments = mi.get("comments", "") or ""
-
-                # try to link to a SubSubEventJudge if exists
+                    r_obj = valid_rubrics[r_name]
+                    r_mark = Decimal(str(rmi.get("mark") or 0))
+                    
+                    if r_mark < 0 or r_mark > r_obj.max_mark:
+                        raise ValidationError({
+                            "error": f"Score {r_mark} for '{r_name}' exceeds the maximum permitted mark of {r_obj.max_mark}."
+                        })
+                    
+                    mark_decimal += r_mark
+                    rubric_save_payload.append((r_obj, r_mark))
+            else:
+                # Legacy flat grading validation
+                raw_mark = mi.get("mark")
+                if raw_mark in (None, ""):
+                    raise ValidationError({"marks": {idx - 1: {"mark": "This field is required."}}})
                 try:
-                    ssj = SubSubEventJudge.objects.filter(subsubevent=subsub, name=judge_name).first()
-                    logger.debug("Linked SubSubEventJudge for name='%s': %s", judge_name, getattr(ssj, "id", None))
-                except Exception:
-                    logger.exception("Error querying SubSubEventJudge for name='%s'", judge_name)
-                    ssj = None
+                    mark_decimal = Decimal(str(raw_mark))
+                except (InvalidOperation, ValueError, TypeError):
+                    raise ValidationError({"marks": {idx - 1: {"mark": f"Invalid numeric value: {raw_mark}"}}})
+
+            comments = mi.get("comments", "") or ""
 
-                # create EvaluationJudgeMark
+            # create or update the EvaluationJudgeMark, linked to the SubSubEventJudge if one exists
+            judge_id = scoring_config.judge_ids.get(judge_name)
+            ejm = existing_marks.pop(judge_name, None)
+            if ejm is None:
                 ejm = EvaluationJudgeMark.objects.create(
                     evaluation=evaluation,
-                    subsubevent_judge=ssj,
+                    subsubevent_judge_id=judge_id,
                     judge_name=judge_name,
                     mark=mark_decimal,
                     comments=comments,
                 )
-                
-                # save individual rubric marks if using rubric
-                if rubric_marks_input and valid_rubrics:
-                    for rubric_obj, r_mark in rubric_save_payload:
-                        EvaluationJudgeRubricMark.objects.create(
-                            judge_mark=ejm,
-                            rubric=rubric_obj,
-                            mark=r_mark
-                        )
-                
-                created_marks.append({"id": ejm.id, "judge_name": ejm.judge_name, "mark": str(ejm.mark)})
-                logger.info("Created EvaluationJudgeMark id=%s judge=%s mark=%s", ejm.id, ejm.judge_name, ejm.mark)
-
-            # recompute totals/average and save on evaluation
-            try:
-                evaluation.recalculate_scores()
-                evaluation.save()
-                logger.debug("Recalculated evaluation scores: total=%s final_score=%s number_of_judges=%s",
-                             getattr(evaluation, "total", None),
-                             getattr(evaluation, "final_score", None),
-                             getattr(evaluation, "number_of_judges", None))
-            except Exception:
-                logger.exception("Failed to recalculate/save evaluation id=%s", evaluation.id)
-                # re-raise to rollback transaction
-                raise
-
-    except ValidationError:
-        # already logged specifics above, re-raise to return DRF 400 response
-        raise
-    except Exception:
-        # Log unexpected exceptions (with stack trace) then re-raise so middleware/DRF handles it
-        logger.exception("Unexpected error in submit_evaluation_marks")
-        raise
+            else:
+                EvaluationJudgeMark.objects.filter(pk=ejm.pk).update(
+                    subsubevent_judge_id=judge_id,
+                    mark=mark_decimal,
+                    comments=comments,
+                    version=F("version") + 1,
+                )
+                ejm.mark = mark_decimal
+                ejm.rubric_marks.all().delete()
+            
+            # save individual rubric marks if using rubric
+            if rubric_marks_input and valid_rubrics:
+                for rubric_obj, r_mark in rubric_save_payload:
+                    EvaluationJudgeRubricMark.objects.create(
+                        judge_mark=ejm,
+                        rubric_id=rubric_obj.id,
+                        mark=r_mark
+                    )
+                rubric_mark_count += len(rubric_save_payload)
+            
+            created_marks.append({"id": ejm.id, "judge_name": ejm.judge_name, "mark": str(ejm.mark)})
+
+        if existing_marks:
+            EvaluationJudgeMark.objects.filter(pk__in=[mark.pk for mark in existing_marks.values()]).delete()
+
+        # recompute totals/average and save on evaluation
+        evaluation.recalculate_scores()
+        evaluation.save()
+        publish_scores(subsub.id, [evaluation], {project.id: previous_score})
+
+    event.add(
+        evaluation_id=evaluation.id,
+        created=created,
+        judge_marks=len(created_marks),
+        rubric_marks=rubric_mark_count,
+    )
 
     # return created evaluation summary
     resp = {
@@ -598,5 +540,101 @@ def submit_evaluation_marks(request):
         "is_disqualified": evaluation.is_disqualified,
         "marks_created": created_marks,
     }
-    logger.debug("submit_evaluation_marks completed successfully: %s", resp)
     return Response(resp, status=status.HTTP_201_CREATED)
+
+
+@api_view(["PUT"])
+@permission_classes([IsAuthenticatedOrReadOnly])
+@log_submission("eval.upsert_judge_mark")
+def upsert_judge_mark_view(request):
+    """
+    Create or update a single judge's mark without touching other judges' rows.
+
+    The request carries the ``version`` of the mark the judge last saw; if
+    another write got there first the response is 409 with the current mark.
+    """
+    serializer = JudgeMarkUpsertSerializer(data=request.data)
+    serializer.is_valid(raise_exception=True)
+    data = serializer.validated_data
+    event = submission_event(request)
+    event.add(project_id=data["project_id"], subsubevent_id=data["subsubevent_id"], version=data["version"])
+
+    project = get_object_or_404(
+        Project.objects.select_related("event"), id=data["project_id"], event_id=data["subsubevent_id"]
+    )
+    subsub = project.event
+    judge_name = data["judge_name"].strip()
+    if not judge_name:
+        raise ValidationError({"judge_name": "This field may not be blank."})
+
+    scoring_config = get_scoring_config(subsub)
+    mark, rubric_scores = score_judge_mark(data.get("mark"), data["rubric_marks"], scoring_config.rubrics_by_name)
+
+    try:
+        evaluation, judge_mark, created = upsert_judge_mark(
+            project=project,
+            subsubevent=subsub,
+            judge_id=scoring_config.judge_ids.get(judge_name),
+            judge_name=judge_name,
+            mark=mark,
+            comments=data.get("comments") or "",
+            rubric_scores=rubric_scores,
+            expected_version=data["version"],
+        )
+    except StaleJudgeMark as exc:
+        return Response(
+            {
+                "error": "This mark was changed by another submission. Reload it and try again.",
+                "current": judge_mark_payload(exc.current) if exc.current is not None else None,
+            },
+            status=status.HTTP_409_CONFLICT,
+        )
+
+    event.add(evaluation_id=evaluation.id, created=created, rubric_marks=len(rubric_scores))
+    return Response(
+        {
+            "evaluation": {
+                "id": evaluation.id,
+                "project_id": project.id,
+                "subsubevent_id": subsub.id,
+                "number_of_judges": evaluation.number_of_judges,
+                "total": str(evaluation.total),
+                "final_score": str(evaluation.final_score),
+            },
+            "mark": judge_mark_payload(judge_mark),
+        },
+        status=status.HTTP_201_CREATED if created else status.HTTP_200_OK,
+    )
+
+
+@api_view(["POST"])
+@permission_classes([IsAuthenticatedOrReadOnly])
+@log_submission("eval.sync_batch")
+def sync_evaluations(request, subsubevent_id):
+    """
+    Apply a judging tablet's queue of marks for one sub-sub-event in one call.
+
+    Each item carries a client-generated ``idempotency_key``; re-sending an
+    item that was already applied returns its stored result. The response
+    has one result per item, in request order.
+    """
+    subsub = get_object_or_404(SubSubEvent, id=subsubevent_id)
+    serializer = SyncBatchSerializer(data=request.data)
+    serializer.is_valid(raise_exception=True)
+    items = serializer.validated_data["items"]
+
+    try:
+        results = sync_evaluation_batch(subsub, items)
+    except IntegrityError:
+        return Response(
+            {"error": "Another submission changed these evaluations at the same time. Retry the batch."},
+            status=status.HTTP_409_CONFLICT,
+        )
+
+    applied = sum(1 for result in results if result["status"] == 200 and not result.get("replayed"))
+    replayed = sum(1 for result in results if result.get("replayed"))
+    submission_event(request).add(subsubevent_id=subsub.id, items=len(items), applied=applied, replayed=replayed)
+    return Response(
+        {"applied": applied, "replayed": replayed, "failed": len(results) - applied - replayed, "results": results},
+        status=status.HTTP_200_OK,
+    )
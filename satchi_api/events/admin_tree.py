@@ -0,0 +1,213 @@
+"""
+Which events an admin can manage, and with which role.
+
+``AdminScope`` reads a user's ``EventUserMapping`` rows once and answers,
+without further queries, which main, sub and sub-sub events they may see
+and the role they hold on each: an event-level role covers the whole main
+event, a sub-event role its sub-event, and a sub-sub-event role only that
+event (its parents are shown so it can be reached). Superusers see
+everything.
+
+``admin_data`` renders the whole visible catalogue with it. The admin tree
+endpoints use ``mains``/``subs``/``subsubs`` to load one level at a time instead: the
+main events with child counts, the children of one node, or name matches,
+so the cost of a request does not depend on how many festivals exist.
+"""
+
+from collections import defaultdict
+
+from django.db.models import Count, Q
+
+from users.models import EventUserMapping, User
+
+from .models import MainEvent, SubEvent, SubSubEvent
+
+ROLE_PRIORITY = {
+    User.Role.SUPERADMIN: 0,
+    User.Role.EVENTADMIN: 1,
+    User.Role.EVENTMANAGER: 2,
+    User.Role.SUBEVENTADMIN: 3,
+    User.Role.SUBEVENTMANAGER: 4,
+    User.Role.SUBSUBEVENTMANAGER: 5,
+    User.Role.COORDINATOR: 6,
+    User.Role.PARTICIPANT: 7,
+}
+
+MAIN_TREE_ROLES = {User.Role.SUPERADMIN, User.Role.EVENTADMIN, User.Role.EVENTMANAGER}
+SUB_TREE_ROLES = MAIN_TREE_ROLES | {User.Role.SUBEVENTADMIN, User.Role.SUBEVENTMANAGER}
+
+
+def pick_highest_role(roles, fallback=None):
+    if not roles and fallback:
+        return fallback
+    if not roles:
+        return None
+    return sorted(roles, key=lambda role: ROLE_PRIORITY.get(role, 99))[0]
+
+
+class AdminScope:
+    def __init__(self, user):
+        self.is_superuser = user.is_superuser
+        self.main_roles = defaultdict(set)
+        self.sub_roles = defaultdict(set)
+        self.subsub_roles = defaultdict(set)
+        self.main_ids = set()
+        self.full_main_ids = set()
+        self.full_sub_ids = set()
+        self.subs_by_main = defaultdict(set)
+        self.subsubs_by_sub = defaultdict(set)
+
+        mappings = EventUserMapping.objects.filter(user=user).select_related("sub_event", "sub_sub_event")
+        for mapping in mappings:
+            role = mapping.user_role
+            if mapping.main_event_id:
+                self.main_ids.add(mapping.main_event_id)
+                self.main_roles[mapping.main_event_id].add(role)
+                if role in MAIN_TREE_ROLES:
+                    self.full_main_ids.add(mapping.main_event_id)
+
+            if mapping.sub_event_id:
+                main_id = mapping.sub_event.parent_event_id
+                self.main_ids.add(main_id)
+                self.sub_roles[mapping.sub_event_id].add(role)
+                self.subs_by_main[main_id].add(mapping.sub_event_id)
+                if role in SUB_TREE_ROLES:
+                    self.full_sub_ids.add(mapping.sub_event_id)
+                if role in MAIN_TREE_ROLES:
+                    self.full_main_ids.add(main_id)
+
+            if mapping.sub_sub_event_id:
+                subsub = mapping.sub_sub_event
+                self.main_ids.add(subsub.parent_event_id)
+                self.subsub_roles[subsub.id].add(role)
+                self.subs_by_main[subsub.parent_event_id].add(subsub.parent_subevent_id)
+                self.subsubs_by_sub[subsub.parent_subevent_id].add(subsub.id)
+
+    @property
+    def is_empty(self):
+        return not self.is_superuser and not self.main_ids
+
+    def includes_all_subs(self, main_id):
+        return self.is_superuser or main_id in self.full_main_ids
+
+    def includes_all_subsubs(self, main_id, sub_id):
+        return self.includes_all_subs(main_id) or sub_id in self.full_sub_ids
+
+    def main_role(self, main_id):
+        candidates = set(self.main_roles.get(main_id, ()))
+        if self.is_superuser:
+            candidates.add(User.Role.SUPERADMIN)
+        for sub_id in self.subs_by_main.get(main_id, ()):
+            candidates |= self.sub_roles.get(sub_id, set())
+            for subsub_id in self.subsubs_by_sub.get(sub_id, ()):
+                candidates |= self.subsub_roles.get(subsub_id, set())
+        if not candidates and self.includes_all_subs(main_id):
+            candidates.add(User.Role.EVENTADMIN)
+        return pick_highest_role(candidates)
+
+    def sub_role(self, main_id, sub_id):
+        main_role = self.main_role(main_id)
+        include_all = self.includes_all_subsubs(main_id, sub_id)
+        candidates = set(self.sub_roles.get(sub_id, ()))
+        if not include_all:
+            for subsub_id in self.subsubs_by_sub.get(sub_id, ()):
+                candidates |= self.subsub_roles.get(subsub_id, set())
+        if include_all and not candidates and main_role:
+            candidates.add(main_role)
+        return pick_highest_role(candidates, fallback=main_role)
+
+    def subsub_role(self, main_id, sub_id, subsub_id):
+        candidates = self.subsub_roles.get(subsub_id, set())
+        if candidates:
+            return pick_highest_role(candidates)
+        return self.sub_role(main_id, sub_id) or self.main_role(main_id)
+
+    # Visibility filters. ``prefix`` applies them across a relation, e.g.
+    # ``sub_q("subevents__")`` on MainEvent. None means no restriction.
+
+    def main_q(self, prefix=""):
+        if self.is_superuser:
+            return None
+        return Q(**{f"{prefix}id__in": self.main_ids})
+
+    def sub_q(self, prefix=""):
+        if self.is_superuser:
+            return None
+        sub_ids = set().union(*self.subs_by_main.values())
+        return Q(**{f"{prefix}parent_event_id__in": self.full_main_ids}) | Q(**{f"{prefix}id__in": sub_ids})
+
+    def subsub_q(self, prefix=""):
+        if self.is_superuser:
+            return None
+        subsub_ids = set().union(*self.subsubs_by_sub.values())
+        return (
+            Q(**{f"{prefix}parent_event_id__in": self.full_main_ids})
+            | Q(**{f"{prefix}parent_subevent_id__in": self.full_sub_ids})
+            | Q(**{f"{prefix}id__in": subsub_ids})
+        )
+
+    @staticmethod
+    def _restrict(queryset, q):
+        return queryset if q is None else queryset.filter(q)
+
+    def mains(self):
+        """Visible main events, each with ``childCount`` visible sub-events."""
+        queryset = MainEvent.objects.annotate(
+            childCount=Count("subevents", filter=self.sub_q("subevents__"), distinct=True)
+        )
+        return self._restrict(queryset, self.main_q())
+
+    def subs(self):
+        """Visible sub-events, each with ``childCount`` visible sub-sub-events."""
+        queryset = SubEvent.objects.select_related("parent_event").annotate(
+            childCount=Count("subsubevents", filter=self.subsub_q("subsubevents__"), distinct=True)
+        )
+        return self._restrict(queryset, self.sub_q())
+
+    def subsubs(self):
+        queryset = SubSubEvent.objects.select_related("parent_event", "parent_subevent")
+        return self._restrict(queryset, self.subsub_q())
+
+
+def main_node(scope, main):
+    return {
+        "level": "main",
+        "id": main.id,
+        "eventId": main.event_id,
+        "name": main.name,
+        "description": main.description,
+        "isOpen": main.isOpen,
+        "role": scope.main_role(main.id),
+        "childCount": main.childCount,
+    }
+
+
+def sub_node(scope, sub):
+    return {
+        "level": "sub",
+        "id": sub.id,
+        "eventId": sub.event_id,
+        "name": sub.name,
+        "description": sub.description,
+        "isOpen": sub.isOpen,
+        "role": scope.sub_role(sub.parent_event_id, sub.id),
+        "parentId": sub.parent_event_id,
+        "parentName": sub.parent_event.name,
+        "childCount": sub.childCount,
+    }
+
+
+def subsub_node(scope, subsub):
+    return {
+        "level": "subsub",
+        "id": subsub.id,
+        "eventId": subsub.event_id,
+        "name": subsub.name,
+        "description": subsub.description,
+        "isOpen": subsub.isOpen,
+        "role": scope.subsub_role(subsub.parent_event_id, subsub.parent_subevent_id, subsub.id),
+        "parentId": subsub.parent_event_id,
+        "parentName": subsub.parent_event.name,
+        "subParentId": subsub.parent_subevent_id,
+        "subParentName": subsub.parent_subevent.name,
+    }
@@ -0,0 +1,232 @@
+"""
+Archiving closed festivals out of the live tables.
+
+``archive_event`` dumps every row of a closed main event's tree (the rows
+``events.purge`` would delete) into one gzip-compressed JSON snapshot on an
+``EventArchive``, renders each participant's registration into an
+``ArchivedRegistration`` and then purges the tree, so queries on projects,
+team members, evaluations and role mappings only see live festivals.
+``restore_event`` loads the snapshot back under the original ids (with
+timestamps at the millisecond precision of Django's JSON serialization).
+
+Both run in one transaction. Trees that ``needs_background_purge`` would
+hand to a job (and archives holding as many projects) are archived or
+restored by an ``ArchiveJob`` through the purge runner instead of in the
+request.
+"""
+
+import gzip
+import logging
+from collections import defaultdict
+from itertools import chain
+
+from django.conf import settings
+from django.core import serializers
+from django.db import connections, router, transaction
+from django.utils import timezone
+
+from api.models import Project
+from users.models import User
+
+from .models import ArchivedRegistration, ArchiveJob, EventArchive, MainEvent
+from .purge import purge, purge_steps, run_in_background
+
+logger = logging.getLogger(__name__)
+
+
+class ArchiveConflict(Exception):
+    """The snapshot's rows cannot be restored because some of their ids are taken."""
+
+    def __init__(self, conflicts):
+        super().__init__("Some archived rows conflict with existing rows.")
+        self.conflicts = conflicts
+
+
+def _tree_querysets(main_event_id):
+    # the purge deletes children first; the snapshot stores parents first
+    return [
+        (name, queryset.order_by("pk"))
+        for name, queryset, update in reversed(purge_steps("main", main_event_id))
+        if update is None
+    ]
+
+
+def _registrations(archive, main_event_id):
+    from api.views import _normalize_email, _serialize_registration
+
+    projects = (
+        Project.objects.filter(event__parent_event_id=main_event_id)
+        .select_related("event", "event__parent_subevent", "event__parent_event")
+        .prefetch_related("members")
+        .order_by("id")
+    )
+    for project in projects:
+        payload = _serialize_registration(project, None)
+        participants = {_normalize_email(project.captain_email): (project.captain_user_id, "Captain")}
+        for member in project.members.all():
+            participants.setdefault(_normalize_email(member.email), (member.user_id, "Team Member"))
+        for email, (user_id, role) in participants.items():
+            if email:
+                yield ArchivedRegistration(
+                    archive=archive,
+                    user_id=user_id,
+                    email=email,
+                    payload={**payload, "role": role, "archived": True, "archiveId": archive.id},
+                )
+
+
+@transaction.atomic
+def archive_event(main_event, archived_by=None):
+    """Move the closed ``main_event`` and its whole tree into an ``EventArchive``."""
+
+    querysets = _tree_querysets(main_event.pk)
+    counts = {name: queryset.count() for name, queryset in querysets}
+    snapshot = serializers.serialize("json", chain.from_iterable(queryset for _, queryset in querysets))
+    compressed = gzip.compress(snapshot.encode())
+    archive = EventArchive.objects.create(
+        source_id=main_event.pk,
+        event_id=main_event.event_id,
+        name=main_event.name,
+        snapshot=compressed,
+        size_bytes=len(compressed),
+        counts=counts,
+        archived_by=archived_by,
+    )
+    ArchivedRegistration.objects.bulk_create(_registrations(archive, main_event.pk), batch_size=500)
+    purge("main", main_event.pk)
+    return archive
+
+
+def _detach_missing_users(instance, fields, existing_users):
+    for field in fields:
+        user_id = getattr(instance, field.attname)
+        if user_id is not None and user_id not in existing_users:
+            if not field.null:
+                return False
+            setattr(instance, field.attname, None)
+    return True
+
+
+def _insert_raw(model, rows):
+    # a raw insert keeps the archived values of auto_now_add fields (registeredAt,
+    # submitted_at, ...) that bulk_create would overwrite, as loaddata does row by row
+    connection = connections[router.db_for_write(model)]
+    fields = model._meta.concrete_fields
+    batch_size = connection.ops.bulk_batch_size(fields, rows) or len(rows)
+    for start in range(0, len(rows), batch_size):
+        model._base_manager.using(connection.alias)._insert(rows[start:start + batch_size], fields=fields, raw=True)
+
+
+@transaction.atomic
+def restore_event(archive):
+    """
+    Put the archived rows back and delete ``archive``. Links to users that no
+    longer exist are cleared, and role mappings of deleted users are dropped.
+    Raises ``ArchiveConflict`` when any archived id is in use again.
+    """
+
+    objects = defaultdict(list)
+    for deserialized in serializers.deserialize("json", gzip.decompress(bytes(archive.snapshot)).decode()):
+        objects[type(deserialized.object)].append(deserialized.object)
+
+    user_fields = {
+        model: [field for field in model._meta.concrete_fields if field.related_model is User]
+        for model in objects
+    }
+    user_ids = {
+        getattr(instance, field.attname)
+        for model, instances in objects.items()
+        for instance in instances
+        for field in user_fields[model]
+    }
+    existing_users = set(User.objects.filter(pk__in=user_ids - {None}).values_list("pk", flat=True))
+
+    conflicts = {}
+    for model, instances in objects.items():
+        taken = list(model.objects.filter(pk__in=[instance.pk for instance in instances]).values_list("pk", flat=True))
+        if taken:
+            conflicts[model.__name__] = sorted(taken)
+    if conflicts:
+        raise ArchiveConflict(conflicts)
+
+    for model, instances in objects.items():
+        rows = [instance for instance in instances if _detach_missing_users(instance, user_fields[model], existing_users)]
+        _insert_raw(model, rows)
+
+    archive.delete()
+    return objects[MainEvent][0]
+
+
+def archive_payload(archive):
+    return {
+        "archiveId": archive.id,
+        "sourceId": archive.source_id,
+        "eventId": archive.event_id,
+        "name": archive.name,
+        "counts": archive.counts,
+        "sizeBytes": archive.size_bytes,
+        "archivedAt": archive.archived_at,
+    }
+
+
+def restored_payload(main_event):
+    return {"id": main_event.id, "level": "main", "event_id": main_event.event_id, "name": main_event.name}
+
+
+def needs_background_restore(archive):
+    return archive.counts.get("projects", 0) > settings.EVENT_PURGE_ASYNC_THRESHOLD
+
+
+def _run(job):
+    if job.action == ArchiveJob.Action.ARCHIVE:
+        main_event = MainEvent.objects.filter(pk=job.target_id).first()
+        if main_event is None:
+            raise LookupError(f"Main event {job.target_id} no longer exists.")
+        if main_event.isOpen:
+            raise ValueError("Close the event before archiving it.")
+        return archive_payload(archive_event(main_event, archived_by=job.created_by))
+
+    archive = EventArchive.objects.filter(pk=job.target_id).first()
+    if archive is None:
+        raise LookupError(f"Archive {job.target_id} no longer exists.")
+    return restored_payload(restore_event(archive))
+
+
+def run_job(job):
+    """Run (or re-run) ``job``; each archive or restore is one transaction, so a failed run left nothing behind."""
+
+    jobs = ArchiveJob.objects.filter(pk=job.pk)
+    jobs.update(status=ArchiveJob.Status.RUNNING, error="", result={}, updated_at=timezone.now())
+    try:
+        result = _run(job)
+    except ArchiveConflict as exc:
+        failure = {"error": str(exc), "result": {"conflicts": exc.conflicts}}
+    except (LookupError, ValueError) as exc:
+        failure = {"error": str(exc)}
+    except Exception as exc:
+        logger.exception("Archive job %s failed", job.pk)
+        failure = {"error": str(exc)}
+    else:
+        jobs.update(status=ArchiveJob.Status.DONE, result=result, finished_at=timezone.now(), updated_at=timezone.now())
+        return
+    jobs.update(status=ArchiveJob.Status.FAILED, finished_at=timezone.now(), updated_at=timezone.now(), **failure)
+
+
+def start_job(job):
+    """Run ``job`` with the purge runner once the current transaction commits."""
+
+    run_in_background(run_job, job, "event-archive")
+
+
+def job_payload(job):
+    return {
+        "jobId": job.id,
+        "action": job.action,
+        "targetId": job.target_id,
+        "targetName": job.target_name,
+        "status": job.status,
+        "result": job.result,
+        "error": job.error,
+        "createdAt": job.created_at,
+        "finishedAt": job.finished_at,
+    }
@@ -0,0 +1,81 @@
+"""
+Sortable, collision-free ``event_id`` values.
+
+Ids are the level prefix (``EVT``, ``EVT_S``, ``EVT_SS``, as before) followed
+by a 26-character ULID: a 48-bit millisecond timestamp and 80 random bits in
+Crockford base32, so they sort by creation time. Within one process ids are
+strictly increasing; several ids in the same millisecond reuse its timestamp
+and count up from the previous random value, the per-process sequence. Other
+processes start from their own random value, so they cannot realistically
+collide.
+
+The generators are the models' field defaults, so instances built for
+``bulk_create`` (which never calls ``save()``) get an id as well. Ids
+generated by earlier versions (``EVT%Y%m%d%H%M%S...``) stay valid; only new
+rows use this format.
+"""
+
+import os
+import secrets
+import threading
+import time
+
+MAIN_EVENT_PREFIX = "EVT"
+SUB_EVENT_PREFIX = "EVT_S"
+SUBSUB_EVENT_PREFIX = "EVT_SS"
+
+_ALPHABET = "0123456789ABCDEFGHJKMNPQRSTVWXYZ"
+_RANDOM_BITS = 80
+_RANDOM_LIMIT = 1 << _RANDOM_BITS
+
+_lock = threading.Lock()
+_last_ms = 0
+_last_random = 0
+
+
+def _reset_after_fork():
+    # a forked worker must not continue the parent's sequence
+    global _lock, _last_ms
+    _lock = threading.Lock()
+    _last_ms = 0
+
+
+os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def _encode(value, length=26):
+    chars = []
+    for _ in range(length):
+        value, index = divmod(value, 32)
+        chars.append(_ALPHABET[index])
+    return "".join(reversed(chars))
+
+
+def ulid():
+    global _last_ms, _last_random
+    with _lock:
+        now = time.time_ns() // 1_000_000
+        if now > _last_ms:
+            _last_ms, _last_random = now, secrets.randbits(_RANDOM_BITS)
+        else:
+            # same millisecond, or the clock stepped back: keep counting from the last id
+            _last_random += 1
+            if _last_random >= _RANDOM_LIMIT:
+                _last_ms, _last_random = _last_ms + 1, secrets.randbits(_RANDOM_BITS - 1)
+        return _encode((_last_ms << _RANDOM_BITS) | _last_random)
+
+
+def new_event_id(prefix):
+    return f"{prefix}{ulid()}"
+
+
+def main_event_id():
+    return new_event_id(MAIN_EVENT_PREFIX)
+
+
+def sub_event_id():
+    return new_event_id(SUB_EVENT_PREFIX)
+
+
+def subsub_event_id():
+    return new_event_id(SUBSUB_EVENT_PREFIX)
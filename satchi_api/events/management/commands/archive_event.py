@@ -0,0 +1,53 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from events.archive import ArchiveConflict, archive_event, restore_event, run_job
+from events.models import ArchiveJob, EventArchive, MainEvent
+
+
+class Command(BaseCommand):
+    help = (
+        "Move a closed main event and its whole tree out of the live tables into an "
+        "archive, or with --restore put an archive back. --resume re-runs archive "
+        "jobs that are pending, failed or were interrupted."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("id", nargs="?", type=int, help="Main event id, or archive id with --restore.")
+        parser.add_argument("--restore", action="store_true", help="Restore the archive with this id.")
+        parser.add_argument("--resume", action="store_true", help="Run every unfinished archive job.")
+
+    def handle(self, *args, **options):
+        if options["resume"]:
+            for job in ArchiveJob.objects.exclude(status=ArchiveJob.Status.DONE).order_by("id"):
+                run_job(job)
+                job.refresh_from_db()
+                if job.status == ArchiveJob.Status.FAILED:
+                    self.stderr.write(f"Archive job {job.id} ({job.action} {job.target_id}) failed: {job.error}")
+                else:
+                    self.stdout.write(self.style.SUCCESS(f"Finished {job.action} of {job.target_name}, job {job.id}."))
+            return
+        if options["id"] is None:
+            raise CommandError("Pass an id, or --resume.")
+
+        if options["restore"]:
+            archive = EventArchive.objects.filter(pk=options["id"]).first()
+            if archive is None:
+                raise CommandError(f"Archive {options['id']} does not exist.")
+            try:
+                main_event = restore_event(archive)
+            except ArchiveConflict as exc:
+                raise CommandError(f"{exc} {exc.conflicts}")
+            self.stdout.write(self.style.SUCCESS(f"Restored '{main_event.name}' as main event {main_event.id}."))
+            return
+
+        main_event = MainEvent.objects.filter(pk=options["id"]).first()
+        if main_event is None:
+            raise CommandError(f"Main event {options['id']} does not exist.")
+        if main_event.isOpen:
+            raise CommandError(f"Main event {main_event.id} is still open; close it before archiving.")
+        archive = archive_event(main_event)
+        for name, value in archive.counts.items():
+            self.stdout.write(f"  {name}: {value}")
+        self.stdout.write(self.style.SUCCESS(
+            f"Archived '{archive.name}' as archive {archive.id} ({archive.size_bytes} bytes)."
+        ))
@@ -0,0 +1,37 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from events.models import MainEvent
+from events.services import clone_event_tree
+from users.models import User
+
+
+class Command(BaseCommand):
+    help = (
+        "Copy a main event with its sub events, sub-sub events, judges and rubrics "
+        "(and optionally role mappings) for the next edition of a festival."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("main_event_id", type=int)
+        parser.add_argument("--name", help="Name of the copy (defaults to the source event's name).")
+        parser.add_argument("--include-roles", action="store_true", help="Copy admin/manager mappings as well.")
+        parser.add_argument("--owner", help="Email of a user to map as SUPERADMIN on the copy.")
+
+    def handle(self, *args, **options):
+        try:
+            main_event = MainEvent.objects.get(pk=options["main_event_id"])
+        except MainEvent.DoesNotExist:
+            raise CommandError(f"Main event {options['main_event_id']} does not exist.")
+
+        owner = None
+        if options["owner"]:
+            owner = User.objects.filter(email=options["owner"].strip().lower()).first()
+            if owner is None:
+                raise CommandError(f"No user with email {options['owner']}.")
+
+        clone, counts = clone_event_tree(
+            main_event, name=options["name"], include_roles=options["include_roles"], owner=owner
+        )
+        for name, value in counts.items():
+            self.stdout.write(f"  {name}: {value}")
+        self.stdout.write(self.style.SUCCESS(f"Cloned '{main_event.name}' as main event {clone.id} ({clone.event_id})."))
@@ -0,0 +1,39 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from events.models import MainEvent, PurgeJob, SubEvent, SubSubEvent
+from events.purge import LEVELS, run_job
+
+MODELS = {"main": MainEvent, "sub": SubEvent, "subsub": SubSubEvent}
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete an event and everything under it in chunks, or with --resume finish "
+        "purge jobs that are pending, failed or were interrupted."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("level", nargs="?", choices=LEVELS)
+        parser.add_argument("event_id", nargs="?", type=int)
+        parser.add_argument("--resume", action="store_true", help="Run every unfinished purge job.")
+
+    def handle(self, *args, **options):
+        if options["resume"]:
+            jobs = list(PurgeJob.objects.exclude(status=PurgeJob.Status.DONE).order_by("id"))
+        else:
+            if not options["level"] or options["event_id"] is None:
+                raise CommandError("Pass <level> <event id>, or --resume.")
+            event = MODELS[options["level"]].objects.filter(pk=options["event_id"]).first()
+            if event is None:
+                raise CommandError(f"No {options['level']} event {options['event_id']}.")
+            jobs = [PurgeJob.objects.create(level=options["level"], target_id=event.pk, target_name=event.name)]
+
+        for job in jobs:
+            run_job(job)
+            job.refresh_from_db()
+            for name, value in job.deleted.items():
+                self.stdout.write(f"  {name}: {value}")
+            if job.status == PurgeJob.Status.FAILED:
+                self.stderr.write(f"Purge job {job.id} ({job.level} {job.target_id}) failed: {job.error}")
+            else:
+                self.stdout.write(self.style.SUCCESS(f"Purged {job.level} event {job.target_id} ({job.target_name}), job {job.id}."))
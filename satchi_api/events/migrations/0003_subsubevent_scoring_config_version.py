@@ -0,0 +1,19 @@
+# Generated by Django 4.2.23 on 2026-10-19 16:39
+
+from django.db import migrations, models
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0002_mainevent_isopen_subevent_isopen_subsubevent_isopen'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='subsubevent',
+            name='scoring_config_version',
+            field=models.UUIDField(default=uuid.uuid4, editable=False),
+        ),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 4.2.23 on 2026-10-19 16:48
+
+from django.db import migrations, models
+import events.ids
+
+
+def backfill_blank_event_ids(apps, schema_editor):
+    """Give any row saved without an event_id one; existing ids are left untouched."""
+
+    for model_name, generate in (
+        ("MainEvent", events.ids.main_event_id),
+        ("SubEvent", events.ids.sub_event_id),
+        ("SubSubEvent", events.ids.subsub_event_id),
+    ):
+        model = apps.get_model("events", model_name)
+        for pk in model.objects.filter(event_id="").values_list("pk", flat=True):
+            model.objects.filter(pk=pk).update(event_id=generate())
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0003_subsubevent_scoring_config_version'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='mainevent',
+            name='event_id',
+            field=models.CharField(blank=True, default=events.ids.main_event_id, editable=False, max_length=100, unique=True),
+        ),
+        migrations.AlterField(
+            model_name='subevent',
+            name='event_id',
+            field=models.CharField(blank=True, default=events.ids.sub_event_id, editable=False, max_length=100, unique=True),
+        ),
+        migrations.AlterField(
+            model_name='subsubevent',
+            name='event_id',
+            field=models.CharField(blank=True, default=events.ids.subsub_event_id, editable=False, max_length=100, unique=True),
+        ),
+        migrations.RunPython(backfill_blank_event_ids, migrations.RunPython.noop),
+    ]
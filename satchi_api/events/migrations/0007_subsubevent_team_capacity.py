@@ -0,0 +1,34 @@
+# Generated by Django 4.2.23 on 2026-10-19 17:02
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def count_registered_teams(apps, schema_editor):
+    SubSubEvent = apps.get_model("events", "SubSubEvent")
+    Project = apps.get_model("api", "Project")
+    counts = Project.objects.filter(event=OuterRef("pk")).order_by().values("event").annotate(n=Count("pk")).values("n")
+    SubSubEvent.objects.update(registeredTeams=Coalesce(Subquery(counts), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0006_eventarchive'),
+        ('api', '0006_project_project_category'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='subsubevent',
+            name='maxTeams',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='subsubevent',
+            name='registeredTeams',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(count_registered_teams, migrations.RunPython.noop),
+    ]
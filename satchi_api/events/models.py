@@ -1,16 +1,19 @@
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
 from django.db import models
-import datetime
+import uuid
+
+from .ids import main_event_id, sub_event_id, subsub_event_id
 
 class MainEvent(models.Model):
     name = models.CharField(max_length=255)
     description = models.TextField(blank=True, null=True)
-    event_id = models.CharField(max_length=100, unique=True, blank=True, editable=False)
+    event_id = models.CharField(max_length=100, unique=True, blank=True, editable=False, default=main_event_id)
     isOpen = models.BooleanField(default=True,null=True, blank=True)
 
     def save(self, *args, **kwargs):
         if not self.event_id:
-            now = datetime.datetime.now().strftime("%Y%m%d%H%M%S")
-            self.event_id = f"EVT{now}"
+            self.event_id = main_event_id()
         super().save(*args, **kwargs)
 
     def __str__(self):
@@ -21,13 +24,12 @@ class SubEvent(models.Model):
     parent_event = models.ForeignKey(MainEvent, related_name='subevents', on_delete=models.CASCADE)
     name = models.CharField(max_length=255)
     description = models.TextField(blank=True, null=True)
-    event_id = models.CharField(max_length=100, unique=True, blank=True, editable=False)
+    event_id = models.CharField(max_length=100, unique=True, blank=True, editable=False, default=sub_event_id)
     isOpen = models.BooleanField(default=True,null=True, blank=True)
 
     def save(self, *args, **kwargs):
         if not self.event_id:
-            now = datetime.datetime.now().strftime("%Y%m%d%H%M%S%f")
-            self.event_id = f"EVT_S{now}"
+            self.event_id = sub_event_id()
         super().save(*args, **kwargs)
 
 
@@ -47,14 +49,123 @@ class SubSubEvent(models.Model):
     maxTeamSize = models.PositiveIntegerField(default=1)
     minFemaleParticipants = models.PositiveIntegerField(default=0)
     isFacultyMentorRequired = models.BooleanField(default=False)
+    # cap on registered teams (None = unlimited); registeredTeams is kept in step by api.waitlist while capped
+    maxTeams = models.PositiveIntegerField(null=True, blank=True)
+    registeredTeams = models.PositiveIntegerField(default=0, editable=False)
     
-    event_id = models.CharField(max_length=100, unique=True, blank=True, editable=False)
+    event_id = models.CharField(max_length=100, unique=True, blank=True, editable=False, default=subsub_event_id)
+    # replaced whenever the judges or rubrics change; keys eval.scoring_config's cache
+    scoring_config_version = models.UUIDField(default=uuid.uuid4, editable=False)
+
+    # written only by their own UPDATE queries; a full save of a stale instance must not put old values back
+    SERVER_MANAGED_FIELDS = ("registeredTeams", "scoring_config_version")
+
     def save(self, *args, **kwargs):
         if not self.event_id:
-            now = datetime.datetime.now().strftime("%Y%m%d%H%M%S%f")
-            self.event_id = f"EVT_SS{now}"
+            self.event_id = subsub_event_id()
+        if not self._state.adding and kwargs.get("update_fields") is None:
+            kwargs["update_fields"] = [
+                field.name
+                for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in self.SERVER_MANAGED_FIELDS
+            ]
         super().save(*args, **kwargs)
 
     def __str__(self):
         return f"{self.name} ({self.parent_subevent.name})"
 
+
+
+class PurgeJob(models.Model):
+    """
+    Progress of deleting an event tree with ``events.purge``.
+
+    The target is stored by level and id rather than by foreign key, since the
+    job outlives the rows it deletes.
+    """
+
+    class Status(models.TextChoices):
+        PENDING = "pending", "Pending"
+        RUNNING = "running", "Running"
+        DONE = "done", "Done"
+        FAILED = "failed", "Failed"
+
+    level = models.CharField(max_length=10)
+    target_id = models.BigIntegerField()
+    target_name = models.CharField(max_length=255, blank=True)
+    status = models.CharField(max_length=10, choices=Status.choices, default=Status.PENDING)
+    step = models.CharField(max_length=40, blank=True)
+    deleted = models.JSONField(default=dict)
+    error = models.TextField(blank=True)
+    created_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"Purge {self.level} {self.target_id} ({self.status})"
+
+
+class ArchiveJob(models.Model):
+    """
+    Progress of archiving a main event, or restoring an archive, with ``events.archive``.
+
+    ``target_id`` is the main event id for an archive and the archive id for
+    a restore; ``result`` is what the synchronous endpoint would have returned.
+    """
+
+    class Action(models.TextChoices):
+        ARCHIVE = "archive", "Archive"
+        RESTORE = "restore", "Restore"
+
+    Status = PurgeJob.Status
+
+    action = models.CharField(max_length=10, choices=Action.choices)
+    target_id = models.BigIntegerField()
+    target_name = models.CharField(max_length=255, blank=True)
+    status = models.CharField(max_length=10, choices=Status.choices, default=Status.PENDING)
+    result = models.JSONField(default=dict, encoder=DjangoJSONEncoder)
+    error = models.TextField(blank=True)
+    created_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"{self.get_action_display()} {self.target_id} ({self.status})"
+
+
+class EventArchive(models.Model):
+    """
+    A closed main event moved out of the live tables by ``events.archive``.
+
+    ``snapshot`` is the gzip-compressed JSON dump of every row of the tree;
+    restoring it puts the rows back under their original ids.
+    """
+
+    source_id = models.BigIntegerField()
+    event_id = models.CharField(max_length=100, db_index=True)
+    name = models.CharField(max_length=255)
+    snapshot = models.BinaryField()
+    size_bytes = models.PositiveIntegerField(default=0)
+    counts = models.JSONField(default=dict)
+    archived_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True)
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"Archive of {self.name} ({self.event_id})"
+
+
+class ArchivedRegistration(models.Model):
+    """
+    One participant's registration in an archived event, already rendered as
+    the ``user_registrations`` payload so history is a single indexed lookup.
+    """
+
+    archive = models.ForeignKey(EventArchive, on_delete=models.CASCADE, related_name="registrations")
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True)
+    email = models.EmailField(db_index=True)
+    payload = models.JSONField()
+
+    def __str__(self):
+        return f"{self.email} @ {self.archive}"
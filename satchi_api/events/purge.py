@@ -0,0 +1,197 @@
+"""
+Bulk deletion of event trees.
+
+Deleting through the ORM makes Django's collector load every evaluation,
+mark, project and team member of the tree to emulate cascades. A purge
+instead deletes bottom-up, one table at a time, with ``DELETE ... WHERE id
+IN (...)`` over chunks of ``EVENT_PURGE_CHUNK_SIZE`` ids, each chunk in its
+own short transaction when run outside a request. Every step only removes
+rows whose dependants are already gone, so a purge that stops halfway can
+simply be run again.
+
+Trees with more than ``EVENT_PURGE_ASYNC_THRESHOLD`` projects are purged by
+a ``PurgeJob`` in a background thread (``EVENT_PURGE_RUNNER = "thread"``);
+``manage.py purge_events --resume`` finishes jobs whose worker died.
+"""
+
+import logging
+import threading
+
+from django.conf import settings
+from django.db import connections, router, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from api.models import EventParticipant, Project, TeamMember, UserProjectMembership, WaitlistEntry
+from eval.models import (
+    Evaluation,
+    EvaluationJudgeMark,
+    EvaluationJudgeRubricMark,
+    EvaluationSyncReceipt,
+    Rubric,
+    SubSubEventJudge,
+)
+from users.models import EventUserMapping
+
+from .models import MainEvent, PurgeJob, SubEvent, SubSubEvent
+
+logger = logging.getLogger(__name__)
+
+LEVELS = ("main", "sub", "subsub")
+
+
+def _scopes(level, pk):
+    if level == "subsub":
+        return SubSubEvent.objects.filter(pk=pk), SubEvent.objects.none(), MainEvent.objects.none()
+    if level == "sub":
+        return SubSubEvent.objects.filter(parent_subevent_id=pk), SubEvent.objects.filter(pk=pk), MainEvent.objects.none()
+    return (
+        SubSubEvent.objects.filter(parent_event_id=pk),
+        SubEvent.objects.filter(parent_event_id=pk),
+        MainEvent.objects.filter(pk=pk),
+    )
+
+
+def purge_steps(level, pk):
+    """
+    ``(name, queryset, update)`` in the order they run. ``update`` is None for
+    a delete, otherwise the field values the matching rows are set to.
+    """
+
+    subsub_events, sub_events, main_events = (scope.values("pk") for scope in _scopes(level, pk))
+    evaluations = Evaluation.objects.filter(
+        Q(subsubevent__in=subsub_events) | Q(project__event__in=subsub_events)
+    ).values("pk")
+    return [
+        ("rubricMarks", EvaluationJudgeRubricMark.objects.filter(
+            Q(judge_mark__evaluation__in=evaluations) | Q(rubric__subsubevent__in=subsub_events)
+        ), None),
+        ("judgeMarks", EvaluationJudgeMark.objects.filter(evaluation__in=evaluations), None),
+        # marks elsewhere that still point at one of these judges keep their judge_name
+        ("judgeLinks", EvaluationJudgeMark.objects.filter(subsubevent_judge__subsubevent__in=subsub_events),
+         {"subsubevent_judge": None}),
+        ("evaluations", Evaluation.objects.filter(pk__in=evaluations), None),
+        ("syncReceipts", EvaluationSyncReceipt.objects.filter(subsubevent__in=subsub_events), None),
+        ("waitlist", WaitlistEntry.objects.filter(event__in=subsub_events), None),
+        ("teamMembers", TeamMember.objects.filter(project__event__in=subsub_events), None),
+        ("participants", EventParticipant.objects.filter(event__in=subsub_events), None),
+        ("memberships", UserProjectMembership.objects.filter(event__in=subsub_events), None),
+        ("projects", Project.objects.filter(event__in=subsub_events), None),
+        ("judges", SubSubEventJudge.objects.filter(subsubevent__in=subsub_events), None),
+        ("rubrics", Rubric.objects.filter(subsubevent__in=subsub_events), None),
+        ("roles", EventUserMapping.objects.filter(
+            Q(sub_sub_event__in=subsub_events) | Q(sub_event__in=sub_events) | Q(main_event__in=main_events)
+        ), None),
+        ("subSubEvents", SubSubEvent.objects.filter(pk__in=subsub_events), None),
+        ("subEvents", SubEvent.objects.filter(pk__in=sub_events), None),
+        ("mainEvents", MainEvent.objects.filter(pk__in=main_events), None),
+    ]
+
+
+def _apply_chunk(queryset, update, chunk_size):
+    ids = list(queryset.order_by().values_list("pk", flat=True)[:chunk_size])
+    if not ids:
+        return 0
+    chunk = queryset.model.objects.filter(pk__in=ids)
+    if update is not None:
+        return chunk.update(**update)
+    # _raw_delete skips the collector; the earlier steps already removed every dependant row
+    return chunk._raw_delete(router.db_for_write(queryset.model))
+
+
+def purge(level, pk, chunk_size=None, deleted=None, on_progress=None):
+    """
+    Delete the ``level`` event ``pk`` and everything under it. Returns the
+    rows affected per step, added to ``deleted`` when resuming.
+    """
+
+    chunk_size = chunk_size or settings.EVENT_PURGE_CHUNK_SIZE
+    deleted = dict(deleted or {})
+    for name, queryset, update in purge_steps(level, pk):
+        while True:
+            with transaction.atomic(using=router.db_for_write(queryset.model)):
+                count = _apply_chunk(queryset, update, chunk_size)
+            if not count:
+                break
+            deleted[name] = deleted.get(name, 0) + count
+            if on_progress is not None:
+                on_progress(name, deleted)
+    return deleted
+
+
+def needs_background_purge(level, pk):
+    subsub_events = _scopes(level, pk)[0]
+    threshold = settings.EVENT_PURGE_ASYNC_THRESHOLD
+    return Project.objects.filter(event__in=subsub_events)[: threshold + 1].count() > threshold
+
+
+def run_job(job):
+    """Run (or resume) ``job`` to completion, recording progress on the row."""
+
+    jobs = PurgeJob.objects.filter(pk=job.pk)
+    jobs.update(status=PurgeJob.Status.RUNNING, error="", updated_at=timezone.now())
+
+    def progress(step, deleted):
+        jobs.update(step=step, deleted=deleted, updated_at=timezone.now())
+
+    try:
+        deleted = purge(job.level, job.target_id, deleted=job.deleted, on_progress=progress)
+    except Exception as exc:
+        logger.exception("Purge job %s failed", job.pk)
+        jobs.update(status=PurgeJob.Status.FAILED, error=str(exc), finished_at=timezone.now(), updated_at=timezone.now())
+        return
+    jobs.update(status=PurgeJob.Status.DONE, step="", deleted=deleted, finished_at=timezone.now(), updated_at=timezone.now())
+
+
+def _run_in_thread(run, model, job_id):
+    try:
+        job = model.objects.filter(pk=job_id).first()
+        if job is not None:
+            run(job)
+    finally:
+        connections.close_all()
+
+
+def run_in_background(run, job, name):
+    """
+    Call ``run(job)`` with ``EVENT_PURGE_RUNNER``: in a daemon thread once the
+    current transaction commits, or right away when the runner is "inline".
+    """
+
+    if settings.EVENT_PURGE_RUNNER == "inline":
+        run(job)
+        return
+    transaction.on_commit(
+        lambda: threading.Thread(
+            target=_run_in_thread, args=(run, type(job), job.pk), name=f"{name}-{job.pk}", daemon=True
+        ).start()
+    )
+
+
+def close_tree(level, pk):
+    """Close the event and everything under it, so nobody registers into a tree being purged."""
+
+    for scope in _scopes(level, pk):
+        scope.filter(isOpen=True).update(isOpen=False)
+
+
+def start_job(job):
+    """Close the job's tree, then run ``job`` with the configured runner once the current transaction commits."""
+
+    close_tree(job.level, job.target_id)
+    run_in_background(run_job, job, "event-purge")
+
+
+def job_payload(job):
+    return {
+        "jobId": job.id,
+        "level": job.level,
+        "targetId": job.target_id,
+        "targetName": job.target_name,
+        "status": job.status,
+        "step": job.step,
+        "deleted": job.deleted,
+        "error": job.error,
+        "createdAt": job.created_at,
+        "finishedAt": job.finished_at,
+    }
@@ -0,0 +1,98 @@
+from django.db import transaction
+
+from eval.models import Rubric, SubSubEventJudge
+from users.models import EventUserMapping, User
+
+from .models import MainEvent, SubEvent, SubSubEvent
+
+SUBSUB_EVENT_FIELDS = (
+    "description",
+    "isOpen",
+    "rules",
+    "minTeamSize",
+    "maxTeamSize",
+    "minFemaleParticipants",
+    "isFacultyMentorRequired",
+    "maxTeams",
+)
+
+
+@transaction.atomic
+def clone_event_tree(main_event, name=None, include_roles=False, owner=None):
+    """
+    Copy ``main_event`` with its sub events, sub-sub events, judges and rubrics.
+
+    Rules, team-size constraints and open/closed state are copied; projects,
+    evaluations and registrations are not. With ``include_roles`` every
+    ``EventUserMapping`` in the tree is copied onto the new nodes. ``owner``
+    is mapped as SUPERADMIN on the new main event, as ``create_event`` does.
+    Each level is written with one ``bulk_create``; every node gets a fresh
+    ``event_id`` from its field default. Returns ``(new_main_event, counts)``.
+    """
+
+    subevents = list(SubEvent.objects.filter(parent_event=main_event).order_by("id"))
+    subsub_events = list(SubSubEvent.objects.filter(parent_event=main_event).order_by("id"))
+
+    clone = MainEvent.objects.create(
+        name=name or main_event.name,
+        description=main_event.description,
+        isOpen=main_event.isOpen,
+    )
+    new_subevents = SubEvent.objects.bulk_create(
+        SubEvent(
+            parent_event=clone,
+            name=subevent.name,
+            description=subevent.description,
+            isOpen=subevent.isOpen,
+        )
+        for subevent in subevents
+    )
+    subevent_map = {old.pk: new for old, new in zip(subevents, new_subevents)}
+    new_subsub_events = SubSubEvent.objects.bulk_create(
+        SubSubEvent(
+            parent_event=clone,
+            parent_subevent=subevent_map[subsub_event.parent_subevent_id],
+            name=subsub_event.name,
+            **{field: getattr(subsub_event, field) for field in SUBSUB_EVENT_FIELDS},
+        )
+        for subsub_event in subsub_events
+    )
+    subsub_map = {old.pk: new for old, new in zip(subsub_events, new_subsub_events)}
+
+    judges = SubSubEventJudge.objects.bulk_create(
+        SubSubEventJudge(subsubevent=subsub_map[judge.subsubevent_id], name=judge.name, order=judge.order)
+        for judge in SubSubEventJudge.objects.filter(subsubevent__in=subsub_events).order_by("id")
+    )
+    rubrics = Rubric.objects.bulk_create(
+        Rubric(subsubevent=subsub_map[rubric.subsubevent_id], name=rubric.name, max_mark=rubric.max_mark)
+        for rubric in Rubric.objects.filter(subsubevent__in=subsub_events).order_by("id")
+    )
+
+    mappings = []
+    if include_roles:
+        for mapping in (
+            EventUserMapping.objects.filter(main_event=main_event)
+            | EventUserMapping.objects.filter(sub_event__in=subevents)
+            | EventUserMapping.objects.filter(sub_sub_event__in=subsub_events)
+        ).order_by("id"):
+            mappings.append(EventUserMapping(
+                user_id=mapping.user_id,
+                user_role=mapping.user_role,
+                main_event=clone if mapping.main_event_id else None,
+                sub_event=subevent_map.get(mapping.sub_event_id),
+                sub_sub_event=subsub_map.get(mapping.sub_sub_event_id),
+            ))
+    if owner is not None and not any(
+        mapping.main_event is not None and mapping.user_id == owner.pk and mapping.user_role == User.Role.SUPERADMIN
+        for mapping in mappings
+    ):
+        mappings.append(EventUserMapping(user=owner, main_event=clone, user_role=User.Role.SUPERADMIN))
+    EventUserMapping.objects.bulk_create(mappings)
+
+    return clone, {
+        "subEvents": len(new_subevents),
+        "subSubEvents": len(new_subsub_events),
+        "judges": len(judges),
+        "rubrics": len(rubrics),
+        "roles": len(mappings),
+    }
@@ -1,3 +1,419 @@
-from django.test import TestCase
+from io import StringIO
+from unittest import mock
 
-# Create your tests here.
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from api.models import Project, TeamMember
+from eval.models import (
+    Evaluation,
+    EvaluationJudgeMark,
+    EvaluationJudgeRubricMark,
+    EvaluationSyncReceipt,
+    Rubric,
+    SubSubEventJudge,
+)
+from eval.scoring_config import get_scoring_config, invalidate_scoring_config
+from users.models import EventUserMapping, User
+
+from . import ids
+from .models import ArchivedRegistration, ArchiveJob, EventArchive, MainEvent, PurgeJob, SubEvent, SubSubEvent
+
+
+class EventIdTests(TestCase):
+    def test_ids_are_unique_and_sorted_within_one_millisecond(self):
+        with mock.patch.object(ids.time, "time_ns", return_value=1_760_000_000_000_000_000):
+            generated = [ids.ulid() for _ in range(1000)]
+        self.assertEqual(len(set(generated)), 1000)
+        self.assertEqual(generated, sorted(generated))
+        self.assertTrue(all(len(value) == 26 for value in generated))
+        # a later millisecond sorts after the whole run
+        self.assertLess(generated[-1], ids.ulid())
+
+    def test_models_get_ids_without_save(self):
+        main_events = MainEvent.objects.bulk_create(MainEvent(name=f"Festival {index}") for index in range(3))
+        sub_event = SubEvent.objects.create(parent_event=main_events[0], name="Track")
+        event_ids = [event.event_id for event in MainEvent.objects.order_by("id")]
+        self.assertEqual(len(set(event_ids)), 3)
+        self.assertTrue(all(event_id.startswith(ids.MAIN_EVENT_PREFIX) for event_id in event_ids))
+        self.assertTrue(sub_event.event_id.startswith(ids.SUB_EVENT_PREFIX))
+
+    def test_existing_ids_are_kept(self):
+        event = MainEvent.objects.create(name="Legacy", event_id="EVT20250818105800")
+        event.name = "Legacy festival"
+        event.save()
+        self.assertEqual(MainEvent.objects.get(pk=event.pk).event_id, "EVT20250818105800")
+
+
+class CloneEventTreeTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.admin = User.objects.create_user(
+            username="admin@amrita.edu", email="admin@amrita.edu", password="password123", role=User.Role.SUPERADMIN
+        )
+        self.manager = User.objects.create_user(
+            username="manager@amrita.edu", email="manager@amrita.edu", password="password123",
+            role=User.Role.SUBSUBEVENTMANAGER,
+        )
+
+        self.main_event = MainEvent.objects.create(name="Festival 2025", description="Annual festival")
+        self.sub_events = [
+            SubEvent.objects.create(parent_event=self.main_event, name=f"Track {index}") for index in range(2)
+        ]
+        self.subsub_events = []
+        for sub_event in self.sub_events:
+            for index in range(2):
+                subsub_event = SubSubEvent.objects.create(
+                    parent_event=self.main_event,
+                    parent_subevent=sub_event,
+                    name=f"{sub_event.name} challenge {index}",
+                    rules="Be kind",
+                    minTeamSize=2,
+                    maxTeamSize=4,
+                    minFemaleParticipants=1,
+                    isFacultyMentorRequired=True,
+                    isOpen=False,
+                )
+                SubSubEventJudge.objects.create(subsubevent=subsub_event, name="Judge A", order=1)
+                SubSubEventJudge.objects.create(subsubevent=subsub_event, name="Judge B", order=2)
+                Rubric.objects.create(subsubevent=subsub_event, name="Innovation", max_mark=10)
+                self.subsub_events.append(subsub_event)
+        EventUserMapping.objects.create(
+            user=self.manager, sub_sub_event=self.subsub_events[0], user_role=User.Role.SUBSUBEVENTMANAGER
+        )
+
+    def _clone(self, user, **payload):
+        self.client.force_authenticate(user=user)
+        return self.client.post(f"/events/clone/{self.main_event.id}/", payload, format="json", secure=True)
+
+    def test_clone_copies_the_tree_with_fresh_ids(self):
+        response = self._clone(self.admin, name="Festival 2026")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        data = response.json()
+        self.assertEqual((data["subEvents"], data["subSubEvents"], data["judges"], data["rubrics"]), (2, 4, 8, 4))
+
+        clone = MainEvent.objects.get(pk=data["id"])
+        self.assertEqual((clone.name, clone.description), ("Festival 2026", "Annual festival"))
+        copies = list(SubSubEvent.objects.filter(parent_event=clone).select_related("parent_subevent").order_by("id"))
+        self.assertEqual([copy.name for copy in copies], [event.name for event in self.subsub_events])
+        for original, copy in zip(self.subsub_events, copies):
+            self.assertEqual(copy.parent_subevent.name, original.parent_subevent.name)
+            self.assertEqual(copy.parent_subevent.parent_event_id, clone.id)
+            self.assertEqual(
+                (copy.rules, copy.minTeamSize, copy.maxTeamSize, copy.minFemaleParticipants,
+                 copy.isFacultyMentorRequired, copy.isOpen),
+                ("Be kind", 2, 4, 1, True, False),
+            )
+            self.assertNotEqual(copy.scoring_config_version, original.scoring_config_version)
+            self.assertEqual(
+                list(copy.judges.order_by("order").values_list("name", flat=True)), ["Judge A", "Judge B"]
+            )
+
+        event_ids = [
+            *MainEvent.objects.values_list("event_id", flat=True),
+            *SubEvent.objects.values_list("event_id", flat=True),
+            *SubSubEvent.objects.values_list("event_id", flat=True),
+        ]
+        self.assertEqual(len(event_ids), len(set(event_ids)))
+
+        # roles are only copied on request; the caller owns the copy
+        self.assertEqual(
+            list(EventUserMapping.objects.filter(sub_sub_event__parent_event=clone)), []
+        )
+        self.assertTrue(
+            EventUserMapping.objects.filter(user=self.admin, main_event=clone, user_role=User.Role.SUPERADMIN).exists()
+        )
+
+    def test_roles_are_copied_on_request(self):
+        data = self._clone(self.admin, includeRoles=True).json()
+        copy = SubSubEvent.objects.filter(parent_event_id=data["id"]).order_by("id").first()
+        self.assertTrue(EventUserMapping.objects.filter(user=self.manager, sub_sub_event=copy).exists())
+        self.assertEqual(data["roles"], 2)
+
+    def test_only_festival_admins_can_clone(self):
+        self.assertEqual(self._clone(self.manager).status_code, status.HTTP_403_FORBIDDEN)
+        self.assertEqual(MainEvent.objects.count(), 1)
+
+    def test_management_command(self):
+        out = StringIO()
+        call_command(
+            "clone_event_tree", str(self.main_event.id), "--name", "Festival 2027", "--owner", self.admin.email,
+            stdout=out,
+        )
+        clone = MainEvent.objects.get(name="Festival 2027")
+        self.assertEqual(SubSubEvent.objects.filter(parent_event=clone).count(), 4)
+        self.assertIn(clone.event_id, out.getvalue())
+
+
+class EventTreeMixin:
+    def setUp(self):
+        self.client = APIClient()
+        self.admin = User.objects.create_user(
+            username="admin@amrita.edu", email="admin@amrita.edu", password="password123", role=User.Role.SUPERADMIN
+        )
+        self.client.force_authenticate(user=self.admin)
+        self.main_event = MainEvent.objects.create(name="Festival 2025")
+        self.sub_event = SubEvent.objects.create(parent_event=self.main_event, name="Track")
+        self.subsub_events = [self._subsub(f"Challenge {index}") for index in range(2)]
+        EventUserMapping.objects.create(user=self.admin, main_event=self.main_event, user_role=User.Role.SUPERADMIN)
+        EventUserMapping.objects.create(user=self.admin, sub_event=self.sub_event, user_role=User.Role.SUBEVENTADMIN)
+
+    def _subsub(self, name, projects=2):
+        subsub_event = SubSubEvent.objects.create(
+            parent_event=self.main_event, parent_subevent=self.sub_event, name=name
+        )
+        judge = SubSubEventJudge.objects.create(subsubevent=subsub_event, name="Judge A", order=1)
+        rubric = Rubric.objects.create(subsubevent=subsub_event, name="Innovation", max_mark=10)
+        EvaluationSyncReceipt.objects.create(subsubevent=subsub_event, idempotency_key=f"{name}-1")
+        EventUserMapping.objects.create(
+            user=self.admin, sub_sub_event=subsub_event, user_role=User.Role.SUBSUBEVENTMANAGER
+        )
+        for index in range(projects):
+            project = Project.objects.create(
+                event=subsub_event, team_name=f"{name} team {index}", project_topic="Topic",
+                captain_name="Captain", captain_phone="9999999999", captain_email=f"c{index}@amrita.edu",
+            )
+            TeamMember.objects.create(project=project, name="Member", email="m@amrita.edu", phone="1")
+            evaluation = Evaluation.objects.create(project=project, subsubevent=subsub_event)
+            judge_mark = EvaluationJudgeMark.objects.create(
+                evaluation=evaluation, subsubevent_judge=judge, judge_name=judge.name, mark=7
+            )
+            EvaluationJudgeRubricMark.objects.create(judge_mark=judge_mark, rubric=rubric, mark=7)
+        return subsub_event
+
+
+
+class PurgeEventTreeTests(EventTreeMixin, TestCase):
+    def _delete(self, level, pk, query=""):
+        return self.client.delete(f"/events/delete_event/{level}/{pk}/{query}", secure=True)
+
+    def test_subsub_delete_purges_dependants_only(self):
+        target, other = self.subsub_events
+        response = self._delete("subsub", target.id)
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+
+        self.assertFalse(SubSubEvent.objects.filter(pk=target.pk).exists())
+        self.assertEqual(Project.objects.filter(event=target).count(), 0)
+        self.assertEqual(Evaluation.objects.count(), 2)
+        self.assertEqual(EvaluationJudgeRubricMark.objects.count(), 2)
+        self.assertEqual(TeamMember.objects.count(), 2)
+        self.assertEqual(EvaluationSyncReceipt.objects.count(), 1)
+        self.assertEqual(list(SubSubEventJudge.objects.values_list("subsubevent", flat=True)), [other.pk])
+        self.assertEqual(EventUserMapping.objects.filter(sub_sub_event__isnull=False).count(), 1)
+        self.assertTrue(SubEvent.objects.filter(pk=self.sub_event.pk).exists())
+
+    def test_main_delete_with_children_requires_recursive(self):
+        response = self._delete("main", self.main_event.id)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.json()["subSubEvents"], 2)
+        self.assertTrue(MainEvent.objects.filter(pk=self.main_event.pk).exists())
+
+        response = self._delete("main", self.main_event.id, "?recursive=true")
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        for model in (MainEvent, SubEvent, SubSubEvent, Project, TeamMember, Evaluation,
+                      EvaluationJudgeMark, EvaluationJudgeRubricMark, Rubric, EventUserMapping):
+            self.assertFalse(model.objects.exists(), model.__name__)
+
+    @override_settings(EVENT_PURGE_ASYNC_THRESHOLD=1, EVENT_PURGE_CHUNK_SIZE=1)
+    def test_large_tree_is_purged_by_a_job(self):
+        response = self._delete("sub", self.sub_event.id, "?recursive=true")
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        data = response.json()
+        self.assertEqual(data["status"], PurgeJob.Status.DONE)
+        self.assertFalse(SubEvent.objects.filter(pk=self.sub_event.pk).exists())
+        self.assertTrue(MainEvent.objects.filter(pk=self.main_event.pk).exists())
+
+        status_response = self.client.get(data["statusUrl"], secure=True)
+        self.assertEqual(status_response.status_code, status.HTTP_200_OK)
+        deleted = status_response.json()["deleted"]
+        self.assertEqual((deleted["projects"], deleted["subSubEvents"], deleted["subEvents"], deleted["roles"]), (4, 2, 1, 3))
+
+    def test_only_festival_admins_purge_main_and_sub_events(self):
+        manager = User.objects.create_user(username="manager@amrita.edu", password="password123")
+        EventUserMapping.objects.create(user=manager, sub_event=self.sub_event, user_role=User.Role.SUBEVENTMANAGER)
+        self.client.force_authenticate(user=manager)
+
+        self.assertEqual(self._delete("main", self.main_event.id, "?recursive=true").status_code, status.HTTP_403_FORBIDDEN)
+        self.assertEqual(self._delete("sub", self.sub_event.id, "?recursive=true").status_code, status.HTTP_403_FORBIDDEN)
+        self.assertEqual(SubSubEvent.objects.count(), 2)
+
+    @override_settings(EVENT_PURGE_ASYNC_THRESHOLD=1)
+    def test_purge_job_closes_the_tree_and_is_private(self):
+        with mock.patch("events.purge.run_job"):
+            response = self._delete("sub", self.sub_event.id, "?recursive=true")
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertFalse(SubEvent.objects.get(pk=self.sub_event.pk).isOpen)
+        self.assertFalse(SubSubEvent.objects.filter(parent_subevent=self.sub_event, isOpen=True).exists())
+        self.assertTrue(MainEvent.objects.get(pk=self.main_event.pk).isOpen)
+
+        status_url = response.json()["statusUrl"]
+        self.assertEqual(self.client.get(status_url, secure=True).status_code, status.HTTP_200_OK)
+        self.client.force_authenticate(user=User.objects.create_user(username="other@amrita.edu", password="password123"))
+        self.assertEqual(self.client.get(status_url, secure=True).status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_resume_command_finishes_an_interrupted_job(self):
+        target = self.subsub_events[0]
+        job = PurgeJob.objects.create(
+            level="subsub", target_id=target.pk, target_name=target.name, status=PurgeJob.Status.RUNNING,
+            step="teamMembers", deleted={"teamMembers": 1},
+        )
+        TeamMember.objects.filter(project__event=target).first().delete()
+
+        call_command("purge_events", "--resume", stdout=StringIO())
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, PurgeJob.Status.DONE)
+        self.assertEqual(job.deleted["teamMembers"], 2)
+        self.assertFalse(SubSubEvent.objects.filter(pk=target.pk).exists())
+
+
+class ArchiveEventTests(EventTreeMixin, TestCase):
+    def _archive(self):
+        return self.client.post(f"/events/archive/{self.main_event.id}/", secure=True)
+
+    def _registrations(self, user, query=""):
+        self.client.force_authenticate(user=user)
+        return self.client.get(f"/api/my-registrations/{query}", secure=True).json()["registrations"]
+
+    def test_open_event_cannot_be_archived(self):
+        response = self._archive()
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(EventArchive.objects.exists())
+
+    def test_archive_moves_the_tree_and_keeps_registration_history(self):
+        MainEvent.objects.filter(pk=self.main_event.pk).update(isOpen=False)
+        captain = User.objects.create_user(username="c0@amrita.edu", email="c0@amrita.edu", password="password123")
+
+        response = self._archive()
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.json()["counts"]["projects"], 4)
+        for model in (MainEvent, SubSubEvent, Project, TeamMember, Evaluation, EventUserMapping):
+            self.assertFalse(model.objects.exists(), model.__name__)
+
+        self.assertEqual(self._registrations(captain), [])
+        archived = self._registrations(captain, "?includeArchived=true")
+        self.assertEqual(len(archived), 2)
+        self.assertTrue(all(item["archived"] and item["role"] == "Captain" for item in archived))
+        self.assertEqual({item["mainEvent"]["name"] for item in archived}, {"Festival 2025"})
+
+    def test_restore_puts_rows_back_under_their_ids(self):
+        MainEvent.objects.filter(pk=self.main_event.pk).update(isOpen=False)
+        # the snapshot uses Django's JSON serialization, which keeps milliseconds
+        projects = {
+            pk: submitted_at.replace(microsecond=submitted_at.microsecond // 1000 * 1000)
+            for pk, submitted_at in Project.objects.values_list("id", "submitted_at")
+        }
+        marks = sorted(EvaluationJudgeRubricMark.objects.values_list("id", "judge_mark_id", "rubric_id"))
+        archive_id = self._archive().json()["archiveId"]
+
+        response = self.client.post(f"/events/archives/{archive_id}/restore/", secure=True)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()["id"], self.main_event.id)
+        self.assertEqual(dict(Project.objects.values_list("id", "submitted_at")), projects)
+        self.assertEqual(sorted(EvaluationJudgeRubricMark.objects.values_list("id", "judge_mark_id", "rubric_id")), marks)
+        self.assertEqual(EventUserMapping.objects.count(), 4)
+        self.assertFalse(EventArchive.objects.exists())
+        self.assertFalse(ArchivedRegistration.objects.exists())
+
+
+    @override_settings(EVENT_PURGE_ASYNC_THRESHOLD=1)
+    def test_large_trees_are_archived_and_restored_by_jobs(self):
+        MainEvent.objects.filter(pk=self.main_event.pk).update(isOpen=False)
+        response = self._archive()
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        data = response.json()
+        self.assertEqual((data["action"], data["status"]), (ArchiveJob.Action.ARCHIVE, ArchiveJob.Status.DONE))
+        self.assertEqual(data["result"]["counts"]["projects"], 4)
+        self.assertFalse(MainEvent.objects.exists())
+
+        outsider = APIClient()
+        outsider.force_authenticate(user=User.objects.create_user(username="other@amrita.edu", password="password123"))
+        self.assertEqual(outsider.get(data["statusUrl"], secure=True).status_code, status.HTTP_403_FORBIDDEN)
+
+        response = self.client.post(f"/events/archives/{data['result']['archiveId']}/restore/", secure=True)
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        status_response = self.client.get(response.json()["statusUrl"], secure=True)
+        self.assertEqual(status_response.json()["status"], ArchiveJob.Status.DONE)
+        self.assertEqual(status_response.json()["result"]["id"], self.main_event.id)
+        self.assertEqual(Project.objects.count(), 4)
+        self.assertFalse(EventArchive.objects.exists())
+
+
+class ServerManagedFieldsTests(EventTreeMixin, TestCase):
+    def test_full_save_of_a_stale_instance_keeps_the_team_counter(self):
+        event = self.subsub_events[0]
+        SubSubEvent.objects.filter(pk=event.pk).update(registeredTeams=5)
+
+        event.name = "Renamed challenge"
+        event.save()
+        response = self.client.post(f"/events/toggle_status/subsub/{event.pk}/", secure=True)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        event = SubSubEvent.objects.get(pk=event.pk)
+        self.assertEqual((event.name, event.isOpen, event.registeredTeams), ("Renamed challenge", False, 5))
+
+    def test_full_save_of_a_stale_instance_keeps_the_scoring_config_version(self):
+        stale = self.subsub_events[0]
+        current = SubSubEvent.objects.get(pk=stale.pk)
+        self.assertEqual(list(get_scoring_config(current).judge_ids), ["Judge A"])
+
+        SubSubEventJudge.objects.create(subsubevent=current, name="Judge B", order=2)
+        invalidate_scoring_config(current)
+        stale.description = "Edited with an old copy"
+        stale.save()
+
+        current = SubSubEvent.objects.get(pk=stale.pk)
+        self.assertNotEqual(current.scoring_config_version, stale.scoring_config_version)
+        self.assertEqual(list(get_scoring_config(current).judge_ids), ["Judge A", "Judge B"])
+
+
+class AdminTreeTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.manager = User.objects.create_user(username="manager@amrita.edu", email="manager@amrita.edu", password="pw")
+        self.client.force_authenticate(user=self.manager)
+        self.festivals = [MainEvent.objects.create(name=f"Festival {index}") for index in range(3)]
+        self.tracks = [SubEvent.objects.create(parent_event=self.festivals[0], name=f"Track {index}") for index in range(2)]
+        self.challenges = [
+            SubSubEvent.objects.create(parent_event=self.festivals[0], parent_subevent=track, name=f"Robotics {index}")
+            for index, track in enumerate(self.tracks)
+        ]
+        EventUserMapping.objects.create(
+            user=self.manager, sub_sub_event=self.challenges[1], user_role=User.Role.SUBSUBEVENTMANAGER
+        )
+
+    def _nodes(self, path, **params):
+        response = self.client.get(f"/events/admin-tree/{path}", params, secure=True)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.json()
+
+    def test_manager_only_sees_the_path_to_their_event(self):
+        [festival] = self._nodes("")["nodes"]
+        self.assertEqual((festival["id"], festival["childCount"], festival["role"]),
+                         (self.festivals[0].id, 1, User.Role.SUBSUBEVENTMANAGER))
+        [track] = self._nodes(f"main/{festival['id']}/")["nodes"]
+        self.assertEqual((track["id"], track["childCount"]), (self.tracks[1].id, 1))
+        [challenge] = self._nodes(f"sub/{track['id']}/")["nodes"]
+        self.assertEqual(challenge["id"], self.challenges[1].id)
+
+        response = self.client.get(f"/events/admin-tree/sub/{self.tracks[0].id}/", secure=True)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertEqual([node["id"] for node in self._nodes("search/", q="robotics")["nodes"]], [self.challenges[1].id])
+
+    @override_settings(ADMIN_TREE_PAGE_SIZE=2)
+    def test_superuser_pages_through_every_festival(self):
+        self.manager.is_superuser = True
+        self.manager.save(update_fields=["is_superuser"])
+
+        first = self._nodes("")
+        self.assertEqual([node["childCount"] for node in first["nodes"]], [2, 0])
+        self.assertEqual(first["nextOffset"], 2)
+        second = self._nodes("", offset=2)
+        self.assertEqual([node["id"] for node in second["nodes"]], [self.festivals[2].id])
+        self.assertIsNone(second["nextOffset"])
+
+        found = self._nodes("search/", q="track")
+        self.assertEqual([(node["level"], node["childCount"]) for node in found["nodes"]], [("sub", 1), ("sub", 1)])
+        self.assertEqual(self._nodes("search/", q="festival", level="main")["truncated"], True)
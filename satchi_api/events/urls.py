@@ -1,14 +1,26 @@
 from django.urls import path
+
+from backend.async_views import read_view
+
 from . import views
 
 urlpatterns = [
-    path('getEvents/', views.get_events, name='get_events'),
+    path('getEvents/', read_view(views.get_events, views.get_events_async), name='get_events'),
     path('create_event/', views.create_event, name='create_event'),
+    path('clone/<int:pk>/', views.clone_event, name='clone_event'),
+    path('archive/<int:pk>/', views.archive_main_event, name='archive_event'),
+    path('archives/', views.list_archives, name='list_archives'),
+    path('archives/<int:archive_id>/restore/', views.restore_archive, name='restore_archive'),
     path('update_event_users/', views.update_event_users, name='update_event_users'),
     path('update_event/<str:level>/<int:pk>/', views.update_event, name='update_event'),
     path("get_event_users/<str:level>/<int:event_id>/", views.get_event_users, name="get_event_users"),
     path('delete_event/<str:level>/<int:pk>/', views.delete_event, name='delete_event'),
+    path('purge_jobs/<int:job_id>/', views.purge_job_status, name='purge_job_status'),
+    path('archive_jobs/<int:job_id>/', views.archive_job_status, name='archive_job_status'),
     path('admin-data/', views.admin_data, name='admin_data'),
-    path('details/<int:event_id>/', views.getSubSubEventDetails, name='get_event_details'),
+    path('admin-tree/', views.admin_tree, name='admin_tree'),
+    path('admin-tree/search/', views.admin_tree_search, name='admin_tree_search'),
+    path('admin-tree/<str:level>/<int:pk>/', views.admin_tree_children, name='admin_tree_children'),
+    path('details/<int:event_id>/', read_view(views.getSubSubEventDetails, views.getSubSubEventDetailsAsync), name='get_event_details'),
     path('toggle_status/<str:level>/<int:eventid>/', views.openStateEvent, name='toggle_event_status'),
 ]
@@ -1,20 +1,46 @@
-from collections import defaultdict
-
+from django.conf import settings
 from django.db import transaction
-from django.db.models import Prefetch, Q
+from django.db.models import Prefetch
 from django.shortcuts import get_object_or_404
+from django.urls import reverse
 from rest_framework import status
 from rest_framework.permissions import IsAuthenticated, IsAuthenticatedOrReadOnly
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
-from .models import MainEvent, SubEvent, SubSubEvent
-from api.models import Project
-from eval.models import Evaluation
+from backend.async_views import aget_object_or_404, async_read_view, json_response
+from backend.db_router import reporting_read
+
+from .admin_tree import ROLE_PRIORITY, AdminScope, main_node, sub_node, subsub_node
+from .archive import (
+    ArchiveConflict,
+    archive_event,
+    archive_payload,
+    job_payload as archive_job_payload,
+    needs_background_restore,
+    restore_event,
+    restored_payload,
+    start_job as start_archive_job,
+)
+from .models import ArchiveJob, EventArchive, MainEvent, PurgeJob, SubEvent, SubSubEvent
+from .purge import job_payload, needs_background_purge, purge, start_job
+from .services import clone_event_tree
+from api.models import UserProjectMembership
+from api.waitlist import recount_registered_teams, schedule_promotion
 from users.models import EventUserMapping, User
 from users.services.roles import promote_user_if_higher
 
+def _parse_max_teams(value):
+    """``maxTeams`` from a request body: a positive integer, or None for no cap."""
+    if value in (None, ""):
+        return None
+    max_teams = int(value)
+    if max_teams < 1:
+        raise ValueError(max_teams)
+    return max_teams
+
+
 @api_view(["POST"])
 @transaction.atomic
 def create_event(request):
@@ -32,7 +58,8 @@ def create_event(request):
       "minMembers": 1,
       "maxMembers": 5,
       "minFemaleMembers": 0,
-      "facultyMentor": false
+      "facultyMentor": false,
+      "maxTeams": null              # cap on registered teams; null = unlimited
     }
     """
     data = request.data
@@ -67,6 +94,10 @@ def create_event(request):
     if etype in ("subsub", "sub_sub"):
         main = get_object_or_404(MainEvent, pk=data.get("parentId"))
         sub = get_object_or_404(SubEvent, pk=data.get("subParentId"), parent_event=main)
+        try:
+            max_teams = _parse_max_teams(data.get("maxTeams"))
+        except (TypeError, ValueError):
+            return Response({"error": "maxTeams must be a positive whole number."}, status=400)
 
         obj = SubSubEvent.objects.create(
             parent_event=main,
@@ -78,6 +109,7 @@ def create_event(request):
             maxTeamSize=int(data.get("maxMembers") or 1),
             minFemaleParticipants=int(data.get("minFemaleMembers") or 0),
             isFacultyMentorRequired=bool(data.get("facultyMentor")),
+            maxTeams=max_teams,
         )
         # your logic: SUPERADMIN if superuser else SUBEVENTADMIN,
         # but if user's role is EVENTADMIN, keep EVENTADMIN
@@ -91,64 +123,214 @@ def create_event(request):
 
     return Response({"error": "Invalid eventType. Use main | sub | subsub."}, status=400)
 
+
+CLONE_ROLES = {User.Role.SUPERADMIN, User.Role.EVENTADMIN}
+
+
+def _is_superadmin(user):
+    return user.is_superuser or user.role == User.Role.SUPERADMIN
+
+
+def _can_copy_or_archive(user, main_event):
+    return (
+        _is_superadmin(user)
+        or EventUserMapping.objects.filter(user=user, main_event=main_event, user_role__in=CLONE_ROLES).exists()
+    )
+
+
 @api_view(["DELETE"])
 @transaction.atomic
 def delete_event(request, level: str, pk: int):
     """
-    DELETE /api/delete_event/<level>/<pk>/
+    DELETE /api/delete_event/<level>/<pk>/[?recursive=true]
     level: main | sub | subsub
+
+    Main and sub events with child events are only deleted with
+    recursive=true, and main and sub events only by a superadmin or an admin
+    of their festival (the clone/archive check). The tree is purged bottom-up
+    in the request (204) unless it has more than EVENT_PURGE_ASYNC_THRESHOLD
+    projects; then it is closed and a background purge job is started (202),
+    whose progress is served by purge_job_status.
     """
     lvl = (level or "").lower()
+    recursive = str(request.query_params.get("recursive", "")).lower() in ("1", "true", "yes")
     if lvl == "main":
-        main_event = get_object_or_404(MainEvent, pk=pk)
-        sub_count = main_event.subevents.count()
-        subsub_count = SubSubEvent.objects.filter(parent_event=main_event).count()
-        if sub_count or subsub_count:
-            message = "Delete child events first."
+        event = get_object_or_404(MainEvent, pk=pk)
+        if not _can_copy_or_archive(request.user, event):
+            return Response({"error": "Unauthorized Access"}, status=status.HTTP_403_FORBIDDEN)
+        sub_count = event.subevents.count()
+        subsub_count = SubSubEvent.objects.filter(parent_event=event).count()
+        if (sub_count or subsub_count) and not recursive:
             return Response(
                 {
                     "error": "Main event has child events.",
                     "subEvents": sub_count,
                     "subSubEvents": subsub_count,
-                    "message": message,
+                    "message": "Delete child events first, or pass recursive=true.",
                 },
                 status=status.HTTP_400_BAD_REQUEST,
             )
-        main_event.delete()
     elif lvl == "sub":
-        sub_event = get_object_or_404(SubEvent, pk=pk)
-        subsub_count = sub_event.subsubevents.count()
-        if subsub_count:
+        event = get_object_or_404(SubEvent, pk=pk)
+        if not _can_copy_or_archive(request.user, event.parent_event):
+            return Response({"error": "Unauthorized Access"}, status=status.HTTP_403_FORBIDDEN)
+        subsub_count = event.subsubevents.count()
+        if subsub_count and not recursive:
             return Response(
                 {
                     "error": "Sub-event has child events.",
                     "subSubEvents": subsub_count,
-                    "message": "Delete child events first.",
+                    "message": "Delete child events first, or pass recursive=true.",
                 },
                 status=status.HTTP_400_BAD_REQUEST,
             )
-        sub_event.delete()
     elif lvl in ("subsub", "sub_sub"):
-        subsub_event = get_object_or_404(SubSubEvent, pk=pk)
-        # Remove evaluations first because they protect the SubSubEvent deletion.
-        Evaluation.objects.filter(subsubevent=subsub_event).delete()
-        # Projects cascade to team members automatically once removed.
-        Project.objects.filter(event=subsub_event).delete()
-        subsub_event.delete()
+        lvl = "subsub"
+        event = get_object_or_404(SubSubEvent, pk=pk)
     else:
         return Response({"error": "Invalid level. Use main | sub | subsub."}, status=400)
+
+    if needs_background_purge(lvl, pk):
+        job = PurgeJob.objects.create(level=lvl, target_id=pk, target_name=event.name, created_by=request.user)
+        start_job(job)
+        job.refresh_from_db()
+        return Response(
+            {**job_payload(job), "statusUrl": reverse("purge_job_status", args=[job.id])},
+            status=status.HTTP_202_ACCEPTED,
+        )
+    purge(lvl, pk)
     return Response(status=status.HTTP_204_NO_CONTENT)
 
 
+@api_view(["GET"])
+def purge_job_status(request, job_id: int):
+    """
+    GET /events/purge_jobs/<job id>/
+    status is pending | running | done | failed; deleted counts rows per step so far.
+    Only the user who started the job and superadmins can see it.
+    """
+    job = get_object_or_404(PurgeJob, pk=job_id)
+    if job.created_by_id != request.user.id and not _is_superadmin(request.user):
+        return Response({"error": "Unauthorized Access"}, status=status.HTTP_403_FORBIDDEN)
+    return Response(job_payload(job))
+
+
+@api_view(["POST"])
+def clone_event(request, pk: int):
+    """
+    POST /events/clone/<main id>/
+    Body (optional): {"name": "Festival 2026", "includeRoles": false}
+
+    Copies the main event's whole tree (sub events, sub-sub events with their
+    rules, team-size limits, judges and rubrics) in one transaction.
+    """
+    main_event = get_object_or_404(MainEvent, pk=pk)
+    user = request.user
+    if not _can_copy_or_archive(user, main_event):
+        return Response({"error": "Unauthorized Access"}, status=status.HTTP_403_FORBIDDEN)
+
+    name = (request.data.get("name") or "").strip() or main_event.name
+    clone, counts = clone_event_tree(
+        main_event, name=name, include_roles=bool(request.data.get("includeRoles")), owner=user
+    )
+    return Response({"id": clone.id, "level": "main", "event_id": clone.event_id, **counts}, status=201)
+
+
+def _start_archive_job(request, action, target_id, target_name):
+    job = ArchiveJob.objects.filter(
+        action=action, target_id=target_id, status__in=[ArchiveJob.Status.PENDING, ArchiveJob.Status.RUNNING]
+    ).first()
+    if job is None:
+        job = ArchiveJob.objects.create(
+            action=action, target_id=target_id, target_name=target_name, created_by=request.user
+        )
+        start_archive_job(job)
+        job.refresh_from_db()
+    return Response(
+        {**archive_job_payload(job), "statusUrl": reverse("archive_job_status", args=[job.id])},
+        status=status.HTTP_202_ACCEPTED,
+    )
+
+
+@api_view(["POST"])
+def archive_main_event(request, pk: int):
+    """
+    POST /events/archive/<main id>/
+
+    Moves a closed main event and everything under it out of the live tables
+    into an EventArchive. Its registrations stay visible through
+    user_registrations?includeArchived=true. Trees large enough for a
+    background purge are archived by a job instead (202, see archive_job_status).
+    """
+    main_event = get_object_or_404(MainEvent, pk=pk)
+    if not _can_copy_or_archive(request.user, main_event):
+        return Response({"error": "Unauthorized Access"}, status=status.HTTP_403_FORBIDDEN)
+    if main_event.isOpen:
+        return Response({"error": "Close the event before archiving it."}, status=status.HTTP_400_BAD_REQUEST)
+
+    if needs_background_purge("main", main_event.pk):
+        return _start_archive_job(request, ArchiveJob.Action.ARCHIVE, main_event.pk, main_event.name)
+    archive = archive_event(main_event, archived_by=request.user)
+    return Response(archive_payload(archive), status=status.HTTP_201_CREATED)
+
+
+@api_view(["GET"])
+def list_archives(request):
+    """GET /events/archives/ (superadmins only)"""
+    if not _is_superadmin(request.user):
+        return Response({"error": "Unauthorized Access"}, status=status.HTTP_403_FORBIDDEN)
+    archives = EventArchive.objects.defer("snapshot").order_by("-archived_at", "-id")
+    return Response({"archives": [archive_payload(archive) for archive in archives]})
+
+
+@api_view(["POST"])
+def restore_archive(request, archive_id: int):
+    """
+    POST /events/archives/<archive id>/restore/ (superadmins only)
+
+    Puts the archived tree back under its original ids and drops the archive.
+    Large archives are restored by a job instead (202, see archive_job_status).
+    """
+    if not _is_superadmin(request.user):
+        return Response({"error": "Unauthorized Access"}, status=status.HTTP_403_FORBIDDEN)
+    archive = get_object_or_404(EventArchive.objects.defer("snapshot"), pk=archive_id)
+    if needs_background_restore(archive):
+        return _start_archive_job(request, ArchiveJob.Action.RESTORE, archive.pk, archive.name)
+    try:
+        main_event = restore_event(archive)
+    except ArchiveConflict as exc:
+        return Response({"error": str(exc), "conflicts": exc.conflicts}, status=status.HTTP_409_CONFLICT)
+    return Response(restored_payload(main_event))
+
+
+@api_view(["GET"])
+def archive_job_status(request, job_id: int):
+    """
+    GET /events/archive_jobs/<job id>/
+    status is pending | running | done | failed; result holds the archive (or
+    restored event) once done, or the conflicting ids of a failed restore.
+    Only the user who started the job and superadmins can see it.
+    """
+    job = get_object_or_404(ArchiveJob, pk=job_id)
+    if job.created_by_id != request.user.id and not _is_superadmin(request.user):
+        return Response({"error": "Unauthorized Access"}, status=status.HTTP_403_FORBIDDEN)
+    return Response(archive_job_payload(job))
+
+
 @api_view(["PATCH"])
 @transaction.atomic
 def update_event(request, level: str, pk: int):
-    """Update event details such as the name for the given level."""
+    """
+    Update event details such as the name for the given level.
+    Sub-sub events also accept "maxTeams" (null = unlimited); raising it
+    moves waitlisted teams in.
+    """
 
     lvl = (level or "").lower()
     name = (request.data.get("name") or "").strip()
+    capacity_given = lvl in ("subsub", "sub_sub") and "maxTeams" in request.data
 
-    if not name:
+    if not name and not capacity_given:
         return Response({"error": "Name is required."}, status=status.HTTP_400_BAD_REQUEST)
 
     if lvl == "main":
@@ -160,13 +342,33 @@ def update_event(request, level: str, pk: int):
     else:
         return Response({"error": "Invalid level. Use main | sub | subsub."}, status=status.HTTP_400_BAD_REQUEST)
 
-    if obj.name == name:
-        return Response({"status": "no-op", "id": obj.id, "name": obj.name}, status=status.HTTP_200_OK)
+    update_fields = []
+    if name and obj.name != name:
+        obj.name = name
+        update_fields.append("name")
+    if capacity_given:
+        try:
+            max_teams = _parse_max_teams(request.data.get("maxTeams"))
+        except (TypeError, ValueError):
+            return Response({"error": "maxTeams must be a positive whole number."}, status=status.HTTP_400_BAD_REQUEST)
+        if obj.maxTeams != max_teams:
+            obj.maxTeams = max_teams
+            update_fields.append("maxTeams")
+
+    payload = {"id": obj.id, "name": obj.name}
+    if capacity_given:
+        payload["maxTeams"] = obj.maxTeams
+    if not update_fields:
+        return Response({"status": "no-op", **payload}, status=status.HTTP_200_OK)
 
-    obj.name = name
-    obj.save(update_fields=["name"])
+    obj.save(update_fields=update_fields)
+    if "maxTeams" in update_fields:
+        if obj.maxTeams is not None:
+            # uncapped events do not keep registeredTeams up to date
+            recount_registered_teams(SubSubEvent.objects.filter(pk=obj.pk))
+        schedule_promotion(obj.id)
 
-    return Response({"status": "success", "id": obj.id, "name": obj.name}, status=status.HTTP_200_OK)
+    return Response({"status": "success", **payload}, status=status.HTTP_200_OK)
 
 
 @api_view(["POST"])
@@ -258,32 +460,30 @@ def update_event_users(request):
     return Response({"ok": True, "created": created}, status=200)
 
 
-@api_view(['GET'])
-@permission_classes([IsAuthenticatedOrReadOnly])
-def get_events(request):
-    mainEvents = MainEvent.objects.all()
-    respData = []
-
-    registered_subsubevent_ids = set()
-    user = request.user
-    if user and user.is_authenticated:
-        email = (user.email or "").strip().lower()
-        registered_subsubevent_ids = set(
-            Project.objects.filter(
-                Q(captain_user=user)
-                | Q(captain_email__iexact=email)
-                | Q(members__user=user)
-                | Q(members__email__iexact=email)
-            ).values_list('event_id', flat=True)
+def _event_tree_queryset():
+    return MainEvent.objects.prefetch_related(
+        Prefetch(
+            "subevents",
+            queryset=SubEvent.objects.order_by("id").prefetch_related(
+                Prefetch("subsubevents", queryset=SubSubEvent.objects.order_by("id"))
+            ),
         )
+    )
+
+
+def _registered_subsubevent_ids_queryset(user):
+    return UserProjectMembership.objects.filter(user=user).values_list('event_id', flat=True)
 
+
+def _serialize_event_tree(mainEvents, registered_subsubevent_ids):
+    respData = []
     for mainEvent in mainEvents:
         subEventsData = []
-        subEvents = SubEvent.objects.filter(parent_event=mainEvent)
+        subEvents = mainEvent.subevents.all()
 
         for subEvent in subEvents:
             subSubEventsData = []
-            subSubEvents = SubSubEvent.objects.filter(parent_subevent=subEvent)
+            subSubEvents = subEvent.subsubevents.all()
 
             for ssEvent in subSubEvents:
                 subSubEventsData.append({
@@ -317,111 +517,41 @@ def get_events(request):
             "isOpen": getattr(mainEvent, "isOpen", True),
             "subEvents": subEventsData
         })
+    return respData
 
-    return Response(respData, status=status.HTTP_200_OK)
 
-ROLE_PRIORITY = {
-    User.Role.SUPERADMIN: 0,
-    User.Role.EVENTADMIN: 1,
-    User.Role.EVENTMANAGER: 2,
-    User.Role.SUBEVENTADMIN: 3,
-    User.Role.SUBEVENTMANAGER: 4,
-    User.Role.SUBSUBEVENTMANAGER: 5,
-    User.Role.COORDINATOR: 6,
-    User.Role.PARTICIPANT: 7,
-}
+@api_view(['GET'])
+@permission_classes([IsAuthenticatedOrReadOnly])
+def get_events(request):
+    registered_subsubevent_ids = set()
+    user = request.user
+    if user and user.is_authenticated:
+        registered_subsubevent_ids = set(_registered_subsubevent_ids_queryset(user))
 
+    return Response(
+        _serialize_event_tree(_event_tree_queryset(), registered_subsubevent_ids),
+        status=status.HTTP_200_OK,
+    )
 
-def _pick_highest_role(roles, fallback=None):
-    if not roles and fallback:
-        return fallback
-    if not roles:
-        return None
-    return sorted(roles, key=lambda role: ROLE_PRIORITY.get(role, 99))[0]
 
+@async_read_view(permission="read_only")
+async def get_events_async(request):
+    registered_subsubevent_ids = set()
+    if request.user.is_authenticated:
+        registered_subsubevent_ids = {
+            event_id async for event_id in _registered_subsubevent_ids_queryset(request.user)
+        }
+    mainEvents = [mainEvent async for mainEvent in _event_tree_queryset()]
+    return json_response(_serialize_event_tree(mainEvents, registered_subsubevent_ids))
 
 @api_view(["GET"])
 @permission_classes([IsAuthenticated])
+@reporting_read
 def admin_data(request):
     """Return a hierarchical listing of events the user can manage, preserving level metadata."""
 
-    user = request.user
-    mappings = list(
-        EventUserMapping.objects.filter(user=user)
-        .select_related(
-            "main_event",
-            "sub_event",
-            "sub_event__parent_event",
-            "sub_sub_event",
-            "sub_sub_event__parent_event",
-            "sub_sub_event__parent_subevent",
-        )
-    )
-
-    main_roles = defaultdict(set)
-    sub_roles = defaultdict(set)
-    subsub_roles = defaultdict(set)
-
-    accessible_main_ids = set()
-    accessible_sub_ids = set()
-
-    full_main_ids = set()
-    full_sub_ids = set()
-
-    subs_by_main = defaultdict(set)
-    subsubs_by_sub = defaultdict(set)
-
-    MAIN_TREE_ROLES = {User.Role.SUPERADMIN, User.Role.EVENTADMIN, User.Role.EVENTMANAGER}
-    SUB_TREE_ROLES = {
-        User.Role.SUPERADMIN,
-        User.Role.EVENTADMIN,
-        User.Role.EVENTMANAGER,
-        User.Role.SUBEVENTADMIN,
-        User.Role.SUBEVENTMANAGER,
-    }
-
-    for mapping in mappings:
-        if mapping.main_event_id:
-            main_id = mapping.main_event_id
-            accessible_main_ids.add(main_id)
-            main_roles[main_id].add(mapping.user_role)
-            if mapping.user_role in MAIN_TREE_ROLES:
-                full_main_ids.add(main_id)
-
-        if mapping.sub_event_id:
-            sub = mapping.sub_event
-            sub_id = sub.id
-            accessible_sub_ids.add(sub_id)
-            sub_roles[sub_id].add(mapping.user_role)
-            parent_main_id = sub.parent_event_id
-            accessible_main_ids.add(parent_main_id)
-            subs_by_main[parent_main_id].add(sub_id)
-            if mapping.user_role in SUB_TREE_ROLES:
-                full_sub_ids.add(sub_id)
-            if mapping.user_role in MAIN_TREE_ROLES:
-                full_main_ids.add(parent_main_id)
-
-        if mapping.sub_sub_event_id:
-            subsub = mapping.sub_sub_event
-            subsub_id = subsub.id
-            subsub_roles[subsub_id].add(mapping.user_role)
-            parent_sub_id = subsub.parent_subevent_id
-            parent_main_id = subsub.parent_event_id
-            accessible_sub_ids.add(parent_sub_id)
-            accessible_main_ids.add(parent_main_id)
-            subs_by_main[parent_main_id].add(parent_sub_id)
-            subsubs_by_sub[parent_sub_id].add(subsub_id)
-
-    # Superusers can see the entire tree even without explicit mappings.
-    if user.is_superuser:
-        all_main_ids = set(MainEvent.objects.values_list("id", flat=True))
-        accessible_main_ids |= all_main_ids
-        full_main_ids |= all_main_ids
-        for mid in all_main_ids:
-            main_roles[mid].add(User.Role.SUPERADMIN)
-
-    target_main_ids = accessible_main_ids | full_main_ids
-    if not target_main_ids:
+    scope = AdminScope(request.user)
+    if scope.is_empty:
         return Response([], status=status.HTTP_200_OK)
 
     sub_prefetch = Prefetch(
@@ -430,33 +560,18 @@ def admin_data(request):
             Prefetch("subsubevents", queryset=SubSubEvent.objects.order_by("id"))
         ),
     )
-
-    main_queryset = (
-        MainEvent.objects.filter(id__in=target_main_ids)
-        .order_by("id")
-        .prefetch_related(sub_prefetch)
-    )
+    main_queryset = MainEvent.objects.order_by("id").prefetch_related(sub_prefetch)
+    if not scope.is_superuser:
+        main_queryset = main_queryset.filter(id__in=scope.main_ids)
 
     response_payload = []
 
     for main in main_queryset:
-        relevant_sub_ids = subs_by_main.get(main.id, set())
-        include_all_subs = main.id in full_main_ids or user.is_superuser
-        sub_events = (
-            list(main.subevents.all())
-            if include_all_subs
-            else [sub for sub in main.subevents.all() if sub.id in relevant_sub_ids]
-        )
-
-        main_role_candidates = set(main_roles.get(main.id, set()))
-        for sub_id in relevant_sub_ids:
-            main_role_candidates |= sub_roles.get(sub_id, set())
-            for subsub_id in subsubs_by_sub.get(sub_id, set()):
-                main_role_candidates |= subsub_roles.get(subsub_id, set())
-        if include_all_subs and not main_role_candidates:
-            main_role_candidates.add(User.Role.SUPERADMIN if user.is_superuser else User.Role.EVENTADMIN)
-
-        main_role = _pick_highest_role(main_role_candidates)
+        main_role = scope.main_role(main.id)
+        sub_events = [
+            sub for sub in main.subevents.all()
+            if scope.includes_all_subs(main.id) or sub.id in scope.subs_by_main.get(main.id, ())
+        ]
 
         response_payload.append(
             {
@@ -471,26 +586,12 @@ def admin_data(request):
         )
 
         for sub_event in sub_events:
-            include_all_subsubs = include_all_subs or sub_event.id in full_sub_ids
-            relevant_subsub_ids = subsubs_by_sub.get(sub_event.id, set())
-            subsub_events = (
-                list(sub_event.subsubevents.all())
-                if include_all_subsubs
-                else [
-                    ss_event
-                    for ss_event in sub_event.subsubevents.all()
-                    if ss_event.id in relevant_subsub_ids
-                ]
-            )
-
-            sub_role_candidates = set(sub_roles.get(sub_event.id, set()))
-            if not include_all_subsubs:
-                for subsub_id in relevant_subsub_ids:
-                    sub_role_candidates |= subsub_roles.get(subsub_id, set())
-            if include_all_subsubs and not sub_role_candidates and main_role:
-                sub_role_candidates.add(main_role)
-
-            sub_role = _pick_highest_role(sub_role_candidates, fallback=main_role)
+            sub_role = scope.sub_role(main.id, sub_event.id)
+            subsub_events = [
+                ss_event for ss_event in sub_event.subsubevents.all()
+                if scope.includes_all_subsubs(main.id, sub_event.id)
+                or ss_event.id in scope.subsubs_by_sub.get(sub_event.id, ())
+            ]
 
             response_payload.append(
                 {
@@ -507,13 +608,6 @@ def admin_data(request):
             )
 
             for subsub_event in subsub_events:
-                subsub_role_candidates = set(subsub_roles.get(subsub_event.id, set()))
-                if not subsub_role_candidates:
-                    fallback_role = sub_role or main_role
-                else:
-                    fallback_role = None
-                subsub_role = _pick_highest_role(subsub_role_candidates, fallback=fallback_role)
-
                 response_payload.append(
                     {
                         "level": "subsub",
@@ -522,7 +616,7 @@ def admin_data(request):
                         "name": subsub_event.name,
                         "description": subsub_event.description,
                         "isOpen": subsub_event.isOpen,
-                        "role": subsub_role,
+                        "role": scope.subsub_role(main.id, sub_event.id, subsub_event.id),
                         "parentId": main.id,
                         "parentName": main.name,
                         "subParentId": sub_event.id,
@@ -532,6 +626,100 @@ def admin_data(request):
 
     return Response(response_payload, status=status.HTTP_200_OK)
 
+
+def _tree_page(request, queryset, node):
+    """One page of ``queryset`` as tree nodes, by id, from ``?offset=``."""
+    try:
+        offset = max(int(request.GET.get("offset", 0)), 0)
+    except ValueError:
+        offset = 0
+    page_size = settings.ADMIN_TREE_PAGE_SIZE
+    rows = list(queryset.order_by("id")[offset:offset + page_size + 1])
+    return {
+        "nodes": [node(row) for row in rows[:page_size]],
+        "nextOffset": offset + page_size if len(rows) > page_size else None,
+    }
+
+
+@api_view(["GET"])
+@permission_classes([IsAuthenticated])
+@reporting_read
+def admin_tree(request):
+    """
+    GET /events/admin-tree/?offset=
+    The main events the user can manage, with the number of visible
+    sub-events under each; expand one with ``admin_tree_children``.
+    """
+    scope = AdminScope(request.user)
+    if scope.is_empty:
+        return Response({"nodes": [], "nextOffset": None}, status=status.HTTP_200_OK)
+    return Response(_tree_page(request, scope.mains(), lambda main: main_node(scope, main)), status=status.HTTP_200_OK)
+
+
+@api_view(["GET"])
+@permission_classes([IsAuthenticated])
+@reporting_read
+def admin_tree_children(request, level, pk):
+    """
+    GET /events/admin-tree/<main|sub>/<id>/?offset=
+    The visible children of one node: sub-events (with their sub-sub-event
+    counts) of a main event, or sub-sub-events of a sub-event.
+    """
+    scope = AdminScope(request.user)
+    level = level.lower()
+    if level == "main":
+        parent = get_object_or_404(MainEvent, pk=pk)
+        if not scope.mains().filter(pk=parent.pk).exists():
+            return Response({"error": "Unauthorized Access"}, status=status.HTTP_403_FORBIDDEN)
+        children = scope.subs().filter(parent_event=parent)
+        node = lambda sub: sub_node(scope, sub)
+    elif level == "sub":
+        parent = get_object_or_404(SubEvent, pk=pk)
+        if not scope.subs().filter(pk=parent.pk).exists():
+            return Response({"error": "Unauthorized Access"}, status=status.HTTP_403_FORBIDDEN)
+        children = scope.subsubs().filter(parent_subevent=parent)
+        node = lambda subsub: subsub_node(scope, subsub)
+    else:
+        return Response({"error": "Invalid level. Use main | sub."}, status=status.HTTP_400_BAD_REQUEST)
+
+    return Response(_tree_page(request, children, node), status=status.HTTP_200_OK)
+
+
+@api_view(["GET"])
+@permission_classes([IsAuthenticated])
+@reporting_read
+def admin_tree_search(request):
+    """
+    GET /events/admin-tree/search/?q=<name>[&level=main|sub|subsub]
+    Events the user can manage whose name contains ``q``, at most
+    ``ADMIN_TREE_PAGE_SIZE`` per level; ``truncated`` says some were left out.
+    """
+    term = (request.GET.get("q") or "").strip()
+    if not term:
+        return Response({"error": "Pass a name to search for in ?q=."}, status=status.HTTP_400_BAD_REQUEST)
+    levels = {
+        "main": (AdminScope.mains, main_node),
+        "sub": (AdminScope.subs, sub_node),
+        "subsub": (AdminScope.subsubs, subsub_node),
+    }
+    requested = (request.GET.get("level") or "").lower()
+    if requested and requested not in levels:
+        return Response({"error": "Invalid level. Use main | sub | subsub."}, status=status.HTTP_400_BAD_REQUEST)
+
+    scope = AdminScope(request.user)
+    nodes = []
+    truncated = False
+    if not scope.is_empty:
+        page_size = settings.ADMIN_TREE_PAGE_SIZE
+        for level, (queryset, node) in levels.items():
+            if requested and level != requested:
+                continue
+            rows = list(queryset(scope).filter(name__icontains=term).order_by("id")[:page_size + 1])
+            truncated = truncated or len(rows) > page_size
+            nodes.extend(node(scope, row) for row in rows[:page_size])
+
+    return Response({"nodes": nodes, "truncated": truncated}, status=status.HTTP_200_OK)
+
 @api_view(["GET"])
 def get_event_users(request, level, event_id):
     """
@@ -580,13 +768,8 @@ def get_event_users(request, level, event_id):
     data = {"admins": admins, "managers": managers}
     return Response(data, status=200)
 
-@api_view(["GET"])
-def getSubSubEventDetails(request, event_id):
-    """
-    Return details for a specific event
-    """
-    obj = get_object_or_404(SubSubEvent, pk=event_id)
-    data = {
+def _subsubevent_details_payload(obj):
+    return {
         "id": obj.id,
         "eventId": obj.event_id,
         "name": obj.name,
@@ -597,9 +780,24 @@ def getSubSubEventDetails(request, event_id):
         "maxTeamSize": obj.maxTeamSize,
         "minFemaleParticipants": obj.minFemaleParticipants,
         "isFacultyMentorRequired": obj.isFacultyMentorRequired,
+        "maxTeams": obj.maxTeams,
+        "registeredTeams": obj.registeredTeams if obj.maxTeams is not None else None,
     }
 
-    return Response(data, status=200)
+
+@api_view(["GET"])
+def getSubSubEventDetails(request, event_id):
+    """
+    Return details for a specific event
+    """
+    obj = get_object_or_404(SubSubEvent, pk=event_id)
+    return Response(_subsubevent_details_payload(obj), status=200)
+
+
+@async_read_view()
+async def getSubSubEventDetailsAsync(request, event_id):
+    obj = await aget_object_or_404(SubSubEvent, pk=event_id)
+    return json_response(_subsubevent_details_payload(obj))
 
 @api_view(["POST"])
 @transaction.atomic
@@ -613,7 +811,7 @@ def openStateEvent(request,level,eventid):
 
     new_state = not bool(obj.isOpen)
     obj.isOpen = new_state
-    obj.save()
+    obj.save(update_fields=["isOpen"])
 
     if level == "main" and new_state is False:
         SubEvent.objects.filter(parent_event=obj, isOpen=True).update(isOpen=False)
@@ -0,0 +1,610 @@
+"""
+Scenario-based HTTP benchmarks against a generated festival.
+
+Scenarios build a list of requests up front and the runner replays them with
+a thread pool, either in-process through Django's test client (exact query
+counts per request) or over HTTP against a local gunicorn (query counts are
+taken from the difference in ``/api/metrics/`` before and after a scenario).
+The local server runs either the WSGI app on sync workers or ``backend.asgi``
+on uvicorn workers with the async read views enabled, so the two serving
+modes can be compared with ``--compare``. On PostgreSQL every scenario also
+samples the server's open connections, which together with the pool stats
+from ``/api/health/`` shows the effect of ``DATABASE_POOL_ENABLED``.
+"""
+
+import json
+import math
+import os
+import re
+import secrets
+import socket
+import subprocess
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass
+from decimal import Decimal
+
+from django.conf import settings
+from django.db import connection, connections, transaction
+from django.db.models import Count
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from rest_framework.authtoken.models import Token
+
+from api.models import Project
+from eval.models import Rubric, SubSubEventJudge
+from events.models import SubSubEvent
+from perf.festival import EMAIL_DOMAIN, EVENT_ID_PREFIX, SUPERADMIN_EMAIL
+from users.models import User
+
+
+@dataclass
+class BenchRequest:
+    name: str
+    method: str
+    path: str
+    data: dict = None
+    token: str = None
+
+
+@dataclass
+class BenchResult:
+    name: str
+    seconds: float
+    status: int
+    queries: int = None
+
+
+@dataclass
+class Scenario:
+    name: str
+    description: str
+    build: object
+    concurrency: int = 4
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return None
+    rank = max(math.ceil(fraction * len(sorted_values)) - 1, 0)
+    return sorted_values[rank]
+
+
+def summarize(results, elapsed):
+    latencies = sorted(result.seconds * 1000 for result in results)
+    queries = [result.queries for result in results if result.queries is not None]
+    return {
+        "requests": len(results),
+        "errors": sum(1 for result in results if result.status >= 400),
+        "duration_s": round(elapsed, 4),
+        "throughput_rps": round(len(results) / elapsed, 2) if elapsed else None,
+        "latency_ms": {
+            "p50": round(percentile(latencies, 0.50), 3) if latencies else None,
+            "p95": round(percentile(latencies, 0.95), 3) if latencies else None,
+            "p99": round(percentile(latencies, 0.99), 3) if latencies else None,
+            "mean": round(sum(latencies) / len(latencies), 3) if latencies else None,
+            "max": round(latencies[-1], 3) if latencies else None,
+        },
+        "queries_per_request": {
+            "mean": round(sum(queries) / len(queries), 2) if queries else None,
+            "max": max(queries) if queries else None,
+        },
+    }
+
+
+class BenchFixture:
+    """Looks up the objects the scenarios target inside a generated festival."""
+
+    def __init__(self):
+        festival_events = SubSubEvent.objects.filter(event_id__startswith=EVENT_ID_PREFIX)
+        self.event = (
+            festival_events.annotate(project_count=Count("project"))
+            .order_by("-project_count", "id")
+            .first()
+        )
+        if self.event is None:
+            raise RuntimeError("No synthetic festival found. Run `manage.py generate_festival` first.")
+
+        superadmin = User.objects.get(email=SUPERADMIN_EMAIL)
+        self.superadmin_token = Token.objects.get_or_create(user=superadmin)[0].key
+        self.judges = list(
+            SubSubEventJudge.objects.filter(subsubevent=self.event).values_list("name", flat=True)
+        )
+        self.rubrics = list(Rubric.objects.filter(subsubevent=self.event).values_list("name", "max_mark"))
+        self.project_ids = list(
+            Project.objects.filter(event=self.event).order_by("id").values_list("id", flat=True)
+        )
+        captain = (
+            Project.objects.filter(event=self.event, captain_user__isnull=False)
+            .order_by("id")
+            .values_list("captain_user", flat=True)
+            .first()
+        )
+        self.captain_token = (
+            Token.objects.get_or_create(user_id=captain)[0].key if captain else self.superadmin_token
+        )
+
+    def rush_participants(self, count):
+        """Create ``count`` fresh users (and tokens) that are not registered anywhere."""
+
+        run = secrets.token_hex(3)
+        users = User.objects.bulk_create(
+            [
+                User(
+                    username=f"rush-{run}-{index}@{EMAIL_DOMAIN}",
+                    email=f"rush-{run}-{index}@{EMAIL_DOMAIN}",
+                    full_name=f"Rush {run} {index}",
+                    phone="9000000000",
+                    role=User.Role.PARTICIPANT,
+                )
+                for index in range(count)
+            ]
+        )
+        tokens = Token.objects.bulk_create(
+            [Token(key=Token.generate_key(), user=user) for user in users]
+        )
+        return run, list(zip(users, [token.key for token in tokens]))
+
+
+def build_registration_rush(fixture, iterations):
+    event = fixture.event
+    run, participants = fixture.rush_participants(iterations)
+    requests = []
+    for index, (user, token) in enumerate(participants):
+        members = [
+            {
+                "name": f"Member {member_index}",
+                "email": f"rush-{run}-{index}-m{member_index}@{EMAIL_DOMAIN}",
+                "phone": "9000000001",
+            }
+            for member_index in range(1, event.minTeamSize)
+        ]
+        requests.append(
+            BenchRequest(
+                name="submit_project",
+                method="POST",
+                path=f"/api/submit-project/{event.event_id}/",
+                token=token,
+                data={
+                    "team_name": f"Rush {run} {index}",
+                    "project_topic": "Benchmark registration",
+                    "project_category": "Software",
+                    "trl_level": 3,
+                    "sdgs": [4, 9],
+                    "captain_name": user.full_name,
+                    "captain_email": user.email,
+                    "captain_phone": user.phone,
+                    "faculty_mentor_name": "Dr. Bench",
+                    "team_members": members,
+                },
+            )
+        )
+    return requests
+
+
+def build_judging_day(fixture, iterations):
+    requests = []
+    project_ids = fixture.project_ids[:iterations]
+    for index, project_id in enumerate(project_ids):
+        marks = []
+        for judge_index, judge_name in enumerate(fixture.judges):
+            marks.append(
+                {
+                    "judge_name": judge_name,
+                    "rubric_marks": [
+                        {
+                            "rubric_name": rubric_name,
+                            "mark": str((Decimal(max_mark) * ((index + judge_index) % 5) / 4).quantize(Decimal("0.01"))),
+                        }
+                        for rubric_name, max_mark in fixture.rubrics
+                    ],
+                    "comments": "benchmark",
+                }
+            )
+        requests.append(
+            BenchRequest(
+                name="submit_evaluation_marks",
+                method="POST",
+                path="/eval/evaluations/submit/",
+                token=fixture.superadmin_token,
+                data={
+                    "project_id": project_id,
+                    "subsubevent_id": fixture.event.id,
+                    "is_disqualified": False,
+                    "remarks": "benchmark",
+                    "marks": marks,
+                },
+            )
+        )
+        requests.append(
+            BenchRequest(
+                name="get_evaluation_submission",
+                method="GET",
+                path=f"/eval/evaluations/detail/?project_id={project_id}&subsubevent_id={fixture.event.id}",
+                token=fixture.superadmin_token,
+            )
+        )
+    return requests
+
+
+def build_dashboard_polling(fixture, iterations):
+    event = fixture.event
+    token = fixture.superadmin_token
+    requests = []
+    for _ in range(iterations):
+        requests.append(BenchRequest("get_event_statistics", "GET", f"/api/statistics/{event.event_id}/", token=token))
+        requests.append(BenchRequest("event_registrations", "GET", f"/api/event-registrations/{event.id}/", token=token))
+        requests.append(BenchRequest("admin_data", "GET", "/events/admin-data/", token=token))
+    return requests
+
+
+def build_landing_page(fixture, iterations):
+    requests = []
+    for index in range(iterations):
+        token = fixture.superadmin_token if index % 2 else None
+        requests.append(BenchRequest("get_events", "GET", "/events/getEvents/", token=token))
+        requests.append(BenchRequest("get_public_stats", "GET", "/api/public-stats/"))
+    return requests
+
+
+def build_read_path(fixture, iterations):
+    event = fixture.event
+    requests = []
+    for index in range(iterations):
+        token = fixture.captain_token if index % 2 else None
+        requests.append(BenchRequest("get_events", "GET", "/events/getEvents/", token=token))
+        requests.append(
+            BenchRequest("get_event_details", "GET", f"/events/details/{event.id}/", token=fixture.captain_token)
+        )
+        requests.append(BenchRequest("list_judges", "GET", f"/eval/subsubevents/{event.id}/judges/", token=token))
+        requests.append(BenchRequest("get_public_stats", "GET", "/api/public-stats/"))
+        requests.append(
+            BenchRequest("user_registrations", "GET", "/api/my-registrations/", token=fixture.captain_token)
+        )
+    return requests
+
+
+SCENARIOS = {
+    "registration_rush": Scenario(
+        "registration_rush",
+        "Concurrent submit_project calls from fresh captains into one sub-sub event "
+        "(the registration queue is off unless the bench is run with --registration-queue).",
+        build_registration_rush,
+        concurrency=8,
+    ),
+    "judging_day": Scenario(
+        "judging_day",
+        "submit_evaluation_marks followed by get_evaluation_submission for each team.",
+        build_judging_day,
+        concurrency=4,
+    ),
+    "dashboard_polling": Scenario(
+        "dashboard_polling",
+        "Organiser dashboards polling statistics, registrations and admin data.",
+        build_dashboard_polling,
+        concurrency=4,
+    ),
+    "landing_page": Scenario(
+        "landing_page",
+        "Public landing page: event tree and public statistics.",
+        build_landing_page,
+        concurrency=8,
+    ),
+    "read_path": Scenario(
+        "read_path",
+        "The read-only endpoints that have async views, mixing anonymous and captain requests.",
+        build_read_path,
+        concurrency=16,
+    ),
+}
+
+
+class TestClientDriver:
+    """Runs requests in-process; each thread gets its own client and DB connection."""
+
+    name = "test-client"
+    reports_queries = True
+
+    def __init__(self):
+        self._local = threading.local()
+
+    def _client(self):
+        client = getattr(self._local, "client", None)
+        if client is None:
+            client = self._local.client = Client(SERVER_NAME="localhost", raise_request_exception=False)
+        return client
+
+    def execute(self, request):
+        client = self._client()
+        extra = {"secure": True}
+        if request.token:
+            extra["HTTP_AUTHORIZATION"] = f"Token {request.token}"
+
+        with CaptureQueriesContext(connection) as captured:
+            started = time.perf_counter()
+            if request.method == "GET":
+                response = client.get(request.path, **extra)
+            else:
+                response = client.generic(
+                    request.method,
+                    request.path,
+                    json.dumps(request.data or {}),
+                    content_type="application/json",
+                    **extra,
+                )
+            elapsed = time.perf_counter() - started
+        return BenchResult(request.name, elapsed, response.status_code, len(captured.captured_queries))
+
+    def queries_marker(self):
+        return None
+
+    def pool_stats(self):
+        pool_stats = getattr(connection, "pool_stats", None)
+        return pool_stats() if pool_stats is not None else None
+
+    def close_thread(self):
+        connections.close_all()
+
+
+class HttpDriver:
+    """Sends requests to a running server; query counts come from the metrics endpoint."""
+
+    name = "http"
+    reports_queries = False
+
+    def __init__(self, base_url):
+        self.base_url = base_url.rstrip("/")
+
+    def _open(self, method, path, data=None, token=None, authorization=None):
+        headers = {"X-Forwarded-Proto": "https", "Content-Type": "application/json"}
+        if token:
+            authorization = f"Token {token}"
+        if authorization:
+            headers["Authorization"] = authorization
+        body = json.dumps(data).encode() if data is not None else None
+        request = urllib.request.Request(self.base_url + path, data=body, method=method, headers=headers)
+        try:
+            with urllib.request.urlopen(request, timeout=120) as response:
+                return response.status, response.read()
+        except urllib.error.HTTPError as exc:
+            return exc.code, exc.read()
+
+    def execute(self, request):
+        started = time.perf_counter()
+        status, _ = self._open(request.method, request.path, request.data, request.token)
+        return BenchResult(request.name, time.perf_counter() - started, status)
+
+    def queries_marker(self):
+        time.sleep(settings.METRICS_FLUSH_INTERVAL + 0.2)
+        metrics_token = settings.METRICS_TOKEN
+        status, body = self._open("GET", "/api/metrics/", authorization=f"Bearer {metrics_token}" if metrics_token else None)
+        if status != 200:
+            return None
+        total = 0.0
+        for line in body.decode().splitlines():
+            match = re.match(r'satchi_db_queries_per_request_sum\{endpoint="([^"]*)"\} (\S+)', line)
+            if match and match.group(1) != "api/metrics/":
+                total += float(match.group(2))
+        return total
+
+    def pool_stats(self):
+        """Pool stats of whichever worker answers the health check."""
+
+        status, body = self._open("GET", "/api/health/")
+        if status != 200:
+            return None
+        return json.loads(body).get("pool")
+
+    def close_thread(self):
+        pass
+
+
+class ConnectionSampler:
+    """Samples the connections PostgreSQL has open to this database while a scenario runs."""
+
+    def __init__(self, interval=0.1):
+        self.interval = interval
+        self.samples = []
+        self._stop = threading.Event()
+        self._thread = None
+
+    def __enter__(self):
+        if connection.vendor == "postgresql":
+            self._thread = threading.Thread(target=self._sample, daemon=True)
+            self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+
+    def _sample(self):
+        try:
+            with connections["default"].cursor() as cursor:
+                while not self._stop.is_set():
+                    cursor.execute(
+                        "SELECT count(*) FROM pg_stat_activity "
+                        "WHERE datname = current_database() AND pid <> pg_backend_pid()"
+                    )
+                    self.samples.append(cursor.fetchone()[0])
+                    self._stop.wait(self.interval)
+        finally:
+            connections.close_all()
+
+    def summary(self):
+        if not self.samples:
+            return None
+        return {
+            "peak": max(self.samples),
+            "mean": round(sum(self.samples) / len(self.samples), 2),
+        }
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class LocalServer:
+    """Starts gunicorn on a free local port for the duration of a benchmark run."""
+
+    def __init__(self, workers=3, worker_class=None, application="backend.wsgi:application", env=None):
+        self.port = _free_port()
+        self.workers = workers
+        self.worker_class = worker_class
+        self.application = application
+        self.env = env or {}
+        self.process = None
+
+    @classmethod
+    def asgi(cls, workers=3, env=None):
+        """A server running ``backend.asgi`` on uvicorn workers with the async read views routed."""
+
+        return cls(
+            workers=workers,
+            worker_class="uvicorn.workers.UvicornWorker",
+            application="backend.asgi:application",
+            env={"DJANGO_ASYNC_READ_VIEWS": "True", **(env or {})},
+        )
+
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self.port}"
+
+    def __enter__(self):
+        command = [
+            sys.executable, "-m", "gunicorn", self.application,
+            "--bind", f"127.0.0.1:{self.port}",
+            "--workers", str(self.workers),
+            "--timeout", "120",
+            "--log-level", "warning",
+        ]
+        if self.worker_class:
+            command += ["--worker-class", self.worker_class]
+        self.process = subprocess.Popen(command, cwd=settings.BASE_DIR, env={**os.environ, **self.env})
+
+        deadline = time.monotonic() + 30
+        while time.monotonic() < deadline:
+            if self.process.poll() is not None:
+                raise RuntimeError("gunicorn exited during startup.")
+            try:
+                with urllib.request.urlopen(
+                    urllib.request.Request(
+                        f"{self.base_url}/api/health/", headers={"X-Forwarded-Proto": "https"}
+                    ),
+                    timeout=2,
+                ):
+                    return self
+            except (urllib.error.URLError, ConnectionError):
+                time.sleep(0.2)
+        self.__exit__(None, None, None)
+        raise RuntimeError("gunicorn did not become healthy within 30 seconds.")
+
+    def __exit__(self, *exc_info):
+        if self.process and self.process.poll() is None:
+            self.process.terminate()
+            try:
+                self.process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+
+
+def run_scenario(scenario, driver, fixture, iterations, concurrency=None):
+    requests = scenario.build(fixture, iterations)
+    workers = concurrency or scenario.concurrency
+
+    def worker(chunk):
+        try:
+            return [driver.execute(request) for request in chunk]
+        finally:
+            driver.close_thread()
+
+    chunks = [requests[index::workers] for index in range(workers)]
+    before = driver.queries_marker()
+    started = time.perf_counter()
+    with ConnectionSampler() as sampler, ThreadPoolExecutor(max_workers=workers) as pool:
+        results = [result for chunk_results in pool.map(worker, chunks) for result in chunk_results]
+    elapsed = time.perf_counter() - started
+    after = driver.queries_marker()
+
+    summary = summarize(results, elapsed)
+    summary["concurrency"] = workers
+    summary["db_connections"] = sampler.summary()
+    summary["db_pool"] = driver.pool_stats()
+    if before is not None and after is not None and results:
+        summary["queries_per_request"]["mean"] = round((after - before) / len(results), 2)
+
+    by_name = defaultdict(list)
+    for result in results:
+        by_name[result.name].append(result)
+    summary["endpoints"] = {name: summarize(items, elapsed) for name, items in by_name.items()}
+    return summary
+
+
+def best_of(repeat, func):
+    """Run ``func`` ``repeat`` times; return the fastest wall time and the last result."""
+
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func()
+        timings.append(time.perf_counter() - started)
+    return min(timings), result
+
+
+class _Rollback(Exception):
+    pass
+
+
+@contextmanager
+def rolled_back():
+    """Run the block in a transaction that is always rolled back, for micro-benchmark data."""
+
+    try:
+        with transaction.atomic():
+            yield
+            raise _Rollback
+    except _Rollback:
+        pass
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=settings.BASE_DIR, stderr=subprocess.DEVNULL
+        ).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def compare(previous, current):
+    """Return printable lines comparing p95 latency and throughput per scenario."""
+
+    lines = []
+    for name, summary in current["scenarios"].items():
+        old = previous.get("scenarios", {}).get(name)
+        if not old:
+            continue
+        old_p95, new_p95 = old["latency_ms"]["p95"], summary["latency_ms"]["p95"]
+        old_rps, new_rps = old["throughput_rps"], summary["throughput_rps"]
+        old_queries = old["queries_per_request"]["mean"]
+        new_queries = summary["queries_per_request"]["mean"]
+        line = (
+            f"{name}: p95 {old_p95} -> {new_p95} ms, "
+            f"throughput {old_rps} -> {new_rps} req/s, "
+            f"queries/request {old_queries} -> {new_queries}"
+        )
+        old_connections = (old.get("db_connections") or {}).get("peak")
+        new_connections = (summary.get("db_connections") or {}).get("peak")
+        if old_connections is not None or new_connections is not None:
+            line += f", peak db connections {old_connections} -> {new_connections}"
+        lines.append(line)
+    return lines
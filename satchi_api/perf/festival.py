@@ -0,0 +1,354 @@
+"""
+Deterministic synthetic festival data for load testing.
+
+Everything is written with ``bulk_create`` so model ``save()`` hooks never run:
+event ids, evaluation totals, team counters and participant links are
+computed here instead. The same seed always produces the same names, emails, teams and marks.
+"""
+
+import random
+from dataclasses import dataclass
+from decimal import Decimal
+from itertools import chain
+
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+
+from api.models import EventParticipant, Project, TeamMember, UserProjectMembership
+from api.waitlist import recount_registered_teams
+from eval.models import (
+    Evaluation,
+    EvaluationJudgeMark,
+    EvaluationJudgeRubricMark,
+    Rubric,
+    SubSubEventJudge,
+)
+from events.models import MainEvent, SubEvent, SubSubEvent
+from users.models import EventUserMapping, User
+
+EMAIL_DOMAIN = "festival.test"
+EVENT_ID_PREFIX = "EVT_SYN"
+DEFAULT_PASSWORD = "festival-password"
+SUPERADMIN_EMAIL = f"superadmin@{EMAIL_DOMAIN}"
+
+BATCH_SIZE = 2000
+TWO_PLACES = Decimal("0.01")
+
+SCHOOLS = ["Engineering", "Business", "Arts and Sciences", "Physical Sciences", "Medicine"]
+DEGREES = ["B.Tech", "M.Tech", "BBA", "MBA", "B.Sc", "M.Sc"]
+TOPIC_WORDS = [
+    "Smart", "Solar", "Adaptive", "Low-cost", "Wearable", "Autonomous", "Secure",
+    "Irrigation", "Grid", "Drone", "Classroom", "Clinic", "Recycling", "Traffic",
+    "Monitor", "Assistant", "Platform", "Sensor", "Network", "Marketplace",
+]
+RUBRIC_NAMES = ["Innovation", "Feasibility", "Impact", "Presentation", "Technical Depth", "Design"]
+
+
+@dataclass
+class FestivalSpec:
+    seed: int = 42
+    main_events: int = 2
+    sub_events: int = 4
+    subsub_events: int = 5
+    users: int = 20000
+    projects_per_event: int = 100
+    min_team_size: int = 2
+    max_team_size: int = 5
+    judges: int = 3
+    rubrics: int = 4
+    evaluated_fraction: float = 0.8
+    legacy_fraction: float = 0.2
+    female_fraction: float = 0.4
+    tag: str = ""
+
+
+def _bulk(model, objects):
+    return model.objects.bulk_create(objects, batch_size=BATCH_SIZE)
+
+
+def _email(tag, index):
+    return f"{tag}user{index:06d}@{EMAIL_DOMAIN}"
+
+
+def superadmin_email(tag=""):
+    return f"{tag}superadmin@{EMAIL_DOMAIN}"
+
+
+def _phone(rng):
+    return f"9{rng.randrange(10**8, 10**9)}"
+
+
+def _topic(rng):
+    return " ".join(rng.sample(TOPIC_WORDS, 3))
+
+
+def delete_festival():
+    """Remove every object created by a previous run (identified by id prefix and email domain)."""
+
+    subsub_events = SubSubEvent.objects.filter(event_id__startswith=EVENT_ID_PREFIX)
+    Evaluation.objects.filter(subsubevent__in=subsub_events).delete()
+    Project.objects.filter(event__in=subsub_events).delete()
+    MainEvent.objects.filter(event_id__startswith=EVENT_ID_PREFIX).delete()
+    User.objects.filter(email__endswith=f"@{EMAIL_DOMAIN}").delete()
+
+
+@transaction.atomic
+def generate_festival(spec, log=None):
+    """Create the festival described by ``spec`` and return per-model row counts."""
+
+    rng = random.Random(spec.seed)
+    log = log or (lambda message: None)
+    counts = {}
+
+    password = make_password(DEFAULT_PASSWORD)
+
+    users = [
+        User(
+            username=_email(spec.tag, index),
+            email=_email(spec.tag, index),
+            password=password,
+            full_name=f"Student {index:06d}",
+            phone=_phone(rng),
+            roll_no=f"CB.EN.U4{index:06d}",
+            school=rng.choice(SCHOOLS),
+            degree=rng.choice(DEGREES),
+            course="Computer Science",
+            sex="female" if rng.random() < spec.female_fraction else "male",
+            current_year=str(rng.randint(1, 4)),
+            role=User.Role.PARTICIPANT,
+        )
+        for index in range(spec.users)
+    ]
+    superadmin = User(
+        username=superadmin_email(spec.tag),
+        email=superadmin_email(spec.tag),
+        password=password,
+        full_name="Festival Superadmin",
+        role=User.Role.SUPERADMIN,
+        is_staff=True,
+        is_superuser=True,
+    )
+    users = _bulk(User, users + [superadmin])
+    superadmin = users.pop()
+    counts["users"] = len(users) + 1
+    log(f"Created {counts['users']} users.")
+
+    main_events = _bulk(
+        MainEvent,
+        [
+            MainEvent(
+                name=f"Festival {spec.tag}{spec.seed}-{main_index + 1}",
+                description=f"Synthetic main event {main_index + 1}.",
+                event_id=f"{EVENT_ID_PREFIX}{spec.tag}{spec.seed}_{main_index + 1}",
+            )
+            for main_index in range(spec.main_events)
+        ],
+    )
+    sub_events = _bulk(
+        SubEvent,
+        [
+            SubEvent(
+                parent_event=main_event,
+                name=f"Track {main_index + 1}.{sub_index + 1}",
+                description="Synthetic sub event.",
+                event_id=f"{main_event.event_id}_S{sub_index + 1}",
+            )
+            for main_index, main_event in enumerate(main_events)
+            for sub_index in range(spec.sub_events)
+        ],
+    )
+    subsub_events = _bulk(
+        SubSubEvent,
+        [
+            SubSubEvent(
+                parent_event=sub_event.parent_event,
+                parent_subevent=sub_event,
+                name=f"{sub_event.name} Challenge {subsub_index + 1}",
+                description="Synthetic competition.",
+                rules="Be original. Submit on time.",
+                minTeamSize=spec.min_team_size,
+                maxTeamSize=spec.max_team_size,
+                minFemaleParticipants=0,
+                isFacultyMentorRequired=subsub_index % 2 == 1,
+                event_id=f"{sub_event.event_id}_SS{subsub_index + 1}",
+            )
+            for sub_event in sub_events
+            for subsub_index in range(spec.subsub_events)
+        ],
+    )
+    counts["main_events"] = len(main_events)
+    counts["sub_events"] = len(sub_events)
+    counts["subsub_events"] = len(subsub_events)
+    log(f"Created {len(main_events)} main, {len(sub_events)} sub and {len(subsub_events)} sub-sub events.")
+
+    mappings = [
+        EventUserMapping(user=superadmin, main_event=main_event, user_role=User.Role.SUPERADMIN)
+        for main_event in main_events
+    ]
+    for index, subsub_event in enumerate(subsub_events):
+        mappings.append(
+            EventUserMapping(
+                user=users[index % len(users)],
+                sub_sub_event=subsub_event,
+                user_role=User.Role.SUBSUBEVENTMANAGER,
+            )
+        )
+    counts["event_user_mappings"] = len(_bulk(EventUserMapping, mappings))
+
+    judges_by_event = {}
+    rubrics_by_event = {}
+    judge_rows = []
+    rubric_rows = []
+    for subsub_event in subsub_events:
+        event_judges = [
+            SubSubEventJudge(subsubevent=subsub_event, name=f"Judge {judge_index + 1}", order=judge_index + 1)
+            for judge_index in range(spec.judges)
+        ]
+        event_rubrics = [
+            Rubric(
+                subsubevent=subsub_event,
+                name=RUBRIC_NAMES[rubric_index % len(RUBRIC_NAMES)]
+                + ("" if rubric_index < len(RUBRIC_NAMES) else f" {rubric_index + 1}"),
+                max_mark=Decimal(rng.choice([5, 10, 10, 20])),
+            )
+            for rubric_index in range(spec.rubrics)
+        ]
+        judges_by_event[subsub_event.id] = event_judges
+        rubrics_by_event[subsub_event.id] = event_rubrics
+        judge_rows.extend(event_judges)
+        rubric_rows.extend(event_rubrics)
+    counts["judges"] = len(_bulk(SubSubEventJudge, judge_rows))
+    counts["rubrics"] = len(_bulk(Rubric, rubric_rows))
+
+    projects = []
+    project_teams = []
+    cursor = 0
+    max_projects = max(len(users) // spec.max_team_size, 1)
+    for event_index, subsub_event in enumerate(subsub_events, start=1):
+        for project_index in range(min(spec.projects_per_event, max_projects)):
+            team_size = rng.randint(spec.min_team_size, spec.max_team_size)
+            team = [users[(cursor + offset) % len(users)] for offset in range(team_size)]
+            cursor = (cursor + team_size) % len(users)
+            captain, members = team[0], team[1:]
+            legacy = rng.random() < spec.legacy_fraction
+
+            team_members = [
+                {"name": member.full_name, "email": member.email, "phone": member.phone}
+                for member in members
+            ]
+            if legacy:
+                team_members = [
+                    entry["email"] if rng.random() < 0.5 else entry for entry in team_members
+                ]
+
+            projects.append(
+                Project(
+                    event=subsub_event,
+                    created_by=captain,
+                    captain_user=captain,
+                    team_name=f"Team {event_index}-{project_index + 1}",
+                    project_topic=_topic(rng),
+                    project_category=rng.choice(Project.PROJECT_CATEGORIES)[0],
+                    trl_level=rng.randint(1, 9),
+                    sdgs=sorted(rng.sample(range(1, 18), rng.randint(1, 3))),
+                    captain_name=captain.full_name,
+                    captain_phone=captain.phone,
+                    captain_email=captain.email,
+                    team_members=team_members,
+                    faculty_mentor_name="Dr. Mentor" if subsub_event.isFacultyMentorRequired else None,
+                )
+            )
+            project_teams.append((members, legacy))
+
+    projects = _bulk(Project, projects)
+    counts["projects"] = len(projects)
+    recount_registered_teams(SubSubEvent.objects.filter(pk__in=[event.pk for event in subsub_events]))
+    log(f"Created {len(projects)} projects.")
+
+    team_member_rows = [
+        TeamMember(
+            name=member.full_name,
+            email=member.email,
+            phone=member.phone,
+            user=member,
+            project=project,
+        )
+        for project, (members, legacy) in zip(projects, project_teams)
+        if not legacy
+        for member in members
+    ]
+    counts["team_members"] = len(_bulk(TeamMember, team_member_rows))
+    membership_rows = {
+        (user.id, project.id): UserProjectMembership(user=user, project=project, event_id=project.event_id)
+        for project, user in chain(
+            ((project, project.captain_user) for project in projects),
+            ((row.project, row.user) for row in team_member_rows),
+        )
+    }
+    counts["memberships"] = len(_bulk(UserProjectMembership, list(membership_rows.values())))
+    participant_rows = {
+        (project.event_id, user.email.lower()): EventParticipant(
+            event_id=project.event_id, project=project, email=user.email.lower()
+        )
+        for project, (members, _) in zip(projects, project_teams)
+        for user in chain([project.captain_user], members)
+    }
+    counts["event_participants"] = len(_bulk(EventParticipant, list(participant_rows.values())))
+
+    evaluations = []
+    evaluation_marks = []
+    for project in projects:
+        if rng.random() >= spec.evaluated_fraction:
+            continue
+        judge_scores = []
+        for judge in judges_by_event[project.event_id]:
+            rubric_scores = [
+                (rubric, (Decimal(rng.randint(0, int(rubric.max_mark) * 2)) / 2).quantize(TWO_PLACES))
+                for rubric in rubrics_by_event[project.event_id]
+            ]
+            judge_scores.append((judge, rubric_scores, sum((score for _, score in rubric_scores), Decimal("0.00"))))
+
+        total = sum((score for _, _, score in judge_scores), Decimal("0.00"))
+        evaluations.append(
+            Evaluation(
+                project=project,
+                subsubevent_id=project.event_id,
+                is_disqualified=rng.random() < 0.02,
+                remarks="",
+                number_of_judges=len(judge_scores),
+                total=total,
+                final_score=(total / len(judge_scores)).quantize(TWO_PLACES) if judge_scores else Decimal("0.00"),
+            )
+        )
+        evaluation_marks.append(judge_scores)
+
+    evaluations = _bulk(Evaluation, evaluations)
+    counts["evaluations"] = len(evaluations)
+
+    judge_mark_rows = []
+    rubric_score_rows = []
+    for evaluation, judge_scores in zip(evaluations, evaluation_marks):
+        for judge, rubric_scores, score in judge_scores:
+            judge_mark_rows.append(
+                EvaluationJudgeMark(
+                    evaluation=evaluation,
+                    subsubevent_judge=judge,
+                    judge_name=judge.name,
+                    mark=score,
+                    comments="",
+                )
+            )
+            rubric_score_rows.append(rubric_scores)
+
+    judge_mark_rows = _bulk(EvaluationJudgeMark, judge_mark_rows)
+    counts["judge_marks"] = len(judge_mark_rows)
+
+    rubric_mark_rows = [
+        EvaluationJudgeRubricMark(judge_mark=judge_mark, rubric=rubric, mark=score)
+        for judge_mark, rubric_scores in zip(judge_mark_rows, rubric_score_rows)
+        for rubric, score in rubric_scores
+    ]
+    counts["rubric_marks"] = len(_bulk(EvaluationJudgeRubricMark, rubric_mark_rows))
+    log(f"Created {counts['evaluations']} evaluations with {counts['judge_marks']} judge marks.")
+
+    return counts
@@ -0,0 +1,129 @@
+import json
+import os
+from datetime import datetime, timezone
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import override_settings
+
+from perf.bench import (
+    SCENARIOS,
+    BenchFixture,
+    HttpDriver,
+    LocalServer,
+    TestClientDriver,
+    compare,
+    git_commit,
+    run_scenario,
+)
+
+DEFAULT_OUTPUT_DIR = os.path.join(settings.BASE_DIR, "perf", "results")
+
+
+class Command(BaseCommand):
+    help = "Run HTTP benchmark scenarios against a generated festival and store the results as JSON."
+
+    def add_arguments(self, parser):
+        parser.add_argument("scenarios", nargs="*", metavar="scenario",
+                            help=f"Scenarios to run (default: all). Choices: {', '.join(SCENARIOS)}.")
+        parser.add_argument("--iterations", type=int, default=50,
+                            help="Iterations per scenario (teams, polls or page loads).")
+        parser.add_argument("--concurrency", type=int, default=None,
+                            help="Override each scenario's default number of concurrent clients.")
+        parser.add_argument("--driver", choices=["client", "gunicorn", "asgi", "url"], default="client",
+                            help="client: in-process test client; gunicorn: spawn a local WSGI server; "
+                                 "asgi: spawn a local uvicorn-worker server with async read views; url: use --url.")
+        parser.add_argument("--url", help="Base URL of an already running server (with --driver url).")
+        parser.add_argument("--workers", type=int, default=3, help="gunicorn workers (with --driver gunicorn or asgi).")
+        parser.add_argument("--registration-queue", action="store_true",
+                            help="Keep the registration queue on, so registration_rush also counts the requests "
+                                 "turned away with 429. By default it is off and the rush measures submit_project "
+                                 "itself (ignored with --driver url).")
+        parser.add_argument("--output-dir", default=DEFAULT_OUTPUT_DIR)
+        parser.add_argument("--compare", metavar="RESULT_JSON", help="Earlier result file to compare against.")
+
+    def handle(self, *args, **options):
+        names = options["scenarios"] or list(SCENARIOS)
+        unknown = [name for name in names if name not in SCENARIOS]
+        if unknown:
+            raise CommandError(f"Unknown scenario(s): {', '.join(unknown)}. Choices: {', '.join(SCENARIOS)}.")
+        fixture = BenchFixture()
+
+        if options["driver"] == "url" and not options["url"]:
+            raise CommandError("--driver url requires --url.")
+
+        concurrency = options["concurrency"]
+        if concurrency is None and connection.vendor == "sqlite":
+            self.stdout.write("SQLite serialises writers; running every scenario with one client.")
+            concurrency = 1
+
+        registration_queue = options["registration_queue"]
+        queue_override = override_settings(REGISTRATION_QUEUE_ENABLED=registration_queue)
+        server_env = {"DJANGO_REGISTRATION_QUEUE_ENABLED": str(registration_queue)}
+        server = None
+        if options["driver"] == "client":
+            driver = TestClientDriver()
+            queue_override.enable()
+        elif options["driver"] == "gunicorn":
+            server = LocalServer(workers=options["workers"], env=server_env).__enter__()
+            driver = HttpDriver(server.base_url)
+        elif options["driver"] == "asgi":
+            server = LocalServer.asgi(workers=options["workers"], env=server_env).__enter__()
+            driver = HttpDriver(server.base_url)
+        else:
+            driver = HttpDriver(options["url"])
+            registration_queue = None
+
+        report = {
+            "meta": {
+                "commit": git_commit(),
+                "timestamp": datetime.now(timezone.utc).isoformat(),
+                "driver": options["driver"],
+                "workers": options["workers"] if server else None,
+                "database": connection.vendor,
+                "db_pool": settings.DATABASE_POOL_ENABLED,
+                "registration_queue": registration_queue,
+                "iterations": options["iterations"],
+                "event": {"id": fixture.event.id, "projects": len(fixture.project_ids)},
+            },
+            "scenarios": {},
+        }
+
+        try:
+            for name in names:
+                self.stdout.write(f"Running {name} ...")
+                summary = run_scenario(
+                    SCENARIOS[name], driver, fixture, options["iterations"], concurrency
+                )
+                report["scenarios"][name] = summary
+                latency = summary["latency_ms"]
+                self.stdout.write(
+                    f"  {summary['requests']} requests, {summary['errors']} errors, "
+                    f"{summary['throughput_rps']} req/s, p50 {latency['p50']} ms, "
+                    f"p95 {latency['p95']} ms, p99 {latency['p99']} ms, "
+                    f"queries/request {summary['queries_per_request']['mean']}"
+                )
+                if summary["db_connections"]:
+                    self.stdout.write(
+                        f"  db connections peak {summary['db_connections']['peak']}, "
+                        f"mean {summary['db_connections']['mean']}"
+                    )
+        finally:
+            if server:
+                server.__exit__(None, None, None)
+            if options["driver"] == "client":
+                queue_override.disable()
+
+        os.makedirs(options["output_dir"], exist_ok=True)
+        stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S")
+        path = os.path.join(options["output_dir"], f"{stamp}-{report['meta']['commit']}.json")
+        with open(path, "w") as handle:
+            json.dump(report, handle, indent=2)
+        self.stdout.write(self.style.SUCCESS(f"Results written to {path}"))
+
+        if options["compare"]:
+            with open(options["compare"]) as handle:
+                previous = json.load(handle)
+            for line in compare(previous, report):
+                self.stdout.write(line)
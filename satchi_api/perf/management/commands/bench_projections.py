@@ -0,0 +1,82 @@
+import json
+import os
+from datetime import datetime, timezone
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.db.models import Exists, OuterRef
+
+from api.projections import PROJECT_LISTING
+from api.serializers import ProjectSerializer
+from api.models import Project
+from eval.models import Evaluation
+from events.models import SubSubEvent
+from perf.bench import best_of, git_commit, rolled_back
+from perf.festival import FestivalSpec, generate_festival
+
+DEFAULT_OUTPUT_DIR = os.path.join(settings.BASE_DIR, "perf", "results")
+
+
+class Command(BaseCommand):
+    help = (
+        "Micro-benchmark the project listing payload: ProjectSerializer over model instances "
+        "versus the values()-based projection. Data is generated in a rolled-back transaction."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000], help="Projects per run.")
+        parser.add_argument("--repeat", type=int, default=3, help="Timed runs per variant; the best is kept.")
+        parser.add_argument("--output-dir", default=DEFAULT_OUTPUT_DIR)
+
+    def _measure(self, size, repeat):
+        spec = FestivalSpec(
+            main_events=1, sub_events=1, subsub_events=1, users=max(size // 2, 10),
+            projects_per_event=size, judges=1, rubrics=1, tag=f"proj{size}",
+        )
+        generate_festival(spec)
+        event = SubSubEvent.objects.get(event_id__contains=spec.tag)
+        projects = (
+            Project.objects.filter(event=event)
+            .annotate(has_evaluation=Exists(Evaluation.objects.filter(project=OuterRef("pk"), subsubevent=event)))
+            .order_by("id")
+        )
+
+        serializer_seconds, expected = best_of(
+            repeat, lambda: ProjectSerializer(projects.prefetch_related("members"), many=True).data
+        )
+        projection_seconds, actual = best_of(repeat, lambda: PROJECT_LISTING.render(projects))
+        return {
+            "projects": len(actual),
+            "serializer_ms": round(serializer_seconds * 1000, 2),
+            "projection_ms": round(projection_seconds * 1000, 2),
+            "speedup": round(serializer_seconds / projection_seconds, 2) if projection_seconds else None,
+            "identical": json.loads(json.dumps(expected)) == actual,
+        }
+
+    def handle(self, *args, **options):
+        report = {
+            "meta": {
+                "commit": git_commit(),
+                "timestamp": datetime.now(timezone.utc).isoformat(),
+                "database": connection.vendor,
+                "repeat": options["repeat"],
+            },
+            "sizes": {},
+        }
+
+        for size in options["sizes"]:
+            self.stdout.write(f"Generating {size} projects ...")
+            with rolled_back():
+                report["sizes"][size] = result = self._measure(size, options["repeat"])
+            self.stdout.write(
+                f"  ProjectSerializer {result['serializer_ms']} ms, projection {result['projection_ms']} ms, "
+                f"{result['speedup']}x, identical output: {result['identical']}"
+            )
+
+        os.makedirs(options["output_dir"], exist_ok=True)
+        stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S")
+        path = os.path.join(options["output_dir"], f"{stamp}-{report['meta']['commit']}-projections.json")
+        with open(path, "w") as handle:
+            json.dump(report, handle, indent=2)
+        self.stdout.write(self.style.SUCCESS(f"Results written to {path}"))
@@ -0,0 +1,111 @@
+import json
+import os
+from datetime import datetime, timezone
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.utils.text import compress_string
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from api import views as api_views
+from backend.renderers import FastJSONRenderer
+from events import views as event_views
+from events.models import SubSubEvent
+from perf.bench import best_of, git_commit, rolled_back
+from perf.festival import FestivalSpec, generate_festival, superadmin_email
+from users.models import User
+
+DEFAULT_OUTPUT_DIR = os.path.join(settings.BASE_DIR, "perf", "results")
+
+
+class Command(BaseCommand):
+    help = (
+        "Micro-benchmark rendering of the largest API payloads (event tree, statistics, registrations) "
+        "with DRF's JSONRenderer versus FastJSONRenderer, and the gzip saving. "
+        "Data is generated in a rolled-back transaction."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--projects", type=int, default=5000, help="Projects in the reported sub-sub event.")
+        parser.add_argument("--events", type=int, default=200, help="Sub-sub events in the event tree.")
+        parser.add_argument("--repeat", type=int, default=5, help="Timed runs per renderer; the best is kept.")
+        parser.add_argument("--output-dir", default=DEFAULT_OUTPUT_DIR)
+
+    def _payloads(self, options):
+        tree = FestivalSpec(
+            main_events=4, sub_events=5, subsub_events=max(options["events"] // 20, 1),
+            users=50, projects_per_event=1, tag="rtree",
+        )
+        reported = FestivalSpec(
+            main_events=1, sub_events=1, subsub_events=1, users=max(options["projects"] // 2, 10),
+            projects_per_event=options["projects"], tag="rstats",
+        )
+        generate_festival(tree)
+        generate_festival(reported)
+        event = SubSubEvent.objects.get(event_id__contains=reported.tag)
+        superadmin = User.objects.get(email=superadmin_email(reported.tag))
+
+        factory = APIRequestFactory()
+
+        def data(view, path, **kwargs):
+            request = factory.get(path)
+            force_authenticate(request, user=superadmin)
+            return view(request, **kwargs).data
+
+        return {
+            "event_tree": data(event_views.get_events, "/events/getEvents/"),
+            "event_statistics": data(
+                api_views.get_event_statistics, "/api/statistics/", event_id=event.event_id
+            ),
+            "event_registrations": data(
+                api_views.event_registrations, "/api/event-registrations/", event_pk=event.pk
+            ),
+        }
+
+    def _measure(self, payload, repeat):
+        drf_seconds, expected = best_of(repeat, lambda: JSONRenderer().render(payload))
+        fast_seconds, actual = best_of(repeat, lambda: FastJSONRenderer().render(payload))
+        gzip_seconds, compressed = best_of(repeat, lambda: compress_string(actual))
+        return {
+            "bytes": len(actual),
+            "gzip_bytes": len(compressed),
+            "drf_ms": round(drf_seconds * 1000, 3),
+            "fast_ms": round(fast_seconds * 1000, 3),
+            "gzip_ms": round(gzip_seconds * 1000, 3),
+            "speedup": round(drf_seconds / fast_seconds, 2) if fast_seconds else None,
+            "identical": expected == actual,
+        }
+
+    def handle(self, *args, **options):
+        report = {
+            "meta": {
+                "commit": git_commit(),
+                "timestamp": datetime.now(timezone.utc).isoformat(),
+                "database": connection.vendor,
+                "repeat": options["repeat"],
+                "projects": options["projects"],
+                "events": options["events"],
+            },
+            "payloads": {},
+        }
+
+        self.stdout.write("Generating payloads ...")
+        with rolled_back():
+            payloads = self._payloads(options)
+
+        for name, payload in payloads.items():
+            report["payloads"][name] = result = self._measure(payload, options["repeat"])
+            self.stdout.write(
+                f"{name}: {result['bytes']} bytes ({result['gzip_bytes']} gzipped in {result['gzip_ms']} ms), "
+                f"JSONRenderer {result['drf_ms']} ms, FastJSONRenderer {result['fast_ms']} ms, "
+                f"{result['speedup']}x, identical output: {result['identical']}"
+            )
+
+        os.makedirs(options["output_dir"], exist_ok=True)
+        stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S")
+        path = os.path.join(options["output_dir"], f"{stamp}-{report['meta']['commit']}-renderers.json")
+        with open(path, "w") as handle:
+            json.dump(report, handle, indent=2)
+        self.stdout.write(self.style.SUCCESS(f"Results written to {path}"))
@@ -0,0 +1,76 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from events.models import MainEvent
+from perf.festival import (
+    DEFAULT_PASSWORD,
+    EVENT_ID_PREFIX,
+    SUPERADMIN_EMAIL,
+    FestivalSpec,
+    delete_festival,
+    generate_festival,
+)
+
+
+class Command(BaseCommand):
+    help = "Generate a deterministic synthetic festival (events, users, teams, judges and marks) for load testing."
+
+    def add_arguments(self, parser):
+        defaults = FestivalSpec()
+        parser.add_argument("--seed", type=int, default=defaults.seed)
+        parser.add_argument("--main-events", type=int, default=defaults.main_events)
+        parser.add_argument("--sub-events", type=int, default=defaults.sub_events, help="Sub events per main event.")
+        parser.add_argument("--subsub-events", type=int, default=defaults.subsub_events, help="Sub-sub events per sub event.")
+        parser.add_argument("--users", type=int, default=defaults.users)
+        parser.add_argument("--projects-per-event", type=int, default=defaults.projects_per_event)
+        parser.add_argument("--min-team-size", type=int, default=defaults.min_team_size)
+        parser.add_argument("--max-team-size", type=int, default=defaults.max_team_size)
+        parser.add_argument("--judges", type=int, default=defaults.judges, help="Judges per sub-sub event.")
+        parser.add_argument("--rubrics", type=int, default=defaults.rubrics, help="Rubrics per sub-sub event.")
+        parser.add_argument("--evaluated-fraction", type=float, default=defaults.evaluated_fraction)
+        parser.add_argument("--legacy-fraction", type=float, default=defaults.legacy_fraction,
+                            help="Share of projects that only carry legacy JSON team_members.")
+        parser.add_argument("--female-fraction", type=float, default=defaults.female_fraction)
+        parser.add_argument("--reset", action="store_true",
+                            help="Delete a previously generated festival before generating.")
+
+    def handle(self, *args, **options):
+        spec = FestivalSpec(
+            seed=options["seed"],
+            main_events=options["main_events"],
+            sub_events=options["sub_events"],
+            subsub_events=options["subsub_events"],
+            users=options["users"],
+            projects_per_event=options["projects_per_event"],
+            min_team_size=options["min_team_size"],
+            max_team_size=options["max_team_size"],
+            judges=options["judges"],
+            rubrics=options["rubrics"],
+            evaluated_fraction=options["evaluated_fraction"],
+            legacy_fraction=options["legacy_fraction"],
+            female_fraction=options["female_fraction"],
+        )
+        if spec.users < spec.max_team_size:
+            raise CommandError("--users must be at least --max-team-size.")
+        if not 1 <= spec.min_team_size <= spec.max_team_size:
+            raise CommandError("--min-team-size must be between 1 and --max-team-size.")
+
+        started = time.perf_counter()
+        if options["reset"]:
+            delete_festival()
+            self.stdout.write("Removed the previous synthetic festival.")
+        elif MainEvent.objects.filter(event_id__startswith=EVENT_ID_PREFIX).exists():
+            raise CommandError("A synthetic festival already exists. Re-run with --reset to replace it.")
+
+        counts = generate_festival(spec, log=self.stdout.write)
+        elapsed = time.perf_counter() - started
+
+        for name, value in counts.items():
+            self.stdout.write(f"  {name}: {value}")
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Generated {sum(counts.values())} rows in {elapsed:.1f}s. "
+                f"Log in as {SUPERADMIN_EMAIL} / {DEFAULT_PASSWORD}."
+            )
+        )
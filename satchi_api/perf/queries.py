@@ -0,0 +1,96 @@
+"""
+Helpers for query-count and query-shape regression tests.
+
+A query "shape" is the SQL with literals, parameter lists, ``bulk_update``
+CASE arms and selected columns stripped, so two requests that differ only
+in ids or row counts produce the same shapes. Shapes are snapshotted per database vendor in
+``perf/query_snapshots/<vendor>.json``; set ``UPDATE_QUERY_SNAPSHOTS=1`` to
+rewrite them after an intentional change (or to record a new endpoint or
+vendor).
+"""
+
+import json
+import os
+import re
+from contextlib import ExitStack
+
+from django.db import connections
+from django.test.utils import CaptureQueriesContext
+
+SNAPSHOT_DIR = os.path.join(os.path.dirname(__file__), "query_snapshots")
+
+_QUOTED_IDENTIFIER = re.compile(r'"([^"]*)"|`([^`]*)`')
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER = re.compile(r"%s|\?")
+_SELECT_LIST = re.compile(r"SELECT (DISTINCT )?.*? FROM ", re.IGNORECASE)
+_IN_LIST = re.compile(r"IN \((?:\?(?:, )?)+\)")
+_VALUES_LIST = re.compile(r"VALUES (?:\((?:[^()]*)\)(?:, )?)+")
+_CASE_WHEN_LIST = re.compile(r"(?:WHEN \([\w.]+ = \?\) THEN (?:CAST\(\? AS \w+\)|\?) )+")
+_SAVEPOINT = re.compile(r"(SAVEPOINT|RELEASE SAVEPOINT|ROLLBACK TO SAVEPOINT) \S+")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_sql(sql):
+    sql = _QUOTED_IDENTIFIER.sub(lambda match: match.group(1) or match.group(2), sql)
+    sql = _SAVEPOINT.sub(r"\1 ?", sql)
+    sql = _STRING_LITERAL.sub("?", sql)
+    sql = _NUMBER.sub("?", sql)
+    sql = _PLACEHOLDER.sub("?", sql)
+    sql = _WHITESPACE.sub(" ", sql).strip()
+    sql = _SELECT_LIST.sub(lambda match: f"SELECT {match.group(1) or ''}... FROM ", sql)
+    sql = _IN_LIST.sub("IN (...)", sql)
+    sql = _VALUES_LIST.sub("VALUES (...)", sql)
+    sql = _CASE_WHEN_LIST.sub("WHEN ... ", sql)
+    return sql
+
+
+class CaptureAllQueries:
+    """CaptureQueriesContext across every configured database alias except test mirrors."""
+
+    def __enter__(self):
+        self._stack = ExitStack()
+        self._contexts = [
+            self._stack.enter_context(CaptureQueriesContext(connections[alias]))
+            for alias in connections
+            if not connections[alias].settings_dict["TEST"]["MIRROR"]
+        ]
+        return self
+
+    def __exit__(self, *exc_info):
+        return self._stack.__exit__(*exc_info)
+
+    @property
+    def queries(self):
+        return [query["sql"] for context in self._contexts for query in context.captured_queries]
+
+    @property
+    def shapes(self):
+        return [normalize_sql(sql) for sql in self.queries]
+
+
+def _snapshot_path(vendor):
+    return os.path.join(SNAPSHOT_DIR, f"{vendor}.json")
+
+
+def load_snapshots(vendor):
+    """The vendor's snapshots, or None when it has no snapshot file yet."""
+
+    try:
+        with open(_snapshot_path(vendor)) as handle:
+            return json.load(handle)
+    except FileNotFoundError:
+        return None
+
+
+def save_snapshot(vendor, key, shapes):
+    snapshots = load_snapshots(vendor) or {}
+    snapshots[key] = shapes
+    os.makedirs(SNAPSHOT_DIR, exist_ok=True)
+    with open(_snapshot_path(vendor), "w") as handle:
+        json.dump(dict(sorted(snapshots.items())), handle, indent=2)
+        handle.write("\n")
+
+
+def should_update_snapshots():
+    return os.getenv("UPDATE_QUERY_SNAPSHOTS", "").strip().lower() in {"1", "true", "yes", "on"}
@@ -0,0 +1,442 @@
+"""
+Query-count and query-shape regression tests.
+
+Every endpoint is exercised twice: once against a tiny festival and once
+after a much larger one has been added. The number of queries must not
+change between the two runs (no per-row queries), and the normalised query
+shapes of the large run must match the snapshot in ``perf/query_snapshots``.
+A database vendor without a snapshot file only gets the size check.
+"""
+
+from django.db import connection
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from api.models import Project
+from eval.models import Evaluation, EvaluationJudgeMark, Rubric, SubSubEventJudge
+from events.models import MainEvent, SubSubEvent
+from perf.festival import (
+    DEFAULT_PASSWORD,
+    EMAIL_DOMAIN,
+    EVENT_ID_PREFIX,
+    FestivalSpec,
+    generate_festival,
+    superadmin_email,
+)
+from perf.queries import CaptureAllQueries, load_snapshots, save_snapshot, should_update_snapshots
+from users.models import EventUserMapping, User
+
+SMALL = FestivalSpec(
+    seed=11, tag="small", main_events=1, sub_events=1, subsub_events=2,
+    users=40, projects_per_event=2, judges=2, rubrics=2, evaluated_fraction=1.0,
+)
+LARGE = FestivalSpec(
+    seed=12, tag="large", main_events=2, sub_events=2, subsub_events=2,
+    users=200, projects_per_event=12, judges=2, rubrics=2, evaluated_fraction=0.9,
+)
+
+
+class Festival:
+    """The objects each endpoint is pointed at inside one generated festival."""
+
+    def __init__(self, spec):
+        generate_festival(spec)
+        self.tag = spec.tag
+        self.main_event = (
+            MainEvent.objects.filter(event_id__startswith=f"{EVENT_ID_PREFIX}{spec.tag}").order_by("id").first()
+        )
+        self.event = SubSubEvent.objects.filter(parent_event=self.main_event).order_by("id").first()
+        self.sub_event = self.event.parent_subevent
+        self.superadmin = User.objects.get(email=superadmin_email(spec.tag))
+        self.manager = (
+            EventUserMapping.objects.filter(sub_sub_event=self.event).select_related("user").first().user
+        )
+        self.project = Project.objects.filter(event=self.event).order_by("id").first()
+        self.captain = self.project.captain_user
+        self.evaluation = Evaluation.objects.filter(subsubevent=self.event).order_by("id").first()
+        self.judges = list(
+            SubSubEventJudge.objects.filter(subsubevent=self.event).order_by("order").values_list("name", flat=True)
+        )
+        self.rubrics = list(
+            Rubric.objects.filter(subsubevent=self.event).order_by("id").values_list("name", "max_mark")
+        )
+
+    def team_payload(self, captain_email, member_email):
+        return {
+            "team_name": f"Fresh team {self.tag}",
+            "project_topic": "Query regression",
+            "project_category": "Software",
+            "trl_level": 4,
+            "sdgs": [3, 7],
+            "captain_name": "Fresh Captain",
+            "captain_email": captain_email,
+            "captain_phone": "9000000000",
+            "faculty_mentor_name": "Dr. Mentor",
+            "team_members": [{"name": "Fresh Member", "email": member_email, "phone": "9000000001"}],
+        }
+
+    def marks_payload(self, project_id):
+        return {
+            "project_id": project_id,
+            "subsubevent_id": self.event.id,
+            "is_disqualified": False,
+            "remarks": "ok",
+            "marks": [
+                {
+                    "judge_name": judge,
+                    "rubric_marks": [{"rubric_name": name, "mark": "1.00"} for name, _ in self.rubrics],
+                }
+                for judge in self.judges
+            ],
+        }
+
+
+@override_settings(PASSWORD_HASHERS=["django.contrib.auth.hashers.MD5PasswordHasher"])
+class QueryShapeTestCase(TestCase):
+    maxDiff = None
+
+    def assertQueriesIndependentOfSize(self, key, prepare, expected_status=200):
+        """
+        ``prepare(festival, client)`` sets up state outside the capture and returns a
+        zero-argument callable that issues the request being measured.
+        """
+
+        runs = []
+        for spec in (SMALL, LARGE):
+            festival = Festival(spec)
+            client = APIClient()
+            perform = prepare(festival, client)
+            with CaptureAllQueries() as captured:
+                response = perform()
+            self.assertEqual(
+                response.status_code,
+                expected_status,
+                f"{key} returned {response.status_code}: {getattr(response, 'content', b'')[:500]!r}",
+            )
+            runs.append(captured.shapes)
+
+        small, large = runs
+        self.assertEqual(
+            len(small),
+            len(large),
+            f"{key}: query count grows with data size ({len(small)} -> {len(large)}).\n"
+            + "\n".join(large),
+        )
+        self.assertMatchesSnapshot(key, large)
+
+    def assertMatchesSnapshot(self, key, shapes):
+        vendor = connection.vendor
+        if should_update_snapshots():
+            save_snapshot(vendor, key, shapes)
+            return
+        snapshots = load_snapshots(vendor)
+        if snapshots is None:
+            # no shapes recorded for this database; the size check above still ran
+            return
+        expected = snapshots.get(key)
+        self.assertIsNotNone(
+            expected,
+            f"{key}: no query shapes recorded for {vendor}. Run with UPDATE_QUERY_SNAPSHOTS=1 to record them.",
+        )
+        self.assertEqual(
+            shapes,
+            expected,
+            f"{key}: query shapes changed. Re-run with UPDATE_QUERY_SNAPSHOTS=1 if this is intended.",
+        )
+
+
+def _as(role):
+    """Authenticate the client as ``festival.<role>`` before preparing the request."""
+
+    def decorator(prepare):
+        def wrapper(festival, client):
+            client.force_authenticate(user=getattr(festival, role))
+            return prepare(festival, client)
+        return wrapper
+    return decorator
+
+
+class ApiQueryTests(QueryShapeTestCase):
+    def test_health(self):
+        self.assertQueriesIndependentOfSize(
+            "api.health", lambda f, c: lambda: c.get("/api/health/", secure=True)
+        )
+
+    def test_public_stats(self):
+        self.assertQueriesIndependentOfSize(
+            "api.get_public_stats", lambda f, c: lambda: c.get("/api/public-stats/", secure=True)
+        )
+
+    def test_event_statistics(self):
+        @_as("superadmin")
+        def prepare(f, c):
+            return lambda: c.get(f"/api/statistics/{f.event.event_id}/", secure=True)
+        self.assertQueriesIndependentOfSize("api.get_event_statistics", prepare)
+
+    def test_event_registrations(self):
+        @_as("manager")
+        def prepare(f, c):
+            return lambda: c.get(f"/api/event-registrations/{f.event.id}/", secure=True)
+        self.assertQueriesIndependentOfSize("api.event_registrations", prepare)
+
+    def test_update_registration(self):
+        @_as("superadmin")
+        def prepare(f, c):
+            payload = f.team_payload(f.project.captain_email, f"patched-{f.tag}@{EMAIL_DOMAIN}")
+            return lambda: c.patch(
+                f"/api/event-registrations/{f.event.id}/{f.project.id}/", payload, format="json", secure=True
+            )
+        self.assertQueriesIndependentOfSize("api.manage_event_registration.patch", prepare)
+
+    def test_delete_registration(self):
+        @_as("superadmin")
+        def prepare(f, c):
+            return lambda: c.delete(f"/api/event-registrations/{f.event.id}/{f.project.id}/", secure=True)
+        self.assertQueriesIndependentOfSize("api.manage_event_registration.delete", prepare)
+
+    def test_user_registrations(self):
+        @_as("captain")
+        def prepare(f, c):
+            return lambda: c.get("/api/my-registrations/", secure=True)
+        self.assertQueriesIndependentOfSize("api.user_registrations", prepare)
+
+    def test_submit_project(self):
+        def prepare(f, c):
+            captain = User.objects.create(
+                username=f"fresh-{f.tag}@{EMAIL_DOMAIN}", email=f"fresh-{f.tag}@{EMAIL_DOMAIN}", full_name="Fresh"
+            )
+            c.force_authenticate(user=captain)
+            payload = f.team_payload(captain.email, f"fresh-member-{f.tag}@{EMAIL_DOMAIN}")
+            return lambda: c.post(f"/api/submit-project/{f.event.event_id}/", payload, format="json", secure=True)
+        self.assertQueriesIndependentOfSize("api.submit_project", prepare, expected_status=201)
+
+
+class EventsQueryTests(QueryShapeTestCase):
+    def test_get_events_anonymous(self):
+        self.assertQueriesIndependentOfSize(
+            "events.get_events.anonymous", lambda f, c: lambda: c.get("/events/getEvents/", secure=True)
+        )
+
+    def test_get_events_participant(self):
+        @_as("captain")
+        def prepare(f, c):
+            return lambda: c.get("/events/getEvents/", secure=True)
+        self.assertQueriesIndependentOfSize("events.get_events.participant", prepare)
+
+    def test_admin_data_superuser(self):
+        @_as("superadmin")
+        def prepare(f, c):
+            return lambda: c.get("/events/admin-data/", secure=True)
+        self.assertQueriesIndependentOfSize("events.admin_data.superuser", prepare)
+
+    def test_admin_data_manager(self):
+        @_as("manager")
+        def prepare(f, c):
+            return lambda: c.get("/events/admin-data/", secure=True)
+        self.assertQueriesIndependentOfSize("events.admin_data.manager", prepare)
+
+    def test_admin_tree_superuser(self):
+        @_as("superadmin")
+        def prepare(f, c):
+            return lambda: c.get("/events/admin-tree/", secure=True)
+        self.assertQueriesIndependentOfSize("events.admin_tree.superuser", prepare)
+
+    def test_admin_tree_children_manager(self):
+        @_as("manager")
+        def prepare(f, c):
+            return lambda: c.get(f"/events/admin-tree/sub/{f.sub_event.id}/", secure=True)
+        self.assertQueriesIndependentOfSize("events.admin_tree_children.manager", prepare)
+
+    def test_admin_tree_search(self):
+        @_as("superadmin")
+        def prepare(f, c):
+            return lambda: c.get("/events/admin-tree/search/", {"q": f.event.name}, secure=True)
+        self.assertQueriesIndependentOfSize("events.admin_tree_search", prepare)
+
+    def test_create_event(self):
+        @_as("superadmin")
+        def prepare(f, c):
+            payload = {"eventType": "subsub", "parentId": f.main_event.id, "subParentId": f.sub_event.id,
+                       "name": "New challenge", "minMembers": 1, "maxMembers": 4}
+            return lambda: c.post("/events/create_event/", payload, format="json", secure=True)
+        self.assertQueriesIndependentOfSize("events.create_event.subsub", prepare, expected_status=201)
+
+    def test_clone_event(self):
+        @_as("superadmin")
+        def prepare(f, c):
+            payload = {"name": "Next edition", "includeRoles": True}
+            return lambda: c.post(f"/events/clone/{f.main_event.id}/", payload, format="json", secure=True)
+        self.assertQueriesIndependentOfSize("events.clone_event", prepare, expected_status=201)
+
+    def test_update_event(self):
+        @_as("superadmin")
+        def prepare(f, c):
+            return lambda: c.patch(f"/events/update_event/sub/{f.sub_event.id}/", {"name": "Renamed"},
+                                   format="json", secure=True)
+        self.assertQueriesIndependentOfSize("events.update_event", prepare)
+
+    def test_update_event_users(self):
+        @_as("superadmin")
+        def prepare(f, c):
+            payload = {"eventId": f.event.id, "level": "subsub",
+                       "roles": {"admins": [], "managers": [{"email": f.captain.email}]}}
+            return lambda: c.post("/events/update_event_users/", payload, format="json", secure=True)
+        self.assertQueriesIndependentOfSize("events.update_event_users", prepare)
+
+    def test_get_event_users(self):
+        @_as("superadmin")
+        def prepare(f, c):
+            return lambda: c.get(f"/events/get_event_users/main/{f.main_event.id}/", secure=True)
+        self.assertQueriesIndependentOfSize("events.get_event_users", prepare)
+
+    def test_event_details(self):
+        @_as("captain")
+        def prepare(f, c):
+            return lambda: c.get(f"/events/details/{f.event.id}/", secure=True)
+        self.assertQueriesIndependentOfSize("events.get_event_details", prepare)
+
+    def test_toggle_status(self):
+        @_as("superadmin")
+        def prepare(f, c):
+            return lambda: c.post(f"/events/toggle_status/main/{f.main_event.id}/", secure=True)
+        self.assertQueriesIndependentOfSize("events.toggle_event_status", prepare)
+
+    def test_delete_subsub_event(self):
+        @_as("superadmin")
+        def prepare(f, c):
+            return lambda: c.delete(f"/events/delete_event/subsub/{f.event.id}/", secure=True)
+        self.assertQueriesIndependentOfSize("events.delete_event.subsub", prepare, expected_status=204)
+
+
+class EvalQueryTests(QueryShapeTestCase):
+    def test_get_main_events(self):
+        @_as("superadmin")
+        def prepare(f, c):
+            return lambda: c.post("/eval/get_main_events/", secure=True)
+        self.assertQueriesIndependentOfSize("eval.get_main_events", prepare)
+
+    def test_get_subevents(self):
+        @_as("superadmin")
+        def prepare(f, c):
+            return lambda: c.post(f"/eval/get_subevents/{f.main_event.id}/", secure=True)
+        self.assertQueriesIndependentOfSize("eval.get_subevents", prepare)
+
+    def test_get_subsubevents(self):
+        @_as("superadmin")
+        def prepare(f, c):
+            return lambda: c.post(f"/eval/get_subsubevents/{f.sub_event.id}/", secure=True)
+        self.assertQueriesIndependentOfSize("eval.get_subsubevents", prepare)
+
+    def test_get_projects(self):
+        @_as("superadmin")
+        def prepare(f, c):
+            return lambda: c.get(f"/eval/get_projects/{f.event.id}/", secure=True)
+        self.assertQueriesIndependentOfSize("eval.get_projects_by_event", prepare)
+
+    def test_link_judges(self):
+        @_as("superadmin")
+        def prepare(f, c):
+            payload = {
+                "subsubevent_id": f.event.id,
+                "names": f.judges,
+                "rubrics": [{"name": name, "max_mark": str(max_mark)} for name, max_mark in f.rubrics],
+            }
+            return lambda: c.post("/eval/subsubevents/judges/link/", payload, format="json", secure=True)
+        self.assertQueriesIndependentOfSize("eval.link_judges", prepare)
+
+    def test_list_judges(self):
+        @_as("superadmin")
+        def prepare(f, c):
+            return lambda: c.get(f"/eval/subsubevents/{f.event.id}/judges/", secure=True)
+        self.assertQueriesIndependentOfSize("eval.list_judges", prepare)
+
+    def test_summary_csv(self):
+        @_as("superadmin")
+        def prepare(f, c):
+            return lambda: c.get(f"/eval/subsubevents/{f.event.id}/summary.csv", secure=True)
+        self.assertQueriesIndependentOfSize("eval.download_summary", prepare)
+
+    def test_evaluation_detail(self):
+        @_as("superadmin")
+        def prepare(f, c):
+            return lambda: c.get(
+                f"/eval/evaluations/detail/?project_id={f.evaluation.project_id}&subsubevent_id={f.event.id}",
+                secure=True,
+            )
+        self.assertQueriesIndependentOfSize("eval.get_evaluation_detail", prepare)
+
+    def test_submit_evaluation(self):
+        @_as("superadmin")
+        def prepare(f, c):
+            payload = f.marks_payload(f.evaluation.project_id)
+            return lambda: c.post("/eval/evaluations/submit/", payload, format="json", secure=True)
+        self.assertQueriesIndependentOfSize("eval.submit_evaluation", prepare, expected_status=201)
+
+    def test_upsert_judge_mark(self):
+        @_as("superadmin")
+        def prepare(f, c):
+            judge_mark = f.evaluation.judge_marks.get(judge_name=f.judges[0])
+            payload = {
+                "project_id": f.evaluation.project_id,
+                "subsubevent_id": f.event.id,
+                "judge_name": judge_mark.judge_name,
+                "rubric_marks": [{"rubric_name": name, "mark": "1.00"} for name, _ in f.rubrics],
+                "version": judge_mark.version,
+            }
+            return lambda: c.put("/eval/evaluations/judge-mark/", payload, format="json", secure=True)
+        self.assertQueriesIndependentOfSize("eval.upsert_judge_mark", prepare)
+
+    def test_sync_evaluations(self):
+        @_as("superadmin")
+        def prepare(f, c):
+            judge_marks = EvaluationJudgeMark.objects.filter(
+                evaluation__subsubevent=f.event, judge_name=f.judges[0]
+            ).select_related("evaluation")
+            items = [
+                {
+                    "idempotency_key": f"sync-{f.tag}-{judge_mark.id}",
+                    "project_id": judge_mark.evaluation.project_id,
+                    "judge_name": judge_mark.judge_name,
+                    "rubric_marks": [{"rubric_name": name, "mark": "1.00"} for name, _ in f.rubrics],
+                    "version": judge_mark.version,
+                }
+                for judge_mark in judge_marks
+            ]
+            return lambda: c.post(
+                f"/eval/subsubevents/{f.event.id}/evaluations/sync/", {"items": items}, format="json", secure=True
+            )
+        self.assertQueriesIndependentOfSize("eval.sync_evaluations", prepare)
+
+
+class UsersQueryTests(QueryShapeTestCase):
+    def test_login(self):
+        def prepare(f, c):
+            payload = {"email": f.captain.email, "password": DEFAULT_PASSWORD}
+            return lambda: c.post("/user/login/", payload, format="json", secure=True)
+        self.assertQueriesIndependentOfSize("users.login", prepare)
+
+    def test_signup(self):
+        def prepare(f, c):
+            payload = {"email": f"signup-{f.tag}@{EMAIL_DOMAIN}", "password": "pw-123456",
+                       "fullName": "New Student", "userType": "student", "sex": "Female"}
+            return lambda: c.post("/user/signup/", payload, format="json", secure=True)
+        self.assertQueriesIndependentOfSize("users.signup", prepare, expected_status=201)
+
+    def test_profile(self):
+        @_as("captain")
+        def prepare(f, c):
+            return lambda: c.get("/user/profile/", secure=True)
+        self.assertQueriesIndependentOfSize("users.profile", prepare)
+
+    def test_manage_users_list(self):
+        @_as("superadmin")
+        def prepare(f, c):
+            return lambda: c.get("/user/admin/users/", secure=True)
+        self.assertQueriesIndependentOfSize("users.manage_users.list", prepare)
+
+    def test_update_managed_user(self):
+        @_as("superadmin")
+        def prepare(f, c):
+            return lambda: c.patch(f"/user/admin/users/{f.captain.id}/", {"phone": "9111111111"},
+                                   format="json", secure=True)
+        self.assertQueriesIndependentOfSize("users.update_managed_user", prepare)
@@ -0,0 +1,56 @@
+from django.test import TestCase
+
+from api.models import EventParticipant, Project, TeamMember
+from eval.models import Evaluation, EvaluationJudgeRubricMark
+from events.models import SubSubEvent
+from perf.festival import FestivalSpec, delete_festival, generate_festival
+
+SMALL_FESTIVAL = FestivalSpec(
+    seed=7,
+    main_events=1,
+    sub_events=2,
+    subsub_events=2,
+    users=60,
+    projects_per_event=5,
+    judges=2,
+    rubrics=3,
+)
+
+
+def _fingerprint():
+    return list(
+        Project.objects.order_by("team_name").values_list(
+            "team_name", "project_topic", "captain_email", "trl_level", "sdgs"
+        )
+    ) + list(Evaluation.objects.order_by("project__team_name").values_list("total", "final_score"))
+
+
+class FestivalGeneratorTests(TestCase):
+    def test_generates_a_consistent_tree(self):
+        counts = generate_festival(SMALL_FESTIVAL)
+
+        self.assertEqual(counts["subsub_events"], 4)
+        self.assertEqual(SubSubEvent.objects.count(), 4)
+        self.assertEqual(Project.objects.count(), 20)
+        self.assertEqual(list(SubSubEvent.objects.values_list("registeredTeams", flat=True)), [5, 5, 5, 5])
+        self.assertEqual(TeamMember.objects.count(), counts["team_members"])
+        self.assertEqual(
+            EventParticipant.objects.count(),
+            sum(1 + len(project.team_members) for project in Project.objects.all()),
+        )
+        for evaluation in Evaluation.objects.prefetch_related("judge_marks"):
+            self.assertEqual(evaluation.total, sum(mark.mark for mark in evaluation.judge_marks.all()))
+            self.assertEqual(evaluation.number_of_judges, 2)
+        self.assertEqual(
+            EvaluationJudgeRubricMark.objects.count(),
+            counts["judge_marks"] * SMALL_FESTIVAL.rubrics,
+        )
+
+    def test_same_seed_produces_the_same_festival(self):
+        generate_festival(SMALL_FESTIVAL)
+        first = _fingerprint()
+        delete_festival()
+        self.assertFalse(Project.objects.exists())
+
+        generate_festival(SMALL_FESTIVAL)
+        self.assertEqual(_fingerprint(), first)